@@ -5,4 +5,34 @@ AGENT_TIMEOUT=12000
 MAX_RETRIES=3
 DEBUG=False
 LOG_LEVEL="INFO"
-CACHE_DURATION=15
\ No newline at end of file
+LOG_MAX_PAYLOAD_CHARS=2000
+LOG_PAYLOAD_SAMPLE_EVERY=10
+LOG_FORMAT="text"
+LOG_ROTATION="size"
+LOG_MAX_BYTES=10485760
+LOG_ROTATE_WHEN="midnight"
+LOG_BACKUP_COUNT=5
+LOG_COMPRESS="true"
+LOG_QUEUE_SIZE=10000
+CACHE_DURATION=15
+REPORT_CACHE_PATH=".cache/report_cache.sqlite"
+REPORT_CACHE_STALE_MINUTES=60
+REPORT_CACHE_SERVE_STALE=True
+PROMPT_VERSION=""
+MARKET_DATA_CACHE_DIR=".cache/market_data"
+CHART_CACHE_MAX_MB=128
+CHART_RENDER_WORKERS=2
+CHART_BACKEND="Static image"
+RATE_LIMIT_MODE="sliding_window"
+RATE_LIMIT_MAX_KEYS=100000
+RATE_LIMIT_BACKEND="memory"
+RATE_LIMIT_SQLITE_PATH=".cache/rate_limits.sqlite"
+RATE_LIMIT_REDIS_URL="redis://localhost:6379/0"
+SYMBOL_LISTING_PATH=".cache/us_symbols.txt"
+SYMBOL_LISTING_MAX_AGE_DAYS=7
+SYMBOL_LISTING_TIMEOUT=10
+METRICS_PORT=0
+METRICS_DUMP_PATH=""
+METRICS_DUMP_INTERVAL=15
+TRACING_ENABLED="false"
+TRACE_EXPORT_PATH=".cache/traces.jsonl"
@@ -0,0 +1,76 @@
+"""Rendering benchmark for long-range technical analysis charts.
+
+Renders every chart of the technical analysis tab to PNG for a 20-year daily history, once through the chart
+reducer (LTTB lines, weekly/monthly candles) and once from the full series for comparison.
+Target: every reduced chart renders within 400 ms.
+"""
+import sys
+import time
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import ui.stock_adv_technical_analysis as ta  # noqa: E402
+from ui.stock_adv_chart_reducer import lttb_indices  # noqa: E402
+
+TARGET_MS = 400
+YEARS = 20
+CHARTS = ("bollinger", "macd", "ma", "candle", "cloud")
+
+
+def synthetic_history() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    index = pd.bdate_range("2005-01-03", periods=252 * YEARS, name="Date")
+    close = 50 * np.cumprod(1 + rng.normal(0.0003, 0.015, len(index)))
+    spread = np.abs(rng.normal(0, 0.01, len(index)))
+    return pd.DataFrame({"Open": close * (1 + rng.normal(0, 0.005, len(index))), "High": close * (1 + spread),
+                         "Low": close * (1 - spread), "Close": close,
+                         "Volume": rng.integers(1e5, 1e7, len(index)).astype(float)}, index=index)
+
+
+def render_all(history: pd.DataFrame) -> dict:
+    timings = {}
+    for name in CHARTS:
+        start = time.perf_counter()
+        ta.render_png(history, getattr(ta, name))
+        timings[name] = time.perf_counter() - start
+    return timings
+
+
+def main() -> int:
+    history = synthetic_history()
+    render_all(history.iloc[:300])  # warm up fonts and caches
+
+    reduced = render_all(history)
+    # The same charts without reduction: an unlimited point budget and candle count
+    ta.LINE_POINTS = len(history) + 1
+    original_resample = ta.resample_ohlc
+    ta.resample_ohlc = lambda frame, max_bars: (frame, "D")
+    full = render_all(history)
+    ta.resample_ohlc = original_resample
+
+    start = time.perf_counter()
+    lttb_indices(np.arange(len(history)), history["Close"].to_numpy(), 1200)
+    lttb_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{len(history)} daily bars ({YEARS} years); LTTB to 1,200 points: {lttb_ms:.1f} ms")
+    print(f"{'chart':10s} {'full (ms)':>10s} {'reduced (ms)':>13s}")
+    failed = False
+    for name in CHARTS:
+        slow = reduced[name] * 1000 > TARGET_MS
+        failed |= slow
+        print(f"{name:10s} {full[name] * 1000:10.0f} {reduced[name] * 1000:13.0f}  [{'SLOW' if slow else 'OK'}]")
+    print(f"{'total':10s} {sum(full.values()) * 1000:10.0f} {sum(reduced.values()) * 1000:13.0f}"
+          f"   speedup {sum(full.values()) / sum(reduced.values()):.1f}x")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+"""End-to-end wall time, CPU, allocations and call counts of the report, the chat and the tools, offline.
+
+Every scenario runs in ``offline_replay.offline``: yfinance, the Yahoo Finance news, DuckDuckGo and the scraped
+pages are replayed from ``benchmarks/fixtures`` and the chat models are ``StubChatModel``, so the figures
+measure the application's own work (agent orchestration, tools, parsing, risk engines, logging) and the run
+never touches the network. Each run starts with empty price, benchmark and Streamlit caches.
+
+- tool scenarios: ``DataFetcherTool``, ``StockRiskAnalysisTool`` and ``WebSearchTool`` run on their own
+- chat: ``get_recommendation_agent_response``, the recommendation agent with its web search agent
+- report: ``ReportGeneratorAgent.generate_report``, the three analyses and the final report
+
+Wall time and CPU are the medians of ``--runs`` runs. A separate instrumented run records the peak of the
+memory allocated (``tracemalloc``) and the spans of the instrumented functions and tools.
+
+The results are compared with ``baseline_end_to_end.json``: a scenario regresses when its service or model
+calls differ from the baseline (fewer calls mean a code path stopped running, and the baseline must be
+re-recorded on purpose), or when its wall time or CPU exceeds the baseline by more than ``--tolerance``
+(and 20 ms). Record the baseline on the machine running the comparison with ``--update-baseline``; ``--record``
+refreshes the fixtures from the live services.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+import streamlit.logger
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import offline_replay  # noqa: E402
+import utils.tracing as tracing  # noqa: E402
+from offline_replay import CallStats, FixtureStore, StubSettings, offline  # noqa: E402
+from utils.log_config import configure_logging, shutdown_logging  # noqa: E402
+
+BASELINE = Path(__file__).resolve().parent / "baseline_end_to_end.json"
+RUNS = 5
+TOLERANCE = 1.5
+# Timing differences below this many seconds are scheduling noise on the millisecond-long tool scenarios
+NOISE_FLOOR_S = 0.02
+# Relative drift of the token counts tolerated before a scenario is reported as regressed
+TOKEN_TOLERANCE = 0.1
+
+
+def scenarios(ticker: str) -> dict:
+    """Name -> factory of the coroutine of one run, imported here so the stub and fixtures are in place first."""
+    from agents.stock_adv_agent import get_recommendation_agent_response
+    from agents.stock_adv_report_generator import ReportGeneratorAgent
+    from tools.stock_adv_data_fetcher_tool import DataFetcherTool, DataFetcherToolInput
+    from tools.stock_adv_risk_assesment_tool import StockRiskAnalysisTool, StockRiskAnalysisToolInput
+    from tools.stock_adv_web_search_tool import WebSearchTool, WebSearchToolInput
+    from ui.progression_bar import ProgressionBar
+
+    return {
+        "tool: DataFetcher": lambda: DataFetcherTool().run(DataFetcherToolInput(stock_symbol=ticker)),
+        "tool: StockRiskAnalyzer": lambda: StockRiskAnalysisTool().run(
+            StockRiskAnalysisToolInput(stock_symbol=ticker)),
+        "tool: websearcher": lambda: WebSearchTool().run(WebSearchToolInput(query=ticker)),
+        "chat": lambda: get_recommendation_agent_response(f"Should I buy {ticker} stock now?"),
+        "report": lambda: ReportGeneratorAgent(ticker, ProgressionBar()).generate_report(),
+    }
+
+
+class SpanCounter:
+    """Tracing exporter counting the finished spans by name."""
+
+    def __init__(self):
+        self.spans = Counter()
+
+    def export(self, spans) -> None:
+        self.spans.update(span.name for span in spans)
+
+
+async def _complete(factory):
+    # Tools return a beeai ``Run``, awaitable but not a coroutine
+    return await factory()
+
+
+def run_once(factory, fixtures: FixtureStore, settings: StubSettings, record: bool = False) -> tuple:
+    """Wall seconds, CPU seconds and call stats of one offline run."""
+    with offline(fixtures, settings, record=record) as stats:
+        wall, cpu = time.perf_counter(), time.process_time()
+        asyncio.run(_complete(factory))
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    if stats.misses:
+        logging.warning("Requests without a recorded response: %s", stats.misses)
+    return wall, cpu, stats
+
+
+def instrumented_run(factory, fixtures: FixtureStore, settings: StubSettings) -> tuple:
+    """Peak allocated bytes and span counts of one offline run with tracemalloc and tracing enabled."""
+    counter = SpanCounter()
+    tracer = tracing.tracer
+    saved = tracer.exporter, tracer.enabled
+    tracer.exporter, tracer.enabled = counter, True
+    tracemalloc.start()
+    try:
+        run_once(factory, fixtures, settings)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        tracer.exporter, tracer.enabled = saved
+    return peak, counter.spans
+
+
+def measure(factory, fixtures: FixtureStore, settings: StubSettings, runs: int) -> dict:
+    # Warm-up: first-use imports and lazily built singletons are not part of a request
+    run_once(factory, fixtures, settings)
+    timings = [run_once(factory, fixtures, settings) for _ in range(runs)]
+    stats: CallStats = timings[-1][2]
+    peak, spans = instrumented_run(factory, fixtures, settings)
+    return {
+        "wall_s": round(statistics.median(t[0] for t in timings), 6),
+        "cpu_s": round(statistics.median(t[1] for t in timings), 6),
+        "peak_alloc_mib": round(peak / 2 ** 20, 3),
+        "llm_calls": sum(stats.llm_calls.values()),
+        "prompt_tokens": stats.prompt_tokens,
+        "completion_tokens": stats.completion_tokens,
+        "service_calls": dict(sorted(stats.calls.items())),
+        "spans": sum(spans.values()),
+        "misses": sum(len(t[2].misses) for t in timings),
+    }
+
+
+def regressions(current: dict, baseline: dict, tolerance: float) -> list:
+    """Reasons for which *current* regressed from *baseline*, empty when it did not."""
+    found = []
+    for key in ("wall_s", "cpu_s"):
+        if current[key] > baseline[key] * tolerance and current[key] - baseline[key] > NOISE_FLOOR_S:
+            found.append(f"{key} {current[key] / max(baseline[key], 1e-9):.2f}x")
+    if current["llm_calls"] != baseline["llm_calls"]:
+        found.append(f"llm_calls {baseline['llm_calls']} -> {current['llm_calls']}")
+    for key in ("prompt_tokens", "completion_tokens"):
+        if current[key] > baseline[key] * (1 + TOKEN_TOLERANCE):
+            found.append(f"{key} {baseline[key]} -> {current[key]}")
+    for service in sorted(current["service_calls"].keys() | baseline["service_calls"].keys()):
+        calls, expected = current["service_calls"].get(service, 0), baseline["service_calls"].get(service, 0)
+        if calls != expected:
+            found.append(f"{service} {expected} -> {calls}")
+    return found
+
+
+def report(results: dict) -> None:
+    print(f"{'scenario':24} {'wall ms':>9} {'CPU ms':>9} {'peak MiB':>9} {'LLM calls':>9} {'tokens in/out':>15}"
+          f" {'service calls':>13} {'spans':>6}")
+    for name, r in results.items():
+        tokens = f"{r['prompt_tokens']}/{r['completion_tokens']}"
+        print(f"{name:24} {r['wall_s'] * 1000:9.1f} {r['cpu_s'] * 1000:9.1f} {r['peak_alloc_mib']:9.2f}"
+              f" {r['llm_calls']:9d} {tokens:>15} {sum(r['service_calls'].values()):13d} {r['spans']:6d}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticker", default="IBM", help="symbol of the recorded fixtures")
+    parser.add_argument("--runs", type=int, default=RUNS, help="timed runs per scenario")
+    parser.add_argument("--scenario", action="append", help="run only this scenario (repeatable)")
+    parser.add_argument("--latency", type=float, default=0.0, help="stub model seconds per call")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="stub model seconds per generated word")
+    parser.add_argument("--answer-tokens", type=int, default=200, help="words of every stub final answer")
+    parser.add_argument("--fixtures", type=Path, default=offline_replay.FIXTURES)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="wall time and CPU ratio to the baseline reported as a regression")
+    parser.add_argument("--update-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--record", action="store_true",
+                        help="call the live services once per scenario and record their responses as fixtures")
+    args = parser.parse_args()
+
+    settings = StubSettings(latency=args.latency, token_latency=args.token_latency,
+                            answer_tokens=args.answer_tokens, ticker=args.ticker.upper())
+    fixtures = FixtureStore(args.fixtures)
+    # Streamlit warns on every element and cache call made outside of ``streamlit run``
+    streamlit.logger.set_log_level("error")
+
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull:
+        # The application logs at its configured level, to a scratch file; the agents' trajectories are discarded
+        configure_logging(log_file=os.path.join(tmp, "stock_advisor.log"), stream=devnull, force=True)
+        selected = {name: factory for name, factory in scenarios(settings.ticker).items()
+                    if not args.scenario or name in args.scenario}
+        with contextlib.redirect_stdout(devnull):
+            if args.record:
+                for name, factory in selected.items():
+                    stats = run_once(factory, fixtures, settings, record=True)[2]
+                    print(f"{name}: recorded {dict(stats.calls)}", file=sys.stderr)
+                results = {}
+            else:
+                results = {name: measure(factory, fixtures, settings, args.runs)
+                           for name, factory in selected.items()}
+        shutdown_logging()
+    if args.record:
+        print(f"fixtures recorded in {fixtures.directory}")
+        return 0
+
+    report(results)
+    settings_key = {"latency": settings.latency, "token_latency": settings.token_latency,
+                    "answer_tokens": settings.answer_tokens, "ticker": settings.ticker}
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps({"settings": settings_key, "scenarios": results}, indent=2) + "\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    ok = True
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else None
+    if baseline is None or baseline["settings"] != settings_key:
+        print(f"no baseline for these settings in {args.baseline}: run with --update-baseline")
+    for name, result in results.items():
+        if result["misses"]:
+            ok = False
+            print(f"{name}: {result['misses']} requests without a recorded response  [FIXTURES MISSING]")
+        if baseline is None or baseline["settings"] != settings_key or name not in baseline["scenarios"]:
+            continue
+        found = regressions(result, baseline["scenarios"][name], args.tolerance)
+        ok = ok and not found
+        print(f"{name:24} vs baseline: [{'REGRESSION ' + ', '.join(found) if found else 'OK'}]")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""Cold-start import time of the Streamlit app, profiled with ``python -X importtime``.
+
+Each scenario runs in a fresh interpreter (``src`` on the path, a scratch working directory for the log file):
+
+- cold start: ``import main``, everything loaded before the symbol input renders
+- technical analysis tab: what its first draw adds (pandas, the indicator and chart modules)
+- first report: what the first "Generate Report" adds (beeai_framework, langchain, yfinance, ...)
+
+The slowest modules of the cold start are listed from the ``-X importtime`` report.
+Targets: the cold start imports within 1.5 s, and none of the heavy subsystems is loaded by it.
+"""
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+TARGET_COLD_START_S = 1.5
+RUNS = 3
+TOP = 12
+
+# Loaded on first use only: by the report, the chat, the first static or candle chart, the first download
+LAZY_MODULES = ("beeai_framework", "langchain_community", "yfinance", "mplfinance", "matplotlib", "bs4",
+                "duckduckgo_search", "agents.stock_adv_report_generator", "ui.stock_adv_technical_analysis")
+
+SCENARIOS = {
+    "cold start": "import main",
+    "technical analysis tab": "import main, ui.stock_adv_technical_analysis",
+    "first report": "import main, agents.stock_adv_report_generator, agents.stock_adv_agent",
+}
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def profile(statement: str) -> dict:
+    """``{module: (self_us, cumulative_us)}`` of one fresh interpreter, in import order."""
+    check = f"{statement}; import sys; print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    with tempfile.TemporaryDirectory() as cwd:
+        run = subprocess.run([sys.executable, "-X", "importtime", "-c", check], cwd=cwd, capture_output=True,
+                             text=True, env={**os.environ, "PYTHONPATH": str(SRC)}, check=True)
+    modules = {}
+    for line in run.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            modules[match[4]] = (int(match[1]), int(match[2]))
+    loaded = [name for name in run.stdout.strip().splitlines()[-1:] for name in name.split(",") if name]
+    return {"modules": modules, "total": sum(s for s, _ in modules.values()) / 1e6, "lazy_loaded": loaded}
+
+
+def best_profile(statement: str) -> dict:
+    return min((profile(statement) for _ in range(RUNS)), key=lambda p: p["total"])
+
+
+def main() -> int:
+    results = {name: best_profile(statement) for name, statement in SCENARIOS.items()}
+    cold = results["cold start"]
+
+    print(f"slowest imports of the cold start (cumulative, best of {RUNS}):")
+    top = sorted(cold["modules"].items(), key=lambda item: -item[1][1])[:TOP]
+    for module, (self_us, cumulative_us) in top:
+        print(f"  {cumulative_us / 1000:9.1f} ms  {module}")
+    print()
+    for name, result in results.items():
+        extra = max(0.0, result["total"] - cold["total"]) if result is not cold else result["total"]
+        print(f"{name:24} {'+' if result is not cold else ' '}{extra:6.2f} s  ({len(result['modules'])} modules)")
+
+    time_ok = cold["total"] <= TARGET_COLD_START_S
+    lazy_ok = not cold["lazy_loaded"]
+    print(f"cold start within {TARGET_COLD_START_S} s: [{'OK' if time_ok else 'BELOW TARGET'}]")
+    print(f"heavy subsystems deferred: [{'OK' if lazy_ok else 'BELOW TARGET'}]"
+          + (f" loaded at start: {', '.join(cold['lazy_loaded'])}" if cold["lazy_loaded"] else ""))
+    return 0 if time_ok and lazy_ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
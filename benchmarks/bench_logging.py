@@ -0,0 +1,131 @@
+"""CPU and I/O spent on logging per report, before and after lazy payload logging.
+
+Replays the log calls a report makes with its large payloads (the fundamentals ``DataFetcherToolResult``, the
+company info Series, the Yahoo news, the risk tool output and the concatenated analyses handed to the report
+writer), on synthetic data of production size:
+
+- legacy: root logger at DEBUG from the import-time ``basicConfig`` calls, eager f-strings, ``print`` of the
+  risk output
+- current: ``configure_logging`` at the default INFO level, payloads logged at DEBUG with ``payload``
+- current at DEBUG: every payload written, truncated to ``LOG_MAX_PAYLOAD_CHARS`` and sampled
+- synchronous at DEBUG: the same calls with the file and console handlers on the root logger, for the time the
+  logging thread spends compared with the queue handler
+
+CPU is that of the whole process, listener thread included; "caller" is the wall time spent in the log calls.
+Target: at the default level, logging costs at least 10x less CPU and writes at least 10x fewer bytes per
+report than the legacy setup.
+"""
+import contextlib
+import io
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import utils.log_config as log_config  # noqa: E402
+from utils.log_config import PayloadSampler, configure_logging, payload, shutdown_logging  # noqa: E402
+
+REPORTS = 40
+TARGET_RATIO = 10.0
+
+
+def report_payloads() -> dict:
+    rng = np.random.default_rng(7)
+    periods = pd.to_datetime(["2025-12-31", "2024-12-31", "2023-12-31", "2022-12-31"])
+    statement = lambda rows: pd.DataFrame(rng.normal(1e9, 3e8, (rows, 4)), columns=periods,  # noqa: E731
+                                          index=[f"Line Item Number {i} Of The Statement" for i in range(rows)])
+    info = pd.Series({f"field{i}": (f"value {i} " * 6 if i % 3 else rng.normal()) for i in range(180)})
+    news = "\n\n".join(f"Headline {i}: " + "lorem ipsum dolor sit amet " * 40 for i in range(8))
+    risk_output = {section: {f"metric_{i}": rng.normal() for i in range(25)}
+                   for section in ("market_risk", "rolling_risk", "fundamental_risk", "sentiment_risk")}
+    analyses = "\n\n".join(f"## Analysis {i}\n" + "The company shows steady margins. " * 120 for i in range(3))
+    result = {"income_statement": statement(45), "balance_sheet": statement(60), "cash_flow": statement(40),
+              "additional_info": info, "financial_news": news}
+    return {"info": info, "news": news, "result": result, "risk_output": risk_output, "analyses": analyses}
+
+
+def legacy_report(p: dict, stdout) -> None:
+    logging.info(f"**********************************************financial_news= {p['news']} *************")
+    logging.info(f"**********************************************additional_info= {p['info']} *************")
+    logging.info(f"***********************************get_fundamental_data END with output {p['result']}")
+    print(p["risk_output"], file=stdout)
+    logging.info(f"******************************_write_final_report STARTS with input: {p['analyses']} *******///")
+
+
+def current_report(p: dict, stdout) -> None:
+    logging.debug("get_fundamental_data financial_news=%s", payload(p["news"]))
+    logging.debug("get_fundamental_data additional_info=%s", payload(p["info"]))
+    logging.info("get_fundamental_data END for %s", "IBM")
+    logging.debug("get_fundamental_data output: %s", payload(p["result"]))
+    logging.debug("StockRiskAnalysisTool output: %s", payload(p["risk_output"]))
+    logging.info("_write_final_report STARTS with a %d chars initial report", len(p["analyses"]))
+    logging.debug("_write_final_report input: %s", payload(p["analyses"]))
+
+
+def synchronous_setup(log_file: str, stream, sampler: PayloadSampler = None) -> None:
+    root = logging.getLogger()
+    formatter = logging.Formatter(log_config.TEXT_FORMAT)
+    for handler in (logging.FileHandler(log_file), logging.StreamHandler(stream)):
+        handler.setFormatter(formatter)
+        if sampler:
+            handler.addFilter(sampler)
+        root.addHandler(handler)
+    root.setLevel(logging.DEBUG)
+
+
+def teardown() -> None:
+    shutdown_logging()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+
+
+def measure(name: str, setup, emit, p: dict) -> tuple:
+    """CPU seconds, bytes (file + console + stdout) and caller seconds per report."""
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file = os.path.join(tmp, "stock_advisor.log")
+        console, stdout = io.StringIO(), io.StringIO()
+        setup(log_file, console)
+        start, wall = time.process_time(), time.perf_counter()
+        for _ in range(REPORTS):
+            emit(p, stdout)
+        caller = time.perf_counter() - wall
+        # Waits for the listener to write the queued records
+        teardown()
+        cpu = time.process_time() - start
+        written = os.path.getsize(log_file) + len(console.getvalue().encode()) + len(stdout.getvalue().encode())
+    cpu, written, caller = cpu / REPORTS, written / REPORTS, caller / REPORTS
+    print(f"{name:22} {cpu * 1000:9.3f} ms CPU  {written / 1024:9.1f} KiB written  {caller * 1000:9.3f} ms caller"
+          f"  per report")
+    return cpu, written, caller
+
+
+def main() -> int:
+    p = report_payloads()
+    teardown()
+    with contextlib.redirect_stderr(io.StringIO()):
+        legacy = measure("legacy (DEBUG, eager)", synchronous_setup, legacy_report, p)
+        current = measure("current (INFO)", lambda f, s: configure_logging("INFO", f, s, force=True),
+                          current_report, p)
+        measure("current (DEBUG)", lambda f, s: configure_logging("DEBUG", f, s, force=True), current_report, p)
+        measure("synchronous (DEBUG)", lambda f, s: synchronous_setup(f, s, PayloadSampler(10)), current_report, p)
+
+    cpu_ratio = legacy[0] / max(current[0], 1e-9)
+    io_ratio = legacy[1] / max(current[1], 1.0)
+    ok = cpu_ratio >= TARGET_RATIO and io_ratio >= TARGET_RATIO
+    print(f"saved at INFO: {(legacy[0] - current[0]) * 1000:.3f} ms CPU ({cpu_ratio:.0f}x), "
+          f"{(legacy[1] - current[1]) / 1024:.1f} KiB ({io_ratio:.0f}x) per report  "
+          f"[{'OK' if ok else 'BELOW TARGET'}]")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""Memory and throughput benchmark for the session rate limiter.
+
+100,000 distinct sessions each make a few requests, as when many short-lived Streamlit sessions hit the chat
+limiter, then every session goes idle. The previous implementation (a list per user, rebuilt on every check,
+never forgotten) is compared with both modes of ``RateLimiter``. A fake clock drives time so that the run is
+deterministic; logging is disabled so that only the limiter is measured.
+Targets: at least 100k checks/s, memory back under 1 MB once the sessions have been idle for a window, and
+never more than ``max_keys`` users tracked (the list-based limiter keeps every session forever).
+"""
+import gc
+import logging
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from agents.stock_adv_security import GCRA, SLIDING_WINDOW, RateLimiter  # noqa: E402
+
+N_SESSIONS = 100_000
+REQUESTS_PER_SESSION = 5
+MAX_REQUESTS = 30
+TIME_WINDOW = 60
+MAX_KEYS = 50_000
+TARGET_IDLE_BYTES = 1_000_000
+TARGET_CHECKS_PER_SECOND = 100_000
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ListRateLimiter:
+    """The list-per-user limiter replaced by ``RateLimiter``."""
+
+    def __init__(self, max_requests: int, time_window: int, clock):
+        self.max_requests = max_requests
+        self.time_window = time_window
+        self.requests = defaultdict(list)
+        self._clock = clock
+
+    def is_allowed(self, user_id: str) -> bool:
+        now = self._clock()
+        self.requests[user_id] = [t for t in self.requests[user_id] if now - t < self.time_window]
+        if len(self.requests[user_id]) >= self.max_requests:
+            return False
+        self.requests[user_id].append(now)
+        logging.debug(f"Request allowed for user: {user_id} ({len(self.requests[user_id])}/{self.max_requests})")
+        return True
+
+
+def replay(limiter, clock: Clock, sessions: list) -> float:
+    start = time.perf_counter()
+    for session in sessions:
+        clock.now += TIME_WINDOW / N_SESSIONS
+        for _ in range(REQUESTS_PER_SESSION):
+            limiter.is_allowed(session)
+    return time.perf_counter() - start
+
+
+def run(make_limiter) -> dict:
+    sessions = [f"session-{i:06d}" for i in range(N_SESSIONS)]
+    clock = Clock()
+    elapsed = replay(make_limiter(clock), clock, sessions)
+
+    clock = Clock()
+    gc.collect()
+    tracemalloc.start()
+    limiter = make_limiter(clock)
+    replay(limiter, clock, sessions)
+    _, peak = tracemalloc.get_traced_memory()
+    clock.now += 2 * TIME_WINDOW
+    limiter.is_allowed("late-session")
+    gc.collect()
+    idle, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    tracked = len(limiter) if isinstance(limiter, RateLimiter) else len(limiter.requests)
+    return {"seconds": elapsed, "peak": peak, "idle": idle, "tracked": tracked}
+
+
+def main() -> int:
+    logging.disable(logging.CRITICAL)
+    results = {
+        "list per user": run(lambda clock: ListRateLimiter(MAX_REQUESTS, TIME_WINDOW, clock)),
+        SLIDING_WINDOW: run(lambda clock: RateLimiter(MAX_REQUESTS, TIME_WINDOW, SLIDING_WINDOW,
+                                                      max_keys=MAX_KEYS, clock=clock)),
+        GCRA: run(lambda clock: RateLimiter(MAX_REQUESTS, TIME_WINDOW, GCRA, max_keys=MAX_KEYS, clock=clock)),
+    }
+    checks = N_SESSIONS * REQUESTS_PER_SESSION
+    print(f"{N_SESSIONS:,} sessions x {REQUESTS_PER_SESSION} requests, {MAX_REQUESTS} per {TIME_WINDOW}s, "
+          f"max_keys={MAX_KEYS:,}")
+    ok = True
+    for name, r in results.items():
+        print(f"{name:15} {checks / r['seconds']:12,.0f} checks/s  peak {r['peak'] / 1e6:7.1f} MB  "
+              f"idle {r['idle'] / 1e6:7.2f} MB  {r['tracked']:7,} users tracked")
+        if name != "list per user":
+            ok &= checks / r["seconds"] >= TARGET_CHECKS_PER_SECOND and r["idle"] <= TARGET_IDLE_BYTES and r["tracked"] <= MAX_KEYS
+    print(f"[{'OK' if ok else 'BELOW TARGET'}]")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
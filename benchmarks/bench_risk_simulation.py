@@ -0,0 +1,43 @@
+"""Throughput benchmark for the Monte Carlo VaR/ES estimators.
+
+Target: at least 100,000 simulated 10-day paths per second per ticker.
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from tools.stock_adv_risk_simulation import estimate_var  # noqa: E402
+
+TARGET_PATHS_PER_SECOND = 100_000
+N_PATHS = 500_000
+HORIZON = 10
+REPEATS = 3
+
+
+def bench(method: str, returns: np.ndarray) -> float:
+    best = float("inf")
+    for i in range(REPEATS):
+        start = time.perf_counter()
+        estimate_var(returns, method, confidence_levels=(0.95, 0.99), horizons=(HORIZON,), n_paths=N_PATHS, seed=i)
+        best = min(best, time.perf_counter() - start)
+    return N_PATHS / best
+
+
+def main() -> int:
+    # Five years of fat-tailed daily returns for one ticker
+    returns = np.random.default_rng(0).standard_t(4, 1260) * 0.012
+    failed = False
+    for method in ("bootstrap", "monte_carlo"):
+        rate = bench(method, returns)
+        status = "OK" if rate >= TARGET_PATHS_PER_SECOND else "BELOW TARGET"
+        failed |= rate < TARGET_PATHS_PER_SECOND
+        print(f"{method:12s} {HORIZON}-day paths: {rate:14,.0f} paths/s  [{status}]")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""Throughput benchmark for the multi-ticker technical screener.
+
+Screens a 500-symbol watchlist with two years of daily bars against every preset rule, once over the aligned
+(dates x symbols) panel and once symbol by symbol for comparison. Panel assembly is timed separately from the
+rule evaluation; the price store is bypassed so that only the screener itself is measured.
+Targets: a full screen (panel assembly included) within 1 s, at least 5x faster than symbol by symbol.
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from tools.stock_adv_price_store import PriceHistory  # noqa: E402
+from tools.stock_adv_screener import PRESET_RULES, PricePanel, compile_rules, screen  # noqa: E402
+
+N_SYMBOLS = 500
+N_DATES = 504
+TARGET_SECONDS = 1.0
+TARGET_SPEEDUP = 5.0
+
+
+def synthetic_histories() -> list:
+    rng = np.random.default_rng(0)
+    dates = np.busday_offset("2023-01-02", np.arange(N_DATES), roll="forward")
+    histories = []
+    for i in range(N_SYMBOLS):
+        close = 100 * np.cumprod(1 + rng.normal(0.0003, 0.02, N_DATES))
+        spread = np.abs(rng.normal(0, 0.01, N_DATES))
+        ohlcv = np.column_stack([close, close * (1 + spread), close * (1 - spread), close,
+                                 rng.integers(1e5, 1e7, N_DATES).astype(float)])
+        histories.append(PriceHistory(f"S{i:03d}", dates, ohlcv))
+    return histories
+
+
+def best_of(fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    histories = synthetic_histories()
+    rules = compile_rules(PRESET_RULES)
+    panel = PricePanel.from_histories(histories)
+
+    assemble = best_of(lambda: PricePanel.from_histories(histories), 3)
+    evaluate = best_of(lambda: screen(panel, rules), 3)
+    per_symbol = best_of(lambda: [screen(PricePanel.from_histories([h]), rules) for h in histories], 1)
+    total = assemble + evaluate
+    matches = screen(panel, rules)
+
+    speedup = per_symbol / total
+    ok = total <= TARGET_SECONDS and speedup >= TARGET_SPEEDUP
+    print(f"{N_SYMBOLS} symbols x {N_DATES} dates, {len(rules)} rules, {len(matches)} matches in the last 5 days")
+    print(f"panel assembly:        {assemble * 1000:10.1f} ms")
+    print(f"rule evaluation:       {evaluate * 1000:10.1f} ms")
+    print(f"full screen:           {total * 1000:10.1f} ms  ({N_SYMBOLS / total:,.0f} symbols/s)")
+    print(f"symbol by symbol:      {per_symbol * 1000:10.1f} ms")
+    print(f"speedup:               {speedup:10.1f}x  [{'OK' if ok else 'BELOW TARGET'}]")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""Startup and lookup benchmark for the symbol index.
+
+Writes a listing the size of the full NASDAQ Trader directory (12,000 symbols, share classes included), then
+times loading it, exact validation lookups and prefix autocomplete.
+Target: the index loads within 10 ms, so that it can be built at application start.
+"""
+import itertools
+import string
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from tools.stock_adv_symbol_index import HEADER, SymbolIndex  # noqa: E402
+
+N_SYMBOLS = 12_000
+TARGET_LOAD_MS = 10.0
+
+
+def synthetic_listing(path: Path) -> list:
+    letters = string.ascii_uppercase
+    symbols = sorted({"".join(p) for n in (1, 2, 3, 4) for p in itertools.product(letters, repeat=n)})
+    symbols = sorted(symbols[::len(symbols) // (N_SYMBOLS - 200)][:N_SYMBOLS - 200]
+                     + [f"{s}-B" for s in symbols[:200]])
+    path.write_text(HEADER + "\n" + "".join(f"{s}|{s} Holdings Inc. - Common Stock\n" for s in symbols))
+    return symbols
+
+
+def best_of(fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "us_symbols.txt"
+        symbols = synthetic_listing(path)
+        load = best_of(lambda: SymbolIndex.load(path, exhaustive=True), 10)
+        index = SymbolIndex.load(path, exhaustive=True)
+
+    queries = [s.replace("-", ".") for s in symbols[::7]] + ["ZZZZZ", "QQQQQ"] * 500
+    lookup = best_of(lambda: [q in index for q in queries], 3)
+    prefixes = [s[:2] for s in symbols[::7]]
+    suggest = best_of(lambda: [index.suggest(p) for p in prefixes], 3)
+
+    ok = load * 1000 <= TARGET_LOAD_MS
+    print(f"{len(index):,} symbols")
+    print(f"load:                  {load * 1000:10.2f} ms  [{'OK' if ok else 'BELOW TARGET'}]")
+    print(f"exact lookup:          {lookup / len(queries) * 1e6:10.2f} us")
+    print(f"autocomplete (8 hits): {suggest / len(prefixes) * 1e6:10.2f} us")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
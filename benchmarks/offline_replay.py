@@ -0,0 +1,556 @@
+"""Offline replay of the services the agents call, for the end-to-end benchmark.
+
+``offline`` swaps, for the duration of a ``with`` block:
+
+- ``yfinance.Ticker`` (``info``, the statements, ``history``), the Yahoo Finance news tool, DuckDuckGo and
+  ``requests.get`` for clients replaying the responses recorded under a fixture directory
+- ``ChatModel.from_name`` for ``StubChatModel``, a deterministic local model with a configurable latency and
+  answer length
+- the price and benchmark stores and the Streamlit data cache for empty ones, so every block starts cold
+
+Any other connection attempt raises ``OfflineError``. With ``record=True`` the live services are called instead
+and their responses are written to the fixture directory; history dates are shifted on replay so that a recording
+ends in the current week.
+"""
+import asyncio
+import contextlib
+import json
+import socket
+import sys
+import tempfile
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncGenerator, Dict, Iterator, List, Optional
+from unittest import mock
+
+import pandas as pd
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import requests  # noqa: E402
+import streamlit as st  # noqa: E402
+import yfinance  # noqa: E402
+from beeai_framework.backend import AssistantMessage, ChatModel, MessageToolCallContent  # noqa: E402
+from beeai_framework.backend.types import ChatModelInput, ChatModelOutput, ChatModelUsage  # noqa: E402
+from beeai_framework.context import RunContext  # noqa: E402
+from beeai_framework.tools import Tool  # noqa: E402
+from langchain_community.tools.yahoo_finance_news import YahooFinanceNewsTool  # noqa: E402
+
+import tools.stock_adv_data_fetcher_tool as data_fetcher  # noqa: E402
+import tools.stock_adv_web_search as web_search  # noqa: E402
+from tools.stock_adv_benchmark_store import benchmark_store  # noqa: E402
+from tools.stock_adv_price_store import price_store  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+STATEMENTS = ("income_stmt", "balance_sheet", "cash_flow")
+# yfinance aliases of the recorded statements
+STATEMENT_ALIASES = {"financials": "income_stmt"}
+FINAL_ANSWER = "final_answer"
+HISTORY_TZ = "America/New_York"
+
+_VOCABULARY = ("the", "company", "reported", "steady", "revenue", "growth", "while", "margins", "improved", "and",
+               "free", "cash", "flow", "covers", "its", "dividend", "risk", "remains", "moderate", "outlook")
+
+
+class OfflineError(ConnectionError):
+    """A network connection was attempted while the services are replayed."""
+
+
+class FixtureMissing(LookupError):
+    """No recorded response matches a request; record the fixtures again."""
+
+
+@dataclass
+class CallStats:
+    """
+    Calls made during an offline run.
+
+    Attributes:
+        calls: Replayed service calls by name (``yfinance.history``, ``duckduckgo.news``, ``http.get``, ...)
+        misses: Requests that had no recorded response
+        llm_calls: Stub model calls by model name
+        prompt_tokens: Words sent to the stub model
+        completion_tokens: Words generated by the stub model
+    """
+    calls: Counter = field(default_factory=Counter)
+    misses: List[str] = field(default_factory=list)
+    llm_calls: Counter = field(default_factory=Counter)
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def hit(self, name: str) -> None:
+        with self._lock:
+            self.calls[name] += 1
+
+    def miss(self, request: str) -> None:
+        with self._lock:
+            self.misses.append(request)
+
+
+class FixtureStore:
+    """
+    Recorded responses, one file per symbol and source under *directory*::
+
+        yfinance/IBM/info.json, income_stmt.json, balance_sheet.json, cash_flow.json, history.csv
+        yahoo_news/IBM.txt
+        duckduckgo/news.json, text.json     {keywords: results}
+        http/pages.json                     {url: html}
+
+    Files are read once; every read returns a copy.
+    """
+
+    def __init__(self, directory: Path = FIXTURES):
+        self.directory = Path(directory)
+        self._cache: Dict[Path, Any] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, path: Path, reader) -> Any:
+        with self._lock:
+            if path not in self._cache:
+                if not path.exists():
+                    raise FixtureMissing(f"No fixture {path.relative_to(self.directory)}")
+                self._cache[path] = reader(path)
+            return self._cache[path]
+
+    def _write(self, path: Path, text: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        with self._lock:
+            self._cache.pop(path, None)
+
+    # ------------------------------------------------------------------ yfinance
+    def info(self, symbol: str) -> dict:
+        return dict(self._load(self.directory / "yfinance" / symbol / "info.json", _read_json))
+
+    def save_info(self, symbol: str, info: dict) -> None:
+        self._write(self.directory / "yfinance" / symbol / "info.json", json.dumps(info, indent=1, default=str))
+
+    def statement(self, symbol: str, name: str) -> pd.DataFrame:
+        split = self._load(self.directory / "yfinance" / symbol / f"{name}.json", _read_json)
+        return pd.DataFrame(split["data"], index=split["index"], columns=pd.to_datetime(split["columns"]),
+                            dtype=float)
+
+    def save_statement(self, symbol: str, name: str, frame: pd.DataFrame) -> None:
+        split = {"index": [str(label) for label in frame.index],
+                 "columns": [str(pd.Timestamp(column).date()) for column in frame.columns],
+                 "data": frame.astype(float).where(frame.notna(), None).values.tolist()}
+        self._write(self.directory / "yfinance" / symbol / f"{name}.json", json.dumps(split))
+
+    def history(self, symbol: str) -> pd.DataFrame:
+        return self._load(self.directory / "yfinance" / symbol / "history.csv",
+                          lambda path: pd.read_csv(path, index_col="Date", parse_dates=["Date"])).copy()
+
+    def save_history(self, symbol: str, frame: pd.DataFrame) -> None:
+        frame = frame.copy()
+        if frame.index.tz is not None:
+            frame.index = frame.index.tz_localize(None)
+        frame.index = frame.index.normalize().rename("Date")
+        self._write(self.directory / "yfinance" / symbol / "history.csv", frame.to_csv(float_format="%.4f"))
+
+    # ------------------------------------------------------------------ news, search and pages
+    def yahoo_news(self, symbol: str) -> str:
+        return self._load(self.directory / "yahoo_news" / f"{symbol}.txt", lambda path: path.read_text("utf-8"))
+
+    def save_yahoo_news(self, symbol: str, text: str) -> None:
+        self._write(self.directory / "yahoo_news" / f"{symbol}.txt", text)
+
+    def search(self, vertical: str, keywords: str) -> List[dict]:
+        results = self._load(self.directory / "duckduckgo" / f"{vertical}.json", _read_json)
+        if keywords not in results:
+            raise FixtureMissing(f"No recorded DuckDuckGo {vertical} results for {keywords!r}")
+        return [dict(item) for item in results[keywords]]
+
+    def save_search(self, vertical: str, keywords: str, results: List[dict]) -> None:
+        path = self.directory / "duckduckgo" / f"{vertical}.json"
+        recorded = _read_json(path) if path.exists() else {}
+        recorded[keywords] = results
+        self._write(path, json.dumps(recorded, indent=1))
+
+    def page(self, url: str) -> Optional[str]:
+        return self._load(self.directory / "http" / "pages.json", _read_json).get(url)
+
+    def save_page(self, url: str, html: str) -> None:
+        path = self.directory / "http" / "pages.json"
+        pages = _read_json(path) if path.exists() else {}
+        pages[url] = html
+        self._write(path, json.dumps(pages, indent=1))
+
+
+def _read_json(path: Path) -> Any:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+# ---------------------------------------------------------------------- replayed clients
+def _shift_to_this_week(frame: pd.DataFrame) -> pd.DataFrame:
+    """Move a recorded history by whole weeks so that its last bar falls within the last 7 days."""
+    if frame.empty:
+        return frame
+    weeks = (pd.Timestamp.today().normalize() - frame.index[-1]).days // 7
+    frame.index = (frame.index + pd.Timedelta(weeks=weeks)).tz_localize(HISTORY_TZ).rename("Date")
+    return frame
+
+
+class FixtureTicker:
+    """``yfinance.Ticker`` replaying the recorded ``info``, statements and daily history of a symbol."""
+
+    def __init__(self, symbol: str, fixtures: FixtureStore, stats: CallStats):
+        self.ticker = symbol.upper()
+        self._fixtures = fixtures
+        self._stats = stats
+
+    def _replay(self, name: str, read, *args):
+        self._stats.hit(f"yfinance.{name}")
+        try:
+            return read(self.ticker, *args)
+        except FixtureMissing as e:
+            self._stats.miss(str(e))
+            raise
+
+    @property
+    def info(self) -> dict:
+        return self._replay("info", self._fixtures.info)
+
+    def __getattr__(self, name: str) -> pd.DataFrame:
+        statement = STATEMENT_ALIASES.get(name, name)
+        if statement not in STATEMENTS:
+            raise AttributeError(name)
+        return self._replay(statement, self._fixtures.statement, statement)
+
+    def history(self, period: Optional[str] = None, interval: str = "1d", start=None, end=None,
+                auto_adjust: bool = True, **_) -> pd.DataFrame:
+        frame = _shift_to_this_week(self._replay("history", self._fixtures.history))
+        if start is not None:
+            frame = frame[frame.index >= pd.Timestamp(start).tz_localize(HISTORY_TZ)]
+        if end is not None:
+            frame = frame[frame.index < pd.Timestamp(end).tz_localize(HISTORY_TZ)]
+        return frame
+
+
+class FixtureDDGS:
+    """``duckduckgo_search.DDGS`` replaying the recorded news and text results of a query."""
+
+    def __init__(self, fixtures: FixtureStore, stats: CallStats):
+        self._fixtures = fixtures
+        self._stats = stats
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+    def _replay(self, vertical: str, keywords: str, max_results: Optional[int]) -> List[dict]:
+        self._stats.hit(f"duckduckgo.{vertical}")
+        try:
+            return self._fixtures.search(vertical, keywords)[:max_results]
+        except FixtureMissing as e:
+            self._stats.miss(str(e))
+            raise
+
+    def news(self, keywords: str, region: str = "us-en", max_results: Optional[int] = None, **_) -> List[dict]:
+        return self._replay("news", keywords, max_results)
+
+    def text(self, keywords: str, region: str = "wt-wt", max_results: Optional[int] = None, **_) -> List[dict]:
+        return self._replay("text", keywords, max_results)
+
+
+class FixtureResponse:
+    """The parts of ``requests.Response`` used by the scraper."""
+
+    def __init__(self, url: str, html: Optional[str]):
+        self.url = url
+        self.status_code = 200 if html is not None else 404
+        self.content = (html or "").encode("utf-8")
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8")
+
+    def raise_for_status(self) -> None:
+        if self.status_code != 200:
+            raise requests.HTTPError(f"{self.status_code} Client Error: no recorded page for url: {self.url}")
+
+
+# ---------------------------------------------------------------------- recording clients
+class RecordingTicker:
+    """Live ``yfinance.Ticker`` whose responses are written to the fixture store."""
+
+    def __init__(self, live, fixtures: FixtureStore, stats: CallStats):
+        self._live = live
+        self._fixtures = fixtures
+        self._stats = stats
+
+    @property
+    def info(self) -> dict:
+        self._stats.hit("yfinance.info")
+        info = self._live.info
+        self._fixtures.save_info(self._live.ticker, info)
+        return info
+
+    def __getattr__(self, name: str):
+        statement = STATEMENT_ALIASES.get(name, name)
+        if statement not in STATEMENTS:
+            return getattr(self._live, name)
+        self._stats.hit(f"yfinance.{statement}")
+        frame = getattr(self._live, statement)
+        self._fixtures.save_statement(self._live.ticker, statement, frame)
+        return frame
+
+    def history(self, *args, **kwargs) -> pd.DataFrame:
+        self._stats.hit("yfinance.history")
+        frame = self._live.history(*args, **kwargs)
+        try:
+            recorded = self._fixtures.history(self._live.ticker)
+            merged = frame.tz_localize(None) if frame.index.tz is not None else frame
+            merged = merged.set_axis(merged.index.normalize()).combine_first(recorded)
+        except FixtureMissing:
+            merged = frame
+        self._fixtures.save_history(self._live.ticker, merged)
+        return frame
+
+
+class RecordingDDGS(FixtureDDGS):
+    """Live ``DDGS`` whose results are written to the fixture store."""
+
+    def __init__(self, live_class, fixtures: FixtureStore, stats: CallStats):
+        super().__init__(fixtures, stats)
+        self._live = live_class()
+
+    def __enter__(self):
+        self._live.__enter__()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        return self._live.__exit__(*exc_info)
+
+    def _record(self, vertical: str, keywords: str, **kwargs) -> List[dict]:
+        self._stats.hit(f"duckduckgo.{vertical}")
+        results = list(getattr(self._live, vertical)(keywords=keywords, **kwargs))
+        self._fixtures.save_search(vertical, keywords, results)
+        return results
+
+    def news(self, keywords: str, **kwargs) -> List[dict]:
+        return self._record("news", keywords, **kwargs)
+
+    def text(self, keywords: str, **kwargs) -> List[dict]:
+        return self._record("text", keywords, **kwargs)
+
+
+# ---------------------------------------------------------------------- stub chat model
+@dataclass
+class StubSettings:
+    """
+    Behaviour of the stub chat model.
+
+    Attributes:
+        latency: Seconds spent on every call
+        token_latency: Additional seconds per generated word
+        answer_tokens: Words of every final answer
+        ticker: Value given to the string arguments of the tool calls
+    """
+    latency: float = 0.0
+    token_latency: float = 0.0
+    answer_tokens: int = 200
+    ticker: str = "IBM"
+
+
+def answer_text(tokens: int) -> str:
+    """Deterministic text of *tokens* words."""
+    return " ".join(_VOCABULARY[i % len(_VOCABULARY)] for i in range(tokens))
+
+
+class StubChatModel(ChatModel):
+    """
+    Deterministic local chat model driving a ``RequirementAgent`` through all of its tools.
+
+    Each call answers with one tool call: the tool forced by ``tool_choice`` if any, else the first offered tool
+    not called yet in the conversation, else the final answer. Tool arguments are built from the tool's input
+    schema, string fields receiving ``StubSettings.ticker`` (mappings: the ticker with weight 1); the final answer has ``answer_tokens`` words.
+    """
+
+    def __init__(self, name: str, settings: StubSettings, stats: CallStats, **kwargs: Any):
+        super().__init__()
+        provider, _, model = name.partition(":")
+        self._provider = provider
+        self._model = model or provider
+        self._name = name
+        self.settings = settings
+        self.stats = stats
+        self._call_ids = 0
+
+    @property
+    def model_id(self) -> str:
+        return self._model
+
+    @property
+    def provider_id(self) -> str:
+        return self._provider
+
+    async def clone(self) -> "StubChatModel":
+        return StubChatModel(self._name, self.settings, self.stats)
+
+    def _arguments(self, tool: Tool) -> dict:
+        if tool.name == FINAL_ANSWER:
+            return {"response": answer_text(self.settings.answer_tokens)}
+        schema = tool.input_schema.model_json_schema()
+        arguments = {}
+        for name in schema.get("required", []):
+            kind = schema["properties"][name].get("type", "string")
+            arguments[name] = {"string": self.settings.ticker, "array": [self.settings.ticker],
+                               "object": {self.settings.ticker: 1.0}, "integer": 1, "number": 1.0,
+                               "boolean": True}.get(kind, self.settings.ticker)
+        return arguments
+
+    def _choose(self, input: ChatModelInput) -> Optional[Tool]:
+        if isinstance(input.tool_choice, Tool):
+            return input.tool_choice
+        tools = input.tools or []
+        if not tools or input.tool_choice == "none":
+            return None
+        called = {call.tool_name for message in input.messages if isinstance(message, AssistantMessage)
+                  for call in message.get_tool_calls()}
+        pending = [tool for tool in tools if tool.name != FINAL_ANSWER and tool.name not in called]
+        final = next((tool for tool in tools if tool.name == FINAL_ANSWER), None)
+        return pending[0] if pending else final or tools[0]
+
+    async def _create(self, input: ChatModelInput, run: RunContext) -> ChatModelOutput:
+        tool = self._choose(input)
+        if tool is None:
+            text = answer_text(self.settings.answer_tokens)
+            message, completion, finish_reason = AssistantMessage(text), self.settings.answer_tokens, "stop"
+        else:
+            self._call_ids += 1
+            arguments = json.dumps(self._arguments(tool))
+            message = AssistantMessage(MessageToolCallContent(
+                id=f"call_{self._call_ids:08d}", tool_name=tool.name, args=arguments))
+            completion, finish_reason = len(arguments.split()), "tool_calls"
+        prompt = sum(len(message.text.split()) for message in input.messages)
+
+        with self.stats._lock:
+            self.stats.llm_calls[self._name] += 1
+            self.stats.prompt_tokens += prompt
+            self.stats.completion_tokens += completion
+        await asyncio.sleep(self.settings.latency + completion * self.settings.token_latency)
+        return ChatModelOutput(
+            output=[message], finish_reason=finish_reason,
+            usage=ChatModelUsage(prompt_tokens=prompt, completion_tokens=completion,
+                                 total_tokens=prompt + completion))
+
+    async def _create_stream(self, input: ChatModelInput, run: RunContext) -> AsyncGenerator[ChatModelOutput, None]:
+        yield await self._create(input, run)
+
+
+# ---------------------------------------------------------------------- offline runs
+def _guard_connect(connect):
+    def guarded(sock, address):
+        if sock.family in (socket.AF_INET, socket.AF_INET6):
+            raise OfflineError(f"Network access to {address} during an offline run")
+        return connect(sock, address)
+    return guarded
+
+
+def _guard_getaddrinfo(host, *args, **kwargs):
+    raise OfflineError(f"DNS lookup of {host} during an offline run")
+
+
+@contextlib.contextmanager
+def _cold_market_caches() -> Iterator[None]:
+    """Point the price store at an empty directory and empty the benchmark, fundamentals and Streamlit caches."""
+    saved = (price_store.root, dict(price_store._open), dict(benchmark_store._series))
+    fundamentals = dict(data_fetcher._fundamentals)
+    with tempfile.TemporaryDirectory(prefix="stockadvisor-bench-") as directory:
+        price_store.root = Path(directory) / "prices"
+        price_store._open.clear()
+        benchmark_store._series.clear()
+        data_fetcher._fundamentals.clear()
+        st.cache_data.clear()
+        try:
+            yield
+        finally:
+            price_store.root, open_histories, series = saved
+            price_store._open.clear()
+            price_store._open.update(open_histories)
+            benchmark_store._series.clear()
+            benchmark_store._series.update(series)
+            data_fetcher._fundamentals.clear()
+            data_fetcher._fundamentals.update(fundamentals)
+            st.cache_data.clear()
+
+
+@contextlib.contextmanager
+def offline(fixtures: Optional[FixtureStore] = None, settings: Optional[StubSettings] = None,
+            record: bool = False) -> Iterator[CallStats]:
+    """
+    Replay the recorded services and the stub chat model for the duration of the block.
+
+    Args:
+        fixtures: Recorded responses, ``benchmarks/fixtures`` by default
+        settings: Stub model behaviour
+        record: Call the live services and record their responses instead of replaying them
+
+    Yields:
+        CallStats updated by the calls of the block
+    """
+    fixtures = fixtures or FixtureStore()
+    settings = settings or StubSettings()
+    stats = CallStats()
+    live_ticker, live_ddgs, live_get = yfinance.Ticker, web_search.DDGS, requests.get
+    live_news = YahooFinanceNewsTool._run
+
+    def ticker(symbol: str, *args, **kwargs):
+        if record:
+            return RecordingTicker(live_ticker(symbol, *args, **kwargs), fixtures, stats)
+        return FixtureTicker(symbol, fixtures, stats)
+
+    def yahoo_news(tool, query: str, *args, **kwargs) -> str:
+        stats.hit("yahoo_finance_news")
+        if record:
+            text = live_news(tool, query, *args, **kwargs)
+            fixtures.save_yahoo_news(query.upper(), text)
+            return text
+        try:
+            return fixtures.yahoo_news(query.upper())
+        except FixtureMissing as e:
+            stats.miss(str(e))
+            raise
+
+    def ddgs(*args, **kwargs):
+        return RecordingDDGS(live_ddgs, fixtures, stats) if record else FixtureDDGS(fixtures, stats)
+
+    def get(url: str, *args, **kwargs):
+        stats.hit("http.get")
+        if record:
+            response = live_get(url, *args, **kwargs)
+            if response.ok:
+                fixtures.save_page(url, response.text)
+            return response
+        try:
+            html = fixtures.page(url)
+        except FixtureMissing:
+            html = None
+        if html is None:
+            stats.miss(f"No recorded page for {url}")
+        return FixtureResponse(url, html)
+
+    def from_name(name: str, **kwargs) -> StubChatModel:
+        return StubChatModel(name, settings, stats, **kwargs)
+
+    with contextlib.ExitStack() as stack:
+        for target, attribute, replacement in (
+                (yfinance, "Ticker", ticker),
+                (YahooFinanceNewsTool, "_run", yahoo_news),
+                (web_search, "DDGS", ddgs),
+                (requests, "get", get),
+                (ChatModel, "from_name", staticmethod(from_name)),
+        ):
+            stack.enter_context(mock.patch.object(target, attribute, replacement))
+        if not record:
+            stack.enter_context(mock.patch.object(socket.socket, "connect", _guard_connect(socket.socket.connect)))
+            stack.enter_context(mock.patch.object(socket, "getaddrinfo", _guard_getaddrinfo))
+        stack.enter_context(_cold_market_caches())
+        yield stats
@@ -9,7 +9,6 @@ from beeai_framework.backend import ChatModel
 from beeai_framework.errors import FrameworkError
 from beeai_framework.middleware.trajectory import GlobalTrajectoryMiddleware
 from beeai_framework.tools import Tool
-from beeai_framework.tools.handoff import HandoffTool
 from beeai_framework.tools.think import ThinkTool
 
 from config.config import ModelConfig as mc
@@ -20,8 +19,8 @@ from config.stock_adv_analysis_instructions import (FUNDAMENTAL_ANALYSIS_INSTRUC
 
 from config.stock_adv_prompts import get_stock_analysis_prompt
 from utils.logging_helper import log_performance
-
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+from tools.stock_adv_handoff_tool import HandoffTool
+from utils.tracing import traced
 
 
 class FinAnalystAgent:
@@ -33,6 +32,8 @@ class FinAnalystAgent:
                    ticker: Stock symbol (e.g., 'IBM')
         """
         self.ticker_symbol = ticker.upper()
+        # Set once an analysis came back from the model; error messages leave it False
+        self.analysis_completed = False
 
     async def _perform_fundamental_analysis(self, ) -> str:
         data_fetcher_agent = RequirementAgent(
@@ -40,7 +41,7 @@ class FinAnalystAgent:
             llm=ChatModel.from_name(mc.small_model, timeout=6000),
             tools=[
                 ThinkTool(),  # to reason
-                DataFetcherTool()
+                DataFetcherTool(self.ticker_symbol)
             ],
             instructions="Retrieve financial stock data given a stock symbol",
             requirements=[
@@ -138,6 +139,7 @@ class FinAnalystAgent:
 
                 if fund_analys_report:
                     agent_response = fund_analys_report
+                    self.analysis_completed = True
                     logging.info(f"Fundamental analysis completed successfully for {self.ticker_symbol}")
                 else:
                     logging.warning(f"Empty fundamental analysis report for {self.ticker_symbol}")
@@ -161,6 +163,7 @@ class FinAnalystAgent:
 
         return agent_response
 
+    @traced()
     @log_performance
     async def analyze(self, ) -> str:
         fundamental_analysis = await self._perform_fundamental_analysis()
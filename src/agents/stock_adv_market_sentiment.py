@@ -8,7 +8,6 @@ from beeai_framework.agents.requirement.requirements.conditional import Conditio
 from beeai_framework.middleware.trajectory import GlobalTrajectoryMiddleware
 from beeai_framework.tools.think import ThinkTool
 from beeai_framework.backend import ChatModel
-from beeai_framework.tools.handoff import HandoffTool
 from beeai_framework.errors import FrameworkError
 from beeai_framework.tools import Tool
 
@@ -22,10 +21,10 @@ from config.stock_adv_market_sent_analysis_instructions import (WEB_SEARCH_INSTR
 
 from config.stock_adv_prompts import get_stock_market_sent_analysis_prompt
 from utils.logging_helper import log_performance
+from tools.stock_adv_handoff_tool import HandoffTool
+from utils.tracing import traced
 import logging
 
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
-
 
 class StockMarketSentimentAnalyzer:
     def __init__(self, ticker: str):
@@ -36,6 +35,8 @@ class StockMarketSentimentAnalyzer:
                    ticker: Stock symbol (e.g., 'IBM')
         """
         self.ticker_symbol = ticker.upper()
+        # Set once an analysis came back from the model; error messages leave it False
+        self.analysis_completed = False
 
     async def _perform_market_sentiment_analysis(self) -> str:
         web_search_agent = RequirementAgent(
@@ -131,6 +132,7 @@ class StockMarketSentimentAnalyzer:
 
                 if risk_market_sent_report:
                     agent_response = risk_market_sent_report
+                    self.analysis_completed = True
                     logging.info(f"Market sentiment analysis completed successfully for {self.ticker_symbol}")
                 else:
                     logging.warning(f"Empty market sentiment report for {self.ticker_symbol}")
@@ -155,6 +157,7 @@ class StockMarketSentimentAnalyzer:
 
         return agent_response
 
+    @traced()
     @log_performance
     async def analyze(self):
         return await self._perform_market_sentiment_analysis()
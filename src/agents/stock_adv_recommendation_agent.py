@@ -8,19 +8,20 @@ from beeai_framework.agents.requirement import RequirementAgent
 from beeai_framework.agents.requirement.requirements.conditional import ConditionalRequirement
 from beeai_framework.middleware.trajectory import GlobalTrajectoryMiddleware
 from beeai_framework.tools.think import ThinkTool
+from tools.stock_adv_portfolio_risk_tool import PortfolioRiskAnalysisTool
 from tools.stock_adv_web_search_tool import WebSearchTool
 from beeai_framework.backend import ChatModel
-from beeai_framework.tools.handoff import HandoffTool
 from beeai_framework.errors import FrameworkError
 from beeai_framework.tools import Tool
 #from stock_adv_utils import SMALL_MODEL, LARGE_MODEL
 from config.config import ModelConfig as mc
 from utils.logging_helper import log_performance
+from tools.stock_adv_handoff_tool import HandoffTool
+from utils.tracing import traced
 from config.stock_adv_market_sent_analysis_instructions import WEB_SEARCH_INSTRUCTIONS
 import logging
 
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
-
+@traced()
 @log_performance
 async def call_recommendation_agent(user_query: str):
     """
@@ -56,6 +57,7 @@ async def call_recommendation_agent(user_query: str):
                 name="WebSearchAgent",
                 description="Consult the Web Search Agent for latest and up to date information.",
             ),
+            PortfolioRiskAnalysisTool(),
         ],
         instructions=""" 
         You are a specialized recommendation agent focused on stock and financial analysis. Your primary objective
@@ -64,6 +66,11 @@ async def call_recommendation_agent(user_query: str):
         
         ### Integration of Web Information
         Use the most recent information gathered from the internet by the web search agent to enhance your analysis. 
+
+        ### Portfolio Risk
+        When the user describes a portfolio (several tickers with weights, percentages or amounts), call the
+        PortfolioRiskAnalyzer tool with the tickers mapped to their weights and base the answer on its volatility,
+        Value at Risk, risk contributions and diversification ratio.
         Deliver the Response:
         Promptly deliver the formatted response back to the user.
         Be prepared to provide additional information or clarification if the user has follow-up questions.
@@ -5,7 +5,6 @@
 """
 
 from beeai_framework.agents.requirement import RequirementAgent
-from beeai_framework.tools.handoff import HandoffTool
 from beeai_framework.backend import ChatModel
 from beeai_framework.tools.think import ThinkTool
 from beeai_framework.agents.requirement.requirements.conditional import ConditionalRequirement
@@ -14,7 +13,7 @@ from beeai_framework.tools import Tool
 from beeai_framework.errors import FrameworkError
 
 import asyncio, logging, time
-from typing import Any
+from typing import Any, Optional
 
 from agents.stock_adv_analysis_engine import FinAnalystAgent
 from agents.stock_adv_market_sentiment import StockMarketSentimentAnalyzer
@@ -26,13 +25,14 @@ from config.stock_adv_report_instructions import (
     REPORT_REFINER_INSTRUCTIONS)
 from config.stock_adv_prompts import get_final_report_prompt
 from ui.progression_bar import ProgressionBar
+from utils.log_config import payload
 from utils.logging_helper import log_performance
-
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+from tools.stock_adv_handoff_tool import HandoffTool
+from utils.tracing import traced
 
 
 class ReportGeneratorAgent:
-    def __init__(self, stock_symbol: str):
+    def __init__(self, stock_symbol: str, progress_bar: Optional[ProgressionBar] = None):
         self.fin_analyst_agent = FinAnalystAgent(stock_symbol)
         self.market_sentiment_analyzer = StockMarketSentimentAnalyzer(stock_symbol)
         self.risk_assessment_agent = StockRiskAnalyzer(stock_symbol)
@@ -41,10 +41,15 @@ class ReportGeneratorAgent:
         self.market_sentiment_analysis = None
         self.stock_symbol = stock_symbol
         self.generated_report = None
+        self.report_completed = False
+        # Kinds of the analyses that succeeded; the report is only complete when all of them did
+        self.completed_analyses: set[str] = set()
         self.report_queue: asyncio.Queue[tuple[str, str]] = asyncio.Queue()
         self.progression = 0
-        self.pb = ProgressionBar()
+        # The bar is created by the Streamlit script thread when the report runs on the background loop
+        self.pb = progress_bar or ProgressionBar()
 
+    @traced()
     async def _perform_fundamental_analysis(self, ):
         logging.info(f"[FUNDAMENTAL] Starting analysis for {self.stock_symbol}")
         start_time = time.time()
@@ -54,6 +59,8 @@ class ReportGeneratorAgent:
                 self.fund_analysis = await self.fin_analyst_agent.analyze()
                 if self.fund_analysis:
                     await self.report_queue.put(("fund_analysis", self.fund_analysis))
+                    if self.fin_analyst_agent.analysis_completed:
+                        self.completed_analyses.add("fund_analysis")
                     duration = time.time() - start_time
                     logging.info(f"[FUNDAMENTAL] Completed successfully in {duration:.2f}s for {self.stock_symbol}")
                 else:
@@ -64,6 +71,7 @@ class ReportGeneratorAgent:
             logging.error(f"[FUNDAMENTAL] Failed after {duration:.2f}s for {self.stock_symbol}: {e}", exc_info=True)
             await self.report_queue.put(("fund_analysis", f"Fundamental analysis error: {str(e)}"))
 
+    @traced()
     async def _perform_market_sentiment_analysis(self, ):
         logging.info(f"[SENTIMENT] Starting analysis for {self.stock_symbol}")
         start_time = time.time()
@@ -73,6 +81,8 @@ class ReportGeneratorAgent:
                 self.market_sentiment_analysis = await self.market_sentiment_analyzer.analyze()
                 if self.market_sentiment_analysis:
                     await self.report_queue.put(("market_sent_analysis", self.market_sentiment_analysis))
+                    if self.market_sentiment_analyzer.analysis_completed:
+                        self.completed_analyses.add("market_sent_analysis")
                     duration = time.time() - start_time
                     logging.info(f"[SENTIMENT] Completed successfully in {duration:.2f}s for {self.stock_symbol}")
                 else:
@@ -83,6 +93,7 @@ class ReportGeneratorAgent:
             logging.error(f"[SENTIMENT] Failed after {duration:.2f}s for {self.stock_symbol}: {e}", exc_info=True)
             await self.report_queue.put(("market_sent_analysis", f"Sentiment analysis error: {str(e)}"))
 
+    @traced()
     async def _perform_risk_assessment(self, ):
         logging.info(f"[RISK] Starting analysis for {self.stock_symbol}")
         start_time = time.time()
@@ -92,6 +103,8 @@ class ReportGeneratorAgent:
                 self.risk_assessment = await self.risk_assessment_agent.analyze()
                 if self.risk_assessment:
                     await self.report_queue.put(("risk_assessment", self.risk_assessment))
+                    if self.risk_assessment_agent.analysis_completed:
+                        self.completed_analyses.add("risk_assessment")
                     duration = time.time() - start_time
                     logging.info(f"[RISK] Completed successfully in {duration:.2f}s for {self.stock_symbol}")
                 else:
@@ -101,9 +114,11 @@ class ReportGeneratorAgent:
             duration = time.time() - start_time
             logging.error(f"[RISK] Failed after {duration:.2f}s for {self.stock_symbol}: {e}", exc_info=True)
             await self.report_queue.put(("risk_assessment", f"Risk assessment error: {str(e)}"))
+    @traced()
     @log_performance
     async def _write_final_report(self, initial_report: str) -> str:
-        logging.info(f"******************************_write_final_report STARTS with input: {initial_report} *******///")
+        logging.info("_write_final_report STARTS with a %d chars initial report", len(initial_report or ""))
+        logging.debug("_write_final_report input: %s", payload(initial_report))
         self.pb.update_progression_bar(self.progression, "final")
         if not initial_report:
             return "Error: Invalid Input, initial_report cannot be empty"
@@ -166,6 +181,7 @@ class ReportGeneratorAgent:
                 
                 if final_report:
                     agent_response = final_report
+                    self.report_completed = True
                     logging.info("Final report generation completed successfully")
                 else:
                     logging.warning("Empty final report generated")
@@ -190,6 +206,7 @@ class ReportGeneratorAgent:
         logging.info(f"_write_final_report completed with result: {bool(agent_response)}")
         return agent_response
 
+    @traced()
     @log_performance
     async def generate_report(self, ):
         """
@@ -249,6 +266,11 @@ class ReportGeneratorAgent:
             if initial_report and initial_report.strip():
                 self.generated_report = await self._write_final_report(initial_report)
                 
+                failed = [key for key in required_keys if key not in self.completed_analyses]
+                if failed:
+                    # The report still reads well, but it is built on error messages: do not share it
+                    logging.warning(f"Report for {self.stock_symbol} is missing analyses: {failed}")
+                    self.report_completed = False
                 if self.generated_report:
                     logging.info(f"Report generation completed successfully for {self.stock_symbol}")
                     self.report_queue.task_done()
@@ -269,7 +291,7 @@ async def main():
     report_agent = ReportGeneratorAgent("IBM")
     generated_report = await report_agent.generate_report()
     if generated_report:
-        logging.info(f"******************************----****generate_report result: {generated_report}")
+        logging.info("generate_report result: %s", payload(generated_report))
 
 
 if __name__ == "__main__":
@@ -14,7 +14,6 @@ from beeai_framework.backend import ChatModel
 from beeai_framework.errors import FrameworkError
 from beeai_framework.middleware.trajectory import GlobalTrajectoryMiddleware
 from beeai_framework.tools import Tool
-from beeai_framework.tools.handoff import HandoffTool
 from beeai_framework.tools.think import ThinkTool
 
 from config.config import ModelConfig as mc
@@ -23,12 +22,13 @@ from config.stock_adv_risk_instructions import (RISK_ASSESSMENT_INSTRUCTIONS,
                                                 RISK_ASSESSMENT_REVIEW_INSTRUCTIONS,
                                                 RISK_ASSESSMENT_IMPROVE_INSTRUCTIONS)
 from config.stock_adv_prompts import get_stock_risk_assessment_prompt
+from utils.log_config import payload
 from utils.logging_helper import log_performance
+from tools.stock_adv_handoff_tool import HandoffTool
+from utils.tracing import traced
 
 import logging
 
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
-
 
 class StockRiskAnalyzer:
     def __init__(self, ticker: str):
@@ -39,6 +39,8 @@ class StockRiskAnalyzer:
                    ticker: Stock symbol (e.g., 'IBM')
         """
         self.ticker_symbol = ticker.upper()
+        # Set once an analysis came back from the model; error messages leave it False
+        self.analysis_completed = False
 
     async def _perform_risk_analysis(self, ) -> str:
         risk_assessment_agent = RequirementAgent(
@@ -110,6 +112,7 @@ class StockRiskAnalyzer:
 
                 if risk_analysis_report:
                     agent_response = risk_analysis_report
+                    self.analysis_completed = True
                     logging.info(f"Risk assessment completed successfully for {self.ticker_symbol}")
                 else:
                     logging.warning(f"Empty risk assessment report for {self.ticker_symbol}")
@@ -133,11 +136,12 @@ class StockRiskAnalyzer:
 
         return agent_response
 
+    @traced()
     @log_performance
     async def analyze(self):
         report = await self._perform_risk_analysis()
         if report:
-            logging.info(f"******************************----****generate_report result: {report}")
+            logging.debug("StockRiskAnalyzer report: %s", payload(report))
             return report
 
 
@@ -145,7 +149,7 @@ async def main():
     risk_analyzer = StockRiskAnalyzer("AUID")
     risk_report = await risk_analyzer.analyze()
     if risk_report:
-        logging.info(f"******************************----****risk_report result: {risk_report}")
+        logging.info("risk_report result: %s", payload(risk_report))
 
 
 if __name__ == "__main__":
@@ -2,15 +2,18 @@
 import re
 import logging
 from typing import Optional, Tuple
-from collections import defaultdict
 from time import time
 
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+from config.config import app_config
+from tools.stock_adv_symbol_index import SYMBOL_PATTERN, normalize_symbol, symbol_index
+from utils.rate_limit_backends import GCRA, SLIDING_WINDOW, InProcessBackend, RateLimitBackend, create_backend
 
 
 def validate_stock_symbol(symbol: str) -> Tuple[bool, Optional[str]]:
     """
-    Validate stock ticker symbol format.
+    Validate stock ticker symbol format, and that the symbol is listed when the full listing is available.
+
+    Share classes are accepted with a dot, hyphen or slash (``BRK.B``, ``RDS-A``).
     
     Args:
         symbol: The stock ticker symbol to validate
@@ -21,18 +24,21 @@ def validate_stock_symbol(symbol: str) -> Tuple[bool, Optional[str]]:
     if not symbol:
         return False, "Stock symbol cannot be empty"
     
-    # Remove whitespace
-    symbol = symbol.strip()
+    # Remove whitespace and write the share class the Yahoo Finance way (BRK.B -> BRK-B)
+    symbol = normalize_symbol(symbol)
     
-    if len(symbol) > 5:
+    if len(symbol.split("-")[0]) > 5:
         return False, "Stock symbol too long (max 5 characters)"
     
     if len(symbol) < 1:
         return False, "Stock symbol too short (min 1 character)"
     
-    # Check if symbol contains only letters
-    if not re.match(r'^[A-Z]{1,5}$', symbol.upper()):
+    # Check if symbol contains only letters, with an optional share class
+    if not SYMBOL_PATTERN.match(symbol):
         return False, "Stock symbol must contain only letters (A-Z)"
+
+    if symbol_index.exhaustive and symbol not in symbol_index:
+        return False, f"Unknown stock symbol '{symbol}' (not listed on a US exchange)"
     
     logging.info(f"Stock symbol '{symbol}' validated successfully")
     return True, None
@@ -62,98 +68,119 @@ def sanitize_input(user_input: str) -> str:
 class RateLimiter:
     """
     Rate limiter to prevent abuse by limiting requests per user/session.
-    
+
+    Two algorithms are available:
+
+    - ``"sliding_window"``: at most ``max_requests`` requests in any ``time_window`` seconds.
+    - ``"gcra"``: the Generic Cell Rate Algorithm, a token bucket refilling ``max_requests`` tokens per
+      ``time_window``; it keeps a single timestamp per user.
+
+    The request history lives in a ``RateLimitBackend``. The default ``InProcessBackend`` enforces the limit in
+    this process only, with bounded memory; a ``SQLiteBackend`` or ``RedisBackend`` shares it between the
+    Streamlit processes of a host or of a cluster. Limiters sharing a backend are kept apart by their ``name``.
+
     Attributes:
         max_requests: Maximum number of requests allowed in the time window
         time_window: Time window in seconds for rate limiting
+        mode: ``"sliding_window"`` or ``"gcra"``
+        name: Namespace of the limiter's keys in the backend
+        backend: Store of the request history
     """
-    
-    def __init__(self, max_requests: int = 10, time_window: int = 60):
+
+    def __init__(self, max_requests: int = 10, time_window: int = 60, mode: str = SLIDING_WINDOW,
+                 max_keys: int = 100_000, sweep_interval: Optional[float] = None, clock=time,
+                 name: str = "default", backend: Optional[RateLimitBackend] = None):
         """
         Initialize rate limiter.
-        
+
         Args:
             max_requests: Maximum requests allowed (default: 10)
             time_window: Time window in seconds (default: 60)
+            mode: Limiting algorithm, ``"sliding_window"`` (default) or ``"gcra"``
+            max_keys: Maximum number of users tracked by the default in-process backend (default: 100,000)
+            sweep_interval: Seconds between sweeps of idle users of the default backend (default: the time window)
+            clock: Time source returning seconds, for tests and benchmarks
+            name: Namespace of the limiter's keys, for limiters sharing a backend
+            backend: Store of the request history (default: a private ``InProcessBackend``)
         """
+        self.backend = backend if backend is not None else InProcessBackend(max_keys, sweep_interval)
+        if mode not in self.backend.modes:
+            raise ValueError(f"Unknown rate limiter mode '{mode}' for {type(self.backend).__name__}, "
+                             f"expected one of {list(self.backend.modes)}")
         self.max_requests = max_requests
         self.time_window = time_window
-        self.requests = defaultdict(list)
-        logging.info(f"RateLimiter initialized: {max_requests} requests per {time_window}s")
-    
+        self.mode = mode
+        self.name = name
+        self._clock = clock
+        logging.info(f"RateLimiter {name} initialized: {max_requests} requests per {time_window}s "
+                     f"({mode}, {type(self.backend).__name__})")
+
+    def __len__(self) -> int:
+        """Number of users currently tracked by the backend."""
+        return len(self.backend)
+
+    def _key(self, user_id: str) -> str:
+        return f"{self.name}:{user_id}"
+
     def is_allowed(self, user_id: str) -> bool:
         """
         Check if a request from the user is allowed.
-        
+
         Args:
             user_id: Unique identifier for the user/session
-        
+
         Returns:
             True if request is allowed, False if rate limit exceeded
         """
-        now = time()
-        
-        # Clean old requests outside the time window
-        self.requests[user_id] = [
-            req_time for req_time in self.requests[user_id]
-            if now - req_time < self.time_window
-        ]
-        
+        allowed, remaining = self.backend.acquire(self._key(user_id), self._clock(), self.max_requests,
+                                                  self.time_window, self.mode)
+
         # Check if limit exceeded
-        if len(self.requests[user_id]) >= self.max_requests:
+        if not allowed:
             logging.warning(f"Rate limit exceeded for user: {user_id}")
             return False
-        
-        # Add current request
-        self.requests[user_id].append(now)
-        logging.debug(f"Request allowed for user: {user_id} ({len(self.requests[user_id])}/{self.max_requests})")
+        logging.debug(f"Request allowed for user: {user_id} ({self.max_requests - remaining}/{self.max_requests})")
         return True
-    
+
     def get_remaining_requests(self, user_id: str) -> int:
         """
         Get the number of remaining requests for a user.
-        
+
         Args:
             user_id: Unique identifier for the user/session
-        
+
         Returns:
             Number of remaining requests in current time window
         """
-        now = time()
-        
-        # Clean old requests
-        self.requests[user_id] = [
-            req_time for req_time in self.requests[user_id]
-            if now - req_time < self.time_window
-        ]
-        
-        remaining = self.max_requests - len(self.requests[user_id])
-        return max(0, remaining)
-    
+        return self.backend.remaining(self._key(user_id), self._clock(), self.max_requests, self.time_window,
+                                      self.mode)
+
     def reset_user(self, user_id: str) -> None:
         """
         Reset rate limit for a specific user.
-        
+
         Args:
             user_id: Unique identifier for the user/session
         """
-        if user_id in self.requests:
-            del self.requests[user_id]
+        if self.backend.reset(self._key(user_id)):
             logging.info(f"Rate limit reset for user: {user_id}")
 
 
 # Global rate limiter instance
 # 10 report generations per 5 minutes (300 seconds)
-report_rate_limiter = RateLimiter(max_requests=10, time_window=300)
+# Set RATE_LIMIT_BACKEND=sqlite (one host) or redis (several hosts) to share the limits between processes
+report_rate_limiter = RateLimiter(max_requests=10, time_window=300, mode=app_config.rate_limit_mode,
+                                  name="report", backend=create_backend())
 
 # 30 chat questions per minute
-chat_rate_limiter = RateLimiter(max_requests=30, time_window=60)
+chat_rate_limiter = RateLimiter(max_requests=30, time_window=60, mode=app_config.rate_limit_mode,
+                                name="chat", backend=create_backend())
 
 
 if __name__ == "__main__":
     # Test validation
     logging.info("Testing stock symbol validation:")
-    test_symbols = ["AAPL", "IBM", "GOOGL", "A", "TOOLONG", "123", "AA-PL", "", "  MSFT  "]
+    test_symbols = ["AAPL", "IBM", "GOOGL", "A", "BRK.B", "RDS-A", "TOOLONG", "123", "AA-PLC", "", "  MSFT  "]
     for symbol in test_symbols:
         is_valid, error = validate_stock_symbol(symbol)
         logging.info(f"  {symbol!r:15} -> Valid: {is_valid:5} {f'Error: {error}' if error else ''}")
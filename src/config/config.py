@@ -18,7 +18,37 @@ class ModelConfig:
 class AppConfig:
     debug: bool = os.getenv("DEBUG", "false").lower() == "true"
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
+    log_max_payload_chars: int = int(os.getenv("LOG_MAX_PAYLOAD_CHARS", "2000"))
+    log_payload_sample_every: int = int(os.getenv("LOG_PAYLOAD_SAMPLE_EVERY", "10"))
+    log_format: str = os.getenv("LOG_FORMAT", "text")
+    log_rotation: str = os.getenv("LOG_ROTATION", "size")
+    log_max_bytes: int = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+    log_rotate_when: str = os.getenv("LOG_ROTATE_WHEN", "midnight")
+    log_backup_count: int = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+    log_compress: bool = os.getenv("LOG_COMPRESS", "true").lower() == "true"
+    log_queue_size: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
     cache_duration_minutes: int = int(os.getenv("CACHE_DURATION", "15"))
+    report_cache_path: str = os.getenv("REPORT_CACHE_PATH", ".cache/report_cache.sqlite")
+    report_cache_stale_minutes: int = int(os.getenv("REPORT_CACHE_STALE_MINUTES", "60"))
+    report_cache_serve_stale: bool = os.getenv("REPORT_CACHE_SERVE_STALE", "true").lower() == "true"
+    prompt_version: str = os.getenv("PROMPT_VERSION", "")
+    market_data_cache_dir: str = os.getenv("MARKET_DATA_CACHE_DIR", ".cache/market_data")
+    chart_cache_max_mb: int = int(os.getenv("CHART_CACHE_MAX_MB", "128"))
+    chart_render_workers: int = int(os.getenv("CHART_RENDER_WORKERS", "2"))
+    chart_backend: str = os.getenv("CHART_BACKEND", "Static image")
+    rate_limit_mode: str = os.getenv("RATE_LIMIT_MODE", "sliding_window")
+    rate_limit_max_keys: int = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+    rate_limit_backend: str = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    rate_limit_sqlite_path: str = os.getenv("RATE_LIMIT_SQLITE_PATH", ".cache/rate_limits.sqlite")
+    rate_limit_redis_url: str = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+    symbol_listing_path: str = os.getenv("SYMBOL_LISTING_PATH", ".cache/us_symbols.txt")
+    symbol_listing_max_age_days: float = float(os.getenv("SYMBOL_LISTING_MAX_AGE_DAYS", "7"))
+    symbol_listing_timeout: float = float(os.getenv("SYMBOL_LISTING_TIMEOUT", "10"))
+    metrics_port: int = int(os.getenv("METRICS_PORT", "0"))
+    metrics_dump_path: str = os.getenv("METRICS_DUMP_PATH", "")
+    metrics_dump_interval: float = float(os.getenv("METRICS_DUMP_INTERVAL", "15"))
+    tracing_enabled: bool = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+    trace_export_path: str = os.getenv("TRACE_EXPORT_PATH", ".cache/traces.jsonl")
 
 
 config = ModelConfig()
@@ -11,11 +11,16 @@ FUNDAMENTAL_ANALYSIS_INSTRUCTIONS = """
 You must follow these steps internally to arrive at your conclusions. Do not output the results of each step individually;
  use them to populate the final JSON object.
 
-1.  **Parse Data:** Ingest and understand the provided stock data.
+1.  **Parse Data:** Ingest and understand the provided stock data. The `financial_ratios` field already contains the
+    margins, ROE, ROA, liquidity, leverage, free cash flow, year-over-year growth and CAGR computed from the
+    statements, for the period given in `latest_period`: use these numbers as given. The `company_profile` field holds
+    the sector, valuation multiples, headline totals (revenue, EBITDA, net income, cash flows, cash and debt) and the
+    analyst consensus.
 2.  **Income Statement Analysis:** Review revenue growth, profit margins (Gross, Operating, Net), EBITDA, Net Income, EPS, and cost structure.
 3.  **Balance Sheet Analysis:** Review liquidity (Current/Quick Ratio), leverage (Debt-to-Equity), and efficiency (Asset Turnover).
 4.  **Cash Flow Analysis:** Review Operating Cash Flow, Free Cash Flow, and cash flow from investing and financing activities.
-5.  **Ratio Analysis:** Aggregate key valuation (P/E, P/B), profitability (ROE, ROA), and market ratios.
+5.  **Ratio Analysis:** Aggregate key valuation (P/E, P/B) from the company attributes with the precomputed profitability
+    (ROE, ROA), liquidity and growth ratios.
 6.  **Contextual Analysis:** Compare metrics against industry averages and consider macroeconomic factors.
 7.  **Qualitative Assessment:** Evaluate management, competitive positioning, and systemic risks.
 8.  **Synthesize Findings:** Consolidate all data into a cohesive analysis covering financial health, growth, and risks.
@@ -52,7 +57,7 @@ or markdown formatting like ```json before or after the JSON object. The JSON mu
     "valuation_ratios": {
       "pe_ratio": "float or null",
       "pb_ratio": "float or null",
-e      "ev_ebitda": "float or null"
+      "ev_ebitda": "float or null"
     },
     "profitability_ratios": {
       "roe": "float or null",
@@ -61,7 +66,13 @@ e      "ev_ebitda": "float or null"
     },
     "liquidity_ratios": {
       "current_ratio": "float or null",
+      "quick_ratio": "float or null",
       "debt_to_equity": "float or null"
+    },
+    "growth_ratios": {
+      "revenue_cagr": "float or null",
+      "net_income_cagr": "float or null",
+      "free_cash_flow": "float or null"
     }
   },
   "competitive_analysis": {
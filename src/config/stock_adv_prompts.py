@@ -1,7 +1,5 @@
 import logging
 
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
-
 RECOMMENDATION_AGENT_PROMPT = """
 ---
 
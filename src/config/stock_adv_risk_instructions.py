@@ -10,10 +10,15 @@ You are a senior financial analyst specializing in risk assessment. Given a stoc
                 Max Drawdown
                 Sharpe Ratio
                 Value at Risk (VaR) 95%
+                Expected Shortfall (CVaR) 95%
+                10-day Value at Risk (VaR) 95% and 10-day Expected Shortfall 95%
                 Risk Interpretation
+            **Rolling Risk Data** (30, 90 and 252 trading-day windows):
+                Rolling Volatility, Beta, Sharpe Ratio and Drawdown (latest, min, max, median)
             **Fundamental Risk Data**:
                 Debt to Equity
                 Current Ratio
+                Quick Ratio
                 Interest Coverage
                 Solvency Check
             **Sentiment Risk Data**:
@@ -37,11 +42,16 @@ You are a senior financial analyst specializing in risk assessment. Given a stoc
                 Max Drawdown: Describe the significance of the max drawdown value.
                 Sharpe Ratio: Explain the Sharpe ratio and what it implies about the stock's risk-adjusted return.
                 Value at Risk (VaR) 95%: Interpret the VaR value and its implications for daily risk.
+                Expected Shortfall (CVaR) 95%: Explain the average loss on the worst 5% of days.
+                10-day VaR and Expected Shortfall 95%: Interpret the loss figures over a two-week holding period.
                 Risk Interpretation: Summarize the overall market risk interpretation.
+                Risk Trend: Compare the latest 30, 90 and 252-day rolling figures with their historical range to say
+                whether risk is currently rising or falling.
         
             Fundamental Risk Analysis:
                 Debt to Equity: Explain the debt-to-equity ratio and its implications for the company's financial health.
                 Current Ratio: Interpret the current ratio and its significance for liquidity.
+                Quick Ratio: Explain liquidity without relying on inventory.
                 Interest Coverage: Describe the interest coverage ratio and its implications for the company's ability to meet interest payments.
                 Solvency Check: Summarize the solvency check and its implications for the company's long-term financial stability.
         
@@ -158,6 +168,8 @@ RISK_ASSESSMENT_IMPROVE_INSTRUCTIONS = """
                 Max Drawdown: Describe the significance of the max drawdown value.
                 Sharpe Ratio: Explain the Sharpe ratio and what it implies about the stock's risk-adjusted return.
                 Value at Risk (VaR) 95%: Interpret the VaR value and its implications for daily risk.
+                Expected Shortfall (CVaR) 95%: Explain the average loss on the worst 5% of days.
+                10-day VaR and Expected Shortfall 95%: Interpret the loss figures over a two-week holding period.
                 Risk Interpretation: Summarize the overall market risk interpretation.
         
             Fundamental Risk Analysis:
@@ -1,28 +1,40 @@
 import logging
+import sys
 from datetime import datetime
 import traceback
 import streamlit as st
 
-from ui.stock_adv_user_interface import create_interface
-from beeai_framework.errors import FrameworkError
+from utils.log_config import configure_logging
 
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+# Before the application modules are imported, so that the messages they log at import time are kept
+configure_logging()
+
+from ui.stock_adv_user_interface import create_interface  # noqa: E402
+from utils.metrics import start_metrics_exporter  # noqa: E402
+from tools.stock_adv_symbol_index import start_listing_refresh  # noqa: E402
 
 if __name__ == "__main__":
     try:
         start = datetime.now()
         logging.info(f"--- Start Time = {start:%H:%M:%S} ---")
+        # Once per process: Prometheus endpoint / textfile dump, when enabled in the configuration
+        start_metrics_exporter()
+        # Once per process: full exchange listing, when it is missing or stale
+        start_listing_refresh()
         create_interface()
         end = datetime.now()
         logging.info(f"--- End Time = {end:%H:%M:%S} ---")
         duration = end - start
         logging.info(f"--- Process duration = {duration} ---")
 
-    except FrameworkError as fe:
-        logging.error(fe)
-        traceback.print_exc()
-        st.error(f"Framework Error: {fe.explain()}")
     except Exception as exc:
-        logging.error("Unexpected error: %s", exc)
-        traceback.print_exc()
-        st.error(f"Unexpected error: {exc}")
\ No newline at end of file
+        # beeai_framework is only loaded once an agent has run
+        framework_errors = sys.modules.get("beeai_framework.errors")
+        if framework_errors and isinstance(exc, framework_errors.FrameworkError):
+            logging.error(exc)
+            traceback.print_exc()
+            st.error(f"Framework Error: {exc.explain()}")
+        else:
+            logging.error("Unexpected error: %s", exc)
+            traceback.print_exc()
+            st.error(f"Unexpected error: {exc}")
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""Shared store of benchmark price series used for beta calculations.
+
+Each benchmark (``SPY`` by default) is read from the incrementally refreshed ``PriceHistoryStore``, so its
+history is downloaded once and afterwards only the bars since the last stored date are requested.
+Daily returns and their variance are precomputed once per stored version of the history and kept in memory,
+so risk assessments only need to align their own dates; a stock that traded on every benchmark day of the
+window reuses the variance as the denominator of its beta.
+"""
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Tuple
+
+import numpy as np
+
+from tools.stock_adv_price_store import PriceHistoryStore, price_store
+
+
+@dataclass
+class BenchmarkSeries:
+    """
+    Daily closes of a benchmark with precomputed returns.
+
+    Attributes
+    ----------
+    ticker: str
+        Benchmark symbol (e.g. "SPY").
+    dates: np.ndarray
+        Sorted ``datetime64[D]`` trading days.
+    closes: np.ndarray
+        Closing prices aligned with ``dates``.
+    returns: np.ndarray
+        Simple daily returns; ``returns[i]`` is the return from ``dates[i]`` to ``dates[i + 1]``.
+    variance: float
+        Sample variance of ``returns``.
+    """
+    ticker: str
+    dates: np.ndarray
+    closes: np.ndarray
+    returns: np.ndarray = field(init=False)
+    variance: float = field(init=False)
+
+    def __post_init__(self):
+        self._recompute()
+
+    def _recompute(self) -> None:
+        self.returns = self.closes[1:] / self.closes[:-1] - 1.0 if len(self.closes) > 1 else np.empty(0)
+        self.variance = float(np.var(self.returns, ddof=1)) if len(self.returns) > 1 else float("nan")
+
+    def aligned_returns(self, dates: np.ndarray) -> np.ndarray:
+        """
+        Return benchmark returns between consecutive entries of *dates*.
+
+        The result has ``len(dates) - 1`` entries, matching ``pct_change().dropna()`` of a price series
+        observed on *dates*. Every date must be a benchmark trading day (see ``common_dates``). When *dates*
+        is a contiguous run of benchmark days the precomputed returns are returned without any arithmetic.
+        """
+        positions = np.searchsorted(self.dates, dates)
+        if len(positions) > 1 and positions[-1] - positions[0] == len(positions) - 1:
+            return self.returns[positions[0]:positions[-1]]
+        aligned = self.closes[positions]
+        return aligned[1:] / aligned[:-1] - 1.0
+
+    def common_dates(self, dates: np.ndarray) -> np.ndarray:
+        """Return a boolean mask of the entries of *dates* on which the benchmark also traded."""
+        return np.isin(dates, self.dates)
+
+
+class BenchmarkStore:
+    """
+    Process-wide cache of benchmark series.
+
+    A series is rebuilt only when the price store hands out another version of the history (a refresh, an
+    adjustment reload or a write by another process) or when the period window moved to another first date.
+
+    Attributes:
+        prices: Price store the benchmark closes are read from
+        period: History window used for beta calculations
+    """
+
+    def __init__(self, prices: PriceHistoryStore, period: str = "5y"):
+        self.prices = prices
+        self.period = period
+        self._series: Dict[str, Tuple[tuple, BenchmarkSeries]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, ticker: str = "SPY") -> BenchmarkSeries:
+        """
+        Return the benchmark series for *ticker*; the underlying price store downloads only missing bars.
+
+        Args:
+            ticker: Benchmark symbol
+
+        Returns:
+            BenchmarkSeries with precomputed returns and variance
+        """
+        ticker = ticker.upper()
+        history = self.prices.load(ticker, period=self.period)
+        key = (history.version, history.dates[0] if len(history) else None, len(history))
+        with self._lock:
+            cached = self._series.get(ticker)
+            if cached is None or cached[0] != key:
+                series = BenchmarkSeries(ticker, np.array(history.dates), np.array(history.close))
+                self._series[ticker] = (key, series)
+                logging.info(f"Benchmark {ticker} returns rebuilt ({len(series.dates)} bars)")
+                return series
+            return cached[1]
+
+
+# Global benchmark store shared by every risk assessment of this process
+benchmark_store = BenchmarkStore(prices=price_store)
@@ -1,8 +1,6 @@
-import pandas as pd
 from pandas import DataFrame, Series
 import yfinance as yf
-from pydantic import BaseModel, Field, ConfigDict
-import streamlit as st
+from pydantic import BaseModel, Field
 from typing import Any
 from beeai_framework.emitter import Emitter
 from beeai_framework.tools import Tool, ToolRunOptions
@@ -10,104 +8,132 @@ from beeai_framework.context import RunContext
 from beeai_framework.tools.search import SearchToolOutput, SearchToolResult
 import asyncio
 import logging
+import threading
+import time
+from collections import OrderedDict
+from config.config import app_config
+from utils.log_config import payload
 from utils.logging_helper import log_performance
+from utils.tracing import CLIENT, traced, tracer
+from tools.stock_adv_ratio_engine import compute_fundamental_ratios
 
 from langchain_community.tools.yahoo_finance_news import YahooFinanceNewsTool
 
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
-
 
 class DataFetcherToolInput(BaseModel):
     stock_symbol: str = Field(description="Stock symbol of the data to fetch.")
 
 
+# yfinance ``info`` keys sent to the model with the ratios; the rest of ``info`` (officers, long business
+# summary, dozens of price fields) and the raw statements only made the prompt longer
+INFO_FIELDS = (
+    "longName", "sector", "industry", "country", "currency",
+    "currentPrice", "fiftyTwoWeekLow", "fiftyTwoWeekHigh", "marketCap", "enterpriseValue", "sharesOutstanding",
+    "trailingPE", "forwardPE", "priceToBook", "trailingPegRatio", "enterpriseToEbitda", "enterpriseToRevenue",
+    "trailingEps", "forwardEps", "dividendYield", "payoutRatio", "beta",
+    "totalRevenue", "revenueGrowth", "earningsGrowth", "ebitda", "netIncomeToCommon",
+    "operatingCashflow", "freeCashflow", "totalCash", "totalDebt",
+    "targetMeanPrice", "recommendationKey", "numberOfAnalystOpinions",
+)
+
+
+def company_profile(info: dict[str, Any]) -> dict[str, Any]:
+    """The ``INFO_FIELDS`` that yfinance reported for the company."""
+    return {key: info[key] for key in INFO_FIELDS if info.get(key) is not None}
+
+
 class DataFetcherToolResult(SearchToolResult):
-    def __init__(self, title, description, url, income_statement, balance_sheet, cash_flow, additional_info,
-                 financial_news, /, **data: Any):
-        super().__init__(**data)
-        self.title = title
-        self.description = description
-        self.url = url
-        self.income_statement = income_statement
-        self.balance_sheet = balance_sheet
-        self.cash_flow = cash_flow
-        self.additional_info = additional_info
-        self.financial_news = financial_news
-
-    def __getstate__(self):
-        # Prepare a picklable state
-        state = self.__dict__.copy()
-
-        # Convert pandas DataFrames to dict if they exist
-        for key in ['income_statement', 'balance_sheet', 'cash_flow']:
-            if hasattr(state[key], 'to_dict'):
-                state[key] = state[key].to_dict()
-
-        return state
-
-    def __setstate__(self, state):
-        # Reconstruct the object
-        self.__dict__.update(state)
+    company_profile: dict[str, Any] | None = None
+    financial_ratios: dict[str, Any] | None = None
+    financial_news: Any = None
 
 
 class DataFetcherToolOutput(SearchToolOutput):
     pass
 
 
+# Fundamentals per symbol, shared by every session and reused for ``AppConfig.cache_duration_minutes``
+_FUNDAMENTALS_ENTRIES = 32
+_fundamentals: OrderedDict[str, tuple[float, DataFetcherToolResult]] = OrderedDict()
+_fundamentals_lock = threading.Lock()
+
+
 class DataFetcherTool(Tool[DataFetcherToolInput, ToolRunOptions, DataFetcherToolOutput]):
     name = "DataFetcher"
     description = """This tool fetch data from Yahoo Finance websites based on a given stock symbol,
      providing users with up-to-date financial information and insights"""
     input_schema = DataFetcherToolInput
 
+    def __init__(self, stock_symbol: str | None = None, options: dict[str, Any] | None = None) -> None:
+        """
+        Args:
+            stock_symbol: Ticker validated by the UI; when given it is fetched whatever symbol the model passes
+        """
+        super().__init__(options)
+        self.stock_symbol = stock_symbol.upper() if stock_symbol else None
+
     def _create_emitter(self) -> Emitter:
         return Emitter.root().child(
             namespace=["tool", "data_fetcher", "DataFetcher"],
             creator=self,
         )
 
+    @staticmethod
     @log_performance
-    @st.cache_data
-    def get_fundamental_data(self, input: DataFetcherToolInput) -> DataFetcherToolResult:
-        logging.info(f"_get_fundamental_data START with input {input}")
-        # TODO For now, this is a workaround for when the model fails to get the right input
-        current_input = input.stock_symbol
-        if 'stock' in st.session_state:
-            if current_input is not st.session_state.stock:
-                current_input = st.session_state.stock
+    def get_fundamental_data(stock_symbol: str) -> DataFetcherToolResult:
+        """Fundamentals of *stock_symbol*, served from the in-process cache while it is fresh."""
+        now = time.monotonic()
+        with _fundamentals_lock:
+            cached = _fundamentals.get(stock_symbol)
+            if cached is not None and now - cached[0] < app_config.cache_duration_minutes * 60:
+                _fundamentals.move_to_end(stock_symbol)
+                return cached[1]
+
+        result = DataFetcherTool._fetch_fundamental_data(stock_symbol)
+        if result is not None:
+            with _fundamentals_lock:
+                _fundamentals[stock_symbol] = (now, result)
+                _fundamentals.move_to_end(stock_symbol)
+                while len(_fundamentals) > _FUNDAMENTALS_ENTRIES:
+                    _fundamentals.popitem(last=False)
+        return result
 
+    @staticmethod
+    def _fetch_fundamental_data(stock_symbol: str) -> DataFetcherToolResult:
+        logging.info("_get_fundamental_data START for %s", stock_symbol)
         result = None
         try:
-            stock_data = yf.Ticker(current_input)
+            with tracer.span("yfinance.fundamentals", CLIENT, ticker=stock_symbol):
+                stock_data = yf.Ticker(stock_symbol)
 
-            income_statement = getattr(stock_data, "income_stmt", None)
-            balance_sheet = getattr(stock_data, "balance_sheet", None)
-            cash_flow = getattr(stock_data, "cash_flow", None)
-            info = yf.Ticker(input.stock_symbol).info
-            additional_info = pd.Series(info)
+                income_statement = getattr(stock_data, "income_stmt", None)
+                balance_sheet = getattr(stock_data, "balance_sheet", None)
+                cash_flow = getattr(stock_data, "cash_flow", None)
+                info = stock_data.info
+            # Ratios and growth are computed here so the model receives finished numbers, not the statements
+            financial_ratios = compute_fundamental_ratios(income_statement, balance_sheet, cash_flow).to_dict()
+            profile = company_profile(info)
 
             yf_news_tool = YahooFinanceNewsTool()
 
-            financial_news = yf_news_tool.run(tool_input=input.stock_symbol)
-
-            logging.info(
-                f"**********************************************financial_news= {financial_news} *************")
+            with tracer.span("yahoo_finance_news", CLIENT, ticker=stock_symbol):
+                financial_news = yf_news_tool.run(tool_input=stock_symbol)
 
-            logging.info(
-                f"**********************************************additional_info= {additional_info} *************")
+            logging.debug("get_fundamental_data financial_news=%s", payload(financial_news))
+            logging.debug("get_fundamental_data company_profile=%s", payload(profile))
 
             result = DataFetcherToolResult(
-                title=f"Financial statements for {input.stock_symbol}",
-                description="""Income statement, balance sheet, cash‑flow data and company's attributes 
-                    such as ratios e.g P/E fetched via yfinance.""",
-                url=f"https://finance.yahoo.com/quote/{input.stock_symbol}",
-                income_statement=income_statement,
-                balance_sheet=balance_sheet,
-                cash_flow=cash_flow,
-                additional_info=additional_info,
+                title=f"Fundamentals of {stock_symbol}",
+                description="""Company profile and valuation attributes (e.g. P/E, P/B, market cap) fetched via
+                    yfinance, plus financial ratios, growth and CAGR precomputed from the financial statements,
+                    and the latest Yahoo Finance news.""",
+                url=f"https://finance.yahoo.com/quote/{stock_symbol}",
+                company_profile=profile,
+                financial_ratios=financial_ratios,
                 financial_news=financial_news
             )
-            logging.info(f"***********************************get_fundamental_data END with output {result}")
+            logging.info("get_fundamental_data END for %s", stock_symbol)
+            logging.debug("get_fundamental_data output: %s", payload(result))
         except Exception as ex:
             logging.error(ex)
 
@@ -115,14 +141,17 @@ class DataFetcherTool(Tool[DataFetcherToolInput, ToolRunOptions, DataFetcherTool
 
     #def _get_technical_data(self, stock_symbol: str, start_date: str, end_date : str)-> DataFetcherToolResult:
 
+    @traced()
     async def _run(
             self,
             input: DataFetcherToolInput,
             options: ToolRunOptions | None,
             context: RunContext,
     ) -> DataFetcherToolOutput:
-        output = None
-        fundamental_data = DataFetcherTool.get_fundamental_data(input)
+        stock_symbol = self.stock_symbol or input.stock_symbol.upper()
+        if stock_symbol != input.stock_symbol.upper():
+            logging.warning("DataFetcher called with %s, fetching the requested %s", input.stock_symbol, stock_symbol)
+        fundamental_data = DataFetcherTool.get_fundamental_data(stock_symbol)
         output = DataFetcherToolOutput(results=[fundamental_data])
         return output
 
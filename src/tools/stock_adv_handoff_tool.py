@@ -0,0 +1,17 @@
+"""Handoff tool recording each delegation to an expert agent as a tracing span."""
+from beeai_framework.context import RunContext
+from beeai_framework.tools import StringToolOutput, ToolRunOptions
+from beeai_framework.tools.handoff import HandoffSchema, HandoffTool as BaseHandoffTool
+
+from utils.tracing import tracer
+
+
+class HandoffTool(BaseHandoffTool):
+    """Drop-in ``HandoffTool`` whose runs appear in the report trace as ``handoff <name>`` spans."""
+
+    async def _run(self, input: HandoffSchema, options: ToolRunOptions | None, context: RunContext) -> StringToolOutput:
+        with tracer.span(f"handoff {self.name}", **{"handoff.target": self.name}) as span:
+            output = await super()._run(input, options, context)
+            if span is not None:
+                span.set_attribute("handoff.output_chars", len(output.get_text_content()))
+            return output
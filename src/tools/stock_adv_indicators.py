@@ -0,0 +1,329 @@
+"""Pure technical indicator library.
+
+Every indicator takes NumPy arrays (or anything ``np.asarray`` accepts, e.g. DataFrame columns) and returns new
+arrays; inputs are never modified, so cached price frames can be shared between the charts, the screener and the
+agents. Arrays may be 1-D (one ticker) or 2-D with shape (dates, tickers), in which case every column is computed
+at once. Leading values without a full window are NaN.
+
+``IndicatorEngine`` computes several indicators over the same prices in one pass, sharing the intermediate
+results (prefix sums, EMAs, true range) between them.
+"""
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from tools.stock_adv_rolling_extrema import rolling_extrema, rolling_max, rolling_min
+
+Array = np.ndarray
+# Dates advanced per matrix product by the exponential averages
+EWM_BLOCK = 64
+
+
+def _as_float(values) -> Array:
+    return np.asarray(values, dtype=float)
+
+
+def _nan_like(x: Array) -> Array:
+    return np.full(x.shape, np.nan)
+
+
+def _prefix(x: Array) -> Array:
+    """Prefix sums along the date axis with a leading zero row."""
+    return np.concatenate([np.zeros((1,) + x.shape[1:]), np.cumsum(x, axis=0, dtype=float)])
+
+
+def _window_sum(prefix: Array, window: int, n: int) -> Array:
+    out = np.full((n,) + prefix.shape[1:], np.nan)
+    if window <= n:
+        out[window - 1:] = prefix[window:] - prefix[:-window]
+    return out
+
+
+def _ewm(x: Array, alpha: float) -> Array:
+    """
+    Recursive exponential average (pandas ``ewm(alpha=..., adjust=False)``), column-wise.
+
+    The recursion is advanced ``EWM_BLOCK`` dates at a time for all columns with one matrix product,
+    ``y[s + j] = y[s - 1] + sum_k alpha * (1 - alpha)**(j - k) * (x[s + k] - y[s - 1])``, instead of
+    pandas' per-column kernel. Leading missing values (a ticker listed later) are skipped; columns with gaps
+    further in, where pandas carries the average over the gap, are left to pandas.
+    """
+    if len(x) == 0:
+        return x.astype(float)
+    values = x.reshape(len(x), -1)
+    missing = np.isnan(values)
+    first = missing.argmin(axis=0)
+    leading = np.arange(len(values))[:, None] < first
+    gaps = (missing & ~leading).any(axis=0)
+
+    # Repeating the first valid value over the leading rows leaves the average unchanged from there on
+    filled = np.where(leading, values[first, np.arange(values.shape[1])], values)
+    decay = 1.0 - alpha
+    steps = np.arange(EWM_BLOCK)
+    lags = steps[:, None] - steps[None, :]
+    weights = np.where(lags >= 0, alpha * decay ** np.maximum(lags, 0), 0.0)
+    out = np.empty(values.shape)
+    previous = filled[0]
+    for start in range(0, len(filled), EWM_BLOCK):
+        block = filled[start:start + EWM_BLOCK]
+        m = len(block)
+        # The weights and the carried share sum to one; working on deviations keeps constant prices exact
+        out[start:start + m] = previous + weights[:m, :m] @ (block - previous)
+        previous = out[start + m - 1]
+    out[leading] = np.nan
+    if gaps.any():
+        out[:, gaps] = pd.DataFrame(values[:, gaps]).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    return out.reshape(x.shape)
+
+
+def _shift(x: Array, periods: int) -> Array:
+    """Shift along the date axis (positive: towards later dates), filling with NaN."""
+    out = _nan_like(x)
+    if periods >= 0:
+        out[periods:] = x[:len(x) - periods]
+    else:
+        out[:periods] = x[-periods:]
+    return out
+
+
+class IndicatorEngine:
+    """
+    Indicators over one set of OHLCV arrays, sharing intermediate results between calls.
+
+    Attributes:
+        close: Closing prices, shape (dates,) or (dates, tickers)
+        high, low, volume: Optional arrays with the same shape as ``close``
+    """
+
+    def __init__(self, close, high=None, low=None, volume=None):
+        self.close = _as_float(close)
+        self.high = None if high is None else _as_float(high)
+        self.low = None if low is None else _as_float(low)
+        self.volume = None if volume is None else _as_float(volume)
+        self._cache: Dict[tuple, Array] = {}
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> "IndicatorEngine":
+        """Build an engine over the columns of a price-store / yfinance frame without copying it."""
+        return cls(frame["Close"].to_numpy(),
+                   frame["High"].to_numpy() if "High" in frame else None,
+                   frame["Low"].to_numpy() if "Low" in frame else None,
+                   frame["Volume"].to_numpy() if "Volume" in frame else None)
+
+    def _cached(self, key: tuple, compute) -> Array:
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def _require(self, *names: str) -> None:
+        missing = [name for name in names if getattr(self, name) is None]
+        if missing:
+            raise ValueError(f"Indicator requires {', '.join(missing)} prices")
+
+    def _close_stats(self) -> Tuple[Array, Array, Array, Array]:
+        """
+        Prefix sums of the close and of its squares around the column mean (numerically stable), plus the
+        prefix count of valid closes so that a missing price only invalidates the windows containing it.
+        """
+
+        def compute():
+            valid = ~np.isnan(self.close)
+            shift = np.nanmean(self.close, axis=0) if valid.any() else np.zeros(self.close.shape[1:])
+            centered = np.where(valid, self.close - shift, 0.0)
+            return np.asarray(shift), _prefix(centered), _prefix(centered * centered), _prefix(valid)
+
+        return self._cached(("close_stats",), compute)
+
+    def _full_windows(self, window: int) -> Array:
+        _, _, _, counts = self._close_stats()
+        return _window_sum(counts, window, len(self.close)) == window
+
+    def sma(self, window: int) -> Array:
+        """Simple moving average of the close."""
+
+        def compute():
+            shift, s1, _, _ = self._close_stats()
+            means = _window_sum(s1, window, len(self.close)) / window + shift
+            return np.where(self._full_windows(window), means, np.nan)
+
+        return self._cached(("sma", window), compute)
+
+    def rolling_std(self, window: int) -> Array:
+        """Sample standard deviation of the close over *window* dates."""
+
+        def compute():
+            _, s1, s2, _ = self._close_stats()
+            n = len(self.close)
+            sums, squares = _window_sum(s1, window, n), _window_sum(s2, window, n)
+            variance = (squares - sums * sums / window) / (window - 1)
+            return np.where(self._full_windows(window), np.sqrt(np.maximum(variance, 0.0)), np.nan)
+
+        return self._cached(("std", window), compute)
+
+    def ema(self, span: int) -> Array:
+        """Exponential moving average of the close (``ewm(span=span, adjust=False)``)."""
+        return self._cached(("ema", span), lambda: _ewm(self.close, 2.0 / (span + 1)))
+
+    def bollinger(self, window: int = 20, num_std: float = 2.0) -> Tuple[Array, Array, Array]:
+        """Return (middle, upper, lower) Bollinger bands."""
+        middle = self.sma(window)
+        width = self.rolling_std(window) * num_std
+        return middle, middle + width, middle - width
+
+    def macd(self, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[Array, Array, Array]:
+        """Return (MACD line, signal line, histogram)."""
+
+        def compute():
+            line = self.ema(fast) - self.ema(slow)
+            signal_line = _ewm(line, 2.0 / (signal + 1))
+            return np.stack([line, signal_line, line - signal_line])
+
+        line, signal_line, histogram = self._cached(("macd", fast, slow, signal), compute)
+        return line, signal_line, histogram
+
+    def rolling_max(self, window: int) -> Array:
+        """Highest high (or close when no highs were given) over *window* dates."""
+        source = self.close if self.high is None else self.high
+        return self._cached(("max", window), lambda: rolling_max(source, window))
+
+    def rolling_min(self, window: int) -> Array:
+        """Lowest low (or close when no lows were given) over *window* dates."""
+        source = self.close if self.low is None else self.low
+        return self._cached(("min", window), lambda: rolling_min(source, window))
+
+    def ichimoku(self, conversion: int = 9, base: int = 26, span_b: int = 52,
+                 displacement: int = 26) -> Dict[str, Array]:
+        """
+        Return the Ichimoku lines: tenkan, kijun, senkou_a, senkou_b (shifted forward) and chikou.
+
+        The midpoints use the highest high and lowest low of each window (closes when no highs/lows were given);
+        the three windows are answered from one sparse table per side.
+        """
+
+        def compute():
+            high = self.close if self.high is None else self.high
+            low = self.close if self.low is None else self.low
+            extremes = rolling_extrema(high, low, (conversion, base, span_b))
+            mid = {w: (hi + lo) / 2 for w, (hi, lo) in extremes.items()}
+            tenkan, kijun = mid[conversion], mid[base]
+            return {
+                "tenkan": tenkan,
+                "kijun": kijun,
+                "senkou_a": _shift((tenkan + kijun) / 2, displacement),
+                "senkou_b": _shift(mid[span_b], displacement),
+                "chikou": _shift(self.close, -displacement),
+            }
+
+        return self._cached(("ichimoku", conversion, base, span_b, displacement), compute)
+
+    def rsi(self, period: int = 14) -> Array:
+        """Relative Strength Index with Wilder smoothing (0-100)."""
+
+        def compute():
+            delta = np.diff(self.close, axis=0)
+            gains = _ewm(np.maximum(delta, 0.0), 1.0 / period)
+            losses = _ewm(np.maximum(-delta, 0.0), 1.0 / period)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                values = np.where(losses == 0, 100.0, 100.0 - 100.0 / (1.0 + gains / losses))
+            out = _nan_like(self.close)
+            out[period:] = values[period - 1:]
+            return out
+
+        return self._cached(("rsi", period), compute)
+
+    def true_range(self) -> Array:
+        def compute():
+            self._require("high", "low")
+            previous = _shift(self.close, 1)
+            ranges = np.stack([self.high - self.low, np.abs(self.high - previous), np.abs(self.low - previous)])
+            return np.nanmax(ranges, axis=0)
+
+        return self._cached(("true_range",), compute)
+
+    def atr(self, period: int = 14) -> Array:
+        """Average True Range with Wilder smoothing."""
+
+        def compute():
+            out = _ewm(self.true_range(), 1.0 / period)
+            out[:period - 1] = np.nan
+            return out
+
+        return self._cached(("atr", period), compute)
+
+    def obv(self) -> Array:
+        """On-Balance Volume, starting at zero on the first date."""
+
+        def compute():
+            self._require("volume")
+            direction = np.sign(np.diff(self.close, axis=0))
+            flow = np.concatenate([np.zeros((1,) + self.close.shape[1:]), direction * self.volume[1:]])
+            return np.cumsum(flow, axis=0)
+
+        return self._cached(("obv",), compute)
+
+    def compute(self, specs: Sequence[str]) -> Dict[str, Array]:
+        """
+        Compute several indicators at once from specifications such as ``"sma:20"``, ``"bollinger:20:2"``,
+        ``"macd"`` or ``"rsi:14"``; multi-output indicators add one entry per line (``"macd.signal"``).
+
+        Returns:
+            Mapping of output name to array
+        """
+        results: Dict[str, Array] = {}
+        for spec in specs:
+            name, *raw_args = spec.split(":")
+            args = [float(a) if "." in a else int(a) for a in raw_args]
+            if name not in INDICATORS:
+                raise ValueError(f"Unknown indicator '{name}', expected one of {sorted(INDICATORS)}")
+            value = getattr(self, name)(*args)
+            if isinstance(value, dict):
+                results.update({f"{spec}.{key}": v for key, v in value.items()})
+            elif isinstance(value, tuple):
+                results.update({f"{spec}.{key}": v for key, v in zip(INDICATORS[name], value)})
+            else:
+                results[spec] = value
+        return results
+
+
+# Indicator name -> labels of its outputs (empty for single-array indicators)
+INDICATORS: Dict[str, Tuple[str, ...]] = {
+    "sma": (), "ema": (), "rolling_std": (), "rsi": (), "atr": (), "obv": (),
+    "rolling_max": (), "rolling_min": (),
+    "bollinger": ("middle", "upper", "lower"),
+    "macd": ("macd", "signal", "histogram"),
+    "ichimoku": ("tenkan", "kijun", "senkou_a", "senkou_b", "chikou"),
+}
+
+
+def sma(close, window: int) -> Array:
+    return IndicatorEngine(close).sma(window)
+
+
+def ema(close, span: int) -> Array:
+    return IndicatorEngine(close).ema(span)
+
+
+def bollinger(close, window: int = 20, num_std: float = 2.0) -> Tuple[Array, Array, Array]:
+    return IndicatorEngine(close).bollinger(window, num_std)
+
+
+def macd(close, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[Array, Array, Array]:
+    return IndicatorEngine(close).macd(fast, slow, signal)
+
+
+def ichimoku(high, low, close, conversion: int = 9, base: int = 26, span_b: int = 52,
+             displacement: int = 26) -> Dict[str, Array]:
+    return IndicatorEngine(close, high, low).ichimoku(conversion, base, span_b, displacement)
+
+
+def rsi(close, period: int = 14) -> Array:
+    return IndicatorEngine(close).rsi(period)
+
+
+def atr(high, low, close, period: int = 14) -> Array:
+    return IndicatorEngine(close, high, low).atr(period)
+
+
+def obv(close, volume) -> Array:
+    return IndicatorEngine(close, volume=volume).obv()
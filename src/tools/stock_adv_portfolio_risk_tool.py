@@ -0,0 +1,289 @@
+"""Portfolio-level risk for a set of holdings.
+
+The expensive part of a portfolio assessment is the covariance matrix of the holdings. It is estimated with
+Ledoit-Wolf shrinkage once per (tickers, date range) and kept in ``covariance_cache``. Changing only the weights
+reuses the cached estimate, so the portfolio figures (volatility, VaR, marginal and component VaR, risk
+contributions and diversification ratio) cost a few O(N^2) matrix-vector products.
+"""
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from statistics import NormalDist
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from pydantic import BaseModel, Field
+from beeai_framework.tools import Tool, ToolRunOptions
+from beeai_framework.context import RunContext
+from beeai_framework.emitter import Emitter
+from beeai_framework.tools import JSONToolOutput
+
+from tools.stock_adv_benchmark_store import benchmark_store
+from tools.stock_adv_price_store import price_store
+from tools.stock_adv_risk_engine import TRADING_DAYS, compute_risk_metrics, ledoit_wolf_covariance
+from utils.tracing import traced
+
+CacheKey = Tuple[Tuple[str, ...], str, str, str]
+
+
+@dataclass
+class CovarianceEstimate:
+    """
+    Shrinkage covariance of the daily returns of a fixed set of tickers over a fixed date range.
+
+    Attributes
+    ----------
+    tickers: tuple[str, ...]
+        Holdings, in the row/column order of every matrix.
+    dates: np.ndarray
+        ``datetime64[D]`` dates of the returns (the second of each pair of trading days).
+    returns: np.ndarray
+        Daily simple returns, shape (dates, tickers).
+    benchmark_returns: np.ndarray
+        Benchmark returns aligned with ``returns``.
+    mean: np.ndarray
+        Mean daily return of every ticker.
+    covariance: np.ndarray
+        Ledoit-Wolf shrinkage covariance of the daily returns.
+    shrinkage: float
+        Shrinkage intensity used for ``covariance``.
+    benchmark_variance: Optional[float]
+        Precomputed variance of ``benchmark_returns`` when they span the whole benchmark series, else None.
+    """
+    tickers: Tuple[str, ...]
+    dates: np.ndarray
+    returns: np.ndarray
+    benchmark_returns: np.ndarray
+    mean: np.ndarray
+    covariance: np.ndarray
+    shrinkage: float
+    benchmark_variance: Optional[float] = None
+
+    @property
+    def volatility(self) -> np.ndarray:
+        """Daily volatility of every ticker."""
+        return np.sqrt(np.diag(self.covariance))
+
+    @property
+    def correlation(self) -> np.ndarray:
+        vol = self.volatility
+        return self.covariance / np.outer(vol, vol)
+
+    @classmethod
+    def from_returns(cls, tickers: Sequence[str], dates: np.ndarray, returns: np.ndarray,
+                     benchmark_returns: np.ndarray,
+                     benchmark_variance: Optional[float] = None) -> "CovarianceEstimate":
+        covariance, shrinkage = ledoit_wolf_covariance(returns)
+        return cls(tuple(tickers), dates, returns, benchmark_returns, returns.mean(axis=0), covariance, shrinkage,
+                   benchmark_variance)
+
+
+class CovarianceCache:
+    """
+    Bounded LRU cache of CovarianceEstimate keyed by tickers and date range.
+
+    The key includes the first and last date of the aligned history, so a new bar picked up by the price store
+    yields a new key while repeated assessments of the same holdings over the same range reuse the estimate.
+    """
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[CacheKey, CovarianceEstimate] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: CacheKey) -> Optional[CovarianceEstimate]:
+        with self._lock:
+            estimate = self._entries.get(key)
+            if estimate is not None:
+                self._entries.move_to_end(key)
+            return estimate
+
+    def put(self, key: CacheKey, estimate: CovarianceEstimate) -> None:
+        with self._lock:
+            self._entries[key] = estimate
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+covariance_cache = CovarianceCache()
+
+
+def load_covariance(tickers: Sequence[str], benchmark_ticker: str = "SPY", period: str = "5y",
+                    cache: CovarianceCache = covariance_cache) -> CovarianceEstimate:
+    """
+    Return the covariance estimate of *tickers* over the dates on which all of them and the benchmark traded.
+
+    Price histories come from the shared price store; the covariance is only estimated when the
+    (tickers, date range) pair is not cached yet.
+    """
+    symbols = tuple(sorted({t.upper() for t in tickers}))
+    histories = [price_store.load(symbol, period=period) for symbol in symbols]
+    benchmark = benchmark_store.get(benchmark_ticker)
+
+    dates = benchmark.dates
+    for history in histories:
+        dates = np.intersect1d(dates, history.dates, assume_unique=True)
+    if len(dates) < 3:
+        raise ValueError(f"Not enough common trading days for {', '.join(symbols)}")
+
+    key = (symbols, benchmark.ticker, str(dates[0]), str(dates[-1]))
+    estimate = cache.get(key)
+    if estimate is not None:
+        logging.info(f"load_covariance cache hit for {key}")
+        return estimate
+
+    closes = np.column_stack([h.close[np.searchsorted(h.dates, dates)] for h in histories])
+    returns = closes[1:] / closes[:-1] - 1.0
+    # Holdings that traded on every benchmark day reuse the benchmark variance computed by the store
+    benchmark_variance = benchmark.variance if len(dates) == len(benchmark.dates) else None
+    estimate = CovarianceEstimate.from_returns(symbols, dates[1:], returns, benchmark.aligned_returns(dates),
+                                               benchmark_variance)
+    cache.put(key, estimate)
+    logging.info(f"load_covariance estimated {len(symbols)}x{len(symbols)} covariance, "
+                 f"shrinkage {estimate.shrinkage:.3f}")
+    return estimate
+
+
+def normalize_weights(estimate: CovarianceEstimate, weights: Dict[str, float]) -> np.ndarray:
+    """Return the weights in the estimate's ticker order, scaled to sum to one."""
+    by_symbol = {t.upper(): float(w) for t, w in weights.items()}
+    w = np.array([by_symbol.get(t, 0.0) for t in estimate.tickers])
+    total = w.sum()
+    if total <= 0:
+        raise ValueError("Portfolio weights must sum to a positive value")
+    return w / total
+
+
+def portfolio_risk(estimate: CovarianceEstimate, weights: np.ndarray, confidence: float = 0.95,
+                   risk_free_rate: float = 0.045) -> Dict[str, Any]:
+    """
+    Compute portfolio risk figures for one weight vector from a (cached) covariance estimate.
+
+    VaR follows the sign convention of ``analyze_market_risk``: a daily return quantile, negative for a loss.
+    Parametric VaR is additive over holdings: ``component_var`` sums to ``value_at_risk``.
+
+    Args:
+        estimate: Covariance estimate of the holdings
+        weights: Weights aligned with ``estimate.tickers`` and summing to one
+        confidence: VaR confidence level
+        risk_free_rate: Annualized risk-free rate (decimal) for the Sharpe ratio
+
+    Returns:
+        Dictionary with portfolio-level figures and per-holding breakdowns
+    """
+    z = NormalDist().inv_cdf(1.0 - confidence)
+    sigma_w = estimate.covariance @ weights
+    variance = float(weights @ sigma_w)
+    volatility = np.sqrt(variance)
+    mean = float(weights @ estimate.mean)
+
+    marginal_var = estimate.mean + z * sigma_w / volatility
+    component_var = weights * marginal_var
+    risk_contribution = weights * sigma_w / variance
+    diversification_ratio = float(weights @ estimate.volatility / volatility)
+
+    # Historical figures of the portfolio return series, computed like the single-stock assessment
+    history = compute_risk_metrics((estimate.returns @ weights)[:, None], estimate.benchmark_returns,
+                                   risk_free_rate, tickers=["portfolio"],
+                                   benchmark_variance=estimate.benchmark_variance).row(0)
+
+    def per_holding(values: np.ndarray, digits: int = 4) -> Dict[str, float]:
+        return {t: round(float(v), digits) for t, v in zip(estimate.tickers, values)}
+
+    return {
+        "weights": per_holding(weights),
+        "volatility_annualized": round(volatility * np.sqrt(TRADING_DAYS), 4),
+        "value_at_risk": round(mean + z * volatility, 4),
+        "historical_value_at_risk_95": round(history["value_at_risk_95"], 4),
+        "beta": round(history["beta"], 3),
+        "max_drawdown": round(history["max_drawdown"], 4),
+        "sharpe_ratio": round(history["sharpe_ratio"], 2),
+        "diversification_ratio": round(diversification_ratio, 3),
+        "marginal_var": per_holding(marginal_var),
+        "component_var": per_holding(component_var),
+        "risk_contribution": per_holding(risk_contribution),
+        "correlation": {t: per_holding(row, 3) for t, row in zip(estimate.tickers, estimate.correlation)},
+        "confidence": confidence,
+        "shrinkage": round(estimate.shrinkage, 4),
+        "observations": len(estimate.dates),
+    }
+
+
+class PortfolioRiskAnalysisToolInput(BaseModel):
+    """
+    Input parameters for the portfolio-risk-analysis tool.
+
+    Attributes
+    ----------
+    holdings: dict[str, float]
+        Ticker symbol to portfolio weight; weights are rescaled to sum to one.
+    benchmark_ticker: str
+        Ticker of the market benchmark used for beta. Defaults to "SPY".
+    annual_risk_free_rate: float
+        Annual risk-free rate expressed as a decimal (e.g., 0.045 for 4.5%).
+    confidence: float
+        Confidence level of the Value at Risk.
+    """
+
+    holdings: Dict[str, float] = Field(description="Ticker symbols mapped to their portfolio weights.")
+    benchmark_ticker: str = Field(default="SPY", description="Benchmark ticker symbol (default: S&P 500 ETF).")
+    annual_risk_free_rate: float = Field(default=0.045, description="Annual risk-free rate as a decimal (0-1).")
+    confidence: float = Field(default=0.95, description="Value at Risk confidence level (0-1).")
+
+
+class PortfolioRiskAnalysisTool(Tool[PortfolioRiskAnalysisToolInput, ToolRunOptions, JSONToolOutput[dict[str, Any]]]):
+    name = "PortfolioRiskAnalyzer"
+    description = """This tool assesses the risk of a portfolio of stocks given their weights.
+
+                        Key Features:
+
+                            Correlation: Shrinkage-estimated covariance and correlation of the holdings,
+                            Risk Breakdown: Portfolio volatility, VaR, marginal VaR, risk contribution per holding
+                            and diversification ratio.
+            """
+    input_schema = PortfolioRiskAnalysisToolInput
+
+    def _create_emitter(self) -> Emitter:
+        return Emitter.root().child(
+            namespace=["tool", "risk_analysis", "PortfolioRiskAnalyzer"],
+            creator=self,
+        )
+
+    @traced()
+    async def _run(
+            self,
+            input: PortfolioRiskAnalysisToolInput,
+            options: ToolRunOptions | None,
+            context: RunContext,
+    ) -> JSONToolOutput[dict[str, Any]]:
+        logging.info(f"**********************************PortfolioRiskAnalyzer START with input {input}")
+        estimate = load_covariance(list(input.holdings), input.benchmark_ticker)
+        weights = normalize_weights(estimate, input.holdings)
+        output = {
+            "tickers": list(estimate.tickers),
+            "timestamp": datetime.now().isoformat(),
+            "portfolio_risk": portfolio_risk(estimate, weights, input.confidence, input.annual_risk_free_rate),
+        }
+        logging.info("**********************************PortfolioRiskAnalyzer END")
+        return JSONToolOutput(output)
+
+
+# ==========================================
+# Example Usage
+# ==========================================
+async def main() -> None:
+    tool = PortfolioRiskAnalysisTool()
+    output = await tool.run(PortfolioRiskAnalysisToolInput(holdings={"IBM": 0.5, "MSFT": 0.3, "KO": 0.2}))
+    logging.info(output.result.get("portfolio_risk"))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
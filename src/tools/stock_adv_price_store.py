@@ -0,0 +1,318 @@
+"""Local, append-only store of daily OHLCV history per symbol.
+
+Each symbol is kept as a small memory-mapped NumPy layout under ``AppConfig.market_data_cache_dir``::
+
+    prices/<SYMBOL>/CURRENT              name of the version directory holding the current history
+    prices/<SYMBOL>/<version>/dates.npy  int64 day numbers (sorted, unique)
+    prices/<SYMBOL>/<version>/ohlcv.npy  float64 array of shape (dates, 5): Open, High, Low, Close, Volume
+    prices/<SYMBOL>/<version>/meta.json  covered start date and time of the last refresh
+
+A refresh writes a complete new version directory and then swaps ``CURRENT``, so a reader always sees the
+three files of one version. Refreshes of a symbol are serialized across processes with a lock file, and a
+process re-opens its memory maps whenever ``CURRENT`` was swapped by another process. Only the date ranges that are not on disk yet are downloaded. New bars are merged and de-duplicated, with
+freshly downloaded bars winning over stored ones. yfinance returns split- and dividend-adjusted prices, so
+when a refresh reports a corporate action, or an overlapping bar no longer matches the stored one, the whole
+history is downloaded again. Reads return views into the memory map, so loading a date range copies nothing.
+"""
+import contextlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: refreshes are serialized per process only; the pointer swap stays atomic
+    fcntl = None
+
+from config.config import app_config
+from utils.tracing import CLIENT, tracer
+
+COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+ADJUSTMENT_TOLERANCE = 1e-6
+
+
+def to_trading_days(index: pd.DatetimeIndex) -> np.ndarray:
+    """Convert a (possibly tz-aware) yfinance index into ``datetime64[D]`` exchange-local dates."""
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.normalize().values.astype("datetime64[D]")
+
+
+def period_start(period: str) -> np.datetime64:
+    """Translate a yfinance period string such as ``"5y"`` or ``"6mo"`` into a start date."""
+    today = pd.Timestamp.today().normalize()
+    units = {"y": "years", "mo": "months", "d": "days"}
+    for suffix, unit in units.items():
+        if period.endswith(suffix) and period[:-len(suffix)].isdigit():
+            return np.datetime64((today - pd.DateOffset(**{unit: int(period[:-len(suffix)])})).date(), "D")
+    raise ValueError(f"Unsupported period: {period}")
+
+
+@dataclass
+class PriceHistory:
+    """
+    Zero-copy view over a date range of a symbol's stored history.
+
+    Attributes
+    ----------
+    symbol: str
+        Ticker symbol.
+    dates: np.ndarray
+        ``datetime64[D]`` trading days (view into the memory map).
+    ohlcv: np.ndarray
+        Array of shape (dates, 5) with the columns of ``COLUMNS`` (view into the memory map).
+    version: str
+        Stored version the views come from; it changes with every refresh that rewrote the history.
+    """
+    symbol: str
+    dates: np.ndarray
+    ohlcv: np.ndarray
+    version: str = ""
+
+    def column(self, name: str) -> np.ndarray:
+        """Return one OHLCV column as a strided view."""
+        return self.ohlcv[:, COLUMNS.index(name)]
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.column("Close")
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the range as a DataFrame indexed by ``Date``, like ``yf.Ticker.history``."""
+        index = pd.DatetimeIndex(self.dates.astype("datetime64[ns]"), name="Date")
+        return pd.DataFrame(self.ohlcv, index=index, columns=list(COLUMNS), copy=False)
+
+
+class PriceHistoryStore:
+    """
+    Process-wide access point to the on-disk price histories.
+
+    Attributes:
+        root: Directory holding one sub-directory per symbol
+        refresh_minutes: Minimum delay before the tail of a history is requested again
+    """
+
+    def __init__(self, cache_dir: str, refresh_minutes: int = 15):
+        self.root = Path(cache_dir) / "prices"
+        self.refresh_minutes = refresh_minutes
+        # symbol -> (dates, ohlcv, meta, version, (inode, mtime) of the CURRENT pointer they were opened from)
+        self._open: Dict[str, Tuple[np.ndarray, np.ndarray, dict, str, tuple]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    # ------------------------------------------------------------------ disk layout
+    def _dir(self, symbol: str) -> Path:
+        return self.root / symbol
+
+    def _lock_for(self, symbol: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(symbol, threading.Lock())
+
+    @contextlib.contextmanager
+    def _file_lock(self, symbol: str):
+        """Serialize the refreshes of *symbol* across the processes sharing the store."""
+        if fcntl is None:
+            yield
+            return
+        path = self._dir(symbol)
+        path.mkdir(parents=True, exist_ok=True)
+        with open(path / ".lock", "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _read(self, symbol: str) -> Optional[Tuple[np.ndarray, np.ndarray, dict, str]]:
+        path = self._dir(symbol)
+        try:
+            pointer = os.stat(path / "CURRENT")
+        except FileNotFoundError:
+            self._open.pop(symbol, None)
+            return None
+        signature = (pointer.st_ino, pointer.st_mtime_ns)
+        cached = self._open.get(symbol)
+        if cached is not None and cached[4] == signature:
+            return cached[:4]
+        try:
+            version = path / (path / "CURRENT").read_text().strip()
+            dates = np.load(version / "dates.npy", mmap_mode="r").view("datetime64[D]")
+            ohlcv = np.load(version / "ohlcv.npy", mmap_mode="r")
+            meta = json.loads((version / "meta.json").read_text())
+        except (OSError, ValueError) as e:
+            logging.error(f"Unreadable price history for {symbol}, refetching: {e}")
+            return None
+        self._open[symbol] = (dates, ohlcv, meta, version.name, signature)
+        return dates, ohlcv, meta, version.name
+
+    def _write(self, symbol: str, dates: np.ndarray, ohlcv: np.ndarray, meta: dict) -> None:
+        path = self._dir(symbol)
+        path.mkdir(parents=True, exist_ok=True)
+        # Write a complete new version, then swap the pointer: readers never mix files of two versions
+        version = Path(tempfile.mkdtemp(prefix="v", dir=path))
+        np.save(version / "dates.npy", np.ascontiguousarray(dates.astype("datetime64[D]").view("int64")))
+        np.save(version / "ohlcv.npy", np.ascontiguousarray(ohlcv))
+        (version / "meta.json").write_text(json.dumps(meta))
+        (path / "CURRENT.tmp").write_text(version.name)
+        os.replace(path / "CURRENT.tmp", path / "CURRENT")
+        self._open.pop(symbol, None)
+        # Maps of older versions stay valid after the unlink on POSIX; elsewhere they are removed on a later write
+        for old in path.glob("v*"):
+            if old != version:
+                shutil.rmtree(old, ignore_errors=True)
+
+    # ------------------------------------------------------------------ downloads
+    @staticmethod
+    def _download(symbol: str, start: np.datetime64,
+                  end: Optional[np.datetime64] = None) -> Tuple[np.ndarray, np.ndarray, bool]:
+        """Return ``(dates, ohlcv, corporate_action)`` for ``[start, end)``."""
+        kwargs = {"start": str(start)}
+        if end is not None:
+            kwargs["end"] = str(end)
+        # yfinance is loaded with the first download, not when the chart tab or the screener is drawn
+        import yfinance as yf
+
+        with tracer.span("yfinance.history", CLIENT, ticker=symbol, **kwargs):
+            history = yf.Ticker(symbol).history(interval="1d", auto_adjust=True, **kwargs)
+        if history.empty:
+            return np.empty(0, dtype="datetime64[D]"), np.empty((0, len(COLUMNS))), False
+        corporate_action = any(
+            col in history and bool((history[col].fillna(0) != 0).any()) for col in ("Dividends", "Stock Splits")
+        )
+        return (to_trading_days(history.index), history[list(COLUMNS)].to_numpy(dtype=float),
+                corporate_action)
+
+    @staticmethod
+    def merge(dates: np.ndarray, ohlcv: np.ndarray,
+              new_dates: np.ndarray, new_ohlcv: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Merge two histories, sorted by date; bars from the new history replace stored bars of the same day."""
+        all_dates = np.concatenate([dates, new_dates])
+        all_ohlcv = np.concatenate([ohlcv, new_ohlcv])
+        order = np.argsort(all_dates, kind="stable")
+        all_dates, all_ohlcv = all_dates[order], all_ohlcv[order]
+        # After a stable sort the newest copy of a duplicated day comes last
+        keep = np.ones(len(all_dates), dtype=bool)
+        keep[:-1] = all_dates[:-1] != all_dates[1:]
+        return all_dates[keep], all_ohlcv[keep]
+
+    # ------------------------------------------------------------------ public API
+    def load(self, symbol: str, start: Optional[np.datetime64 | str] = None,
+             end: Optional[np.datetime64 | str] = None, period: str = "5y") -> PriceHistory:
+        """
+        Return the daily history of *symbol* for ``[start, end)``, downloading only what is missing.
+
+        Args:
+            symbol: Ticker symbol
+            start: First date to include (defaults to the beginning of *period*)
+            end: Exclusive end date (defaults to "up to today")
+            period: yfinance-style period used when *start* is omitted
+
+        Returns:
+            PriceHistory whose arrays are views into the memory-mapped store
+        """
+        symbol = symbol.upper()
+        # A period-based start moves forward every day; tolerate a week before asking for older bars again
+        head_slack = np.timedelta64(0, "D") if start is not None else np.timedelta64(7, "D")
+        start = np.datetime64(start, "D") if start is not None else period_start(period)
+        end = np.datetime64(end, "D") if end is not None else None
+
+        with self._lock_for(symbol), self._file_lock(symbol):
+            self._ensure(symbol, start, end, head_slack)
+            stored = self._read(symbol)
+        if stored is None:
+            return PriceHistory(symbol, np.empty(0, dtype="datetime64[D]"), np.empty((0, len(COLUMNS))))
+        dates, ohlcv, _, version = stored
+
+        lo = np.searchsorted(dates, start, side="left")
+        hi = np.searchsorted(dates, end, side="left") if end is not None else len(dates)
+        return PriceHistory(symbol, dates[lo:hi], ohlcv[lo:hi], version)
+
+    def _ensure(self, symbol: str, start: np.datetime64, end: Optional[np.datetime64],
+                head_slack: np.timedelta64) -> None:
+        stored = self._read(symbol)
+        now = time.time()
+
+        if stored is None:
+            logging.info(f"--- 📡 Fetching price history for {symbol} from {start} ---")
+            dates, ohlcv, _ = self._download(symbol, start, end)
+            if len(dates) == 0:
+                # Unknown symbol or a failed download: do not record the range as covered, retry on the next load
+                logging.warning(f"No price history returned for {symbol}")
+                return
+            self._write(symbol, dates, ohlcv, {"covered_start": str(start), "refreshed_at": now})
+            return
+
+        dates, ohlcv, meta, _ = stored
+        covered_start = np.datetime64(meta["covered_start"], "D")
+        new_dates, new_ohlcv = dates, ohlcv
+        changed = False
+
+        # Older history than ever requested before
+        if start + head_slack < covered_start:
+            head_dates, head_ohlcv, _ = self._download(symbol, start, covered_start)
+            new_dates, new_ohlcv = self.merge(head_dates, head_ohlcv, new_dates, new_ohlcv)
+            meta = {**meta, "covered_start": str(start)}
+            changed = True
+
+        # Newer bars, at most once per refresh interval
+        wants_tail = len(dates) == 0 or end is None or end > dates[-1]
+        if wants_tail and now - meta["refreshed_at"] >= self.refresh_minutes * 60:
+            # Overlap two stored bars: the last one may be a partial intraday bar, the one before it is final
+            overlap_from = dates[-2] if len(dates) > 1 else (dates[-1] if len(dates) else covered_start)
+            tail_dates, tail_ohlcv, corporate_action = self._download(symbol, overlap_from)
+            refreshed = True
+            if corporate_action or self._adjusted(dates, ohlcv, tail_dates, tail_ohlcv):
+                logging.info(f"Adjustment detected for {symbol}, reloading full history")
+                full_dates, full_ohlcv, _ = self._download(symbol, np.datetime64(meta["covered_start"], "D"))
+                if self._covers(full_dates, new_dates):
+                    new_dates, new_ohlcv = full_dates, full_ohlcv
+                else:
+                    # Throttled or failed reload: keep the stored version and retry on the next load
+                    logging.warning(f"Full history reload of {symbol} returned {len(full_dates)} bars, "
+                                    f"short of the {len(new_dates)} stored; keeping the stored history")
+                    refreshed = False
+            else:
+                new_dates, new_ohlcv = self.merge(new_dates, new_ohlcv, tail_dates, tail_ohlcv)
+            if refreshed:
+                meta = {**meta, "refreshed_at": now}
+                changed = True
+                logging.info(f"Price history for {symbol} refreshed ({len(new_dates) - len(dates):+d} bars)")
+
+        if changed:
+            self._write(symbol, new_dates, new_ohlcv, meta)
+
+    @staticmethod
+    def _covers(reloaded: np.ndarray, stored: np.ndarray) -> bool:
+        """Return True if a reloaded history spans at least the stored date range."""
+        if len(reloaded) == 0:
+            return False
+        return len(stored) == 0 or (reloaded[0] <= stored[0] and reloaded[-1] >= stored[-1])
+
+    @staticmethod
+    def _adjusted(dates: np.ndarray, ohlcv: np.ndarray, tail_dates: np.ndarray, tail_ohlcv: np.ndarray) -> bool:
+        """Return True if a completed stored bar no longer matches the freshly downloaded one."""
+        if len(dates) < 2 or len(tail_dates) == 0 or tail_dates[0] != dates[-2]:
+            return False
+        stored_close = ohlcv[-2, COLUMNS.index("Close")]
+        fresh_close = tail_ohlcv[0, COLUMNS.index("Close")]
+        return abs(fresh_close - stored_close) > ADJUSTMENT_TOLERANCE * max(abs(stored_close), 1.0)
+
+
+# Global price store shared by the risk tools and the technical analysis tab
+price_store = PriceHistoryStore(
+    cache_dir=os.path.abspath(app_config.market_data_cache_dir),
+    refresh_minutes=app_config.cache_duration_minutes,
+)
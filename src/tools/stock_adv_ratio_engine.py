@@ -0,0 +1,173 @@
+"""Deterministic fundamental ratio engine.
+
+Works directly on the statement frames returned by yfinance (``income_stmt``, ``balance_sheet`` and
+``cash_flow``: one row per line item, one column per fiscal period, newest first). Every ratio is computed for
+all periods at once with column-wise arithmetic, and growth is derived from the same columns, so the agents
+receive finished numbers instead of asking the LLM to do the arithmetic on raw statement text.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# yfinance line items, with the alternative labels used by some filers
+INCOME_ITEMS = {
+    "revenue": ("Total Revenue", "Operating Revenue"),
+    "gross_profit": ("Gross Profit",),
+    "operating_income": ("Operating Income",),
+    "ebit": ("EBIT",),
+    "ebitda": ("EBITDA", "Normalized EBITDA"),
+    "net_income": ("Net Income", "Net Income Common Stockholders"),
+    "interest_expense": ("Interest Expense", "Interest Expense Non Operating"),
+    "eps": ("Diluted EPS", "Basic EPS"),
+}
+BALANCE_ITEMS = {
+    "total_assets": ("Total Assets",),
+    "equity": ("Stockholders Equity", "Common Stock Equity"),
+    "current_assets": ("Current Assets",),
+    "current_liabilities": ("Current Liabilities",),
+    "inventory": ("Inventory",),
+    "total_debt": ("Total Debt",),
+}
+CASH_FLOW_ITEMS = {
+    "operating_cash_flow": ("Operating Cash Flow",),
+    "capital_expenditure": ("Capital Expenditure",),
+    "free_cash_flow": ("Free Cash Flow",),
+}
+GROWTH_ITEMS = ("revenue", "net_income", "eps", "free_cash_flow")
+
+
+@dataclass
+class FundamentalRatios:
+    """
+    Ratios and growth rates for every fiscal period of a company.
+
+    Attributes
+    ----------
+    ratios: pd.DataFrame
+        One row per ratio, one column per fiscal period (newest first).
+    growth: pd.DataFrame
+        Year-over-year growth of ``GROWTH_ITEMS``; the oldest period has no growth figure.
+    cagr: dict[str, float]
+        Compound annual growth of ``GROWTH_ITEMS`` between the oldest and the newest period.
+    """
+    ratios: pd.DataFrame
+    growth: pd.DataFrame
+    cagr: Dict[str, float]
+
+    @property
+    def latest_period(self) -> Optional[str]:
+        """Label of the most recent fiscal period, None without statements."""
+        return _label(self.ratios.columns[0]) if len(self.ratios.columns) else None
+
+    def latest(self) -> Dict[str, float]:
+        """
+        Return the ratios of the most recent period, NaN where that period does not report them.
+
+        Older periods are never mixed in: every value belongs to ``latest_period``.
+        """
+        if self.ratios.empty:
+            return {}
+        return {name: float(value) for name, value in self.ratios.iloc[:, 0].items()}
+
+    def to_dict(self, digits: int = 4) -> Dict[str, Any]:
+        """Compact, JSON-friendly view for the agents: latest ratios and their period, growth per period and CAGR."""
+
+        def clean(value: float) -> Optional[float]:
+            return None if value is None or not np.isfinite(value) else round(float(value), digits)
+
+        return {
+            "latest_period": self.latest_period,
+            "latest": {name: clean(v) for name, v in self.latest().items()},
+            "growth_yoy": {name: {_label(period): clean(v) for period, v in row.items()}
+                           for name, row in self.growth.iterrows()},
+            "cagr": {name: clean(v) for name, v in self.cagr.items()},
+            "periods": [_label(p) for p in self.ratios.columns],
+        }
+
+
+def _label(period: Any) -> str:
+    return str(period.date()) if hasattr(period, "date") else str(period)
+
+
+def _items(frame: Optional[pd.DataFrame], items: Dict[str, tuple], periods: pd.Index) -> pd.DataFrame:
+    """Pick the first available label of every item and align it on *periods* (missing -> NaN)."""
+    rows = {}
+    for name, labels in items.items():
+        row = None
+        if frame is not None and not frame.empty:
+            for label in labels:
+                if label in frame.index:
+                    row = pd.to_numeric(frame.loc[label], errors="coerce").reindex(periods)
+                    break
+        rows[name] = row if row is not None else pd.Series(np.nan, index=periods)
+    return pd.DataFrame(rows).T.astype(float)
+
+
+def _divide(numerator: pd.Series, denominator: pd.Series) -> pd.Series:
+    """Element-wise ratio with zero or missing denominators mapped to NaN."""
+    return (numerator / denominator.where(denominator != 0)).astype(float)
+
+
+def compute_fundamental_ratios(income_statement: Optional[pd.DataFrame],
+                               balance_sheet: Optional[pd.DataFrame],
+                               cash_flow: Optional[pd.DataFrame] = None) -> FundamentalRatios:
+    """
+    Compute profitability, return, liquidity, leverage and cash-flow ratios plus growth for every period.
+
+    Args:
+        income_statement: yfinance ``income_stmt`` (or ``financials``) frame
+        balance_sheet: yfinance ``balance_sheet`` frame
+        cash_flow: yfinance ``cash_flow`` frame; free cash flow is derived from it when the line is missing
+
+    Returns:
+        FundamentalRatios with periods ordered newest first
+    """
+    frames = [f for f in (income_statement, balance_sheet, cash_flow) if f is not None and not f.empty]
+    if not frames:
+        empty = pd.DataFrame()
+        return FundamentalRatios(empty, empty, {})
+    periods = pd.Index(sorted(set().union(*(f.columns for f in frames)), reverse=True))
+
+    inc = _items(income_statement, INCOME_ITEMS, periods)
+    bal = _items(balance_sheet, BALANCE_ITEMS, periods)
+    cf = _items(cash_flow, CASH_FLOW_ITEMS, periods)
+
+    free_cash_flow = cf.loc["free_cash_flow"].fillna(cf.loc["operating_cash_flow"] + cf.loc["capital_expenditure"])
+    revenue = inc.loc["revenue"]
+    ratios = pd.DataFrame({
+        "gross_margin": _divide(inc.loc["gross_profit"], revenue),
+        "operating_margin": _divide(inc.loc["operating_income"], revenue),
+        "ebitda_margin": _divide(inc.loc["ebitda"], revenue),
+        "net_margin": _divide(inc.loc["net_income"], revenue),
+        "roe": _divide(inc.loc["net_income"], bal.loc["equity"]),
+        "roa": _divide(inc.loc["net_income"], bal.loc["total_assets"]),
+        "asset_turnover": _divide(revenue, bal.loc["total_assets"]),
+        "current_ratio": _divide(bal.loc["current_assets"], bal.loc["current_liabilities"]),
+        "quick_ratio": _divide(bal.loc["current_assets"] - bal.loc["inventory"].fillna(0.0),
+                               bal.loc["current_liabilities"]),
+        "debt_to_equity": _divide(bal.loc["total_debt"], bal.loc["equity"]),
+        "interest_coverage": _divide(inc.loc["ebit"], inc.loc["interest_expense"].abs()),
+        "free_cash_flow": free_cash_flow,
+        "fcf_margin": _divide(free_cash_flow, revenue),
+        "fcf_conversion": _divide(free_cash_flow, inc.loc["net_income"]),
+    }).T
+
+    base = pd.concat([inc.loc[["revenue", "net_income", "eps"]], free_cash_flow.rename("free_cash_flow").to_frame().T])
+    values = base.loc[list(GROWTH_ITEMS)].to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Columns are newest first: each period is compared with the next (older) column
+        older = values[:, 1:]
+        yoy = np.where(older > 0, values[:, :-1] / older - 1.0, np.nan)
+    growth = pd.DataFrame(yoy, index=list(GROWTH_ITEMS), columns=periods[:-1])
+
+    cagr = {}
+    for name, row in base.loc[list(GROWTH_ITEMS)].iterrows():
+        valid = row.dropna()
+        cagr[name] = float("nan")
+        if len(valid) >= 2 and valid.iloc[-1] > 0 and valid.iloc[0] > 0:
+            years = (pd.Timestamp(valid.index[0]) - pd.Timestamp(valid.index[-1])).days / 365.25
+            if years > 0:
+                cagr[name] = float((valid.iloc[0] / valid.iloc[-1]) ** (1.0 / years) - 1.0)
+    return FundamentalRatios(ratios, growth, cagr)
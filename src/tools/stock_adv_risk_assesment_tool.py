@@ -1,7 +1,8 @@
 import asyncio
 
-import yfinance as yf
 import numpy as np
+import pandas as pd
+import yfinance as yf
 from datetime import datetime
 from typing import Dict, Any
 from pydantic import BaseModel, Field
@@ -10,9 +11,24 @@ from beeai_framework.context import RunContext
 from beeai_framework.emitter import Emitter
 from beeai_framework.tools import JSONToolOutput
 
+from tools.stock_adv_benchmark_store import benchmark_store
+from tools.stock_adv_price_store import price_store
+from tools.stock_adv_ratio_engine import compute_fundamental_ratios
+from tools.stock_adv_risk_engine import compute_risk_metrics
+from tools.stock_adv_risk_simulation import estimate_var
+from tools.stock_adv_rolling_risk import RollingRiskEngine
+from utils.log_config import payload
+from utils.tracing import CLIENT, traced, tracer
+
 import logging
 
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+# Fixed seed so that repeated assessments of the same history report the same simulated figures
+SIMULATION_SEED = 42
+SIMULATION_PATHS = 20_000
+
+
+def _rounded(value: float, digits: int = 2) -> float | str:
+    return "N/A" if np.isnan(value) else round(value, digits)
 
 
 class StockRiskAnalysisToolInput(BaseModel):
@@ -45,6 +61,7 @@ class StockRiskAnalysisTool(Tool[StockRiskAnalysisToolInput, ToolRunOptions, JSO
         super().__init__(options)
         self.financials = None
         self.balance_sheet = None
+        self.cash_flow = None
         self.info = None
         self.benchmark_returns = None
         self.benchmark_data = None
@@ -71,23 +88,33 @@ class StockRiskAnalysisTool(Tool[StockRiskAnalysisToolInput, ToolRunOptions, JSO
         self.ticker = yf.Ticker(self.ticker_symbol)
 
         # 1. Fetch Historical Data (Eager Loading)
-        print(f"--- 📡 Fetching Data for {self.ticker_symbol} & {benchmark_ticker} ---")
-        self.hist_data = self.ticker.history(period="5y", interval="1d")
-
-        # Fetch Benchmark for Beta Calculation
-        self.benchmark_data = yf.Ticker(benchmark_ticker).history(period="5y", interval="1d")
-
-        # Align dataframes by date to ensure accurate correlation/beta
-        self.hist_data, self.benchmark_data = self.hist_data.align(self.benchmark_data, join='inner', axis=0)
-
-        # Pre-calculate returns
-        self.returns = self.hist_data['Close'].pct_change().dropna()
-        self.benchmark_returns = self.benchmark_data['Close'].pct_change().dropna()
+        logging.info("Fetching data for %s & %s", self.ticker_symbol, benchmark_ticker)
+        history = price_store.load(self.ticker_symbol, period="5y")
+        self.hist_data = history.to_frame()
+
+        # Benchmark for Beta Calculation comes from the shared, incrementally refreshed store
+        self.benchmark_data = benchmark_store.get(benchmark_ticker)
+
+        # Keep only the dates on which both traded to ensure accurate correlation/beta
+        stock_dates = history.dates
+        common = self.benchmark_data.common_dates(stock_dates)
+        self.hist_data = self.hist_data[common]
+
+        # Pre-calculate returns (benchmark returns are precomputed by the store) on the same dates: a missing
+        # close drops the returns around it from both series, so beta and correlation compare the same days
+        paired = pd.DataFrame({
+            "stock": self.hist_data['Close'].pct_change(fill_method=None),
+            "benchmark": np.concatenate([[np.nan], self.benchmark_data.aligned_returns(stock_dates[common])]),
+        }, index=self.hist_data.index).dropna()
+        self.returns = paired["stock"]
+        self.benchmark_returns = paired["benchmark"]
 
         # 2. Fetch Fundamental Data
-        self.info = self.ticker.info
-        self.balance_sheet = self.ticker.balance_sheet
-        self.financials = self.ticker.financials
+        with tracer.span("yfinance.fundamentals", CLIENT, ticker=self.ticker_symbol):
+            self.info = self.ticker.info
+            self.balance_sheet = self.ticker.balance_sheet
+            self.financials = self.ticker.financials
+            self.cash_flow = self.ticker.cash_flow
 
     logging.info("****************************************** initialize_risk_data END********************************")
 
@@ -115,68 +142,82 @@ class StockRiskAnalysisTool(Tool[StockRiskAnalysisToolInput, ToolRunOptions, JSO
         if self.returns.empty:
             return {"error": "Insufficient historical data"}
 
-        # Annualized Volatility
-        volatility = self.returns.std() * np.sqrt(252)
-
-        # Beta Calculation (Covariance / Variance)
-        covariance = np.cov(self.returns, self.benchmark_returns)[0][1]
-        market_variance = np.var(self.benchmark_returns)
-        beta = covariance / market_variance
-
-        # Maximum Drawdown
-        cumulative = (1 + self.returns).cumprod()
-        peak = cumulative.cummax()
-        drawdown = (cumulative - peak) / peak
-        max_drawdown = drawdown.min()
-
-        # Value at Risk (VaR) - Historical Method (95% Confidence)
+        # Single-column run of the vectorized engine shared with watchlist analysis. When the stock traded on
+        # every benchmark day of the window, its returns are paired with the whole benchmark series, whose
+        # variance the benchmark store already computed
+        full_window = len(self.benchmark_returns) == len(self.benchmark_data.returns)
+        metrics = compute_risk_metrics(
+            self.returns.to_numpy()[:, None],
+            self.benchmark_returns.to_numpy(),
+            self.risk_free_rate,
+            tickers=[self.ticker_symbol],
+            benchmark_variance=self.benchmark_data.variance if full_window else None,
+        ).row(0)
+        volatility = metrics["volatility"]
+        beta = metrics["beta"]
+        max_drawdown = metrics["max_drawdown"]
         # "We are 95% confident daily loss won't exceed this %"
-        var_95 = np.percentile(self.returns, 5)
-
-        # Sharpe Ratio
-        excess_returns = self.returns.mean() * 252 - self.risk_free_rate
-        sharpe = excess_returns / volatility if volatility != 0 else 0
+        var_95 = metrics["value_at_risk_95"]
+        sharpe = metrics["sharpe_ratio"]
+
+        # Expected Shortfall (CVaR) and a 10-day VaR from bootstrapped paths; both need two returns at least,
+        # which a newly listed ticker or a short overlap with the benchmark does not have
+        tail = dict.fromkeys(("expected_shortfall_95", "value_at_risk_95_10d", "expected_shortfall_95_10d"), "N/A")
+        if len(self.returns) >= 2:
+            returns = self.returns.to_numpy()
+            daily_tail = estimate_var(returns, "historical", confidence_levels=(0.95,), horizons=(1,))[0]
+            ten_day_tail = estimate_var(returns, "bootstrap", confidence_levels=(0.95,), horizons=(10,),
+                                        n_paths=SIMULATION_PATHS, seed=SIMULATION_SEED)[0]
+            tail = {"expected_shortfall_95": _rounded(daily_tail.expected_shortfall, 4),
+                    "value_at_risk_95_10d": _rounded(ten_day_tail.value_at_risk, 4),
+                    "expected_shortfall_95_10d": _rounded(ten_day_tail.expected_shortfall, 4)}
         logging.info(f"**********************************************analyze_market_risk END***********************")
         return {
-            "volatility_annualized": round(volatility, 4),
-            "beta": round(beta, 3),
-            "max_drawdown": round(max_drawdown, 4),
-            "sharpe_ratio": round(sharpe, 2),
-            "value_at_risk_95": round(var_95, 4),
+            "volatility_annualized": _rounded(volatility, 4),
+            "beta": _rounded(beta, 3),
+            "max_drawdown": _rounded(max_drawdown, 4),
+            "sharpe_ratio": _rounded(sharpe, 2),
+            "value_at_risk_95": _rounded(var_95, 4),
+            **tail,
             "risk_interpretation": self._interpret_market_risk(beta, volatility)
         }
 
+    async def analyze_rolling_risk(self) -> Dict[str, Any]:
+        """Summarizes 30/90/252-day rolling volatility, Beta, Sharpe ratio and drawdown."""
+        logging.info(f"**********************************************analyze_rolling_risk START***********************")
+        if self.returns.empty:
+            return {"error": "Insufficient historical data"}
+        try:
+            engine = RollingRiskEngine(risk_free_rate=self.risk_free_rate)
+            series = engine.fit(self.returns.index.to_numpy(dtype="datetime64[D]"),
+                                self.returns.to_numpy(),
+                                self.benchmark_returns.to_numpy())
+        except ValueError as e:
+            return {"error": f"Rolling risk calculation failed: {str(e)}"}
+        logging.info(f"**********************************************analyze_rolling_risk END***********************")
+        return series.summary()
+
     async def analyze_fundamental_risk(self) -> Dict[str, Any]:
         """Analyzes Solvency and Liquidity risks from Balance Sheet/Income Stmt."""
         logging.info(f"*************************************analyze_fundamental_risk START***********************")
         try:
-            # Get most recent reporting period
-            bs = self.balance_sheet.iloc[:, 0] if not self.balance_sheet.empty else None
-            is_stmt = self.financials.iloc[:, 0] if not self.financials.empty else None
-
-            if bs is None or is_stmt is None:
+            if self.balance_sheet.empty or self.financials.empty:
                 return {"error": "Missing financial statements"}
 
-            # Solvency: Debt to Equity
-            total_debt = bs.get('Total Debt', 0)
-            total_equity = bs.get('Stockholders Equity', 1)  # Avoid div/0
-            debt_to_equity = total_debt / total_equity
-
-            # Liquidity: Current Ratio (Assets / Liabilities)
-            curr_assets = bs.get('Current Assets', 0)
-            curr_liab = bs.get('Current Liabilities', 1)
-            current_ratio = curr_assets / curr_liab
+            # Most recent reporting period of the ratios computed by the shared ratio engine
+            ratios = compute_fundamental_ratios(self.financials, self.balance_sheet, self.cash_flow).latest()
+            debt_to_equity = ratios["debt_to_equity"]
+            interest_coverage = ratios["interest_coverage"]
+            if np.isnan(interest_coverage):
+                interest_coverage = 999.0  # 999 implies safe/no interest
 
-            # Coverage: Interest Coverage (EBIT / Interest Expense)
-            ebit = is_stmt.get('EBIT', 0)
-            interest = abs(is_stmt.get('Interest Expense', 0))
-            interest_coverage = ebit / interest if interest > 0 else 999.0  # 999 implies safe/no interest
             logging.info(
                 f"**********************************************analyze_fundamental_risk END***********************")
             return {
-                "debt_to_equity": round(debt_to_equity, 2),
-                "current_ratio": round(current_ratio, 2),
-                "interest_coverage": round(interest_coverage, 2),
+                "debt_to_equity": _rounded(debt_to_equity),
+                "current_ratio": _rounded(ratios["current_ratio"]),
+                "quick_ratio": _rounded(ratios["quick_ratio"]),
+                "interest_coverage": _rounded(interest_coverage),
                 "solvency_check": "High Risk" if debt_to_equity > 2.0 else "Stable"
             }
         except Exception as e:
@@ -220,10 +261,12 @@ class StockRiskAnalysisTool(Tool[StockRiskAnalysisToolInput, ToolRunOptions, JSO
             "ticker": self.ticker_symbol,
             "timestamp": datetime.now().isoformat(),
             "market_risk": await self.analyze_market_risk(),
+            "rolling_risk": await self.analyze_rolling_risk(),
             "fundamental_risk": await self.analyze_fundamental_risk(),
             "sentiment_risk": await self.analyze_sentiment_alternative_risk()
         }
 
+    @traced()
     async def _run(
             self,
             input: StockRiskAnalysisToolInput,
@@ -233,7 +276,7 @@ class StockRiskAnalysisTool(Tool[StockRiskAnalysisToolInput, ToolRunOptions, JSO
         StockRiskAnalysisTool.initialize_risk_data(self, input)
 
         output = await StockRiskAnalysisTool.generate_full_report(self)
-        print(output)
+        logging.debug("StockRiskAnalysisTool output: %s", payload(output))
         if output:
             return JSONToolOutput(output)
 
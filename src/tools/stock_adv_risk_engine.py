@@ -0,0 +1,207 @@
+"""Vectorized market-risk engine working on a dates x tickers returns matrix.
+
+Every metric reported by ``StockRiskAnalysisTool.analyze_market_risk`` (volatility, beta, max drawdown,
+historical VaR and Sharpe ratio) is computed here for all columns of the matrix in one NumPy pass, so a
+watchlist of hundreds of symbols costs about the same number of Python operations as a single ticker.
+Missing observations (NaN) from mismatched histories are excluded per column, and beta only uses the
+dates on which both the ticker and the benchmark traded.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+import logging
+
+from utils.tracing import CLIENT, tracer
+
+TRADING_DAYS = 252
+
+
+@dataclass
+class RiskMetricsTable:
+    """
+    Column-oriented risk metrics, one entry per ticker.
+
+    Attributes
+    ----------
+    tickers: list[str]
+        Column labels of the returns matrix.
+    volatility, beta, max_drawdown, sharpe_ratio, value_at_risk_95: np.ndarray
+        Metric arrays aligned with ``tickers``; NaN when a column has fewer than two observations.
+    observations: np.ndarray
+        Number of non-missing daily returns per ticker.
+    """
+    tickers: List[str]
+    volatility: np.ndarray
+    beta: np.ndarray
+    max_drawdown: np.ndarray
+    sharpe_ratio: np.ndarray
+    value_at_risk_95: np.ndarray
+    observations: np.ndarray
+
+    METRICS = ("volatility", "beta", "max_drawdown", "sharpe_ratio", "value_at_risk_95", "observations")
+
+    def row(self, ticker: str | int) -> Dict[str, Any]:
+        """Return the metrics of one ticker (by label or column position) as plain floats."""
+        idx = ticker if isinstance(ticker, int) else self.tickers.index(ticker)
+        return {name: getattr(self, name)[idx].item() for name in self.METRICS}
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the table as a DataFrame indexed by ticker."""
+        return pd.DataFrame({name: getattr(self, name) for name in self.METRICS}, index=self.tickers)
+
+
+def returns_from_prices(prices: np.ndarray) -> np.ndarray:
+    """
+    Convert a dates x tickers price matrix into simple daily returns.
+
+    A return is NaN whenever either of its two prices is missing, so gaps never leak into neighbouring days.
+    """
+    prices = np.asarray(prices, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return prices[1:] / prices[:-1] - 1.0
+
+
+def compute_risk_metrics(returns: np.ndarray,
+                         benchmark_returns: np.ndarray,
+                         risk_free_rate: float = 0.045,
+                         tickers: Optional[Sequence[str]] = None,
+                         benchmark_variance: Optional[float] = None) -> RiskMetricsTable:
+    """
+    Compute volatility, beta, max drawdown, 95% historical VaR and Sharpe ratio for every column.
+
+    Args:
+        returns: Daily simple returns, shape (dates, tickers) or (dates,); NaN marks a missing observation
+        benchmark_returns: Daily benchmark returns aligned with the rows of ``returns``, shape (dates,)
+        risk_free_rate: Annualized risk-free rate (decimal)
+        tickers: Optional column labels (defaults to the column positions)
+        benchmark_variance: Precomputed sample variance of ``benchmark_returns`` (``BenchmarkSeries.variance``),
+            used for beta instead of recomputing it when every column has a return on every row
+
+    Returns:
+        RiskMetricsTable with one entry per column
+    """
+    r = np.asarray(returns, dtype=float)
+    if r.ndim == 1:
+        r = r[:, None]
+    b = np.asarray(benchmark_returns, dtype=float).reshape(-1)
+    if b.shape[0] != r.shape[0]:
+        raise ValueError(f"Benchmark has {b.shape[0]} rows but returns matrix has {r.shape[0]}")
+
+    labels = list(tickers) if tickers is not None else [str(i) for i in range(r.shape[1])]
+    valid = ~np.isnan(r)
+    n = valid.sum(axis=0)
+    r0 = np.where(valid, r, 0.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Annualized volatility (sample standard deviation)
+        mean = r0.sum(axis=0) / n
+        centered = np.where(valid, r - mean, 0.0)
+        std = np.sqrt((centered ** 2).sum(axis=0) / (n - 1))
+        volatility = std * np.sqrt(TRADING_DAYS)
+
+        # Beta on the dates where both the ticker and the benchmark have a return
+        pair = valid & ~np.isnan(b)[:, None]
+        n_pair = pair.sum(axis=0)
+        b_col = np.where(pair, b[:, None], 0.0)
+        r_pair = np.where(pair, r, 0.0)
+        b_mean = b_col.sum(axis=0) / n_pair
+        r_mean = r_pair.sum(axis=0) / n_pair
+        b_dev = np.where(pair, b[:, None] - b_mean, 0.0)
+        r_dev = np.where(pair, r - r_mean, 0.0)
+        covariance = (r_dev * b_dev).sum(axis=0) / (n_pair - 1)
+        if benchmark_variance is not None and (n_pair == len(b)).all():
+            market_variance = np.full(r.shape[1], benchmark_variance)
+        else:
+            market_variance = (b_dev ** 2).sum(axis=0) / (n_pair - 1)
+        beta = covariance / market_variance
+
+        # Maximum drawdown; missing days are flat so the wealth curve carries forward
+        cumulative = np.cumprod(1.0 + r0, axis=0)
+        peak = np.maximum.accumulate(cumulative, axis=0)
+        max_drawdown = ((cumulative - peak) / peak).min(axis=0)
+
+        # Value at Risk (VaR) - historical method, 95% confidence
+        var_95 = np.full(r.shape[1], np.nan)
+        has_data = n > 0
+        if has_data.any():
+            var_95[has_data] = np.nanpercentile(r[:, has_data], 5, axis=0)
+
+        # Sharpe ratio
+        excess_returns = mean * TRADING_DAYS - risk_free_rate
+        sharpe = np.where(volatility != 0, excess_returns / volatility, 0.0)
+
+    insufficient = n < 2
+    for arr in (volatility, beta, max_drawdown, sharpe, var_95):
+        arr[insufficient] = np.nan
+
+    return RiskMetricsTable(
+        tickers=labels,
+        volatility=volatility,
+        beta=beta,
+        max_drawdown=max_drawdown,
+        sharpe_ratio=sharpe,
+        value_at_risk_95=var_95,
+        observations=n,
+    )
+
+
+def ledoit_wolf_covariance(returns: np.ndarray) -> tuple[np.ndarray, float]:
+    """
+    Ledoit-Wolf shrinkage estimate of the covariance of a dates x tickers returns matrix.
+
+    The sample covariance is shrunk towards a scaled identity matrix with the intensity that minimizes the
+    expected Frobenius loss, which keeps the estimate well conditioned when there are few dates per ticker.
+
+    Args:
+        returns: Daily simple returns, shape (dates, tickers), without missing values
+
+    Returns:
+        (covariance matrix, shrinkage intensity in [0, 1])
+    """
+    x = np.asarray(returns, dtype=float)
+    t, n = x.shape
+    if t < 2:
+        raise ValueError("At least two observations are required to estimate a covariance matrix")
+    x = x - x.mean(axis=0)
+    sample = x.T @ x / t
+    mu = np.trace(sample) / n
+    target = mu * np.eye(n)
+
+    # delta: distance of the sample covariance to the target; beta: estimation error of the sample covariance
+    delta = ((sample - target) ** 2).sum() / n
+    x2 = x ** 2
+    beta = ((x2.T @ x2).sum() / t - (sample ** 2).sum()) / (n * t)
+    shrinkage = 0.0 if delta == 0 else float(min(beta, delta) / delta)
+    return (1.0 - shrinkage) * sample + shrinkage * target, shrinkage
+
+
+def analyze_watchlist_risk(symbols: Sequence[str],
+                           benchmark_ticker: str = "SPY",
+                           period: str = "5y",
+                           risk_free_rate: float = 0.045) -> pd.DataFrame:
+    """
+    Download closing prices for a watchlist and return its risk metrics table.
+
+    Args:
+        symbols: Ticker symbols to analyze
+        benchmark_ticker: Market benchmark used for beta
+        period: yfinance period string for the history window
+        risk_free_rate: Annualized risk-free rate (decimal)
+
+    Returns:
+        DataFrame indexed by ticker with one column per metric
+    """
+    tickers = [s.upper() for s in symbols]
+    logging.info(f"analyze_watchlist_risk START for {len(tickers)} symbols against {benchmark_ticker}")
+    with tracer.span("yfinance.download", CLIENT, tickers=",".join(tickers), period=period):
+        closes = yf.download(tickers + [benchmark_ticker], period=period, interval="1d",
+                             auto_adjust=True, progress=False)["Close"]
+    closes = closes.reindex(columns=tickers + [benchmark_ticker])
+    rets = returns_from_prices(closes.to_numpy())
+    table = compute_risk_metrics(rets[:, :-1], rets[:, -1], risk_free_rate, tickers)
+    logging.info("analyze_watchlist_risk END")
+    return table.to_frame()
@@ -0,0 +1,210 @@
+"""Value at Risk and Expected Shortfall estimators for the risk tool.
+
+Five estimators share one interface (``estimate_var``):
+
+* ``historical``      empirical quantile of overlapping h-day returns
+* ``parametric``      normal distribution fitted to daily returns, scaled to the horizon
+* ``cornish_fisher``  normal quantile corrected for the skewness and excess kurtosis of daily returns
+* ``bootstrap``       Monte Carlo paths resampled from the daily returns (i.i.d. bootstrap)
+* ``monte_carlo``     Monte Carlo paths drawn from the fitted normal distribution
+
+Sign convention follows ``analyze_market_risk``: VaR is the return quantile (a negative number for a loss)
+and Expected Shortfall is the mean return beyond it. Simulated estimates also carry a distribution-free
+confidence interval derived from the order statistics of the simulated sample.
+Paths are generated in batches of ``batch_size`` so memory stays bounded whatever the number of paths.
+"""
+from dataclasses import dataclass, asdict
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+METHODS = ("historical", "parametric", "cornish_fisher", "bootstrap", "monte_carlo")
+SIMULATED_METHODS = ("bootstrap", "monte_carlo")
+DEFAULT_BATCH_SIZE = 50_000
+_STANDARD_NORMAL = NormalDist()
+
+
+@dataclass
+class VarEstimate:
+    """
+    One VaR/ES figure.
+
+    Attributes
+    ----------
+    method: str
+        Estimator used (see ``METHODS``).
+    confidence: float
+        Confidence level, e.g. 0.95.
+    horizon_days: int
+        Holding period in trading days.
+    value_at_risk: float
+        Return quantile at ``1 - confidence``.
+    expected_shortfall: float
+        Mean return at or below ``value_at_risk`` (also called CVaR).
+    ci_low, ci_high: float | None
+        95% confidence interval of ``value_at_risk`` for simulated methods.
+    """
+    method: str
+    confidence: float
+    horizon_days: int
+    value_at_risk: float
+    expected_shortfall: float
+    ci_low: Optional[float] = None
+    ci_high: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _clean(returns: np.ndarray) -> np.ndarray:
+    r = np.asarray(returns, dtype=float).reshape(-1)
+    r = r[~np.isnan(r)]
+    if len(r) < 2:
+        raise ValueError("At least two daily returns are required")
+    return r
+
+
+def _tail_stats(sample: np.ndarray, confidence_levels: Sequence[float]) -> tuple[np.ndarray, np.ndarray]:
+    """Return (VaR, ES) of *sample* for every confidence level."""
+    var = np.quantile(sample, 1.0 - np.asarray(confidence_levels))
+    es = np.array([sample[sample <= v].mean() for v in var])
+    return var, es
+
+
+def _order_statistic_ci(sorted_sample: np.ndarray, confidence: float) -> tuple[float, float]:
+    """Distribution-free 95% interval for the ``1 - confidence`` quantile (normal approximation to the binomial)."""
+    n = len(sorted_sample)
+    p = 1.0 - confidence
+    half_width = 1.96 * np.sqrt(n * p * (1.0 - p))
+    lo = int(np.clip(np.floor(n * p - half_width), 0, n - 1))
+    hi = int(np.clip(np.ceil(n * p + half_width), 0, n - 1))
+    return float(sorted_sample[lo]), float(sorted_sample[hi])
+
+
+def horizon_returns(returns: np.ndarray, horizon: int) -> np.ndarray:
+    """
+    Return the overlapping compounded *horizon*-day returns of a daily return series.
+
+    Raises:
+        ValueError: When *horizon* is not positive or the series does not span more than *horizon* days
+    """
+    r = _clean(returns)
+    if horizon < 1:
+        raise ValueError(f"The horizon must be at least one day, got {horizon}")
+    if horizon >= len(r):
+        raise ValueError(f"A {horizon}-day horizon needs more than {horizon} daily returns, got {len(r)}")
+    if horizon == 1:
+        return r
+    log_cum = np.concatenate([[0.0], np.cumsum(np.log1p(r))])
+    return np.expm1(log_cum[horizon:] - log_cum[:-horizon])
+
+
+def simulate_horizon_returns(returns: np.ndarray,
+                             horizon: int,
+                             n_paths: int,
+                             rng: np.random.Generator,
+                             method: str = "bootstrap",
+                             batch_size: int = DEFAULT_BATCH_SIZE) -> np.ndarray:
+    """
+    Simulate *n_paths* compounded *horizon*-day returns.
+
+    Args:
+        returns: Historical daily returns used to resample from or to fit the normal distribution
+        horizon: Holding period in trading days
+        n_paths: Number of simulated paths
+        rng: Seeded NumPy generator (``np.random.default_rng(seed)``)
+        method: ``"bootstrap"`` or ``"monte_carlo"``
+        batch_size: Paths generated per batch; bounds the (batch_size x horizon) working memory
+
+    Returns:
+        Array of shape (n_paths,) with the terminal return of every path
+    """
+    r = _clean(returns)
+    log_r = np.log1p(r)
+    mu, sigma = log_r.mean(), log_r.std(ddof=1)
+    out = np.empty(n_paths)
+
+    for start in range(0, n_paths, batch_size):
+        size = min(batch_size, n_paths - start)
+        if method == "bootstrap":
+            draws = log_r[rng.integers(0, len(log_r), size=(size, horizon))]
+            out[start:start + size] = draws.sum(axis=1)
+        elif method == "monte_carlo":
+            # A sum of i.i.d. normal log returns is itself normal: draw the horizon total directly
+            out[start:start + size] = rng.normal(mu * horizon, sigma * np.sqrt(horizon), size)
+        else:
+            raise ValueError(f"Unknown simulation method: {method}")
+    return np.expm1(out)
+
+
+def _cornish_fisher_z(z: np.ndarray, skew: float, kurt: float) -> np.ndarray:
+    return (z
+            + (z ** 2 - 1) * skew / 6
+            + (z ** 3 - 3 * z) * kurt / 24
+            - (2 * z ** 3 - 5 * z) * skew ** 2 / 36)
+
+
+def estimate_var(returns: np.ndarray,
+                 method: str = "historical",
+                 confidence_levels: Sequence[float] = (0.95, 0.99),
+                 horizons: Sequence[int] = (1, 10),
+                 n_paths: int = 100_000,
+                 seed: Optional[int] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE) -> List[VarEstimate]:
+    """
+    Estimate VaR and Expected Shortfall for every (horizon, confidence level) pair.
+
+    Args:
+        returns: Daily simple returns (NaN values are ignored)
+        method: One of ``METHODS``
+        confidence_levels: Confidence levels, e.g. (0.95, 0.99)
+        horizons: Holding periods in trading days
+        n_paths: Paths per horizon for simulated methods
+        seed: Seed of the random generator, for reproducible simulations
+        batch_size: Paths generated per batch for simulated methods
+
+    Returns:
+        List of VarEstimate, ordered by horizon then confidence level
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown VaR method '{method}', expected one of {METHODS}")
+    r = _clean(returns)
+    levels = np.asarray(confidence_levels, dtype=float)
+    estimates: List[VarEstimate] = []
+    rng = np.random.default_rng(seed)
+
+    mean, std = r.mean(), r.std(ddof=1)
+    z = np.array([_STANDARD_NORMAL.inv_cdf(1.0 - c) for c in levels])
+
+    for horizon in horizons:
+        ci = [(None, None)] * len(levels)
+        if method == "historical":
+            var, es = _tail_stats(horizon_returns(r, horizon), levels)
+        elif method in SIMULATED_METHODS:
+            sample = np.sort(simulate_horizon_returns(r, horizon, n_paths, rng, method, batch_size))
+            var, es = _tail_stats(sample, levels)
+            ci = [_order_statistic_ci(sample, c) for c in levels]
+        else:
+            mu_h, sigma_h = mean * horizon, std * np.sqrt(horizon)
+            if method == "parametric":
+                var = mu_h + sigma_h * z
+                # E[X | X <= q] for a normal: mu - sigma * pdf(z) / (1 - c)
+                pdf = np.array([_STANDARD_NORMAL.pdf(v) for v in z])
+                es = mu_h - sigma_h * pdf / (1.0 - levels)
+            else:
+                centered = (r - mean) / std
+                skew = float((centered ** 3).mean())
+                kurt = float((centered ** 4).mean() - 3.0)
+                var = mu_h + sigma_h * _cornish_fisher_z(z, skew, kurt)
+                # ES as the average of the adjusted quantiles over the tail probabilities
+                es = np.empty(len(levels))
+                for i, c in enumerate(levels):
+                    tail = (np.arange(1, 201) - 0.5) / 200 * (1.0 - c)
+                    tail_z = np.array([_STANDARD_NORMAL.inv_cdf(p) for p in tail])
+                    es[i] = mu_h + sigma_h * _cornish_fisher_z(tail_z, skew, kurt).mean()
+
+        for i, c in enumerate(levels):
+            estimates.append(VarEstimate(method, float(c), int(horizon), float(var[i]), float(es[i]),
+                                         ci[i][0], ci[i][1]))
+    return estimates
@@ -0,0 +1,143 @@
+"""Rolling maximum/minimum kernels.
+
+Batch queries use a sparse table: level ``k`` holds the extreme of every run of ``2**k`` consecutive values, so
+the extreme of any window ``w`` is the combination of two overlapping runs from level ``floor(log2(w))``.
+Building the table once up to the largest window answers every window size (e.g. Ichimoku's 9, 26 and 52) with
+O(n log W) vectorized work, on 1-D arrays or on (dates, tickers) matrices.
+
+Streaming updates use monotonic deques, adding one value in O(1) amortized time, so live charts extend their
+indicators without recomputing the history.
+"""
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+Array = np.ndarray
+
+
+def _sparse_table(values: Array, max_window: int, op) -> List[Array]:
+    levels = [values]
+    span = 1
+    while span * 2 <= max_window and span * 2 <= len(values):
+        previous = levels[-1]
+        levels.append(op(previous[:-span], previous[span:]))
+        span *= 2
+    return levels
+
+
+def _query(levels: List[Array], window: int, n: int, op) -> Array:
+    out = np.full(levels[0].shape, np.nan)
+    if window > n:
+        return out
+    k = window.bit_length() - 1
+    level, span = levels[k], 1 << k
+    out[window - 1:] = op(level[:n - window + 1], level[window - span:n - span + 1])
+    return out
+
+
+def _rolling(values, windows: Sequence[int], op) -> Dict[int, Array]:
+    values = np.asarray(values, dtype=float)
+    levels = _sparse_table(values, max(windows), op)
+    return {w: _query(levels, w, len(values), op) for w in windows}
+
+
+def rolling_max(values, window: int) -> Array:
+    """Maximum of the *window* values ending at every position (NaN before the first full window)."""
+    return _rolling(values, (window,), np.maximum)[window]
+
+
+def rolling_min(values, window: int) -> Array:
+    """Minimum of the *window* values ending at every position (NaN before the first full window)."""
+    return _rolling(values, (window,), np.minimum)[window]
+
+
+def rolling_extrema(high, low, windows: Sequence[int]) -> Dict[int, Tuple[Array, Array]]:
+    """
+    Rolling maximum of *high* and rolling minimum of *low* for several windows from one sparse table each.
+
+    Args:
+        high: Values whose rolling maximum is returned, shape (dates,) or (dates, tickers)
+        low: Values whose rolling minimum is returned, same shape as *high*
+        windows: Window lengths
+
+    Returns:
+        ``{window: (rolling_max, rolling_min)}``; a window containing NaN yields NaN
+    """
+    highs = _rolling(high, windows, np.maximum)
+    lows = _rolling(low, windows, np.minimum)
+    return {w: (highs[w], lows[w]) for w in windows}
+
+
+class MonotonicWindow:
+    """
+    Extreme of the last ``window`` values pushed, maintained with a monotonic deque.
+
+    Attributes:
+        window: Number of most recent values covered
+        mode: ``"max"`` or ``"min"``
+    """
+
+    def __init__(self, window: int, mode: str = "max"):
+        if mode not in ("max", "min"):
+            raise ValueError(f"Unknown mode '{mode}', expected 'max' or 'min'")
+        self.window = window
+        self.mode = mode
+        self._count = 0
+        self._candidates: deque = deque()  # (position, value), values monotonic from the front
+
+    def _dominates(self, new: float, old: float) -> bool:
+        return new >= old if self.mode == "max" else new <= old
+
+    def push(self, value: float) -> float:
+        """Add a value and return the extreme of the current window (NaN until the window is full)."""
+        while self._candidates and self._dominates(value, self._candidates[-1][1]):
+            self._candidates.pop()
+        self._candidates.append((self._count, value))
+        self._count += 1
+        while self._candidates[0][0] <= self._count - 1 - self.window:
+            self._candidates.popleft()
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self._candidates[0][1] if self._count >= self.window else float("nan")
+
+
+class RollingExtrema:
+    """
+    Rolling high/low extremes for several windows with batch fitting and incremental appends.
+
+    ``fit`` answers the whole history from sparse tables and primes one pair of monotonic deques per window
+    with the last ``window`` bars; ``append`` then extends every window by one bar in O(1) amortized time.
+
+    Attributes:
+        windows: Window lengths
+    """
+
+    def __init__(self, windows: Sequence[int]):
+        self.windows = tuple(windows)
+        self._highs: Dict[int, MonotonicWindow] = {}
+        self._lows: Dict[int, MonotonicWindow] = {}
+        self._reset()
+
+    def _reset(self) -> None:
+        self._highs = {w: MonotonicWindow(w, "max") for w in self.windows}
+        self._lows = {w: MonotonicWindow(w, "min") for w in self.windows}
+
+    def fit(self, high, low: Optional[Array] = None) -> Dict[int, Tuple[Array, Array]]:
+        """Compute the extremes of a full 1-D history and prepare the streaming state."""
+        high = np.asarray(high, dtype=float)
+        low = high if low is None else np.asarray(low, dtype=float)
+        result = rolling_extrema(high, low, self.windows)
+        self._reset()
+        for w in self.windows:
+            for h, l in zip(high[-w:], low[-w:]):
+                self._highs[w].push(h)
+                self._lows[w].push(l)
+        return result
+
+    def append(self, high: float, low: Optional[float] = None) -> Dict[int, Tuple[float, float]]:
+        """Add one bar and return ``{window: (max, min)}`` for the windows ending at it."""
+        low = high if low is None else low
+        return {w: (self._highs[w].push(high), self._lows[w].push(low)) for w in self.windows}
@@ -0,0 +1,233 @@
+"""Rolling risk metrics (volatility, beta, Sharpe ratio, drawdown) over several window lengths.
+
+The history is processed with prefix sums, so each window costs O(n) instead of the O(n * w) of recomputing
+every window from scratch. After ``fit`` the engine keeps running sums for the last ``w`` bars of every window,
+so ``append`` adds a new bar in O(1) amortized time without touching the rest of the history.
+
+Results live in a compact array-backed ``RollingRiskSeries`` (one row per window, one column per date) with a
+``summary`` the risk agent can read.
+"""
+from collections import deque
+from typing import Any, Dict, Sequence
+
+import numpy as np
+
+from tools.stock_adv_risk_engine import TRADING_DAYS
+from tools.stock_adv_rolling_extrema import MonotonicWindow, rolling_max
+
+DEFAULT_WINDOWS = (30, 90, 252)
+METRICS = ("volatility", "beta", "sharpe_ratio", "drawdown")
+
+
+class RollingRiskSeries:
+    """
+    Growable (windows x dates) arrays of rolling metrics.
+
+    Attributes
+    ----------
+    windows: tuple[int, ...]
+        Window lengths, one row per window in every metric array.
+    dates: np.ndarray
+        ``datetime64[D]`` date of every column.
+    volatility, beta, sharpe_ratio, drawdown: np.ndarray
+        Arrays of shape (len(windows), len(dates)); NaN until a window is full.
+    """
+
+    def __init__(self, windows: Sequence[int], capacity: int = 256):
+        self.windows = tuple(windows)
+        self._size = 0
+        self._dates = np.empty(capacity, dtype="datetime64[D]")
+        self._data = {name: np.full((len(self.windows), capacity), np.nan) for name in METRICS}
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def dates(self) -> np.ndarray:
+        return self._dates[:self._size]
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        if name in METRICS:
+            return self._data[name][:, :self._size]
+        raise AttributeError(name)
+
+    def _reserve(self, extra: int) -> None:
+        needed = self._size + extra
+        capacity = len(self._dates)
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2)
+        self._dates = np.concatenate([self._dates, np.empty(new_capacity - capacity, dtype="datetime64[D]")])
+        for name, arr in self._data.items():
+            grown = np.full((len(self.windows), new_capacity), np.nan)
+            grown[:, :self._size] = arr[:, :self._size]
+            self._data[name] = grown
+
+    def extend(self, dates: np.ndarray, values: Dict[str, np.ndarray]) -> None:
+        """Append columns; *values* maps each metric name to a (windows, len(dates)) array."""
+        n = len(dates)
+        self._reserve(n)
+        self._dates[self._size:self._size + n] = dates
+        for name in METRICS:
+            self._data[name][:, self._size:self._size + n] = values[name]
+        self._size += n
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarize every window: latest value plus the min/max/median observed over the history.
+
+        Returns:
+            ``{"30d": {"volatility": {"latest": ..., "min": ..., "max": ..., "median": ...}, ...}, ...}``
+        """
+        result: Dict[str, Dict[str, Any]] = {}
+        for row, window in enumerate(self.windows):
+            per_metric = {}
+            for name in METRICS:
+                values = self._data[name][row, :self._size]
+                valid = values[~np.isnan(values)]
+                if len(valid) == 0:
+                    per_metric[name] = "N/A"
+                    continue
+                per_metric[name] = {
+                    "latest": round(float(valid[-1]), 4),
+                    "min": round(float(valid.min()), 4),
+                    "max": round(float(valid.max()), 4),
+                    "median": round(float(np.median(valid)), 4),
+                }
+            result[f"{window}d"] = per_metric
+        return result
+
+
+class _WindowState:
+    """Running sums over the last ``window`` bars, used by ``RollingRiskEngine.append``."""
+
+    def __init__(self, window: int, returns: np.ndarray, benchmark: np.ndarray, wealth: np.ndarray):
+        self.window = window
+        self.r = deque(returns[-window:].tolist(), maxlen=window)
+        self.b = deque(benchmark[-window:].tolist(), maxlen=window)
+        # Peak wealth over the window's w + 1 price points
+        self.peak = MonotonicWindow(window + 1, "max")
+        for w in wealth[-(window + 1):]:
+            self.peak.push(float(w))
+        self.resync()
+
+    def resync(self) -> None:
+        r, b = np.array(self.r), np.array(self.b)
+        self.s_r, self.s_rr, self.s_b = float(r.sum()), float((r * r).sum()), float(b.sum())
+        self.s_bb, self.s_rb = float((b * b).sum()), float((r * b).sum())
+        self.appended = 0
+
+    def push(self, r: float, b: float) -> None:
+        if len(self.r) == self.window:
+            old_r, old_b = self.r[0], self.b[0]
+            self.s_r -= old_r
+            self.s_rr -= old_r * old_r
+            self.s_b -= old_b
+            self.s_bb -= old_b * old_b
+            self.s_rb -= old_r * old_b
+        self.r.append(r)
+        self.b.append(b)
+        self.s_r += r
+        self.s_rr += r * r
+        self.s_b += b
+        self.s_bb += b * b
+        self.s_rb += r * b
+        # Bound the floating-point drift of the running sums: O(w) work every w appends
+        self.appended += 1
+        if self.appended >= self.window:
+            self.resync()
+
+
+class RollingRiskEngine:
+    """
+    Computes rolling risk metrics for one ticker against its benchmark and keeps them up to date.
+
+    Attributes:
+        windows: Window lengths in trading days
+        risk_free_rate: Annualized risk-free rate (decimal) used by the Sharpe ratio
+        series: The RollingRiskSeries built by ``fit`` and extended by ``append``
+    """
+
+    def __init__(self, windows: Sequence[int] = DEFAULT_WINDOWS, risk_free_rate: float = 0.045):
+        self.windows = tuple(windows)
+        self.risk_free_rate = risk_free_rate
+        self.series = RollingRiskSeries(self.windows)
+        self._states: list[_WindowState] = []
+        self._wealth = 1.0
+
+    def _metrics(self, n: np.ndarray | float, s_r, s_rr, s_b, s_bb, s_rb) -> Dict[str, Any]:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            var_r = (s_rr - s_r * s_r / n) / (n - 1)
+            var_b = (s_bb - s_b * s_b / n) / (n - 1)
+            cov = (s_rb - s_r * s_b / n) / (n - 1)
+            volatility = np.sqrt(np.maximum(var_r, 0.0)) * np.sqrt(TRADING_DAYS)
+            sharpe = (s_r / n * TRADING_DAYS - self.risk_free_rate) / volatility
+            return {"volatility": volatility, "beta": cov / var_b, "sharpe_ratio": sharpe}
+
+    def fit(self, dates: np.ndarray, returns: np.ndarray, benchmark_returns: np.ndarray) -> RollingRiskSeries:
+        """
+        Compute the rolling metrics over a full history in O(n) per window.
+
+        Args:
+            dates: ``datetime64[D]`` date of every return
+            returns: Daily simple returns of the ticker, without gaps
+            benchmark_returns: Benchmark returns aligned with *returns*
+
+        Returns:
+            The populated RollingRiskSeries (also available as ``self.series``)
+        """
+        r = np.asarray(returns, dtype=float)
+        b = np.asarray(benchmark_returns, dtype=float)
+        if r.shape != b.shape or np.isnan(r).any() or np.isnan(b).any():
+            raise ValueError("Returns and benchmark returns must be aligned and free of missing values")
+
+        # Prefix sums on demeaned data keep the window differences numerically stable
+        shift_r, shift_b = (r.mean(), b.mean()) if len(r) else (0.0, 0.0)
+        rc, bc = r - shift_r, b - shift_b
+
+        def window_sums(x: np.ndarray, w: int) -> np.ndarray:
+            prefix = np.concatenate([[0.0], np.cumsum(x)])
+            out = np.full(len(x), np.nan)
+            out[w - 1:] = prefix[w:] - prefix[:-w]
+            return out
+
+        wealth = np.concatenate([[1.0], np.cumprod(1.0 + r)])
+        values = {name: np.full((len(self.windows), len(r)), np.nan) for name in METRICS}
+        for row, w in enumerate(self.windows):
+            if len(r) < w:
+                continue
+            s_r, s_b = window_sums(rc, w), window_sums(bc, w)
+            metrics = self._metrics(w, s_r, window_sums(rc * rc, w), s_b, window_sums(bc * bc, w),
+                                    window_sums(rc * bc, w))
+            # Sharpe needs the raw (not demeaned) mean return
+            with np.errstate(divide="ignore", invalid="ignore"):
+                metrics["sharpe_ratio"] = ((s_r / w + shift_r) * TRADING_DAYS - self.risk_free_rate) \
+                    / metrics["volatility"]
+            for name, arr in metrics.items():
+                values[name][row] = arr
+            # Drawdown from the highest wealth over the window's w + 1 price points
+            values["drawdown"][row] = wealth[1:] / rolling_max(wealth, w + 1)[1:] - 1.0
+
+        self.series = RollingRiskSeries(self.windows, capacity=max(256, len(r)))
+        self.series.extend(np.asarray(dates, dtype="datetime64[D]"), values)
+        self._wealth = float(wealth[-1])
+        self._states = [_WindowState(w, r, b, wealth) for w in self.windows]
+        return self.series
+
+    def append(self, date: np.datetime64, ret: float, benchmark_ret: float) -> None:
+        """Add one new bar and the corresponding column of every rolling metric in O(1) amortized time."""
+        if not self._states:
+            self._states = [_WindowState(w, np.empty(0), np.empty(0), np.array([1.0])) for w in self.windows]
+        self._wealth *= 1.0 + ret
+
+        column = {name: np.full((len(self.windows), 1), np.nan) for name in METRICS}
+        for row, state in enumerate(self._states):
+            state.push(ret, benchmark_ret)
+            peak = state.peak.push(self._wealth)
+            if len(state.r) < state.window:
+                continue
+            metrics = self._metrics(float(state.window), state.s_r, state.s_rr, state.s_b, state.s_bb, state.s_rb)
+            for name, value in metrics.items():
+                column[name][row, 0] = value
+            column["drawdown"][row, 0] = self._wealth / peak - 1.0
+        self.series.extend(np.array([date], dtype="datetime64[D]"), column)
@@ -0,0 +1,315 @@
+"""Multi-ticker technical screener.
+
+The histories of a watchlist are aligned into one (dates, symbols) panel, every indicator a rule needs is
+computed once for all symbols by the ``IndicatorEngine``, and each rule is evaluated as a whole-panel boolean
+array. Rules are small expressions over the price series and the engine's indicators::
+
+    close < bollinger(20, 2).lower
+    crosses_above(macd().macd, macd().signal)
+    crosses_above(ichimoku().tenkan, ichimoku().kijun) and rsi(14) < 70
+
+They are parsed with ``ast`` and only a whitelisted grammar is accepted: price names, indicator calls with
+numeric arguments, their output fields, arithmetic, comparisons, ``and``/``or``/``not`` and the cross
+functions. Nothing is ever passed to ``eval``.
+"""
+import ast
+import inspect
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+
+from tools.stock_adv_indicators import INDICATORS, IndicatorEngine
+from tools.stock_adv_price_store import COLUMNS, PriceHistoryStore, price_store
+
+Array = np.ndarray
+
+PRESET_RULES: Dict[str, str] = {
+    "macd_bullish_cross": "crosses_above(macd().macd, macd().signal)",
+    "macd_bearish_cross": "crosses_below(macd().macd, macd().signal)",
+    "below_lower_bollinger": "close < bollinger(20, 2).lower",
+    "above_upper_bollinger": "close > bollinger(20, 2).upper",
+    "tenkan_kijun_bullish_cross": "crosses_above(ichimoku().tenkan, ichimoku().kijun)",
+    "tenkan_kijun_bearish_cross": "crosses_below(ichimoku().tenkan, ichimoku().kijun)",
+    "rsi_oversold": "rsi(14) < 30",
+    "rsi_overbought": "rsi(14) > 70",
+}
+
+SERIES = tuple(column.lower() for column in COLUMNS)
+
+
+def _previous(x: Array) -> Array:
+    out = np.full(x.shape, np.nan)
+    out[1:] = x[:-1]
+    return out
+
+
+def crosses_above(a: Array, b: Array) -> Array:
+    """True on the dates where *a* moves from at or below *b* to above it."""
+    return (a > b) & (_previous(a) <= _previous(b))
+
+
+def crosses_below(a: Array, b: Array) -> Array:
+    """True on the dates where *a* moves from at or above *b* to below it."""
+    return (a < b) & (_previous(a) >= _previous(b))
+
+
+FUNCTIONS: Dict[str, Callable[[Array, Array], Array]] = {
+    "crosses_above": crosses_above,
+    "crosses_below": crosses_below,
+}
+
+_COMPARISONS = {ast.Lt: np.less, ast.LtE: np.less_equal, ast.Gt: np.greater, ast.GtE: np.greater_equal}
+# Smallest accepted window per (indicator, parameter); 1 otherwise. A sample variance needs two dates.
+_MIN_WINDOW = {("rolling_std", "window"): 2, ("bollinger", "window"): 2}
+_ARITHMETIC = {ast.Add: np.add, ast.Sub: np.subtract, ast.Mult: np.multiply, ast.Div: np.divide}
+
+
+@dataclass
+class PricePanel:
+    """
+    OHLCV histories of several symbols aligned on the union of their trading days.
+
+    Attributes
+    ----------
+    symbols: list of str
+        Column order of the arrays.
+    dates: np.ndarray
+        ``datetime64[D]`` trading days.
+    series: dict
+        ``{"open": ..., "close": ...}`` arrays of shape (dates, symbols); NaN where a symbol has no bar.
+    """
+    symbols: List[str]
+    dates: np.ndarray
+    series: Dict[str, Array]
+
+    @classmethod
+    def from_histories(cls, histories) -> "PricePanel":
+        histories = [h for h in histories if len(h)]
+        dates = np.unique(np.concatenate([h.dates for h in histories])) if histories else np.array([], "M8[D]")
+        ohlcv = np.full((len(dates), len(histories), len(COLUMNS)), np.nan)
+        for i, history in enumerate(histories):
+            ohlcv[np.searchsorted(dates, history.dates), i] = history.ohlcv
+        series = {name: ohlcv[:, :, j] for j, name in enumerate(SERIES)}
+        return cls([h.symbol for h in histories], dates, series)
+
+    def engine(self) -> IndicatorEngine:
+        return IndicatorEngine(self.series["close"], self.series["high"], self.series["low"],
+                               self.series["volume"])
+
+
+def load_panel(symbols: Sequence[str], start=None, end=None, period: str = "1y",
+               store: PriceHistoryStore = price_store, max_workers: int = 8) -> PricePanel:
+    """
+    Load the histories of *symbols* from the price store in parallel and align them.
+
+    Symbols that cannot be loaded are logged and left out of the panel.
+    """
+    def load(symbol: str):
+        try:
+            return store.load(symbol, start=start, end=end, period=period)
+        except Exception as e:
+            logging.error(f"load_panel could not load {symbol}: {e}")
+            return None
+
+    unique = list(dict.fromkeys(s.upper() for s in symbols))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        histories = [h for h in pool.map(load, unique) if h is not None]
+    return PricePanel.from_histories(histories)
+
+
+class Rule:
+    """
+    A compiled screening expression.
+
+    Attributes:
+        name: Label reported with the matches
+        expression: Source text of the rule
+    """
+
+    def __init__(self, name: str, expression: str):
+        self.name = name
+        self.expression = expression
+        try:
+            tree = ast.parse(expression, mode="eval")
+        except SyntaxError as e:
+            raise ValueError(f"Invalid rule '{name}': {e.msg}") from None
+        self._check(tree.body)
+        self._tree = tree.body
+
+    def _fail(self, message: str):
+        raise ValueError(f"Invalid rule '{self.name}': {message}")
+
+    def _check(self, node: ast.AST) -> None:
+        """Reject anything outside the screener grammar before the rule is ever evaluated."""
+        if isinstance(node, ast.BoolOp):
+            for value in node.values:
+                self._check(value)
+        elif isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.USub)):
+            self._check(node.operand)
+        elif isinstance(node, ast.BinOp) and type(node.op) in _ARITHMETIC:
+            self._check(node.left)
+            self._check(node.right)
+        elif isinstance(node, ast.Compare):
+            if not all(type(op) in _COMPARISONS for op in node.ops):
+                self._fail("only <, <=, > and >= comparisons are supported")
+            for operand in [node.left, *node.comparators]:
+                self._check(operand)
+        elif isinstance(node, ast.Constant):
+            if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+                self._fail(f"unsupported constant {node.value!r}")
+        elif isinstance(node, ast.Name):
+            if node.id not in SERIES:
+                self._fail(f"unknown name '{node.id}', expected one of {list(SERIES)} or an indicator call")
+        elif isinstance(node, ast.Attribute):
+            if not isinstance(node.value, ast.Call):
+                self._fail("fields can only be read from indicator calls, e.g. macd().signal")
+            self._check_call(node.value)
+            fields = INDICATORS.get(node.value.func.id, ())
+            if node.attr not in fields:
+                self._fail(f"{node.value.func.id}() has no field '{node.attr}', expected one of {list(fields)}")
+        elif isinstance(node, ast.Call):
+            self._check_call(node)
+            if INDICATORS.get(node.func.id):
+                self._fail(f"{node.func.id}() has several outputs, pick one of {list(INDICATORS[node.func.id])}")
+        else:
+            self._fail(f"unsupported syntax '{ast.unparse(node)}'")
+
+    def _check_call(self, node: ast.Call) -> None:
+        if not isinstance(node.func, ast.Name) or node.keywords:
+            self._fail("calls take positional arguments only, e.g. sma(20)")
+        name = node.func.id
+        if name in FUNCTIONS:
+            if len(node.args) != 2:
+                self._fail(f"{name}() takes two series")
+            for arg in node.args:
+                self._check(arg)
+        elif name in INDICATORS:
+            if not all(isinstance(arg, ast.Constant) and isinstance(arg.value, (int, float)) for arg in node.args):
+                self._fail(f"{name}() takes numeric arguments only")
+            signature = inspect.signature(getattr(IndicatorEngine, name))
+            try:
+                bound = signature.bind(None, *[a.value for a in node.args])
+            except TypeError as e:
+                self._fail(f"{name}(): {e}")
+            for parameter, value in list(bound.arguments.items())[1:]:
+                self._check_argument(name, parameter, signature.parameters[parameter].annotation, value)
+        else:
+            self._fail(f"unknown function '{name}'")
+
+    def _check_argument(self, name: str, parameter: str, annotation, value) -> None:
+        """Windows and periods are whole numbers of dates, at least ``_MIN_WINDOW``; multipliers are positive."""
+        if isinstance(value, bool):
+            self._fail(f"{name}(): {parameter} must be a number, got {value!r}")
+        if annotation is int:
+            minimum = _MIN_WINDOW.get((name, parameter), 1)
+            if not isinstance(value, int) or value < minimum:
+                self._fail(f"{name}(): {parameter} must be an integer >= {minimum}, got {value!r}")
+        elif value <= 0:
+            self._fail(f"{name}(): {parameter} must be positive, got {value!r}")
+
+    def evaluate(self, engine: IndicatorEngine, series: Dict[str, Array]) -> Array:
+        """Evaluate the rule over a panel; returns a boolean array of shape (dates, symbols)."""
+        result = self._eval(self._tree, engine, series)
+        if not isinstance(result, np.ndarray) or result.dtype != bool:
+            self._fail("the expression must be a condition (comparison, cross or boolean combination)")
+        return result
+
+    def _eval(self, node: ast.AST, engine: IndicatorEngine, series: Dict[str, Array]):
+        if isinstance(node, ast.BoolOp):
+            values = [self._eval(v, engine, series) for v in node.values]
+            reduce = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            return reduce.reduce(values)
+        if isinstance(node, ast.UnaryOp):
+            operand = self._eval(node.operand, engine, series)
+            return np.logical_not(operand) if isinstance(node.op, ast.Not) else -operand
+        if isinstance(node, ast.BinOp):
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return _ARITHMETIC[type(node.op)](self._eval(node.left, engine, series),
+                                                  self._eval(node.right, engine, series))
+        if isinstance(node, ast.Compare):
+            left, result = self._eval(node.left, engine, series), None
+            for op, comparator in zip(node.ops, node.comparators):
+                right = self._eval(comparator, engine, series)
+                with np.errstate(invalid="ignore"):
+                    step = _COMPARISONS[type(op)](left, right)
+                result = step if result is None else result & step
+                left = right
+            return result
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.Name):
+            return series[node.id]
+        if isinstance(node, ast.Attribute):
+            value = self._eval(node.value, engine, series)
+            if isinstance(value, dict):
+                return value[node.attr]
+            return value[INDICATORS[node.value.func.id].index(node.attr)]
+        name = node.func.id
+        args = [self._eval(arg, engine, series) for arg in node.args]
+        if name in FUNCTIONS:
+            with np.errstate(invalid="ignore"):
+                return FUNCTIONS[name](*args)
+        return getattr(engine, name)(*args)
+
+
+@dataclass
+class ScreenerMatch:
+    """
+    Symbol for which a rule fired in the lookback window.
+
+    Attributes
+    ----------
+    symbol: str
+        Ticker symbol.
+    rule: str
+        Name of the rule.
+    dates: list of str
+        ISO dates on which the rule was true, oldest first.
+    """
+    symbol: str
+    rule: str
+    dates: List[str] = field(default_factory=list)
+
+    @property
+    def last_signal(self) -> str:
+        return self.dates[-1]
+
+
+def compile_rules(rules: Dict[str, str]) -> List[Rule]:
+    """Compile ``{name: expression}`` pairs; preset names may be given with an empty expression."""
+    compiled = []
+    for name, expression in rules.items():
+        expression = expression or PRESET_RULES.get(name, "")
+        if not expression:
+            raise ValueError(f"Unknown preset rule '{name}', expected one of {sorted(PRESET_RULES)}")
+        compiled.append(Rule(name, expression))
+    return compiled
+
+
+def screen(panel: PricePanel, rules: Dict[str, str] | Sequence[Rule], lookback: int = 5) -> List[ScreenerMatch]:
+    """
+    Evaluate every rule over the whole panel and report the symbols that matched in the last *lookback* dates.
+
+    Indicators shared between rules (e.g. MACD in both cross directions) are computed once.
+
+    Returns:
+        Matches ordered by rule, then symbol
+    """
+    compiled = compile_rules(rules) if isinstance(rules, dict) else list(rules)
+    if not panel.symbols or not len(panel.dates):
+        return []
+    engine = panel.engine()
+    window = slice(max(0, len(panel.dates) - lookback), None)
+    dates = np.datetime_as_string(panel.dates[window], unit="D")
+    matches = []
+    for rule in compiled:
+        signals = rule.evaluate(engine, panel.series)[window]
+        for column in np.flatnonzero(signals.any(axis=0)):
+            fired = dates[signals[:, column]].tolist()
+            matches.append(ScreenerMatch(panel.symbols[column], rule.name, fired))
+    logging.info(f"screen evaluated {len(compiled)} rules over {len(panel.symbols)} symbols, "
+                 f"{len(matches)} matches")
+    return matches
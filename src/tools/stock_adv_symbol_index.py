@@ -0,0 +1,264 @@
+"""Local index of listed US symbols, for ticker validation and autocomplete.
+
+Symbols are kept as one sorted array: exact lookups and prefix completion are binary searches (``bisect``), and
+loading is a single pass over a pipe-delimited ``Symbol|Security Name`` file.
+
+Two listings are used:
+
+- ``AppConfig.symbol_listing_path``: the full NASDAQ Trader listing of NASDAQ, NYSE and other US exchanges,
+  written by ``refresh_listing``. The application fetches it in the background at startup when it is missing
+  or older than ``AppConfig.symbol_listing_max_age_days`` (``start_listing_refresh``); it can also be fetched
+  beforehand with ``python src/tools/stock_adv_symbol_index.py``. The index is then exhaustive, and unknown
+  symbols are rejected before any agent runs.
+- the listing bundled with the application (``data/us_symbols.txt``), used until a full listing has been
+  fetched. It only covers widely held symbols, so it serves autocomplete and unknown symbols stay accepted.
+
+Share classes are written the Yahoo Finance way (``BRK-B``); ``BRK.B``, ``BRK/B`` and ``BRK B`` all resolve
+to the same entry.
+"""
+import logging
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from config.config import app_config
+
+BUNDLED_LISTING = Path(__file__).resolve().parent / "data" / "us_symbols.txt"
+LISTING_URLS = (
+    "https://www.nasdaqtrader.com/dynamic/SymDir/nasdaqlisted.txt",
+    "https://www.nasdaqtrader.com/dynamic/SymDir/otherlisted.txt",
+)
+HEADER = "Symbol|Security Name"
+
+# One to five letters, optionally followed by a one or two letter share class
+SYMBOL_PATTERN = re.compile(r"^[A-Z]{1,5}(?:-[A-Z]{1,2})?$")
+_CLASS_SEPARATORS = re.compile(r"[./ ]")
+_DERIVATIVES = re.compile(r"\b(?:Warrants?|Rights?)\b", re.IGNORECASE)
+_FUNDS = re.compile(r"\b(?:ETF|ETN|Fund)\b")
+
+
+def normalize_symbol(symbol: str) -> str:
+    """Upper-case *symbol* and write its share class the Yahoo Finance way (``brk.b`` -> ``BRK-B``)."""
+    return _CLASS_SEPARATORS.sub("-", symbol.strip().upper())
+
+
+class SymbolIndex:
+    """
+    Sorted array of symbols with their security names.
+
+    Attributes:
+        exhaustive: True when built from a full exchange listing, so that a missing symbol does not exist
+    """
+
+    def __init__(self, symbols: Sequence[str], names: Sequence[str], exhaustive: bool = False):
+        # One tuple, so that ``replace`` swaps symbols and names at once for concurrent readers
+        self._listing = (list(symbols), list(names))
+        self.exhaustive = exhaustive
+
+    @classmethod
+    def from_pairs(cls, pairs: Dict[str, str], exhaustive: bool = False) -> "SymbolIndex":
+        symbols = sorted(pairs)
+        return cls(symbols, [pairs[s] for s in symbols], exhaustive)
+
+    @classmethod
+    def load(cls, path, exhaustive: bool = False) -> "SymbolIndex":
+        """Load a ``Symbol|Security Name`` listing; lines are expected sorted, as ``refresh_listing`` writes them."""
+        with open(path, encoding="utf-8") as listing:
+            rows = [line.partition("|") for line in listing.read().splitlines()]
+        if rows and rows[0][0] == "Symbol":
+            del rows[0]
+        symbols = [row[0] for row in rows]
+        names = [row[2] for row in rows]
+        if symbols != sorted(symbols):
+            return cls.from_pairs(dict(zip(symbols, names)), exhaustive)
+        return cls(symbols, names, exhaustive)
+
+    def replace(self, other: "SymbolIndex") -> None:
+        """Serve the listing of *other* from now on, in place, for the modules holding this index."""
+        self._listing = other._listing
+        self.exhaustive = other.exhaustive
+
+    def __len__(self) -> int:
+        return len(self._listing[0])
+
+    @staticmethod
+    def _position(symbols: List[str], symbol: str) -> int:
+        i = bisect_left(symbols, symbol)
+        return i if i < len(symbols) and symbols[i] == symbol else -1
+
+    def __contains__(self, symbol: str) -> bool:
+        return self._position(self._listing[0], normalize_symbol(symbol)) >= 0
+
+    def name(self, symbol: str) -> Optional[str]:
+        """Security name of *symbol*, or None when it is not listed."""
+        symbols, names = self._listing
+        i = self._position(symbols, normalize_symbol(symbol))
+        return names[i] if i >= 0 else None
+
+    def suggest(self, prefix: str, limit: int = 8) -> List[Tuple[str, str]]:
+        """Up to *limit* ``(symbol, name)`` pairs starting with *prefix*, in alphabetical order."""
+        prefix = normalize_symbol(prefix)
+        if not prefix:
+            return []
+        symbols, names = self._listing
+        suggestions = []
+        i = bisect_left(symbols, prefix)
+        while i < len(symbols) and len(suggestions) < limit and symbols[i].startswith(prefix):
+            suggestions.append((symbols[i], names[i]))
+            i += 1
+        return suggestions
+
+
+def parse_nasdaq_trader(text: str) -> Dict[str, str]:
+    """
+    Parse a NASDAQ Trader symbol directory file (``nasdaqlisted.txt`` or ``otherlisted.txt``).
+
+    Test issues, warrants, rights and symbols that do not look like a common or class share (units, preferred
+    series) are left out.
+
+    Returns:
+        ``{symbol: security name}`` with normalized symbols
+    """
+    lines = text.splitlines()
+    if not lines:
+        return {}
+    header = lines[0].split("|")
+    symbol_column = header.index("Symbol") if "Symbol" in header else header.index("ACT Symbol")
+    name_column = header.index("Security Name")
+    test_column = header.index("Test Issue") if "Test Issue" in header else None
+    listing = {}
+    for line in lines[1:]:
+        fields = line.split("|")
+        if len(fields) != len(header):
+            continue  # trailing "File Creation Time" line
+        if test_column is not None and fields[test_column] == "Y":
+            continue
+        symbol = normalize_symbol(fields[symbol_column])
+        name = fields[name_column].strip()
+        if SYMBOL_PATTERN.match(symbol) and not _DERIVATIVES.search(name):
+            listing[symbol] = name
+    return listing
+
+
+def refresh_listing(path: str = app_config.symbol_listing_path, timeout: float = 30.0) -> int:
+    """
+    Download the NASDAQ Trader listings and write them, sorted, to *path*.
+
+    Returns:
+        Number of symbols written
+    """
+    import httpx
+
+    listing: Dict[str, str] = {}
+    for url in LISTING_URLS:
+        response = httpx.get(url, timeout=timeout)
+        response.raise_for_status()
+        listing.update(parse_nasdaq_trader(response.text))
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as out:
+        out.write(HEADER + "\n")
+        out.writelines(f"{symbol}|{listing[symbol]}\n" for symbol in sorted(listing))
+    os.replace(tmp, path)
+    logging.info(f"Symbol listing refreshed: {len(listing)} symbols written to {path}")
+    return len(listing)
+
+
+def load_symbol_index(path: str = app_config.symbol_listing_path) -> SymbolIndex:
+    """Load the full listing at *path* if it has been fetched, else the bundled one."""
+    start = time.perf_counter()
+    exhaustive = os.path.exists(path)
+    try:
+        index = SymbolIndex.load(path if exhaustive else BUNDLED_LISTING, exhaustive)
+    except OSError as e:
+        logging.error(f"Symbol listing could not be loaded: {e}")
+        index = SymbolIndex([], [])
+    logging.info(f"Symbol index loaded: {len(index)} symbols ({'full' if exhaustive else 'bundled'} listing) "
+                 f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+    return index
+
+
+# Global index shared by every session
+symbol_index = load_symbol_index()
+
+_refresh_lock = threading.Lock()
+_refresh_started = False
+
+
+def listing_is_stale(path: str = app_config.symbol_listing_path,
+                     max_age_days: float = app_config.symbol_listing_max_age_days) -> bool:
+    """True when the full listing at *path* is missing or older than *max_age_days*."""
+    try:
+        age = time.time() - os.path.getmtime(path)
+    except OSError:
+        return True
+    return age > max_age_days * 86400
+
+
+def _refresh_and_swap(index: SymbolIndex, path: str, timeout: float) -> None:
+    try:
+        refresh_listing(path, timeout)
+        index.replace(SymbolIndex.load(path, exhaustive=True))
+    except Exception as e:
+        # No network, NASDAQ Trader down or a partial answer: keep serving the listing already loaded
+        logging.warning(f"Symbol listing could not be refreshed, keeping the "
+                        f"{'full' if index.exhaustive else 'bundled'} listing: {e}")
+
+
+def start_listing_refresh(index: SymbolIndex = symbol_index, path: str = app_config.symbol_listing_path,
+                          max_age_days: float = app_config.symbol_listing_max_age_days,
+                          timeout: float = app_config.symbol_listing_timeout) -> Optional[threading.Thread]:
+    """
+    Fetch the full listing in a background thread when it is missing or stale, once per process.
+
+    The index keeps serving its current listing until the download completes, then switches to the fresh one.
+
+    Args:
+        max_age_days: Age from which the listing is fetched again; 0 disables the refresh
+        timeout: Seconds allowed to each listing download
+
+    Returns:
+        The refresh thread, or None when no refresh was started
+    """
+    global _refresh_started
+    if max_age_days <= 0:
+        return None
+    with _refresh_lock:
+        if _refresh_started or not listing_is_stale(path, max_age_days):
+            return None
+        _refresh_started = True
+    thread = threading.Thread(target=_refresh_and_swap, args=(index, path, timeout),
+                              name="symbol-listing-refresh", daemon=True)
+    thread.start()
+    logging.info(f"Symbol listing missing or older than {max_age_days:g} days: fetching it in the background")
+    return thread
+
+
+def classify_symbol(symbol: Optional[str], index: SymbolIndex = symbol_index) -> str:
+    """
+    Coarse class of *symbol*, usable as a low-cardinality metrics label.
+
+    Returns:
+        ``"none"``, ``"invalid"``, ``"unlisted"``, ``"fund"``, ``"share_class"`` or ``"equity"``
+    """
+    if not symbol:
+        return "none"
+    symbol = normalize_symbol(symbol)
+    if not SYMBOL_PATTERN.match(symbol):
+        return "invalid"
+    name = index.name(symbol)
+    if name is None:
+        return "unlisted"
+    if _FUNDS.search(name):
+        return "fund"
+    return "share_class" if "-" in symbol else "equity"
+
+
+if __name__ == "__main__":
+    count = refresh_listing()
+    print(f"{count} symbols written to {app_config.symbol_listing_path}")
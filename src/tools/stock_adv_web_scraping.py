@@ -3,7 +3,7 @@ from bs4 import BeautifulSoup
 from typing import Tuple, Optional
 import logging
 
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+from utils.tracing import CLIENT, tracer
 
 
 class ContentExtractor:
@@ -45,10 +45,13 @@ class ContentExtractor:
             *error*   – error message or ``None`` on success.
         """
         try:
-            resp = requests.get(url,
-                                timeout=self.timeout,
-                                headers=self.headers)
-            resp.raise_for_status()
+            with tracer.span("http.get", CLIENT, **{"http.url": url}) as span:
+                resp = requests.get(url,
+                                    timeout=self.timeout,
+                                    headers=self.headers)
+                if span is not None:
+                    span.set_attribute("http.status_code", resp.status_code)
+                resp.raise_for_status()
             return resp.content, None
         except requests.RequestException as exc:
             logging.info(f"*********************_fetch_page ENDED Successfully")
@@ -4,7 +4,7 @@ from datetime import datetime
 
 import logging
 
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+from utils.tracing import CLIENT, tracer
 
 
 class NewsSearcher:
@@ -37,11 +37,12 @@ class NewsSearcher:
             # 1. Official News (High Credibility)
             # Using .news() for structured news results with source attribution
             try:
-                news_results = ddgs.news(
-                    keywords=f"{query}",
-                    region="us-en",
-                    max_results=limit
-                )
+                with tracer.span("duckduckgo.news", CLIENT, query=query):
+                    news_results = ddgs.news(
+                        keywords=f"{query}",
+                        region="us-en",
+                        max_results=limit
+                    )
 
                 for item in news_results:
                     report["news"].append({
@@ -52,18 +53,19 @@ class NewsSearcher:
                         "snippet": item.get("body", "")[:200] + "..."
                     })
             except Exception as e:
-                print(f"⚠️ News retrieval failed: {e}")
+                logging.warning("News retrieval failed: %s", e)
 
             # 2. Social Media & Forum Discussions
             # Using .text() with site: operators to target social platforms
             # This aggregates Reddit, StockTwits, and Twitter without needing their APIs
             try:
                 social_query = f'{query} (site:reddit.com OR site:stocktwits.com OR site:twitter.com)'
-                social_results = ddgs.text(
-                    keywords=social_query,
-                    region="wt-wt",
-                    max_results=limit
-                )
+                with tracer.span("duckduckgo.text", CLIENT, query=social_query):
+                    social_results = ddgs.text(
+                        keywords=social_query,
+                        region="wt-wt",
+                        max_results=limit
+                    )
 
                 for item in social_results:
                     # Determine platform from URL
@@ -84,7 +86,7 @@ class NewsSearcher:
                         "snippet": item.get("body", "")[:150] + "..."
                     })
             except Exception as e:
-                print(f"⚠️ Social retrieval failed: {e}")
+                logging.warning("Social retrieval failed: %s", e)
 
         return report
 
@@ -10,8 +10,8 @@ import logging
 
 from tools.stock_adv_web_scraping import ContentExtractor
 from tools.stock_adv_web_search import NewsSearcher
-
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+from utils.log_config import payload
+from utils.tracing import traced
 
 
 class StockIntelParser:
@@ -59,9 +59,9 @@ class StockIntelParser:
         if content:
             new_content += content
         if error:
-            logging.error(f"Content extraction failed for %s – %s {current_url}, {error}")
+            logging.error("Content extraction failed for %s – %s", current_url, error)
         else:
-            logging.warning(f"Extractor returned no content for %s {current_url}")
+            logging.warning("Extractor returned no content for %s", current_url)
         if new_content:
             return new_content
         else:
@@ -204,6 +204,7 @@ class WebSearchTool(Tool[WebSearchToolInput, ToolRunOptions, StringToolOutput]):
             creator=self,
         )
 
+    @traced()
     async def _run(
             self, input: WebSearchToolInput, options: ToolRunOptions | None, context: RunContext
     ) -> StringToolOutput:
@@ -241,7 +242,7 @@ async def main() -> None:
     query = "What is the current price for IBM stock?"
     input = WebSearchToolInput(query="IBM")
     contents = await tool.run(input)
-    logging.info(f"///////////////////////////////{contents}")
+    logging.info("%s", payload(contents))
 
 
 if __name__ == "__main__":
@@ -1,14 +1,24 @@
+import threading
+
 import streamlit as st
 
 import logging
 
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
-
 
 class ProgressionBar:
+    """
+    Progress bar and status line of the report generation.
+
+    Updates may come from the background event loop thread, where Streamlit elements cannot be written:
+    they are recorded and drawn by ``refresh``, which the script thread calls while it waits for the report.
+    """
+
     def __init__(self, ):
         self.progress_bar = st.progress(0)
         self.status_text = st.empty()
+        self._script_thread = threading.current_thread()
+        self._lock = threading.Lock()
+        self._pending = None
 
     def update_progression_bar(self, progression: int, task_completed: str):
         logging.info(f"....................////////***************** update_progression_bar STRT with progression={progression} and task_completed ={task_completed}")
@@ -22,5 +32,21 @@ class ProgressionBar:
             progression += 25
             status = "Generating final report..."
 
-        self.status_text.text(status)
-        self.progress_bar.progress(progression)
+        with self._lock:
+            self._pending = (progression, status)
+        if threading.current_thread() is self._script_thread:
+            self.refresh()
+
+    def refresh(self):
+        """Draw the latest recorded update; must be called from the script thread."""
+        with self._lock:
+            pending, self._pending = self._pending, None
+        if pending is not None:
+            progression, status = pending
+            self.status_text.text(status)
+            self.progress_bar.progress(progression)
+
+    def clear(self):
+        """Remove the bar, e.g. when the report was served from the cache."""
+        self.progress_bar.empty()
+        self.status_text.empty()
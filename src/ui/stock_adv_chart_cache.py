@@ -0,0 +1,162 @@
+"""Process-wide cache of indicator arrays and rendered charts for the technical analysis tab.
+
+Streamlit reruns the whole script on every widget change. Entries are keyed by ticker, date range, indicator
+name and parameters, so a rerun caused by an unrelated widget, or switching back to a chart viewed before,
+is served from memory instead of recomputing the indicator and re-rendering the figure.
+The cache is a least-recently-used map bounded by the total size in bytes of its values
+(``AppConfig.chart_cache_max_mb``), not by the number of entries, because a 20-year chart and a 3-month
+chart differ in size by orders of magnitude.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.config import app_config
+from tools.stock_adv_indicators import IndicatorEngine
+
+
+@dataclass(frozen=True)
+class ChartCacheKey:
+    """
+    Identity of a cached value.
+
+    Attributes
+    ----------
+    ticker: str
+        Stock symbol.
+    start, end: str
+        Date range of the price data.
+    name: str
+        Indicator or chart name (e.g. "bollinger", "BOLL").
+    params: tuple
+        Parameters of the indicator or rendering (windows, figure width, backend...).
+    kind: str
+        "indicator" for arrays, "chart" for rendered images, "columns" for client-side chart data.
+    """
+    ticker: str
+    start: str
+    end: str
+    name: str
+    params: Tuple[Any, ...] = ()
+    kind: str = "indicator"
+
+
+def size_of(value: Any) -> int:
+    """Approximate memory footprint in bytes of arrays, frames, bytes and (nested) containers of them."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(size_of(v) for v in value.values())
+    if isinstance(value, (tuple, list)):
+        return sum(size_of(v) for v in value)
+    return 64
+
+
+class ChartCache:
+    """
+    Thread-safe LRU cache bounded by the total byte size of its values.
+
+    Attributes:
+        max_bytes: Size budget; least recently used entries are evicted beyond it
+        hits, misses: Lookup counters
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[ChartCacheKey, Tuple[Any, int]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """Total size in bytes of the cached values."""
+        return self._size
+
+    def get(self, key: ChartCacheKey) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: ChartCacheKey, value: Any) -> None:
+        nbytes = size_of(value)
+        if nbytes > self.max_bytes:
+            logging.info(f"ChartCache not caching {key.name} for {key.ticker}: {nbytes} bytes exceeds budget")
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous[1]
+            self._entries[key] = (value, nbytes)
+            self._size += nbytes
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= evicted
+
+    def get_or_compute(self, key: ChartCacheKey, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for *key*, computing and storing it on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+chart_cache = ChartCache(app_config.chart_cache_max_mb * 1024 * 1024)
+
+
+class CachedIndicators:
+    """
+    Indicator arrays of one price frame, memoized in the chart cache.
+
+    Exposes the ``IndicatorEngine`` methods (``indicators.bollinger(20, 2)``); each call is looked up by
+    (ticker, range, indicator, params) before the engine is built and asked to compute it.
+    """
+
+    def __init__(self, ticker: str, start: Any, end: Any, frame, cache: ChartCache = chart_cache):
+        self.ticker = ticker
+        self.start = str(start)
+        self.end = str(end)
+        self._frame = frame
+        self._cache = cache
+        self._engine: Optional[IndicatorEngine] = None
+
+    def key(self, name: str, params: Tuple[Any, ...] = (), kind: str = "indicator") -> ChartCacheKey:
+        return ChartCacheKey(self.ticker, self.start, self.end, name, tuple(params), kind)
+
+    def _compute(self, name: str, params: Tuple[Any, ...]) -> Any:
+        if self._engine is None:
+            self._engine = IndicatorEngine.from_frame(self._frame)
+        return getattr(self._engine, name)(*params)
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        if name.startswith("_") or not callable(getattr(IndicatorEngine, name, None)):
+            raise AttributeError(name)
+
+        def cached(*params):
+            return self._cache.get_or_compute(self.key(name, params), lambda: self._compute(name, params))
+
+        return cached
@@ -0,0 +1,107 @@
+"""Server-side chart rendering without pyplot global state.
+
+Charts are drawn on standalone ``matplotlib.figure.Figure`` objects, which are not registered with pyplot's
+figure manager: nothing outlives a render, and two sessions can never draw into the same "current" figure.
+Rendering runs on a small bounded worker pool so that concurrent sessions cannot pile up unbounded
+matplotlib work, and the PNG bytes are stored in the chart cache, where identical requests already being
+rendered are shared instead of drawn twice.
+"""
+import io
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Dict, Tuple
+
+from config.config import app_config
+from ui.stock_adv_chart_cache import ChartCache, ChartCacheKey, chart_cache
+from ui.stock_adv_chart_reducer import FIGURE_DPI
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+
+def new_figure(figsize: Tuple[float, float] = (12, 6)) -> "Figure":
+    """A figure that is owned by the caller only (not tracked by pyplot)."""
+    # matplotlib is loaded with the first static chart, not when the technical analysis tab is drawn
+    from matplotlib.figure import Figure
+
+    return Figure(figsize=figsize, dpi=FIGURE_DPI)
+
+
+def figure_to_png(figure: "Figure") -> bytes:
+    """Encode a figure as PNG and release its artists."""
+    buffer = io.BytesIO()
+    try:
+        figure.savefig(buffer, format="png")
+    finally:
+        figure.clear()
+    return buffer.getvalue()
+
+
+class FigureRenderer:
+    """
+    Bounded pool rendering charts to cached PNG bytes.
+
+    Attributes:
+        cache: Byte-bounded cache holding the rendered PNGs
+        max_workers: Number of rendering threads
+        max_pending: Renders queued or running at once; further submissions wait for a free slot
+    """
+
+    def __init__(self, cache: ChartCache = chart_cache, max_workers: int = 2, max_pending: int = 0):
+        self.cache = cache
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max_pending or self.max_workers * 4
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="chart-render")
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._in_flight: Dict[ChartCacheKey, Future] = {}
+        self._lock = threading.Lock()
+
+    def _draw(self, draw: Callable[[], "Figure"]) -> bytes:
+        try:
+            result = draw()
+            return result if isinstance(result, bytes) else figure_to_png(result)
+        finally:
+            self._slots.release()
+
+    def submit(self, draw: Callable[[], "Figure"]) -> Future:
+        """Render ``draw()`` (a Figure, or PNG bytes) on the pool; blocks while ``max_pending`` renders are queued."""
+        self._slots.acquire()
+        try:
+            return self._executor.submit(self._draw, draw)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def render(self, key: ChartCacheKey, draw: Callable[[], "Figure"]) -> bytes:
+        """Return the PNG cached under *key*, rendering it on the pool on a miss."""
+        png = self.cache.get(key)
+        if png is not None:
+            return png
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+        if not owner:
+            return future.result()
+        # Submitting may wait for a free slot: other keys must not queue behind the lock meanwhile
+        try:
+            png = self.submit(draw).result()
+            self.cache.put(key, png)
+            future.set_result(png)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+        return png
+
+    def shutdown(self) -> None:
+        logging.info("FigureRenderer shutting down")
+        self._executor.shutdown(wait=True)
+
+
+figure_renderer = FigureRenderer(chart_cache, max_workers=app_config.chart_render_workers)
@@ -0,0 +1,125 @@
+"""Client-side (Vega-Lite) chart backend for the technical analysis tab.
+
+Instead of rendering an image on the server, every chart is described by a small Vega-Lite spec plus one
+compact columnar frame (dates and float32 series) that Streamlit ships to the browser as Arrow. The browser
+draws the chart and handles pan and zoom locally, so interacting with it never reruns the Python script, and
+the server only does the indicator math.
+"""
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+ChartSpec = Dict[str, Any]
+INTERACTIVE = "Interactive"
+STATIC = "Static image"
+BACKENDS = (INTERACTIVE, STATIC)
+
+# Shared x axis with interval selection bound to the scales: drag to pan, scroll to zoom, in the browser
+_ZOOM = {"name": "zoom", "select": {"type": "interval", "encodings": ["x"]}, "bind": "scales"}
+_X = {"field": "Date", "type": "temporal", "title": "Date"}
+
+
+def chart_frame(data: pd.DataFrame, series: Dict[str, Any]) -> pd.DataFrame:
+    """Build the columnar frame sent to the browser: a Date column plus one float32 column per series."""
+    columns = {"Date": data.index.to_numpy()}
+    columns.update({name: np.asarray(values, dtype=np.float32) for name, values in series.items()})
+    return pd.DataFrame(columns)
+
+
+def _lines(columns: List[str], y_title: str, colors: List[str] | None = None) -> ChartSpec:
+    """One line per column, drawn from the wide frame with a fold transform."""
+    color: Dict[str, Any] = {"field": "series", "type": "nominal", "sort": columns, "title": None}
+    if colors:
+        color["scale"] = {"domain": columns, "range": colors}
+    return {
+        "transform": [{"fold": columns, "as": ["series", "value"]}],
+        "mark": {"type": "line", "strokeWidth": 1.2},
+        "encoding": {"x": _X, "y": {"field": "value", "type": "quantitative", "title": y_title,
+                                    "scale": {"zero": False}},
+                     "color": color},
+        "params": [_ZOOM],
+    }
+
+
+def bollinger_chart(data: pd.DataFrame, indicators) -> Tuple[pd.DataFrame, ChartSpec]:
+    middle, upper, lower = indicators.bollinger(20, 2)
+    frame = chart_frame(data, {"Close": data["Close"], "20-Day SMA": middle, "Upper Band": upper,
+                               "Lower Band": lower})
+    spec = _lines(["Close", "20-Day SMA", "Upper Band", "Lower Band"], "Price", ["blue", "orange", "green", "red"])
+    return frame, {"title": "Bollinger Bands (20-day window)", **spec}
+
+
+def ma_chart(data: pd.DataFrame, indicators) -> Tuple[pd.DataFrame, ChartSpec]:
+    periods = [10, 20, 30, 40, 50, 60]
+    series = {"Price": data["Close"]}
+    series.update({f"SMA {p}": indicators.sma(p) for p in periods})
+    return chart_frame(data, series), {"title": "Moving Average Ribbon", **_lines(list(series), "Price")}
+
+
+def macd_chart(data: pd.DataFrame, indicators) -> Tuple[pd.DataFrame, ChartSpec]:
+    line, signal, histogram = indicators.macd(12, 26, 9)
+    frame = chart_frame(data, {"MACD": line, "Signal Line": signal, "Histogram": histogram})
+    spec = {
+        "title": "MACD Indicator",
+        "layer": [
+            {"mark": {"type": "bar", "color": "gray", "opacity": 0.5},
+             "encoding": {"x": _X, "y": {"field": "Histogram", "type": "quantitative"}}},
+            _lines(["MACD", "Signal Line"], "MACD Value", ["blue", "red"]),
+        ],
+    }
+    return frame, spec
+
+
+def cloud_chart(data: pd.DataFrame, indicators) -> Tuple[pd.DataFrame, ChartSpec]:
+    lines = indicators.ichimoku(9, 26, 52, 26)
+    senkou_a, senkou_b = np.asarray(lines["senkou_a"]), np.asarray(lines["senkou_b"])
+    # An area mark has one colour: the cloud is one layer per side of its base, each flat where the other
+    # span is on top, so it is green where Senkou A >= Senkou B and red elsewhere, as on the static chart
+    frame = chart_frame(data, {"Close Price": data["Close"], "Tenkan-sen": lines["tenkan"],
+                               "Kijun-sen": lines["kijun"], "Chikou Span": lines["chikou"],
+                               "Senkou A": senkou_a, "Senkou B": senkou_b,
+                               "Cloud Base": np.minimum(senkou_a, senkou_b)})
+    cloud = [{"mark": {"type": "area", "opacity": 0.4},
+              "encoding": {"x": _X,
+                           "y": {"field": top, "type": "quantitative", "scale": {"zero": False}},
+                           "y2": {"field": "Cloud Base"},
+                           "color": {"value": color}}}
+             for top, color in (("Senkou A", "lightgreen"), ("Senkou B", "lightcoral"))]
+    spec = {
+        "title": "Ichimoku Cloud",
+        "layer": [
+            *cloud,
+            _lines(["Close Price", "Tenkan-sen", "Kijun-sen", "Chikou Span"], "Price",
+                   ["black", "red", "blue", "purple"]),
+        ],
+    }
+    return frame, spec
+
+
+def candle_chart(data: pd.DataFrame, indicators) -> Tuple[pd.DataFrame, ChartSpec]:
+    frame = chart_frame(data, {column: data[column] for column in ("Open", "High", "Low", "Close")})
+    color = {"condition": {"test": "datum.Open <= datum.Close", "value": "#26a69a"}, "value": "#ef5350"}
+    spec = {
+        "title": "Candlestick Chart",
+        "encoding": {"x": _X, "color": color},
+        "layer": [
+            {"mark": "rule",
+             "encoding": {"y": {"field": "Low", "type": "quantitative", "scale": {"zero": False},
+                                "title": "Price"},
+                          "y2": {"field": "High"}},
+             "params": [_ZOOM]},
+            {"mark": "bar", "encoding": {"y": {"field": "Open", "type": "quantitative"},
+                                         "y2": {"field": "Close"}}},
+        ],
+    }
+    return frame, spec
+
+
+CHART_BUILDERS: Dict[str, Callable[[pd.DataFrame, Any], Tuple[pd.DataFrame, ChartSpec]]] = {
+    "bollinger": bollinger_chart,
+    "ma": ma_chart,
+    "macd": macd_chart,
+    "cloud": cloud_chart,
+    "candle": candle_chart,
+}
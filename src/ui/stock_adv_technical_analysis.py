@@ -1,116 +1,156 @@
+from typing import TYPE_CHECKING
+
 import streamlit as st
 import pandas as pd
-import yfinance as yf
-import mplfinance as mpf
-import asyncio
-import matplotlib.pyplot as plt
+import numpy as np
 
 import logging
 
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+from config.config import app_config
+from tools.stock_adv_indicators import IndicatorEngine
+from tools.stock_adv_price_store import price_store
+from tools.stock_adv_screener import PRESET_RULES, load_panel, screen
+from ui.stock_adv_chart_cache import CachedIndicators, chart_cache
+from ui.stock_adv_chart_reducer import candle_budget, downsample, lttb_indices, point_budget, resample_ohlc
+from ui.stock_adv_figure_renderer import figure_renderer, figure_to_png, new_figure
+from ui.stock_adv_interactive_charts import BACKENDS, CHART_BUILDERS, INTERACTIVE, STATIC
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+# Points drawn per line on the 12-inch figures; longer series are downsampled with LTTB
+LINE_POINTS = point_budget(12)
+CANDLE_PERIODS = {'W-FRI': 'weekly', 'ME': 'monthly', 'QE': 'quarterly'}
 
 
 @st.cache_data
 def fetch_data(ticker, start, end):
-    return yf.Ticker(ticker).history(start=start, end=end)
+    # Served from the local price store; only bars missing on disk are downloaded
+    return price_store.load(ticker, start=start, end=end).to_frame()
 
 
-def bollinger(data):
+def bollinger(data, indicators=None) -> "Figure":
     sma_window_length = 20
     std_dev_factor = 2
-    data['SMA'] = data['Close'].rolling(window=sma_window_length).mean()
-    rolling_std = data['Close'].rolling(window=sma_window_length).std()
-    data['rf'] = (rolling_std * std_dev_factor)
-    data['upper'] = data['SMA'] + data['rf']
-    data['lower'] = data['SMA'] - data['rf']
-
-    plt.figure(figsize=(12, 6))
-    plt.plot(data.index, data['Close'], label="Close Price", color="blue", linewidth=1)
-    plt.plot(data.index, data['SMA'], label=f"{sma_window_length}-Day SMA", color="orange", linewidth=1.5)
-    plt.plot(data.index, data['upper'], label="Upper Bollinger Band", color="green", linestyle="--", linewidth=1)
-    plt.plot(data.index, data['lower'], label="Lower Bollinger Band", color="red", linestyle="--", linewidth=1)
-
-    plt.title(f"Bollinger Bands for (20-day window)", fontsize=14)
-    plt.xlabel("Date", fontsize=12)
-    plt.ylabel("Price", fontsize=12)
-    plt.legend()
-    plt.grid(alpha=0.3)
-    return plt
-
-
-def macd(data):
-    short_window = 12
-    long_window = 26
-    signal_window = 9
-    data['EMA_12'] = data['Close'].ewm(span=short_window, adjust=False).mean()
-    data['EMA_26'] = data['Close'].ewm(span=long_window, adjust=False).mean()
-    data['MACD'] = data['EMA_12'] - data['EMA_26']
-    data['Signal_Line'] = data['MACD'].ewm(span=signal_window, adjust=False).mean()
-    plt.figure(figsize=(12, 6))
-    plt.plot(data.index, data['MACD'], label='MACD', color='blue')
-    plt.plot(data.index, data['Signal_Line'], label='Signal Line', color='red')
-    plt.bar(data.index, data['MACD'] - data['Signal_Line'], label='Histogram', color='gray', alpha=0.5)
-    plt.legend(loc='best')
-    plt.title('MACD Indicator')
-    plt.xlabel('Date')
-    plt.ylabel('MACD Value')
-    plt.grid()
-    return plt
-
-
-def ma(data):
-    data.reset_index(inplace=True)
+    indicators = indicators or IndicatorEngine.from_frame(data)
+    middle, upper, lower = indicators.bollinger(sma_window_length, std_dev_factor)
+
+    figure = new_figure((12, 6))
+    ax = figure.subplots()
+    ax.plot(*downsample(data.index, data['Close'], LINE_POINTS), label="Close Price", color="blue", linewidth=1)
+    ax.plot(*downsample(data.index, middle, LINE_POINTS), label=f"{sma_window_length}-Day SMA", color="orange",
+            linewidth=1.5)
+    ax.plot(*downsample(data.index, upper, LINE_POINTS), label="Upper Bollinger Band", color="green",
+            linestyle="--", linewidth=1)
+    ax.plot(*downsample(data.index, lower, LINE_POINTS), label="Lower Bollinger Band", color="red",
+            linestyle="--", linewidth=1)
+
+    ax.set_title(f"Bollinger Bands for (20-day window)", fontsize=14)
+    ax.set_xlabel("Date", fontsize=12)
+    ax.set_ylabel("Price", fontsize=12)
+    ax.legend()
+    ax.grid(alpha=0.3)
+    return figure
+
+
+def macd(data, indicators=None) -> "Figure":
+    indicators = indicators or IndicatorEngine.from_frame(data)
+    macd_line, signal_line, histogram = indicators.macd(12, 26, 9)
+    figure = new_figure((12, 6))
+    ax = figure.subplots()
+    ax.plot(*downsample(data.index, macd_line, LINE_POINTS), label='MACD', color='blue')
+    ax.plot(*downsample(data.index, signal_line, LINE_POINTS), label='Signal Line', color='red')
+    # The histogram is drawn as one stepped area instead of one bar artist per date
+    bar_dates, bar_values = downsample(data.index, histogram, LINE_POINTS)
+    ax.fill_between(bar_dates, 0, bar_values, step='mid', label='Histogram', color='gray', alpha=0.5)
+    ax.legend(loc='best')
+    ax.set_title('MACD Indicator')
+    ax.set_xlabel('Date')
+    ax.set_ylabel('MACD Value')
+    ax.grid()
+    return figure
+
+
+def ma(data, indicators=None) -> "Figure":
     periods = [10, 20, 30, 40, 50, 60]
-    for period in periods:
-        data[f"SMA_{period}"] = data["Close"].rolling(window=period).mean()
+    # All averages share one prefix sum of the closes
+    indicators = indicators or IndicatorEngine.from_frame(data)
 
     # Plot Moving Average Ribbon
-    plt.figure(figsize=(12, 6))
-    plt.plot(data["Date"], data["Close"], label="Price", color="black", linewidth=1.5)
+    figure = new_figure((12, 6))
+    ax = figure.subplots()
+    ax.plot(*downsample(data.index, data["Close"], LINE_POINTS), label="Price", color="black", linewidth=1.5)
     for period in periods:
-        plt.plot(data["Date"], data[f"SMA_{period}"], label=f"SMA {period}")
-    plt.title("Moving Average Ribbon")
-    plt.xlabel("Date")
-    plt.ylabel("Price")
-    plt.legend()
-    plt.grid()
-    return plt
+        ax.plot(*downsample(data.index, indicators.sma(period), LINE_POINTS), label=f"SMA {period}")
+    ax.set_title("Moving Average Ribbon")
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Price")
+    ax.legend()
+    ax.grid()
+    return figure
+
+
+def candle(data, indicators=None) -> "Figure":
+    # Long ranges are drawn as weekly/monthly candles so that every candle stays visible
+    bars, rule = resample_ohlc(data, candle_budget(15))
+    title = 'Candlestick Chart' if rule == 'D' else f'Candlestick Chart ({CANDLE_PERIODS[rule]} candles)'
+    figure = new_figure((15, 10))
+    ax = figure.subplots()
+    # mplfinance draws on the given axes instead of creating a pyplot figure; it is loaded with the first candle chart
+    import mplfinance as mpf
+
+    mpf.plot(bars, type='candle', style='charles', ax=ax)
+    ax.set_title(title)
+    return figure
+
+
+def cloud(data, indicators=None) -> "Figure":
+    # Calculate Ichimoku components
+    indicators = indicators or IndicatorEngine.from_frame(data)
+    lines = indicators.ichimoku(9, 26, 52, 26)
+    senkou_a, senkou_b = lines["senkou_a"], lines["senkou_b"]
 
+    # Plot Ichimoku Cloud
+    # Both cloud edges share the points selected on the cloud thickness so that crossovers are preserved
+    valid = ~np.isnan(senkou_a) & ~np.isnan(senkou_b)
+    dates = data.index[valid]
+    keep = lttb_indices(dates.asi8, (senkou_a - senkou_b)[valid], LINE_POINTS)
+    cloud_dates, cloud_a, cloud_b = dates[keep], senkou_a[valid][keep], senkou_b[valid][keep]
 
-def candle(data):
-    fig, ax = mpf.plot(data, type='candle', style='charles', figsize=(15, 10), title='Candlestick Chart',
-                       returnfig=True)
-    return fig
+    figure = new_figure((12, 6))
+    ax = figure.subplots()
+    ax.plot(*downsample(data.index, data["Close"], LINE_POINTS), label="Close Price", color="black")
+    ax.plot(*downsample(data.index, lines["tenkan"], LINE_POINTS), label="Tenkan-sen", color="red")
+    ax.plot(*downsample(data.index, lines["kijun"], LINE_POINTS), label="Kijun-sen", color="blue")
+    ax.fill_between(cloud_dates, cloud_a, cloud_b, where=cloud_a >= cloud_b, color="lightgreen", alpha=0.5)
+    ax.fill_between(cloud_dates, cloud_a, cloud_b, where=cloud_a < cloud_b, color="lightcoral", alpha=0.5)
+    ax.plot(*downsample(data.index, lines["chikou"], LINE_POINTS), label="Chikou Span", color="purple",
+            linestyle="dotted")
 
+    ax.set_title("Ichimoku Cloud")
+    ax.legend()
+    return figure
 
-def cloud(data):
-    # Calculate Ichimoku components
-    data["Tenkan"] = (data["Close"].rolling(window=9).max() + data["Close"].rolling(window=9).min()) / 2
-    data["Kijun"] = (data["Close"].rolling(window=26).max() + data["Close"].rolling(window=26).min()) / 2
-    data["Senkou_A"] = ((data["Tenkan"] + data["Kijun"]) / 2).shift(26)
-    data["Senkou_B"] = ((data["Close"].rolling(window=52).max() + data["Close"].rolling(window=52).min()) / 2).shift(26)
-    data["Chikou"] = data["Close"].shift(-26)
 
-    # Plot Ichimoku Cloud
-    plt.figure(figsize=(12, 6))
-    plt.plot(data.index, data["Close"], label="Close Price", color="black")
-    plt.plot(data.index, data["Tenkan"], label="Tenkan-sen", color="red")
-    plt.plot(data.index, data["Kijun"], label="Kijun-sen", color="blue")
-    plt.fill_between(data.index, data["Senkou_A"], data["Senkou_B"], where=data["Senkou_A"] >= data["Senkou_B"],
-                     color="lightgreen", alpha=0.5)
-    plt.fill_between(data.index, data["Senkou_A"], data["Senkou_B"], where=data["Senkou_A"] < data["Senkou_B"],
-                     color="lightcoral", alpha=0.5)
-    plt.plot(data.index, data["Chikou"], label="Chikou Span", color="purple", linestyle="dotted")
-
-    plt.title("Ichimoku Cloud")
-    plt.legend()
-    return plt
-
-
-def plot_ta(title: str, df, method):
+def render_png(df, method, indicators=None) -> bytes:
+    """Draw a chart and return it as PNG bytes; the figure is released afterwards."""
+    return figure_to_png(method(df, indicators))
+
+
+def plot_ta(title: str, df, method, ticker: str, start, end, backend: str = STATIC):
     st.header(title)
-    plt = method(df)
-    st.pyplot(plt)
+    # Indicators and rendered charts are reused across reruns and chart switches for the same data
+    indicators = CachedIndicators(ticker, start, end, df)
+    if backend == INTERACTIVE:
+        # Only the columns are sent; the browser draws the chart and handles pan/zoom without a rerun
+        build = CHART_BUILDERS[method.__name__]
+        frame, spec = chart_cache.get_or_compute(indicators.key(method.__name__, (INTERACTIVE,), kind="columns"),
+                                                 lambda: build(df, indicators))
+        st.vega_lite_chart(frame, spec, width="stretch")
+        return
+    png = figure_renderer.render(indicators.key(method.__name__, (LINE_POINTS,), kind="chart"),
+                                 lambda: render_png(df, method, indicators))
+    st.image(png)
 
 
 def add_ticker(tickers, new):
@@ -139,7 +179,42 @@ def add_ticker(tickers, new):
     return tickers + new_items
 
 
-async def perform_tech_analysis(ticker):
+def parse_watchlist(text: str) -> list:
+    """Split a comma/space/newline separated watchlist into unique upper-case symbols."""
+    symbols = text.replace(",", " ").split()
+    return list(dict.fromkeys(symbol.upper() for symbol in symbols))
+
+
+def perform_screening(ticker, start, end):
+    watchlist = st.text_area("Watchlist", value=ticker or "", help="Symbols separated by commas or spaces")
+    presets = st.multiselect("Conditions", list(PRESET_RULES),
+                             default=["macd_bullish_cross", "below_lower_bollinger", "tenkan_kijun_bullish_cross"])
+    custom = st.text_input("Custom condition", placeholder="e.g. close > sma(50) and rsi(14) < 40")
+    lookback = st.number_input("Signals within the last N days", min_value=1, max_value=60, value=5)
+    if not st.button("Run screener"):
+        return
+
+    rules = {name: PRESET_RULES[name] for name in presets}
+    if custom.strip():
+        rules["custom"] = custom.strip()
+    symbols = parse_watchlist(watchlist)
+    if not symbols or not rules:
+        st.warning("Enter at least one symbol and one condition")
+        return
+    with st.spinner(f"Screening {len(symbols)} symbols..."):
+        try:
+            matches = screen(load_panel(symbols, start=start, end=end), rules, lookback=int(lookback))
+        except ValueError as e:
+            st.error(str(e))
+            return
+    if not matches:
+        st.info("No symbol matched the selected conditions")
+        return
+    st.dataframe(pd.DataFrame([{"Symbol": m.symbol, "Condition": m.rule, "Last signal": m.last_signal,
+                                "Signal dates": ", ".join(m.dates)} for m in matches]), hide_index=True)
+
+
+def perform_tech_analysis(ticker):
     logging.info(f"*********************** perform_tech_analysis START with input: ******************{ticker}")
     tickers = ("NONE",)
     if ticker:
@@ -151,6 +226,9 @@ async def perform_tech_analysis(ticker):
     plot = st.selectbox("Select Plot", ptype)
     start = st.date_input('Start Date', pd.to_datetime('2024-01-01'))
     end = st.date_input('End Date', pd.to_datetime('today'))
+    default_backend = BACKENDS.index(app_config.chart_backend) if app_config.chart_backend in BACKENDS \
+        else BACKENDS.index(STATIC)
+    backend = st.radio("Chart rendering", BACKENDS, index=default_backend, horizontal=True)
 
     with st.spinner("In progress..."):
         if len(selected_ticker) > 0 and plot != 'NONE':
@@ -158,17 +236,20 @@ async def perform_tech_analysis(ticker):
 
             match (plot):
                 case 'BOLL':
-                    plot_ta("Bollinger bands", fetched_data, bollinger)
+                    plot_ta("Bollinger bands", fetched_data, bollinger, selected_ticker, start, end, backend)
                 case 'MA':
-                    plot_ta("Moving Average Ribbons", fetched_data, ma)
+                    plot_ta("Moving Average Ribbons", fetched_data, ma, selected_ticker, start, end, backend)
                 case 'MACD':
-                    plot_ta("MACD", fetched_data, macd)
+                    plot_ta("MACD", fetched_data, macd, selected_ticker, start, end, backend)
                 case 'CANDLE':
-                    plot_ta("CANDLE", fetched_data, candle)
+                    plot_ta("CANDLE", fetched_data, candle, selected_ticker, start, end, backend)
                 case 'CLOUD':
-                    plot_ta("CLOUD", fetched_data, cloud)
+                    plot_ta("CLOUD", fetched_data, cloud, selected_ticker, start, end, backend)
+
+    with st.expander("Watchlist screener"):
+        perform_screening(ticker, start, end)
 
 
 if __name__ == "__main__":
     ticker = "RGTI"
-    asyncio.run(perform_tech_analysis(ticker))
+    perform_tech_analysis(ticker)
@@ -1,14 +1,17 @@
 """Manages the app's user interface and user interactions.
-Triggers the DataFetcher module to gather real-time data for the specified stock symbol"""
-import asyncio
+Triggers the DataFetcher module to gather real-time data for the specified stock symbol
 
+The agent stack (beeai_framework, langchain, yfinance, ...) and the charting stack (matplotlib, mplfinance) are
+imported on first use, when a report or an answer is requested and when the technical analysis tab is drawn,
+so that the symbol input renders without waiting for them."""
 import streamlit as st
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 
-from agents.stock_adv_agent import get_recommendation_agent_response
-from agents.stock_adv_report_generator import ReportGeneratorAgent
-from ui.stock_adv_technical_analysis import perform_tech_analysis
+from ui.progression_bar import ProgressionBar
+from utils.event_loop import run_async
+from tools.stock_adv_symbol_index import normalize_symbol, symbol_index
+from utils.report_cache import ReportCacheKey, report_cache
 from agents.stock_adv_security import (
     validate_stock_symbol,
     sanitize_input,
@@ -16,8 +19,6 @@ from agents.stock_adv_security import (
     chat_rate_limiter
 )
 
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
-
 
 def create_message(role: str, content: str) -> Dict[str, str]:
     """
@@ -62,22 +63,49 @@ def update_chat_history(input: Any, result: Any) -> None:
     chat_history.extend([input, result])
 
 
-async def generate_report_async(user_stock: str):
-    """Generate the report asynchronously."""
+async def _run_report_generator(generator_class: type, user_stock: str,
+                                progress_bar: Optional[ProgressionBar] = None) -> Tuple[Optional[str], bool]:
+    """Run the multi-agent pipeline and report whether its output may be shared through the cache."""
+    report_generator = generator_class(user_stock, progress_bar)
+    generated_report = await report_generator.generate_report()
+    return generated_report, report_generator.report_completed
+
+
+def generate_report(user_stock: str, force: bool = False):
+    """
+    Generate the report on the shared background event loop.
+
+    The session cache is checked first, then the cache shared by all sessions. ``force`` bypasses both
+    and runs a fresh analysis.
+    """
     # Check if report already exists in session state for this stock
-    if 'generated_report' in st.session_state and st.session_state.get('report_stock') == user_stock:
+    if not force and 'generated_report' in st.session_state and st.session_state.get('report_stock') == user_stock:
         logging.info(f"Using cached report for {user_stock}")
         return st.session_state['generated_report']
 
-    logging.info(f"Generating new report for {user_stock}")
-    report_generator = ReportGeneratorAgent(user_stock)
-    generated_report = await report_generator.generate_report()
+    logging.info(f"Requesting report for {user_stock} (force={force})")
+    # Imported here, in the script thread: the first import of the agent stack takes seconds and must not
+    # block the shared event loop, which serves the other sessions' reports and chats meanwhile
+    from agents.stock_adv_report_generator import ReportGeneratorAgent
+
+    cache_key = ReportCacheKey.for_ticker(user_stock)
+    # Created here, in the script thread; the pipeline only records progress and it is drawn while waiting
+    progress_bar = ProgressionBar()
+    generated_report, cache_status = run_async(
+        report_cache.get_or_generate(cache_key,
+                                     lambda: _run_report_generator(ReportGeneratorAgent, user_stock, progress_bar),
+                                     force=force),
+        on_wait=progress_bar.refresh,
+    )
+    if cache_status in ("hit", "stale"):
+        progress_bar.clear()
+    st.session_state['report_cache_status'] = cache_status
 
     # Store in session state
     if generated_report:
         st.session_state['generated_report'] = generated_report
         st.session_state['report_stock'] = user_stock
-        logging.info(f"Report cached in session state for {user_stock}")
+        logging.info(f"Report cached in session state for {user_stock} (shared cache: {cache_status})")
 
     return generated_report
 
@@ -85,7 +113,8 @@ async def generate_report_async(user_stock: str):
 def get_user_input() -> str:
     """
     Prompt the user for a stock ticker symbol and store it in ``st.session_state``.
-    Includes validation to ensure only valid stock symbols are accepted.
+    Includes validation to ensure only valid stock symbols are accepted, and lists the listed symbols
+    starting with what was typed while it is not a known symbol.
 
     Returns
     -------
@@ -107,10 +136,16 @@ def get_user_input() -> str:
 
     # Validate and update session state only when the user provides a non‑empty value
     if user_stock:
+        if user_stock not in symbol_index:
+            suggestions = symbol_index.suggest(user_stock)
+            if suggestions:
+                st.caption("Matching symbols: " + ", ".join(f"**{s}** ({name})" for s, name in suggestions))
+
         # Validate stock symbol
         is_valid, error_message = validate_stock_symbol(user_stock)
 
         if is_valid:
+            user_stock = normalize_symbol(user_stock)
             st.session_state[STOCK_KEY] = user_stock
             # Clear any previous validation errors
             if VALIDATION_KEY in st.session_state:
@@ -140,7 +175,11 @@ def should_regenerate_report(user_stock: str) -> bool:
 
 def perform_fundamental_analysis(user_stock: str):
     """Perform fundamental analysis and display results."""
-    if st.button("Generate Report"):
+    generate_col, regenerate_col = st.columns(2)
+    generate_clicked = generate_col.button("Generate Report")
+    regenerate_clicked = regenerate_col.button("Regenerate Report", help="Ignore cached reports and run a fresh analysis")
+
+    if generate_clicked or regenerate_clicked:
         if user_stock:
             # Get or create session ID for rate limiting
             if 'session_id' not in st.session_state:
@@ -160,9 +199,9 @@ def perform_fundamental_analysis(user_stock: str):
             try:
                 logging.info(f"Generating report for: {user_stock}")
                 # Check if we need to regenerate
-                if should_regenerate_report(user_stock):
+                if regenerate_clicked or should_regenerate_report(user_stock):
                     with st.spinner(f":green[Generating report for {user_stock}...This may take a few minutes]"):
-                        generated_report = asyncio.run(generate_report_async(user_stock))
+                        generated_report = generate_report(user_stock, force=regenerate_clicked)
                         st.session_state['generated_report'] = generated_report
                         st.session_state['last_stock'] = user_stock
                 else:
@@ -171,6 +210,10 @@ def perform_fundamental_analysis(user_stock: str):
 
                 if generated_report:
                     st.text_area(":blue[Here is the generated report:]", value=generated_report, height=500)
+                    if st.session_state.get('report_cache_status') == "stale":
+                        st.info("Showing a recently cached report while a fresh one is generated in the background.")
+                    elif st.session_state.get('report_cache_status') == "hit":
+                        st.info("Showing a recently generated report. Use 'Regenerate Report' for a fresh analysis.")
                     st.success("Report generated successfully!")
                 else:
                     st.error("Failed to generate report. Please try again.")
@@ -207,7 +250,9 @@ def perform_fundamental_analysis(user_stock: str):
 
             try:
                 with st.spinner("Getting answer..."):
-                    agent_response = asyncio.run(get_recommendation_agent_response(sanitized_question))
+                    from agents.stock_adv_agent import get_recommendation_agent_response
+
+                    agent_response = run_async(get_recommendation_agent_response(sanitized_question))
                     if agent_response:
                         update_chat_history(user_question, agent_response)
                     else:
@@ -231,7 +276,9 @@ def create_interface():
     with tab2:
         st.header("Technical analysis")
         try:
-            asyncio.run(perform_tech_analysis(user_stock))
+            from ui.stock_adv_technical_analysis import perform_tech_analysis
+
+            perform_tech_analysis(user_stock)
         except Exception as e:
             st.error(f"Error in technical analysis: {str(e)}")
             logging.error(f"Technical analysis failed: {e}", exc_info=True)
@@ -0,0 +1,121 @@
+"""Process-wide asyncio event loop for the Streamlit app.
+
+Streamlit runs every script rerun synchronously in its own thread. Calling ``asyncio.run`` there creates and
+closes a fresh loop for each action, which discards every async HTTP connection pool, model client and
+loop-bound cache created during that action. Instead, one loop is started in a daemon thread the first time it
+is needed and lives as long as the process; UI code hands it coroutines with ``run_async`` and waits for the
+result, so loop-bound resources survive across reruns and sessions.
+
+Coroutines submitted here run outside the Streamlit script thread: they must not call ``st.*`` directly
+(``ProgressionBar`` records updates that the waiting script thread draws through ``on_wait``).
+"""
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Coroutine, Optional
+
+
+class BackgroundEventLoop:
+    """
+    An asyncio loop running forever in a daemon thread, started lazily.
+
+    Attributes:
+        name: Name of the loop thread
+    """
+
+    def __init__(self, name: str = "app-event-loop"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The running loop, started on first access."""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._start()
+            return self._loop
+
+    def _start(self) -> None:
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+            loop.close()
+
+        self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+        self._thread.start()
+        ready.wait()
+        self._loop = loop
+        logging.info(f"BackgroundEventLoop {self.name} started")
+
+    def in_loop_thread(self) -> bool:
+        return self._thread is threading.current_thread()
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> Future:
+        """Schedule *coro* on the loop from any thread and return a ``concurrent.futures.Future``."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None,
+            on_wait: Optional[Callable[[], None]] = None, poll_interval: float = 0.2) -> Any:
+        """
+        Run *coro* on the loop and block the calling thread until it finishes.
+
+        Args:
+            coro: Coroutine to run
+            timeout: Seconds to wait before cancelling it (no limit when omitted)
+            on_wait: Called in the waiting thread every *poll_interval* seconds and once at the end, e.g. to
+                draw progress recorded by the coroutine
+
+        Raises:
+            RuntimeError: When called from the loop thread itself, where waiting would deadlock
+            TimeoutError: When *timeout* seconds pass first (the coroutine is cancelled)
+        """
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("run() cannot wait on the event loop from inside it; await the coroutine instead")
+        future = self.submit(coro)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while True:
+                wait = poll_interval if on_wait is not None else None
+                if deadline is not None:
+                    remaining = max(0.0, deadline - time.monotonic())
+                    wait = remaining if wait is None else min(wait, remaining)
+                try:
+                    return future.result(wait)
+                except TimeoutError:
+                    if deadline is not None and time.monotonic() >= deadline:
+                        future.cancel()
+                        raise
+                if on_wait is not None:
+                    on_wait()
+        finally:
+            if on_wait is not None:
+                on_wait()
+
+    def stop(self) -> None:
+        """Stop the loop and wait for its thread; a later submission starts a new one."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            logging.info(f"BackgroundEventLoop {self.name} stopped")
+
+
+# Global loop shared by every session of the process
+background_loop = BackgroundEventLoop()
+
+
+def run_async(coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None,
+              on_wait: Optional[Callable[[], None]] = None) -> Any:
+    """Run *coro* on the shared background loop and return its result (replacement for ``asyncio.run``)."""
+    return background_loop.run(coro, timeout, on_wait)
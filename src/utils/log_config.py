@@ -0,0 +1,293 @@
+"""Process-wide logging configuration and cheap logging of large payloads.
+
+``configure_logging`` installs the handlers of the root logger once, at the level of ``AppConfig.log_level``;
+modules only call ``logging.info`` & co. and never configure logging themselves.
+
+Large objects (DataFrames, fetched pages, agent reports) are logged through ``payload``::
+
+    logging.debug("financial_news=%s", payload(financial_news))
+
+The message is then formatted only if a handler emits the record, the object's text is cut to
+``LOG_MAX_PAYLOAD_CHARS`` characters, and a call site logging payloads repeatedly has only one record in
+``LOG_PAYLOAD_SAMPLE_EVERY`` written in full, the others carrying a one-line summary of each payload.
+
+The logging thread (usually the event loop) only formats the message and puts the record on a bounded queue; a
+listener thread writes it to the console and to the log file. The file is rotated by size (``LOG_MAX_BYTES``)
+or time (``LOG_ROTATE_WHEN``), rotated files are gzipped, and ``LOG_FORMAT=json`` writes one JSON object per
+line for log collectors.
+"""
+import atexit
+import copy
+import gzip
+import json
+import logging
+import os
+import queue
+import shutil
+import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+from config.config import app_config
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+LOG_FILE = 'stock_advisor.log'
+
+# LOG_FORMAT values
+TEXT = "text"
+JSON = "json"
+FORMATS = (TEXT, JSON)
+
+# LOG_ROTATION values
+SIZE = "size"
+TIME = "time"
+NONE = "none"
+ROTATIONS = (SIZE, TIME, NONE)
+
+
+class Payload:
+    """
+    Log argument formatted only when its record is emitted, truncated to *limit* characters.
+
+    Attributes:
+        value: The object to log
+        limit: Maximum number of characters written
+    """
+
+    __slots__ = ("value", "limit", "_text")
+
+    def __init__(self, value: Any, limit: Optional[int] = None):
+        self.value = value
+        self.limit = app_config.log_max_payload_chars if limit is None else limit
+        self._text = None
+
+    def summary(self) -> str:
+        """Type and size of the value, computed without formatting it."""
+        value = self.value
+        shape = getattr(value, "shape", None)
+        if shape is not None:
+            return f"<{type(value).__name__} {'x'.join(str(n) for n in shape)}>"
+        if hasattr(value, "__len__"):
+            unit = " chars" if isinstance(value, str) else " items"
+            return f"<{type(value).__name__} {len(value)}{unit}>"
+        return f"<{type(value).__name__}>"
+
+    def __str__(self) -> str:
+        # Every handler formats the record again: the value is converted once
+        if self._text is None:
+            text = str(self.value)
+            if len(text) > self.limit:
+                text = f"{text[:self.limit]}… [{len(text) - self.limit} more chars]"
+            self._text = text
+        return self._text
+
+
+def payload(value: Any, limit: Optional[int] = None) -> Payload:
+    """Wrap a large object passed as a ``%s`` argument of a log call."""
+    return Payload(value, limit)
+
+
+class PayloadSampler(logging.Filter):
+    """
+    Handler filter writing the payloads of one record in every *every* per call site in full.
+
+    The other records keep their message, with each payload replaced by its ``summary()``.
+    """
+
+    def __init__(self, every: int):
+        super().__init__()
+        self.every = max(1, every)
+        self._counts: Dict[Tuple[str, int], int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        args = record.args
+        if self.every == 1 or not isinstance(args, tuple) or getattr(record, "payload_sampled", False):
+            return True
+        if not any(isinstance(arg, Payload) for arg in args):
+            return True
+        # A record reaches every handler: count it once, at the first one
+        record.payload_sampled = True
+        key = (record.pathname, record.lineno)
+        with self._lock:
+            seen = self._counts.get(key, 0)
+            self._counts[key] = seen + 1
+        if seen % self.every:
+            record.args = tuple(arg.summary() if isinstance(arg, Payload) else arg for arg in args)
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, source location, thread and exception."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+            "thread": record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def _gzip_namer(name: str) -> str:
+    return f"{name}.gz"
+
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    with open(source, "rb") as src, gzip.open(dest, "wb") as out:
+        shutil.copyfileobj(src, out)
+    os.remove(source)
+
+
+def rotating_file_handler(path: str, rotation: str = app_config.log_rotation,
+                          max_bytes: int = app_config.log_max_bytes, when: str = app_config.log_rotate_when,
+                          backup_count: int = app_config.log_backup_count,
+                          compress: bool = app_config.log_compress) -> logging.FileHandler:
+    """
+    File handler of the log file, rotated as selected by ``LOG_ROTATION``.
+
+    Args:
+        path: Log file
+        rotation: ``size`` (at *max_bytes*), ``time`` (at *when*, e.g. ``midnight`` or ``H``) or ``none``
+        backup_count: Rotated files kept
+        compress: Gzip the rotated files (``stock_advisor.log.1.gz``)
+    """
+    if rotation == SIZE:
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8",
+                                      delay=True)
+    elif rotation == TIME:
+        handler = TimedRotatingFileHandler(path, when=when, backupCount=backup_count, encoding="utf-8", delay=True)
+    elif rotation == NONE:
+        return logging.FileHandler(path, encoding="utf-8", delay=True)
+    else:
+        raise ValueError(f"Unknown log rotation '{rotation}', expected one of {list(ROTATIONS)}")
+    if compress:
+        handler.namer = _gzip_namer
+        handler.rotator = _gzip_rotator
+    return handler
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    ``QueueHandler`` that never blocks the logging thread: when the queue is full, the record is dropped.
+
+    Attributes:
+        dropped: Number of records dropped so far
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge the arguments now, while they are in the state they were logged in, but leave the layout
+        # (text or JSON) to the listener's handlers; the traceback is kept apart for the JSON "exception" field
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_lock = threading.Lock()
+_handlers: List[logging.Handler] = []
+_listener: Optional[QueueListener] = None
+
+
+def _level(level) -> int:
+    if isinstance(level, int):
+        return level
+    value = logging.getLevelName(str(level).upper())
+    if isinstance(value, int):
+        return value
+    logging.warning(f"Unknown log level {level!r}, using INFO")
+    return logging.INFO
+
+
+def configure_logging(level=app_config.log_level, log_file: Optional[str] = LOG_FILE,
+                      stream: Optional[TextIO] = None, force: bool = False, fmt: str = app_config.log_format) -> None:
+    """
+    Install the queue handler of the root logger and start the listener thread writing to the console and to
+    *log_file*; later calls do nothing unless *force* is set.
+
+    Args:
+        level: Level name (``LOG_LEVEL``) or number
+        log_file: File receiving the logs, rotated per ``LOG_ROTATION``; None to log to the console only
+        stream: Console stream, stderr by default
+        force: Replace the handlers installed by a previous call
+        fmt: ``text`` or ``json``
+    """
+    global _listener
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown log format '{fmt}', expected one of {list(FORMATS)}")
+    with _lock:
+        if _handlers and not force:
+            return
+        _shutdown()
+
+        targets: List[logging.Handler] = [logging.StreamHandler(stream or sys.stderr)]
+        if log_file:
+            targets.insert(0, rotating_file_handler(log_file))
+        formatter = JSONFormatter() if fmt == JSON else logging.Formatter(TEXT_FORMAT)
+        for target in targets:
+            target.setFormatter(formatter)
+
+        log_queue: queue.Queue = queue.Queue(app_config.log_queue_size)
+        handler = NonBlockingQueueHandler(log_queue)
+        handler.addFilter(PayloadSampler(app_config.log_payload_sample_every))
+        _listener = QueueListener(log_queue, *targets, respect_handler_level=True)
+        _listener.start()
+
+        root = logging.getLogger()
+        root.addHandler(handler)
+        _handlers.append(handler)
+        root.setLevel(_level(level))
+
+
+def _shutdown() -> None:
+    global _listener
+    root = logging.getLogger()
+    for handler in _handlers:
+        if handler.dropped:
+            # Blocking put: the listener is still draining the queue
+            handler.queue.put(handler.prepare(root.makeRecord(
+                root.name, logging.WARNING, __file__, 0, "%d log records dropped: the log queue was full",
+                (handler.dropped,), None)))
+        root.removeHandler(handler)
+        handler.close()
+    _handlers.clear()
+    if _listener is not None:
+        # Writes the records still queued, then joins the thread
+        _listener.stop()
+        for target in _listener.handlers:
+            target.close()
+        _listener = None
+
+
+def shutdown_logging() -> None:
+    """Write the queued records and stop the listener thread; called at interpreter exit."""
+    with _lock:
+        _shutdown()
+
+
+atexit.register(shutdown_logging)
@@ -1,37 +1,102 @@
+import inspect
 import logging
 import time
 from functools import wraps
 
+from tools.stock_adv_symbol_index import classify_symbol
+from utils.log_config import configure_logging
+from utils.metrics import metrics
+
+# ----------------------------------------------------------------------
+# Logging configuration (once per process, at AppConfig.log_level)
+# ----------------------------------------------------------------------
+configure_logging()
+
 # ----------------------------------------------------------------------
-# Logging configuration (run once when this module is imported)
+# Metrics recorded by ``log_performance``
 # ----------------------------------------------------------------------
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('stock_advisor.log'),
-        logging.StreamHandler()
-    ]
-)
+PERFORMANCE_LABELS = ("function", "agent", "ticker_class")
+
+function_calls = metrics.counter(
+    "stockadvisor_function_calls_total", "Calls of instrumented functions by outcome",
+    PERFORMANCE_LABELS + ("outcome",))
+function_duration = metrics.histogram(
+    "stockadvisor_function_duration_seconds", "Wall time of instrumented functions", PERFORMANCE_LABELS)
+function_in_progress = metrics.gauge(
+    "stockadvisor_function_in_progress", "Instrumented calls currently running", ("function", "agent"))
+
+
+def _find_ticker(args, kwargs):
+    """The ticker a call works on: an agent's ``ticker_symbol``/``stock_symbol`` or a tool input's."""
+    for value in list(args) + list(kwargs.values()):
+        for attribute in ("ticker_symbol", "stock_symbol"):
+            ticker = getattr(value, attribute, None)
+            if isinstance(ticker, str):
+                return ticker
+    return None
+
+
+def _performance_labels(func, args, kwargs) -> dict:
+    # Methods are labelled with their class, module-level functions with their module
+    if "." in func.__qualname__ and args and hasattr(args[0], func.__name__):
+        agent = type(args[0]).__name__
+    else:
+        agent = func.__module__.rsplit(".", 1)[-1]
+    return {"function": func.__name__, "agent": agent, "ticker_class": classify_symbol(_find_ticker(args, kwargs))}
+
+
+class _Measurement:
+    """Times one call, then logs it and records it into the metrics registry."""
+
+    def __init__(self, func, args, kwargs):
+        self.func = func
+        self.labels = _performance_labels(func, args, kwargs)
+        self.start = time.perf_counter()
+        function_in_progress.inc(function=self.labels["function"], agent=self.labels["agent"])
+
+    def finish(self, error: BaseException = None) -> None:
+        duration = time.perf_counter() - self.start
+        function_in_progress.dec(function=self.labels["function"], agent=self.labels["agent"])
+        function_duration.observe(duration, **self.labels)
+        function_calls.inc(outcome="error" if error else "ok", **self.labels)
+        if error:
+            logging.error("%s failed after %.2fs: %s", self.func.__name__, duration, error)
+        else:
+            logging.info("%s completed in %.2fs", self.func.__name__, duration)
 
 
 # ----------------------------------------------------------------------
 # Performance‑logging decorator
 # ----------------------------------------------------------------------
 def log_performance(func):
-    """Decorator to log async function execution time."""
-
-    @wraps(func)
-    async def wrapper(*args, **kwargs):
-        start = time.time()
-        try:
-            result = await func(*args, **kwargs)
-            duration = time.time() - start
-            logging.info(f"{func.__name__} completed in {duration:.2f}s")
+    """
+    Decorator to log the execution time of a sync or async function and record it into the metrics registry.
+
+    Each call updates ``stockadvisor_function_duration_seconds`` and ``stockadvisor_function_calls_total``,
+    labelled by function, agent (class or module) and ticker class.
+    """
+
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            measurement = _Measurement(func, args, kwargs)
+            try:
+                result = await func(*args, **kwargs)
+            except BaseException as e:
+                measurement.finish(e)
+                raise
+            measurement.finish()
+            return result
+    else:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            measurement = _Measurement(func, args, kwargs)
+            try:
+                result = func(*args, **kwargs)
+            except BaseException as e:
+                measurement.finish(e)
+                raise
+            measurement.finish()
             return result
-        except Exception as e:
-            duration = time.time() - start
-            logging.error(f"{func.__name__} failed after {duration:.2f}s: {e}")
-            raise
 
     return wrapper
@@ -0,0 +1,294 @@
+"""In-process metrics registry with Prometheus text exposition.
+
+Counters, gauges and fixed-bucket histograms are registered once by name and updated with label values::
+
+    reports = metrics.counter("stockadvisor_reports_total", "Reports generated", ("outcome",))
+    reports.inc(outcome="ok")
+
+The registry renders the Prometheus text format (version 0.0.4). ``start_metrics_exporter`` serves it over HTTP
+on ``METRICS_PORT`` and/or rewrites ``METRICS_DUMP_PATH`` every ``METRICS_DUMP_INTERVAL`` seconds, for the
+node_exporter textfile collector or for a quick look at the latency percentiles.
+"""
+import logging
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from config.config import app_config
+
+# Latency buckets in seconds, from cached lookups up to full multi-agent report runs
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    """
+    Base of the metric families: one series per combination of label values.
+
+    Attributes:
+        name: Metric name, e.g. ``stockadvisor_function_duration_seconds``
+        help: One-line description
+        labelnames: Names of the labels every update must provide
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._series: Dict[LabelValues, object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {list(self.labelnames)}, got {sorted(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: LabelValues, extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(zip(self.labelnames, key)) + ([extra] if extra else [])
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing total."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError(f"Counter {self.name} can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._series.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        return [f"{self.name}{self._labels(key)} {_format_value(value)}" for key, value in self._series.items()]
+
+
+class Gauge(Counter):
+    """Value that can go up and down, e.g. the calls in progress."""
+
+    kind = "gauge"
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = float(value)
+
+
+class Histogram(Metric):
+    """
+    Distribution over fixed bucket upper bounds, rendered as cumulative Prometheus buckets.
+
+    Attributes:
+        buckets: Sorted upper bounds in the observed unit; ``+Inf`` is implied
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        slot = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # per-bucket counts (last one is +Inf), sum, count
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][slot] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return series[2] if series else 0
+
+    def quantile(self, q: float, **labels: str) -> float:
+        """
+        Estimate the *q* quantile (e.g. 0.95) by linear interpolation inside its bucket, like PromQL's
+        ``histogram_quantile``; NaN when nothing was observed.
+        """
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            counts = list(series[0]) if series else []
+        total = sum(counts)
+        if not total:
+            return math.nan
+        rank = q * total
+        seen = 0
+        for i, count in enumerate(counts):
+            if count and seen + count >= rank:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total, count) in self._series.items():
+            cumulative = 0
+            for bound, bucket in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket
+                lines.append(f"{self.name}_bucket{self._labels(key, ('le', _format_value(bound)))} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{self._labels(key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metric families of the process; registering an existing name returns the same family."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name: str, help: str, labelnames: Sequence[str], **kwargs) -> Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, labelnames, **kwargs)
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind} "
+                                 f"with labels {list(metric.labelnames)}")
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, help, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            families = list(self._metrics.values())
+        return "".join(metric.render() + "\n" for metric in families)
+
+    def dump(self, path: str) -> None:
+        """Write ``render()`` to *path* atomically, so that a scraper never reads a partial file."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as out:
+            out.write(self.render())
+        os.replace(tmp, path)
+
+
+# Global registry of the process
+metrics = MetricsRegistry()
+
+
+def serve_metrics(port: int, registry: MetricsRegistry = metrics, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Serve ``registry`` at ``http://host:port/metrics`` from a daemon thread and return the server."""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    logging.info(f"Metrics served on http://{host}:{server.server_port}/metrics")
+    return server
+
+
+def _dump_periodically(path: str, interval: float, registry: MetricsRegistry) -> None:
+    while True:
+        try:
+            registry.dump(path)
+        except OSError as e:
+            logging.error(f"Metrics dump to {path} failed: {e}")
+        time.sleep(interval)
+
+
+_exporter_lock = threading.Lock()
+_exporter_started = False
+
+
+def start_metrics_exporter(port: int = app_config.metrics_port, dump_path: str = app_config.metrics_dump_path,
+                           interval: float = app_config.metrics_dump_interval) -> None:
+    """
+    Start the exporters enabled in the configuration, once per process (later calls do nothing).
+
+    Args:
+        port: HTTP port of the ``/metrics`` endpoint; 0 disables it
+        dump_path: File rewritten every *interval* seconds; empty disables it
+    """
+    global _exporter_started
+    with _exporter_lock:
+        if _exporter_started:
+            return
+        _exporter_started = True
+    if port:
+        try:
+            serve_metrics(port)
+        except OSError as e:
+            logging.error(f"Metrics endpoint could not listen on port {port}: {e}")
+    if dump_path:
+        threading.Thread(target=_dump_periodically, args=(dump_path, interval, metrics),
+                         name="metrics-dump", daemon=True).start()
+        logging.info(f"Metrics dumped to {dump_path} every {interval:g}s")
@@ -0,0 +1,538 @@
+"""Storage backends of the session rate limiters.
+
+A backend holds the per-user request history and performs the check-and-increment of ``RateLimiter`` as one
+atomic step, so that several limiters (or several Streamlit processes) sharing a backend enforce one limit:
+
+- ``InProcessBackend`` (default): LRU-ordered dict in the process memory; limits are per process.
+- ``SQLiteBackend``: a SQLite file shared by every process of the host; each check runs in a
+  ``BEGIN IMMEDIATE`` transaction, which serialises concurrent writers.
+- ``RedisBackend``: any client with the redis-py sorted-set, pipeline and script commands, for limits shared
+  across hosts; ``InMemoryRedis`` is a single-process stand-in implementing that subset of commands.
+
+Every backend supports the ``"sliding_window"`` and ``"gcra"`` (Generic Cell Rate Algorithm) modes.
+"""
+import itertools
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config.config import app_config
+
+SLIDING_WINDOW = "sliding_window"
+GCRA = "gcra"
+MODES = (SLIDING_WINDOW, GCRA)
+
+MEMORY = "memory"
+SQLITE = "sqlite"
+REDIS = "redis"
+
+
+def gcra_remaining(arrival: float, now: float, max_requests: int, time_window: float) -> int:
+    """Requests still allowed right now given the theoretical arrival time *arrival*."""
+    interval = time_window / max_requests
+    backlog = max(arrival - now, 0.0)
+    return max(0, int((time_window - backlog) / interval + 1e-9))
+
+
+def gcra_acquire(arrival: float, now: float, max_requests: int, time_window: float) -> Tuple[bool, float, int]:
+    """
+    One GCRA step: a token bucket refilling *max_requests* tokens per *time_window*.
+
+    Args:
+        arrival: Theoretical arrival time of the user's next request (``now`` for a new user)
+        now: Current time in seconds
+
+    Returns:
+        (allowed, new arrival time, remaining requests)
+    """
+    candidate = max(arrival, now) + time_window / max_requests
+    allowed = candidate - now <= time_window * (1 + 1e-9)
+    if allowed:
+        arrival = candidate
+    return allowed, arrival, gcra_remaining(arrival, now, max_requests, time_window)
+
+
+class RateLimitBackend(ABC):
+    """Per-key request history with an atomic check-and-increment."""
+
+    modes: Tuple[str, ...] = MODES
+
+    @abstractmethod
+    def acquire(self, key: str, now: float, max_requests: int, time_window: float, mode: str) -> Tuple[bool, int]:
+        """
+        Record a request for *key* if the limit allows it.
+
+        Returns:
+            (allowed, remaining requests in the current window)
+        """
+
+    @abstractmethod
+    def remaining(self, key: str, now: float, max_requests: int, time_window: float, mode: str) -> int:
+        """Requests still allowed for *key* without recording one."""
+
+    @abstractmethod
+    def reset(self, key: str) -> bool:
+        """Forget *key*; returns True if it was tracked."""
+
+
+class InProcessBackend(RateLimitBackend):
+    """
+    Request history kept in the process memory.
+
+    Keys are kept in least-recently-used order. Keys idle for a whole window hold no state that matters anymore
+    and are swept from the front every ``sweep_interval`` seconds, and at most ``max_keys`` keys are tracked:
+    beyond that the least recently seen one is dropped, so memory stays bounded however many sessions come and
+    go. In ``"sliding_window"`` mode each key keeps a deque of its accepted request times; in ``"gcra"`` mode a
+    single theoretical arrival time.
+
+    Attributes:
+        max_keys: Maximum number of keys tracked at once
+        sweep_interval: Seconds between two sweeps of idle keys (the first window seen when omitted)
+    """
+
+    def __init__(self, max_keys: int = 100_000, sweep_interval: Optional[float] = None):
+        self.max_keys = max_keys
+        self.sweep_interval = sweep_interval
+        # key -> [idle after, state]: a deque of timestamps, or the GCRA theoretical arrival time
+        self._keys: OrderedDict[str, list] = OrderedDict()
+        self._next_sweep: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of keys currently tracked."""
+        return len(self._keys)
+
+    def _sweep(self, now: float, time_window: float) -> None:
+        """Drop the keys idle for a whole window, oldest first; stops at the first active one."""
+        if self.sweep_interval is None:
+            self.sweep_interval = time_window
+        if self._next_sweep is None:
+            self._next_sweep = now + self.sweep_interval
+            return
+        self._next_sweep = now + self.sweep_interval
+        keys = self._keys
+        swept = 0
+        while keys:
+            key, (idle_after, _) = next(iter(keys.items()))
+            if now < idle_after:
+                break
+            del keys[key]
+            swept += 1
+        if swept > len(keys):
+            # Dicts never shrink their table on deletion; rebuild it once most keys are gone
+            self._keys = OrderedDict(keys)
+        if swept:
+            logging.debug(f"InProcessBackend swept {swept} idle keys, {len(self._keys)} tracked")
+
+    def _prune(self, timestamps: deque, now: float, time_window: float) -> None:
+        while timestamps and now - timestamps[0] >= time_window:
+            timestamps.popleft()
+
+    def acquire(self, key: str, now: float, max_requests: int, time_window: float, mode: str) -> Tuple[bool, int]:
+        with self._lock:
+            if self._next_sweep is None or now >= self._next_sweep:
+                self._sweep(now, time_window)
+            entry = self._keys.get(key)
+            if entry is None:
+                entry = [0.0, deque() if mode == SLIDING_WINDOW else now]
+                self._keys[key] = entry
+                if len(self._keys) > self.max_keys:
+                    evicted, _ = self._keys.popitem(last=False)
+                    logging.warning(f"InProcessBackend tracking more than {self.max_keys} keys, dropped {evicted}")
+            else:
+                self._keys.move_to_end(key)
+            entry[0] = now + time_window
+            if mode == SLIDING_WINDOW:
+                timestamps = entry[1]
+                self._prune(timestamps, now, time_window)
+                allowed = len(timestamps) < max_requests
+                if allowed:
+                    timestamps.append(now)
+                return allowed, max_requests - len(timestamps)
+            allowed, entry[1], remaining = gcra_acquire(entry[1], now, max_requests, time_window)
+            return allowed, remaining
+
+    def remaining(self, key: str, now: float, max_requests: int, time_window: float, mode: str) -> int:
+        with self._lock:
+            entry = self._keys.get(key)
+            if entry is None:
+                return max_requests
+            if mode == SLIDING_WINDOW:
+                self._prune(entry[1], now, time_window)
+                return max(0, max_requests - len(entry[1]))
+            return gcra_remaining(entry[1], now, max_requests, time_window)
+
+    def reset(self, key: str) -> bool:
+        with self._lock:
+            return self._keys.pop(key, None) is not None
+
+
+class SQLiteBackend(RateLimitBackend):
+    """
+    Request history in a SQLite file shared by every process of the host.
+
+    The check and the increment run in one ``BEGIN IMMEDIATE`` transaction, so concurrent processes never admit
+    more requests than the limit together. Expired rows are purged every ``sweep_interval`` seconds. When the
+    database cannot be used the error is logged and requests are let through, so that a broken limiter never
+    takes the application down.
+
+    Attributes:
+        path: Location of the SQLite database
+        sweep_interval: Seconds between two purges of expired rows
+    """
+
+    def __init__(self, path: str, sweep_interval: float = 60.0):
+        self.path = path
+        self.sweep_interval = sweep_interval
+        self._next_sweep = 0.0
+        self._initialized = False
+        logging.info(f"SQLiteBackend initialized at {path}")
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS hits (
+                       key TEXT NOT NULL,
+                       ts REAL NOT NULL,
+                       expires_at REAL NOT NULL)"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS hits_key ON hits (key, ts)")
+            conn.execute("CREATE INDEX IF NOT EXISTS hits_expiry ON hits (expires_at)")
+            conn.execute("CREATE TABLE IF NOT EXISTS gcra (key TEXT PRIMARY KEY, arrival REAL NOT NULL)")
+            self._initialized = True
+        return conn
+
+    def _transaction(self, step: Callable[[sqlite3.Connection], Tuple[bool, int]], key: str,
+                     fallback: Tuple[bool, int]) -> Tuple[bool, int]:
+        try:
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    result = step(conn)
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                conn.execute("COMMIT")
+                return result
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logging.error(f"Rate limit store failed for {key}, request let through: {e}")
+            return fallback
+
+    def _sweep(self, conn: sqlite3.Connection, now: float) -> None:
+        self._next_sweep = now + self.sweep_interval
+        hits = conn.execute("DELETE FROM hits WHERE expires_at <= ?", (now,)).rowcount
+        users = conn.execute("DELETE FROM gcra WHERE arrival <= ?", (now,)).rowcount
+        if hits or users:
+            logging.debug(f"SQLiteBackend purged {hits} expired hits and {users} idle GCRA keys")
+
+    def acquire(self, key: str, now: float, max_requests: int, time_window: float, mode: str) -> Tuple[bool, int]:
+        def step(conn: sqlite3.Connection) -> Tuple[bool, int]:
+            if now >= self._next_sweep:
+                self._sweep(conn, now)
+            if mode == SLIDING_WINDOW:
+                conn.execute("DELETE FROM hits WHERE key = ? AND ts <= ?", (key, now - time_window))
+                used = conn.execute("SELECT COUNT(*) FROM hits WHERE key = ?", (key,)).fetchone()[0]
+                allowed = used < max_requests
+                if allowed:
+                    conn.execute("INSERT INTO hits VALUES (?, ?, ?)", (key, now, now + time_window))
+                    used += 1
+                return allowed, max_requests - used
+            row = conn.execute("SELECT arrival FROM gcra WHERE key = ?", (key,)).fetchone()
+            allowed, arrival, remaining = gcra_acquire(row[0] if row else now, now, max_requests, time_window)
+            if allowed:
+                conn.execute("INSERT OR REPLACE INTO gcra VALUES (?, ?)", (key, arrival))
+            return allowed, remaining
+
+        return self._transaction(step, key, fallback=(True, max_requests))
+
+    def remaining(self, key: str, now: float, max_requests: int, time_window: float, mode: str) -> int:
+        try:
+            conn = self._connect()
+            try:
+                if mode == SLIDING_WINDOW:
+                    used = conn.execute("SELECT COUNT(*) FROM hits WHERE key = ? AND ts > ?",
+                                        (key, now - time_window)).fetchone()[0]
+                    return max(0, max_requests - used)
+                row = conn.execute("SELECT arrival FROM gcra WHERE key = ?", (key,)).fetchone()
+                return gcra_remaining(row[0], now, max_requests, time_window) if row else max_requests
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logging.error(f"Rate limit store read failed for {key}: {e}")
+            return max_requests
+
+    def reset(self, key: str) -> bool:
+        def step(conn: sqlite3.Connection) -> Tuple[bool, int]:
+            removed = conn.execute("DELETE FROM hits WHERE key = ?", (key,)).rowcount
+            removed += conn.execute("DELETE FROM gcra WHERE key = ?", (key,)).rowcount
+            return removed > 0, 0
+
+        return self._transaction(step, key, fallback=(False, 0))[0]
+
+    def __len__(self) -> int:
+        """Number of keys currently tracked."""
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT (SELECT COUNT(DISTINCT key) FROM hits) + (SELECT COUNT(*) FROM gcra)"
+                                ).fetchone()[0]
+        finally:
+            conn.close()
+
+
+# Atomic GCRA step on the server: KEYS[1] holds the theoretical arrival time, ARGV are now, max_requests and
+# time_window; returns {allowed, remaining}. Mirrors ``gcra_acquire``; the key expires once it is idle.
+GCRA_SCRIPT = """
+local now = tonumber(ARGV[1])
+local max_requests = tonumber(ARGV[2])
+local time_window = tonumber(ARGV[3])
+local interval = time_window / max_requests
+local arrival = tonumber(redis.call('GET', KEYS[1])) or now
+local candidate = math.max(arrival, now) + interval
+local allowed = 0
+if candidate - now <= time_window * (1 + 1e-9) then
+    allowed = 1
+    arrival = candidate
+    redis.call('SET', KEYS[1], string.format('%.17g', arrival), 'PX', math.ceil((arrival - now) * 1000) + 1)
+end
+local backlog = math.max(arrival - now, 0)
+return {allowed, math.max(0, math.floor((time_window - backlog) / interval + 1e-9))}
+"""
+
+
+class RedisBackend(RateLimitBackend):
+    """
+    Request history in a Redis-like store, shared across hosts.
+
+    In ``"sliding_window"`` mode each key is a sorted set of request ids scored by their time. One
+    ``MULTI``/``EXEC`` pipeline drops the expired ids, adds the new one, counts the set and refreshes its
+    expiry; when the count is over the limit the new id is removed again. The count already includes the
+    concurrent requests, so the limit is never exceeded; a rejected request only holds its slot for the round
+    trip. In ``"gcra"`` mode each key is the theoretical arrival time, updated by ``GCRA_SCRIPT`` in one atomic
+    server-side step. Idle keys expire in the store itself.
+
+    Like ``SQLiteBackend``, the backend fails open: when the store cannot be reached (*errors*) the error is
+    logged and requests are let through.
+
+    Attributes:
+        client: Object with the redis-py ``pipeline``, ``zremrangebyscore``, ``zadd``, ``zcard``, ``zrem``,
+            ``pexpire``, ``get``, ``delete`` and ``register_script`` commands (``redis.Redis`` or ``InMemoryRedis``)
+        prefix: Prefix of every key written by the backend
+        errors: Exception types of the client meaning the store is unavailable
+    """
+
+    def __init__(self, client, prefix: str = "stockadvisor:rate:",
+                 errors: Tuple[type, ...] = (ConnectionError, TimeoutError)):
+        self.client = client
+        self.prefix = prefix
+        self.errors = errors
+        self._ids = itertools.count()
+        self._origin = f"{os.getpid()}-{id(self):x}"
+        self._gcra = client.register_script(GCRA_SCRIPT)
+
+    def acquire(self, key: str, now: float, max_requests: int, time_window: float, mode: str) -> Tuple[bool, int]:
+        name = self.prefix + key
+        try:
+            if mode == GCRA:
+                allowed, remaining = self._gcra(keys=[name], args=[repr(now), max_requests, repr(time_window)])
+                return bool(allowed), int(remaining)
+            request_id = f"{now!r}-{self._origin}-{next(self._ids)}"
+            pipe = self.client.pipeline(transaction=True)
+            pipe.zremrangebyscore(name, "-inf", now - time_window)
+            pipe.zadd(name, {request_id: now})
+            pipe.zcard(name)
+            pipe.pexpire(name, int(time_window * 1000) + 1)
+            used = pipe.execute()[2]
+            if used > max_requests:
+                self.client.zrem(name, request_id)
+                return False, 0
+            return True, max_requests - used
+        except self.errors as e:
+            logging.error(f"Rate limit store failed for {key}, request let through: {e}")
+            return True, max_requests
+
+    def remaining(self, key: str, now: float, max_requests: int, time_window: float, mode: str) -> int:
+        name = self.prefix + key
+        try:
+            if mode == GCRA:
+                arrival = self.client.get(name)
+                return gcra_remaining(float(arrival), now, max_requests, time_window) if arrival else max_requests
+            pipe = self.client.pipeline(transaction=True)
+            pipe.zremrangebyscore(name, "-inf", now - time_window)
+            pipe.zcard(name)
+            return max(0, max_requests - pipe.execute()[1])
+        except self.errors as e:
+            logging.error(f"Rate limit store read failed for {key}: {e}")
+            return max_requests
+
+    def reset(self, key: str) -> bool:
+        try:
+            return bool(self.client.delete(self.prefix + key))
+        except self.errors as e:
+            logging.error(f"Rate limit store reset failed for {key}: {e}")
+            return False
+
+
+class InMemoryRedis:
+    """
+    Single-process stand-in for a Redis server, implementing the commands used by ``RedisBackend``.
+
+    Pipelines are executed under one lock, like ``MULTI``/``EXEC``; expiries use *clock*. The only script it
+    can run is ``GCRA_SCRIPT``, executed by ``gcra_acquire`` under the same lock.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._clock = clock
+        self._sets: Dict[str, Dict[str, float]] = {}
+        self._strings: Dict[str, str] = {}
+        self._expires: Dict[str, float] = {}
+        self._lock = threading.RLock()
+
+    def _expire(self, name: str) -> None:
+        if name in self._expires and self._clock() >= self._expires[name]:
+            self._sets.pop(name, None)
+            self._strings.pop(name, None)
+            del self._expires[name]
+
+    def _live(self, name: str) -> Dict[str, float]:
+        self._expire(name)
+        return self._sets.get(name, {})
+
+    def zremrangebyscore(self, name: str, minimum, maximum) -> int:
+        with self._lock:
+            members = self._live(name)
+            low, high = float(minimum), float(maximum)
+            dropped = [m for m, score in members.items() if low <= score <= high]
+            for member in dropped:
+                del members[member]
+            return len(dropped)
+
+    def zadd(self, name: str, mapping: Dict[str, float]) -> int:
+        with self._lock:
+            members = self._sets.setdefault(name, self._live(name))
+            added = sum(member not in members for member in mapping)
+            members.update(mapping)
+            return added
+
+    def zcard(self, name: str) -> int:
+        with self._lock:
+            return len(self._live(name))
+
+    def zrem(self, name: str, *members: str) -> int:
+        with self._lock:
+            live = self._live(name)
+            return sum(live.pop(member, None) is not None for member in members)
+
+    def pexpire(self, name: str, milliseconds: int) -> bool:
+        with self._lock:
+            if not self._live(name):
+                return False
+            self._expires[name] = self._clock() + milliseconds / 1000
+            return True
+
+    def get(self, name: str) -> Optional[bytes]:
+        with self._lock:
+            self._expire(name)
+            value = self._strings.get(name)
+            return None if value is None else value.encode()
+
+    def set(self, name: str, value, px: Optional[int] = None) -> bool:
+        with self._lock:
+            self._sets.pop(name, None)
+            self._strings[name] = str(value)
+            if px is None:
+                self._expires.pop(name, None)
+            else:
+                self._expires[name] = self._clock() + px / 1000
+            return True
+
+    def delete(self, *names: str) -> int:
+        with self._lock:
+            deleted = 0
+            for name in names:
+                self._expire(name)
+                had_set = bool(self._sets.pop(name, None))
+                had_string = self._strings.pop(name, None) is not None
+                deleted += had_set or had_string
+                self._expires.pop(name, None)
+            return deleted
+
+    def dbsize(self) -> int:
+        with self._lock:
+            for name in list(self._sets) + list(self._strings):
+                self._expire(name)
+            return sum(bool(members) for members in self._sets.values()) + len(self._strings)
+
+    def pipeline(self, transaction: bool = True) -> "_InMemoryPipeline":
+        return _InMemoryPipeline(self)
+
+    def register_script(self, script: str) -> Callable[..., list]:
+        if script != GCRA_SCRIPT:
+            raise NotImplementedError("InMemoryRedis only runs GCRA_SCRIPT")
+
+        def gcra(keys: List[str], args: list) -> list:
+            now, max_requests, time_window = float(args[0]), int(args[1]), float(args[2])
+            with self._lock:
+                arrival = self.get(keys[0])
+                allowed, arrival, remaining = gcra_acquire(float(arrival) if arrival else now, now,
+                                                           max_requests, time_window)
+                if allowed:
+                    self.set(keys[0], repr(arrival), px=math.ceil((arrival - now) * 1000) + 1)
+                return [int(allowed), remaining]
+        return gcra
+
+
+class _InMemoryPipeline:
+    """Queues commands and runs them atomically on ``execute``."""
+
+    def __init__(self, store: InMemoryRedis):
+        self._store = store
+        self._commands: List[Tuple[str, tuple]] = []
+
+    def __getattr__(self, command: str):
+        method = getattr(self._store, command)
+
+        def queue(*args):
+            self._commands.append((method, args))
+            return self
+        return queue
+
+    def execute(self) -> list:
+        with self._store._lock:
+            results = [method(*args) for method, args in self._commands]
+        self._commands = []
+        return results
+
+
+def create_backend(kind: str = app_config.rate_limit_backend, max_keys: int = app_config.rate_limit_max_keys
+                   ) -> RateLimitBackend:
+    """
+    Build the backend selected by ``RATE_LIMIT_BACKEND`` (``memory``, ``sqlite`` or ``redis``).
+
+    ``redis`` needs the optional ``redis`` package and connects to ``RATE_LIMIT_REDIS_URL``.
+    """
+    if kind == MEMORY:
+        return InProcessBackend(max_keys=max_keys)
+    if kind == SQLITE:
+        return SQLiteBackend(app_config.rate_limit_sqlite_path)
+    if kind == REDIS:
+        try:
+            import redis
+        except ImportError:
+            raise ValueError("RATE_LIMIT_BACKEND=redis requires the 'redis' package (pip install redis)") from None
+        return RedisBackend(redis.Redis.from_url(app_config.rate_limit_redis_url),
+                            errors=(redis.exceptions.ConnectionError, redis.exceptions.TimeoutError))
+    raise ValueError(f"Unknown rate limit backend '{kind}', expected one of {[MEMORY, SQLITE, REDIS]}")
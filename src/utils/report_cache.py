@@ -0,0 +1,306 @@
+"""Shared report cache used across Streamlit sessions and worker processes.
+
+Reports are stored in a small SQLite file so that every session (and every Streamlit process running on the
+same host) can reuse a report generated for the same ticker, model set and prompt version.
+Freshness follows US market hours: a report generated while the market is open stays fresh for
+``AppConfig.cache_duration_minutes``; a report generated while the market is closed stays fresh until the
+next market open, since none of the underlying prices change in the meantime.
+"""
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Awaitable, Callable, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from config.config import ModelConfig as mc, app_config
+from utils.event_loop import background_loop
+
+MARKET_TZ = ZoneInfo("America/New_York")
+MARKET_OPEN = (9, 30)
+MARKET_CLOSE = (16, 0)
+
+CONFIG_DIR = Path(__file__).resolve().parent.parent / "config"
+
+
+def compute_prompt_version() -> str:
+    """
+    Return a short fingerprint of every prompt and instruction file.
+
+    Any edit to an agent prompt changes the fingerprint, which in turn invalidates the reports generated
+    with the previous prompts. ``PROMPT_VERSION`` overrides the computed value.
+    """
+    if app_config.prompt_version:
+        return app_config.prompt_version
+
+    digest = hashlib.sha256()
+    for path in sorted(CONFIG_DIR.glob("stock_adv_*.py")):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:12]
+
+
+def is_market_open(moment: datetime) -> bool:
+    """Return True if *moment* falls inside regular NYSE trading hours (holidays are not modelled)."""
+    local = moment.astimezone(MARKET_TZ)
+    if local.weekday() >= 5:
+        return False
+    minutes = local.hour * 60 + local.minute
+    return MARKET_OPEN[0] * 60 + MARKET_OPEN[1] <= minutes < MARKET_CLOSE[0] * 60 + MARKET_CLOSE[1]
+
+
+def next_market_open(moment: datetime) -> datetime:
+    """Return the next regular-session open strictly after *moment*."""
+    local = moment.astimezone(MARKET_TZ)
+    candidate = local.replace(hour=MARKET_OPEN[0], minute=MARKET_OPEN[1], second=0, microsecond=0)
+    if candidate <= local:
+        candidate += timedelta(days=1)
+    while candidate.weekday() >= 5:
+        candidate += timedelta(days=1)
+    return candidate
+
+
+def compute_fresh_until(created_at: float, ttl_minutes: int) -> float:
+    """
+    Return the epoch timestamp until which a report created at *created_at* is considered fresh.
+
+    Args:
+        created_at: Epoch seconds at which the report was generated
+        ttl_minutes: Freshness window applied while the market is open
+
+    Returns:
+        Epoch seconds of the end of the freshness window
+    """
+    moment = datetime.fromtimestamp(created_at, tz=MARKET_TZ)
+    if is_market_open(moment):
+        return created_at + ttl_minutes * 60
+    return next_market_open(moment).timestamp()
+
+
+@dataclass(frozen=True)
+class ReportCacheKey:
+    """Identifies a report: same ticker, same models and same prompts give the same report."""
+    ticker: str
+    model_set: str
+    prompt_version: str
+
+    @classmethod
+    def for_ticker(cls, ticker: str) -> "ReportCacheKey":
+        model_set = "|".join([mc.large_model, mc.small_model, mc.fin_model])
+        return cls(ticker=ticker.upper(), model_set=model_set, prompt_version=compute_prompt_version())
+
+    def as_string(self) -> str:
+        return f"{self.ticker}::{self.model_set}::{self.prompt_version}"
+
+
+@dataclass
+class CachedReport:
+    report: str
+    created_at: float
+    fresh_until: float
+    stale_until: float
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.fresh_until
+
+    def is_servable(self, now: float) -> bool:
+        return now < self.stale_until
+
+
+class ReportCache:
+    """
+    Two-level report cache: a small in-process LRU in front of a SQLite file shared by all processes.
+
+    Only fresh in-process entries are served without reading the database, so a report regenerated by
+    another process replaces a stale local copy on the next read.
+
+    Attributes:
+        path: Location of the SQLite database
+        ttl_minutes: Freshness window while the market is open
+        stale_minutes: How long past freshness a report may still be served while it is regenerated
+        serve_stale: Enables stale-while-revalidate serving
+        memory_entries: Number of reports kept in process
+    """
+
+    def __init__(self, path: str, ttl_minutes: int = 15, stale_minutes: int = 60, serve_stale: bool = True,
+                 memory_entries: int = 64):
+        self.path = path
+        self.ttl_minutes = ttl_minutes
+        self.stale_minutes = stale_minutes
+        self.serve_stale = serve_stale
+        self.memory_entries = memory_entries
+        self._memory: OrderedDict[str, CachedReport] = OrderedDict()
+        self._lock = threading.Lock()
+        self._revalidating: set[str] = set()
+        self._initialized = False
+        logging.info(f"ReportCache initialized at {path} (ttl={ttl_minutes}m, stale={stale_minutes}m)")
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._initialized:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS reports (
+                       cache_key TEXT PRIMARY KEY,
+                       report TEXT NOT NULL,
+                       created_at REAL NOT NULL,
+                       fresh_until REAL NOT NULL,
+                       stale_until REAL NOT NULL)"""
+            )
+            conn.commit()
+            self._initialized = True
+        return conn
+
+    def get(self, key: ReportCacheKey, now: Optional[float] = None) -> Optional[CachedReport]:
+        """
+        Return the cached report for *key* if it can still be served (fresh or within the stale window).
+
+        Args:
+            key: Cache key of the report
+            now: Current epoch time, mainly for tests
+
+        Returns:
+            The cached entry, or None on a miss
+        """
+        now = time.time() if now is None else now
+        cache_key = key.as_string()
+
+        with self._lock:
+            entry = self._memory.get(cache_key)
+            if entry is not None:
+                self._memory.move_to_end(cache_key)
+        if entry is None or not entry.is_fresh(now):
+            # Another process may have regenerated (or invalidated) the report since it was cached here
+            try:
+                with self._connect() as conn:
+                    row = conn.execute(
+                        "SELECT report, created_at, fresh_until, stale_until FROM reports WHERE cache_key = ?",
+                        (cache_key,),
+                    ).fetchone()
+            except sqlite3.Error as e:
+                logging.error(f"Report cache read failed for {key.ticker}: {e}")
+            else:
+                if row is None:
+                    entry = None
+                    with self._lock:
+                        self._memory.pop(cache_key, None)
+                elif entry is None or row[1] > entry.created_at:
+                    entry = CachedReport(*row)
+                    self._remember(cache_key, entry)
+
+        if entry is None or not entry.is_servable(now):
+            return None
+        return entry
+
+    def _remember(self, cache_key: str, entry: CachedReport) -> None:
+        with self._lock:
+            self._memory[cache_key] = entry
+            self._memory.move_to_end(cache_key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def put(self, key: ReportCacheKey, report: str, now: Optional[float] = None) -> CachedReport:
+        """Store *report* under *key* and return the new cache entry."""
+        now = time.time() if now is None else now
+        fresh_until = compute_fresh_until(now, self.ttl_minutes)
+        stale_until = fresh_until + (self.stale_minutes * 60 if self.serve_stale else 0)
+        entry = CachedReport(report=report, created_at=now, fresh_until=fresh_until, stale_until=stale_until)
+
+        cache_key = key.as_string()
+        self._remember(cache_key, entry)
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO reports VALUES (?, ?, ?, ?, ?)",
+                    (cache_key, report, entry.created_at, entry.fresh_until, entry.stale_until),
+                )
+        except sqlite3.Error as e:
+            logging.error(f"Report cache write failed for {key.ticker}: {e}")
+        logging.info(f"Report cached for {key.ticker} until {datetime.fromtimestamp(fresh_until):%Y-%m-%d %H:%M}")
+        return entry
+
+    def invalidate(self, key: ReportCacheKey) -> None:
+        """Drop the cached report for *key* from both cache levels."""
+        cache_key = key.as_string()
+        with self._lock:
+            self._memory.pop(cache_key, None)
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM reports WHERE cache_key = ?", (cache_key,))
+        except sqlite3.Error as e:
+            logging.error(f"Report cache invalidation failed for {key.ticker}: {e}")
+
+    async def _generate_and_store(self, key: ReportCacheKey,
+                                  generate: Callable[[], Awaitable[Tuple[Optional[str], bool]]]) -> Optional[str]:
+        report, cacheable = await generate()
+        if report and cacheable:
+            self.put(key, report)
+        return report
+
+    def _revalidate_in_background(self, key: ReportCacheKey,
+                                  generate: Callable[[], Awaitable[Tuple[Optional[str], bool]]]) -> None:
+        cache_key = key.as_string()
+        with self._lock:
+            if cache_key in self._revalidating:
+                return
+            self._revalidating.add(cache_key)
+
+        def done(future):
+            with self._lock:
+                self._revalidating.discard(cache_key)
+            if future.cancelled():
+                logging.warning(f"Background revalidation cancelled for {key.ticker}")
+            elif future.exception() is not None:
+                error = future.exception()
+                logging.error(f"Background revalidation failed for {key.ticker}: {error}",
+                              exc_info=(type(error), error, error.__traceback__))
+            else:
+                logging.info(f"Background revalidation completed for {key.ticker}")
+
+        # Runs on the shared loop, next to (not inside) the request that found the stale entry
+        background_loop.submit(self._generate_and_store(key, generate)).add_done_callback(done)
+
+    async def get_or_generate(self, key: ReportCacheKey,
+                              generate: Callable[[], Awaitable[Tuple[Optional[str], bool]]],
+                              force: bool = False) -> Tuple[Optional[str], str]:
+        """
+        Return a report for *key*, generating it only when no servable cached copy exists.
+
+        Args:
+            key: Cache key of the report
+            generate: Coroutine factory returning ``(report, cacheable)``; failed runs should return
+                ``cacheable=False`` so that error messages are never shared with other sessions
+            force: Bypass the cache and always regenerate (the "regenerate" path)
+
+        Returns:
+            (report, status): status is one of ``"hit"``, ``"stale"``, ``"miss"`` or ``"bypass"``
+        """
+        if not force:
+            now = time.time()
+            entry = self.get(key, now)
+            if entry is not None and entry.is_fresh(now):
+                logging.info(f"Report cache hit for {key.ticker}")
+                return entry.report, "hit"
+            if entry is not None and self.serve_stale:
+                logging.info(f"Serving stale report for {key.ticker} while revalidating")
+                self._revalidate_in_background(key, generate)
+                return entry.report, "stale"
+
+        report = await self._generate_and_store(key, generate)
+        return report, "bypass" if force else "miss"
+
+
+# Global report cache instance shared by every session of this process
+report_cache = ReportCache(
+    path=os.path.abspath(app_config.report_cache_path),
+    ttl_minutes=app_config.cache_duration_minutes,
+    stale_minutes=app_config.report_cache_stale_minutes,
+    serve_stale=app_config.report_cache_serve_stale,
+)
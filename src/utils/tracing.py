@@ -0,0 +1,278 @@
+"""Lightweight tracing of report runs.
+
+A span times one unit of work (an analysis, a handoff, a tool run, an HTTP call). The current span is held in
+a ``contextvars.ContextVar``; ``asyncio`` copies the context into every task it creates, so spans opened in the
+three concurrent analyses nest under the report span without being passed around. Work handed to a thread pool
+keeps its parent when the callable is wrapped with ``in_current_context``.
+
+When a trace's root span ends, the whole trace is appended as one line of OTLP/JSON
+(``ExportTraceServiceRequest``) to ``AppConfig.trace_export_path``; the OpenTelemetry collector's
+``otlpjsonfile`` receiver can forward it to Jaeger or Tempo. ``to_chrome_trace`` converts the file into the
+Chrome trace event format, which chrome://tracing, Perfetto and speedscope display as a flame or waterfall
+chart::
+
+    python src/utils/tracing.py .cache/traces.jsonl report_trace.json
+
+Tracing is off unless ``TRACING_ENABLED=true``; disabled spans cost one attribute check.
+"""
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import secrets
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from config.config import app_config
+
+SERVICE_NAME = "stockadvisor"
+
+# OTLP span kinds and status codes
+INTERNAL = 1
+CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+# Traces whose root never ends (e.g. an abandoned generator) are dropped beyond this many open spans
+MAX_OPEN_SPANS = 10_000
+
+
+class Span:
+    """
+    One timed operation of a trace.
+
+    Attributes:
+        name: Operation name, e.g. ``ReportGeneratorAgent.generate_report`` or ``yfinance.history``
+        trace_id: 32 hex digits shared by every span of the trace
+        span_id: 16 hex digits
+        parent_id: ``span_id`` of the enclosing span, None for the root
+        kind: ``INTERNAL`` or ``CLIENT`` (outgoing network call)
+        attributes: Key/value annotations
+    """
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "kind", "attributes", "start_ns", "end_ns",
+                 "status", "status_message")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], kind: int, attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.status = STATUS_OK
+        self.status_message = ""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def duration(self) -> float:
+        """Seconds between start and end (0 while the span is open)."""
+        return max(0, self.end_ns - self.start_ns) / 1e9
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": self.status, "message": self.status_message} if self.status == STATUS_ERROR
+            else {"code": self.status},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+class OTLPJSONFileExporter:
+    """Appends each finished trace to *path* as one OTLP/JSON ``ExportTraceServiceRequest`` line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        request = {"resourceSpans": [{
+            "resource": {"attributes": _otlp_attributes({"service.name": SERVICE_NAME})},
+            "scopeSpans": [{"scope": {"name": SERVICE_NAME}, "spans": [span.to_otlp() for span in spans]}],
+        }]}
+        line = json.dumps(request, separators=(",", ":")) + "\n"
+        try:
+            with self._lock:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as out:
+                    out.write(line)
+        except OSError as e:
+            logging.error(f"Trace export to {self.path} failed: {e}")
+
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """
+    Creates spans and hands every finished trace to the exporter.
+
+    Attributes:
+        enabled: When False, ``span`` yields None and records nothing
+        exporter: Receives the spans of a trace once its root span has ended
+    """
+
+    def __init__(self, exporter=None, enabled: bool = False):
+        self.exporter = exporter
+        self.enabled = enabled
+        self._open: Dict[str, List[Span]] = {}
+        self._open_count = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, kind: int = INTERNAL, **attributes: Any) -> Iterator[Optional[Span]]:
+        """
+        Time the enclosed block as a child of the current span (or as a new trace's root).
+
+        Exceptions are recorded on the span and re-raised.
+        """
+        if not self.enabled:
+            yield None
+            return
+        parent = _current_span.get()
+        span = Span(name, parent.trace_id if parent else secrets.token_hex(16), parent.span_id if parent else None,
+                    kind, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = STATUS_ERROR
+            span.status_message = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            _current_span.reset(token)
+            self._finish(span)
+
+    def _finish(self, span: Span) -> None:
+        with self._lock:
+            spans = self._open.setdefault(span.trace_id, [])
+            spans.append(span)
+            self._open_count += 1
+            if span.parent_id is None:
+                del self._open[span.trace_id]
+                self._open_count -= len(spans)
+            elif self._open_count > MAX_OPEN_SPANS:
+                dropped = self._open.pop(next(iter(self._open)))
+                self._open_count -= len(dropped)
+                logging.warning(f"Tracer dropped {len(dropped)} spans of an unfinished trace")
+                return
+            else:
+                return
+        if self.exporter is not None:
+            self.exporter.export(spans)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def in_current_context(func: Callable) -> Callable:
+    """Bind *func* to the caller's context, so that a thread pool running it keeps the current span."""
+    context = contextvars.copy_context()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        # A context can only be entered by one thread at a time: each call runs in its own copy
+        return context.copy().run(func, *args, **kwargs)
+    return wrapper
+
+
+# Global tracer of the process
+tracer = Tracer(OTLPJSONFileExporter(app_config.trace_export_path), enabled=app_config.tracing_enabled)
+
+
+def traced(name: Optional[str] = None, kind: int = INTERNAL):
+    """Decorator running a sync or async function inside a span named *name* (default: its qualified name)."""
+
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                with tracer.span(span_name, kind):
+                    return await func(*args, **kwargs)
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with tracer.span(span_name, kind):
+                    return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def to_chrome_trace(otlp_path: str, output_path: str) -> int:
+    """
+    Convert an OTLP/JSON lines file into a Chrome trace event file.
+
+    Each trace becomes one process and each span a complete ("X") event. Concurrent spans are spread over
+    separate rows, while nested spans stay under their parent, so that the three analyses of a report show up
+    side by side.
+
+    Returns:
+        Number of spans converted
+    """
+    events = []
+    with open(otlp_path, encoding="utf-8") as lines:
+        for pid, line in enumerate(lines, start=1):
+            spans = [span for resource in json.loads(line)["resourceSpans"]
+                     for scope in resource["scopeSpans"] for span in scope["spans"]]
+            spans.sort(key=lambda s: int(s["startTimeUnixNano"]))
+            rows: List[List[int]] = []  # per row, the end times of the spans still open at this point
+            for span in spans:
+                start, end = int(span["startTimeUnixNano"]), int(span["endTimeUnixNano"])
+                for row, stack in enumerate(rows):
+                    while stack and stack[-1] <= start:
+                        stack.pop()
+                    if not stack or stack[-1] >= end:
+                        break
+                else:
+                    row, stack = len(rows), []
+                    rows.append(stack)
+                stack.append(end)
+                args = {a["key"]: next(iter(a["value"].values())) for a in span["attributes"]}
+                events.append({"name": span["name"], "ph": "X", "pid": pid, "tid": row, "ts": start / 1000,
+                               "dur": (end - start) / 1000, "args": args})
+    with open(output_path, "w", encoding="utf-8") as out:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, out)
+    return len(events)
+
+
+if __name__ == "__main__":
+    count = to_chrome_trace(sys.argv[1], sys.argv[2])
+    print(f"{count} spans written to {sys.argv[2]}")
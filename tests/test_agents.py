@@ -368,6 +368,43 @@ class TestReportGeneratorAgent:
             assert sample_stock_symbol in result
             assert result.startswith("An unexpected error")
 
+    @staticmethod
+    def _analyze_mock(analyzer, text, completed=True):
+        async def _mock():
+            analyzer.analysis_completed = completed
+            return text
+
+        return AsyncMock(side_effect=_mock)
+
+    @pytest.mark.asyncio
+    async def test_report_with_a_failed_analysis_is_not_cached(self, sample_stock_symbol, tmp_path):
+        from src.utils.report_cache import ReportCache, ReportCacheKey
+
+        reporter = ReportGeneratorAgent(sample_stock_symbol)
+        reporter.fin_analyst_agent.analyze = self._analyze_mock(reporter.fin_analyst_agent, "Fund text")
+        reporter.market_sentiment_analyzer.analyze = self._analyze_mock(
+            reporter.market_sentiment_analyzer, "Unexpected error occurred during market sentiment analysis",
+            completed=False)
+        reporter.risk_assessment_agent.analyze = self._analyze_mock(reporter.risk_assessment_agent, "Risk text")
+
+        async def _write(initial_report):
+            reporter.report_completed = True
+            return f"Final report for {sample_stock_symbol}"
+
+        reporter._write_final_report = AsyncMock(side_effect=_write)
+
+        async def generate():
+            return await reporter.generate_report(), reporter.report_completed
+
+        cache = ReportCache(str(tmp_path / "reports.sqlite"))
+        key = ReportCacheKey(sample_stock_symbol, "a|b|c", "v1")
+        report, status = await cache.get_or_generate(key, generate)
+
+        assert report.startswith("Final") and status == "miss"
+        assert reporter.completed_analyses == {"fund_analysis", "risk_assessment"}
+        assert not reporter.report_completed
+        assert cache.get(key) is None
+
     @pytest.mark.asyncio
     async def test_write_final_report_success(self, sample_stock_symbol,
                                               patched_report_generator_agent_requirements,
@@ -0,0 +1,73 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+import src.tools.stock_adv_benchmark_store as bs
+import src.tools.stock_adv_price_store as ps
+
+DATES = np.arange(np.datetime64("2025-01-01"), np.datetime64("2025-01-21"))
+CLOSES = 100.0 + np.arange(len(DATES), dtype=float)
+
+
+@pytest.fixture
+def prices():
+    """A price store stand-in serving DATES/CLOSES under a settable version and counting loads."""
+    loads = []
+
+    class FakePrices:
+        version = "v1"
+
+        def load(self, ticker, period="5y"):
+            loads.append(ticker)
+            return ps.PriceHistory(ticker, DATES, np.column_stack([CLOSES] * 5), self.version)
+
+    return FakePrices(), loads
+
+
+def test_series_is_rebuilt_only_for_a_new_price_version(prices):
+    fake_prices, loads = prices
+    store = bs.BenchmarkStore(fake_prices)
+
+    series = store.get("spy")
+    assert series.ticker == "SPY" and len(series.returns) == len(DATES) - 1
+    assert series.variance == pytest.approx(np.var(series.returns, ddof=1))
+    assert store.get("SPY") is series
+
+    fake_prices.version = "v2"  # e.g. the history was reloaded after a split
+    assert store.get("SPY") is not series
+    assert loads == ["SPY", "SPY", "SPY"]
+
+
+def test_series_follows_the_price_store(tmp_path, monkeypatch):
+    closes = [CLOSES]
+
+    def download(symbol, start, end=None):
+        return DATES, np.column_stack([closes[0]] * 5), False
+
+    monkeypatch.setattr(ps.PriceHistoryStore, "_download", staticmethod(download))
+    prices = ps.PriceHistoryStore(str(tmp_path), refresh_minutes=0)
+    store = bs.BenchmarkStore(prices, period="1y")
+    monkeypatch.setattr(ps, "period_start", lambda period: DATES[0])
+
+    first = store.get("SPY")
+    closes[0] = CLOSES / 2  # restated history, same last date
+    second = store.get("SPY")
+
+    assert np.allclose(second.closes, first.closes / 2)
+
+
+def test_aligned_returns_match_pct_change():
+    series = bs.BenchmarkSeries("SPY", DATES, CLOSES)
+    gapped = DATES[[0, 1, 2, 5, 6, 9]]
+
+    expected = pd.Series(CLOSES[[0, 1, 2, 5, 6, 9]]).pct_change().dropna().to_numpy()
+
+    assert np.allclose(series.aligned_returns(gapped), expected)
+    assert np.shares_memory(series.aligned_returns(DATES[3:8]), series.returns)
+
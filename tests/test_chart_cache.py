@@ -0,0 +1,89 @@
+import sys
+from pathlib import Path
+
+import matplotlib
+import numpy as np
+import pandas as pd
+import pytest
+
+matplotlib.use("Agg")
+
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+import src.ui.stock_adv_technical_analysis as ta
+from src.ui.stock_adv_chart_cache import CachedIndicators, ChartCache, ChartCacheKey
+from src.ui.stock_adv_figure_renderer import FigureRenderer
+
+
+@pytest.fixture
+def frame():
+    close = 100 + np.sin(np.arange(120) / 5)
+    index = pd.bdate_range("2024-01-01", periods=120, name="Date")
+    return pd.DataFrame({"Open": close, "High": close + 1, "Low": close - 1, "Close": close,
+                         "Volume": np.full(120, 1e6)}, index=index)
+
+
+def key(name):
+    return ChartCacheKey("IBM", "2024-01-01", "2024-06-01", name)
+
+
+def test_eviction_is_bounded_by_bytes_in_lru_order():
+    cache = ChartCache(max_bytes=250)
+    cache.put(key("a"), b"x" * 100)
+    cache.put(key("b"), b"x" * 100)
+    cache.get(key("a"))  # "b" becomes the least recently used entry
+
+    cache.put(key("c"), b"x" * 100)
+
+    assert cache.get(key("b")) is None
+    assert cache.get(key("a")) is not None and cache.get(key("c")) is not None
+    assert cache.size == 200
+
+
+def test_values_larger_than_the_budget_are_not_cached():
+    cache = ChartCache(max_bytes=10)
+
+    cache.put(key("big"), np.zeros(100))
+
+    assert len(cache) == 0
+
+
+def test_indicators_are_computed_once_per_key(frame, monkeypatch):
+    cache = ChartCache(max_bytes=1 << 20)
+    calls = []
+    original = CachedIndicators._compute
+
+    def recording_compute(self, name, params):
+        calls.append((name, params))
+        return original(self, name, params)
+
+    monkeypatch.setattr(CachedIndicators, "_compute", recording_compute)
+
+    first = CachedIndicators("IBM", "2024-01-01", "2024-06-01", frame, cache).bollinger(20, 2)
+    # A later rerun builds a new wrapper around the same data
+    second = CachedIndicators("IBM", "2024-01-01", "2024-06-01", frame, cache).bollinger(20, 2)
+    CachedIndicators("IBM", "2024-01-01", "2024-06-01", frame, cache).bollinger(10, 2)
+
+    assert first is second
+    assert calls == [("bollinger", (20, 2)), ("bollinger", (10, 2))]
+
+
+def test_switching_back_to_a_chart_serves_the_cached_png(frame, monkeypatch):
+    monkeypatch.setattr(ta, "figure_renderer", FigureRenderer(ChartCache(max_bytes=1 << 24), max_workers=1))
+    monkeypatch.setattr(ta.st, "header", lambda title: None)
+    shown, renders = [], []
+    monkeypatch.setattr(ta.st, "image", shown.append)
+    original = ta.render_png
+
+    def recording_render(df, method, indicators=None):
+        renders.append(method.__name__)
+        return original(df, method, indicators)
+
+    monkeypatch.setattr(ta, "render_png", recording_render)
+
+    for method in (ta.bollinger, ta.macd, ta.cloud, ta.bollinger, ta.macd):
+        ta.plot_ta("chart", frame, method, "IBM", "2024-01-01", "2024-06-01")
+
+    assert renders == ["bollinger", "macd", "cloud"]
+    assert shown[0] is shown[3] and shown[0].startswith(b"\x89PNG")
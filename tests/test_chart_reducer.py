@@ -0,0 +1,78 @@
+import sys
+from pathlib import Path
+
+import matplotlib
+import numpy as np
+import pandas as pd
+import pytest
+
+matplotlib.use("Agg")
+
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+import src.ui.stock_adv_technical_analysis as ta
+from src.ui.stock_adv_chart_reducer import downsample, lttb_indices, point_budget, resample_ohlc
+
+
+@pytest.fixture
+def history():
+    """Twenty years of synthetic daily bars."""
+    rng = np.random.default_rng(9)
+    index = pd.bdate_range("2005-01-03", periods=5040, name="Date")
+    close = 50 * np.cumprod(1 + rng.normal(0.0003, 0.015, len(index)))
+    return pd.DataFrame({"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close,
+                         "Volume": rng.integers(1e5, 1e6, len(index)).astype(float)}, index=index)
+
+
+def test_lttb_keeps_endpoints_and_extremes():
+    y = np.zeros(1000)
+    y[123], y[777] = 10.0, -10.0
+
+    keep = lttb_indices(np.arange(1000), y, 50)
+
+    assert len(keep) == 50 and keep[0] == 0 and keep[-1] == 999
+    assert 123 in keep and 777 in keep
+    assert np.all(np.diff(keep) > 0)
+
+
+def test_short_series_are_left_untouched():
+    assert list(lttb_indices(np.arange(10), np.arange(10.0), 50)) == list(range(10))
+
+
+def test_downsample_drops_missing_values(history):
+    values = history["Close"].to_numpy().copy()
+    values[:20] = np.nan
+
+    x, y = downsample(history.index, values, point_budget(12))
+
+    assert len(x) == point_budget(12) and not np.isnan(y).any()
+    assert x[0] == history.index[20].to_datetime64()
+
+
+def test_ohlc_resampling_picks_the_shortest_period_that_fits(history):
+    bars, rule = resample_ohlc(history, 400)
+
+    assert rule == "ME" and len(bars) <= 400
+    first_month = history.loc["2005-01"]
+    assert bars["Open"].iloc[0] == first_month["Open"].iloc[0]
+    assert bars["High"].iloc[0] == first_month["High"].max()
+    assert bars["Low"].iloc[0] == first_month["Low"].min()
+    assert bars["Close"].iloc[0] == first_month["Close"].iloc[-1]
+    assert bars["Volume"].iloc[0] == first_month["Volume"].sum()
+
+
+def test_short_ranges_keep_daily_candles(history):
+    recent = history.iloc[-300:]
+
+    bars, rule = resample_ohlc(recent, 400)
+
+    assert rule == "D" and bars is recent
+
+
+@pytest.mark.parametrize("plot", [ta.bollinger, ta.macd, ta.ma, ta.cloud])
+def test_line_charts_draw_at_most_the_point_budget(history, plot):
+    figure = plot(history)
+
+    for line in figure.axes[0].get_lines():
+        assert len(line.get_xdata()) <= ta.LINE_POINTS
@@ -0,0 +1,69 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+import src.tools.stock_adv_data_fetcher_tool as dft
+
+
+@pytest.fixture
+def fetched():
+    symbols = []
+
+    def fetch(stock_symbol):
+        symbols.append(stock_symbol)
+        return dft.DataFetcherToolResult(title=stock_symbol, description="", url="")
+
+    dft._fundamentals.clear()
+    with patch.object(dft.DataFetcherTool, "_fetch_fundamental_data", side_effect=fetch):
+        yield symbols
+    dft._fundamentals.clear()
+
+
+@pytest.mark.asyncio
+async def test_bound_ticker_is_fetched_whatever_the_model_asks(fetched):
+    tool = dft.DataFetcherTool("ibm")
+
+    output = await tool.run(dft.DataFetcherToolInput(stock_symbol="AAPL"))
+
+    assert fetched == ["IBM"]
+    assert output.results[0].title == "IBM"
+
+
+@pytest.mark.asyncio
+async def test_fundamentals_are_reused_until_they_expire(fetched):
+    tool = dft.DataFetcherTool()
+    await tool.run(dft.DataFetcherToolInput(stock_symbol="msft"))
+    await tool.run(dft.DataFetcherToolInput(stock_symbol="MSFT"))
+    assert fetched == ["MSFT"]
+
+    with patch.object(dft.app_config, "cache_duration_minutes", 0):
+        await tool.run(dft.DataFetcherToolInput(stock_symbol="MSFT"))
+    assert fetched == ["MSFT", "MSFT"]
+
+
+def test_result_carries_ratios_a_curated_profile_and_the_news():
+    periods = pd.to_datetime(["2024-12-31", "2023-12-31"])
+    income = pd.DataFrame({"Total Revenue": [200.0, 160.0], "Net Income": [30.0, 20.0]}, index=periods).T
+    balance = pd.DataFrame({"Stockholders Equity": [150.0, 125.0]}, index=periods).T
+    ticker = SimpleNamespace(income_stmt=income, balance_sheet=balance, cash_flow=pd.DataFrame(),
+                             info={"sector": "Technology", "trailingPE": 21.5, "forwardPE": None,
+                                   "longBusinessSummary": "x" * 5000, "companyOfficers": [{"name": "CEO"}]})
+
+    with patch.object(dft.yf, "Ticker", return_value=ticker), \
+            patch.object(dft.YahooFinanceNewsTool, "_run", return_value="IBM beats estimates") as news:
+        result = dft.DataFetcherTool._fetch_fundamental_data("IBM")
+
+    news.assert_called_once()
+    assert result.financial_news == "IBM beats estimates"
+
+    assert result.company_profile == {"sector": "Technology", "trailingPE": 21.5}
+    assert result.financial_ratios["latest_period"] == "2024-12-31"
+    assert result.financial_ratios["latest"]["roe"] == pytest.approx(0.2)
+    assert len(result.model_dump_json()) < 2000
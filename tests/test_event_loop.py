@@ -0,0 +1,124 @@
+import asyncio
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+import src.ui.progression_bar as progression_bar
+import src.utils.report_cache as rc
+from src.utils.event_loop import BackgroundEventLoop
+
+
+@pytest.fixture
+def background():
+    loop = BackgroundEventLoop(name="test-loop")
+    yield loop
+    loop.stop()
+
+
+def test_loop_and_loop_bound_objects_survive_across_runs(background):
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    async def make_lock():
+        return asyncio.Lock()
+
+    async def use(lock):
+        async with lock:
+            return threading.current_thread().name
+
+    first = background.run(current_loop())
+    lock = background.run(make_lock())
+
+    assert background.run(current_loop()) is first
+    assert background.run(use(lock)) == "test-loop"
+
+
+def test_sessions_share_the_loop_concurrently(background):
+    async def slow(i):
+        await asyncio.sleep(0.1)
+        return i
+
+    results = []
+    threads = [threading.Thread(target=lambda i=i: results.append(background.run(slow(i)))) for i in range(10)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(results) == list(range(10))
+    assert time.perf_counter() - start < 0.5
+
+
+def test_timeout_cancels_the_coroutine(background):
+    cancelled = threading.Event()
+
+    async def hang():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(TimeoutError):
+        background.run(hang(), timeout=0.1)
+    assert cancelled.wait(1)
+
+
+def test_waiting_from_inside_the_loop_is_rejected(background):
+    async def nested():
+        return background.run(asyncio.sleep(0))
+
+    with pytest.raises(RuntimeError):
+        background.run(nested())
+
+
+def test_progress_recorded_on_the_loop_is_drawn_by_the_waiting_thread(background, monkeypatch):
+    st = mock.MagicMock(name="st")
+    monkeypatch.setattr(progression_bar, "st", st)
+    bar = progression_bar.ProgressionBar()
+    drawn_from = []
+    st.progress.return_value.progress.side_effect = lambda value: drawn_from.append(threading.current_thread())
+
+    async def pipeline():
+        bar.update_progression_bar(25, "fund_analysis")
+        await asyncio.sleep(0.3)
+        return "report"
+
+    assert background.run(pipeline(), on_wait=bar.refresh) == "report"
+    st.empty.return_value.text.assert_called_with("Completed Fundamental Analysis...")
+    assert drawn_from == [threading.current_thread()]
+
+
+@pytest.mark.asyncio
+async def test_stale_reports_are_revalidated_on_the_background_loop(tmp_path, monkeypatch):
+    background = BackgroundEventLoop(name="test-revalidation")
+    monkeypatch.setattr(rc, "background_loop", background)
+    cache = rc.ReportCache(str(tmp_path / "reports.sqlite"), ttl_minutes=15, stale_minutes=60)
+    key = rc.ReportCacheKey(ticker="IBM", model_set="a|b|c", prompt_version="v1")
+    market_hours = datetime(2026, 1, 21, 11, 0, tzinfo=rc.MARKET_TZ).timestamp()
+    cache.put(key, "old report", now=market_hours)
+    monkeypatch.setattr(rc, "time", SimpleNamespace(time=lambda: market_hours + 30 * 60))
+    threads = []
+
+    async def generate():
+        threads.append(threading.current_thread().name)
+        return "new report", True
+
+    assert await cache.get_or_generate(key, generate) == ("old report", "stale")
+    for _ in range(100):
+        if cache._revalidating:
+            await asyncio.sleep(0.01)
+    background.stop()
+
+    assert threads == ["test-revalidation"]
+    assert cache.get(key).report == "new report"
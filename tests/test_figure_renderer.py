@@ -0,0 +1,146 @@
+import gc
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+
+matplotlib.use("Agg")
+
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+import src.ui.stock_adv_technical_analysis as ta
+from src.ui.stock_adv_chart_cache import ChartCache, ChartCacheKey
+from src.ui.stock_adv_figure_renderer import FigureRenderer, new_figure
+
+
+@pytest.fixture
+def frame():
+    close = 100 + np.sin(np.arange(120) / 5)
+    index = pd.bdate_range("2024-01-01", periods=120, name="Date")
+    return pd.DataFrame({"Open": close - 0.5, "High": close + 1, "Low": close - 1, "Close": close,
+                         "Volume": np.full(120, 1e6)}, index=index)
+
+
+def small_chart(seed: int) -> Figure:
+    # A bare line artist keeps the 1,000 renders fast while going through the same figure lifecycle
+    figure = new_figure((2, 1))
+    figure.add_artist(Line2D(np.linspace(0, 1, 50), np.random.default_rng(seed).random(50)))
+    return figure
+
+
+def live_figures() -> int:
+    gc.collect()
+    return sum(isinstance(o, Figure) for o in gc.get_objects())
+
+
+@pytest.mark.parametrize("plot", [ta.bollinger, ta.macd, ta.ma, ta.cloud, ta.candle])
+def test_charts_do_not_touch_pyplot_state(frame, plot):
+    plt.close("all")
+
+    png = ta.render_png(frame, plot)
+
+    assert png.startswith(b"\x89PNG")
+    assert plt.get_fignums() == []
+
+
+def test_concurrent_requests_for_one_chart_render_once():
+    renderer = FigureRenderer(ChartCache(1 << 20), max_workers=2)
+    key = ChartCacheKey("IBM", "2024-01-01", "2024-06-01", "small", kind="chart")
+    started, release, calls = threading.Event(), threading.Event(), []
+
+    def draw():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return small_chart(0)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(renderer.render(key, draw))) for _ in range(4)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert len(results) == 4 and all(png is results[0] for png in results)
+    renderer.shutdown()
+
+
+def test_waiting_for_a_slot_does_not_block_requests_for_charts_in_flight():
+    renderer = FigureRenderer(ChartCache(1 << 20), max_workers=1, max_pending=1)
+    first, second = (ChartCacheKey("IBM", "2024-01-01", "2024-06-01", name, kind="chart") for name in "ab")
+    started, release_first, release_second = threading.Event(), threading.Event(), threading.Event()
+
+    def draw_first():
+        started.set()
+        release_first.wait(5)
+        return small_chart(0)
+
+    def draw_second():
+        release_second.wait(5)
+        return small_chart(1)
+
+    owner = threading.Thread(target=renderer.render, args=(first, draw_first))
+    owner.start()
+    started.wait(5)
+    # Waits for the only slot until the first chart is done, then holds it
+    blocked = threading.Thread(target=renderer.render, args=(second, draw_second))
+    blocked.start()
+    time.sleep(0.2)
+    # The registry stays available to every other request while the second render waits for its slot
+    assert renderer._lock.acquire(timeout=1)
+    renderer._lock.release()
+    joined = []
+    waiter = threading.Thread(target=lambda: joined.append(renderer.render(first, draw_second)))
+    waiter.start()
+    release_first.set()
+    waiter.join(2)
+
+    assert joined and joined[0] is renderer.cache.get(first)
+    release_second.set()
+    owner.join(5)
+    blocked.join(5)
+    renderer.shutdown()
+
+
+CHARTS = [ta.bollinger, ta.macd, ta.ma, ta.cloud, ta.candle]
+
+
+@pytest.mark.slow
+def test_rendering_charts_keeps_memory_flat(frame):
+    renderer = FigureRenderer(ChartCache(256 * 1024), max_workers=4)
+
+    def render(rounds):
+        futures = [renderer.submit(lambda plot=plot: plot(frame)) for _ in range(rounds) for plot in CHARTS]
+        return [future.result() for future in futures]
+
+    render(1)  # warm up fonts, mplfinance, matplotlib caches and the worker threads
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        for i, png in enumerate(render(4)):
+            renderer.cache.put(ChartCacheKey("IBM", "2024-01-01", "2024-06-01", f"chart-{i}", kind="chart"), png)
+        gc.collect()
+        growth = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+    renderer.shutdown()
+
+    assert renderer.cache.size <= 256 * 1024
+    assert live_figures() == 0
+    # A leaked chart keeps its figure, artists and data alive, about 0.4 MiB each; the PNGs are cached
+    assert growth - renderer.cache.size < 1 << 20
@@ -0,0 +1,97 @@
+import sys
+from pathlib import Path
+
+import matplotlib
+import numpy as np
+import pandas as pd
+import pytest
+
+matplotlib.use("Agg")
+
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+import src.tools.stock_adv_indicators as ind
+import src.ui.stock_adv_technical_analysis as ta
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(2)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.01, 300))
+    index = pd.bdate_range("2024-01-01", periods=300, name="Date")
+    return pd.DataFrame({"Open": close, "High": close * 1.01, "Low": close * 0.98, "Close": close,
+                         "Volume": rng.integers(1_000, 5_000, 300).astype(float)}, index=index)
+
+
+def test_moving_averages_match_pandas(frame):
+    close = frame["Close"]
+
+    middle, upper, lower = ind.bollinger(close, 20, 2)
+
+    assert np.allclose(ind.sma(close, 10), close.rolling(10).mean(), equal_nan=True)
+    assert np.allclose(ind.ema(close, 12), close.ewm(span=12, adjust=False).mean())
+    assert np.allclose(upper, close.rolling(20).mean() + 2 * close.rolling(20).std(), equal_nan=True)
+    assert np.allclose(middle - lower, upper - middle, equal_nan=True)
+
+
+def test_macd_rsi_atr_obv_match_reference_formulas(frame):
+    close, high, low, volume = frame["Close"], frame["High"], frame["Low"], frame["Volume"]
+
+    line, signal, histogram = ind.macd(close)
+    expected_line = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    assert np.allclose(line, expected_line)
+    assert np.allclose(signal, expected_line.ewm(span=9, adjust=False).mean())
+    assert np.allclose(histogram, line - signal)
+
+    delta = close.diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+    loss = (-delta).clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+    assert np.allclose(ind.rsi(close)[14:], (100 - 100 / (1 + gain / loss))[14:])
+
+    true_range = pd.concat([high - low, (high - close.shift()).abs(), (low - close.shift()).abs()], axis=1).max(axis=1)
+    assert np.allclose(ind.atr(high, low, close)[13:], true_range.ewm(alpha=1 / 14, adjust=False).mean()[13:])
+
+    assert np.allclose(ind.obv(close, volume), (np.sign(delta.fillna(0)) * volume).cumsum())
+
+
+def test_two_dimensional_input_computes_every_column(frame):
+    close = frame["Close"].to_numpy()
+    prices = np.column_stack([close, close * 2])
+    prices[:30, 1] = np.nan  # second ticker listed later
+
+    engine = ind.IndicatorEngine(prices)
+    results = engine.compute(["sma:20", "macd", "bollinger:20:2"])
+
+    assert np.allclose(results["sma:20"][:, 0], ind.sma(close, 20), equal_nan=True)
+    assert np.isnan(results["sma:20"][48, 1]) and np.allclose(results["sma:20"][49:, 1], 2 * ind.sma(close, 20)[49:])
+    assert results["macd.signal"].shape == prices.shape
+    assert results["bollinger:20:2.middle"] is results["sma:20"]
+
+
+def test_unknown_indicator_is_rejected(frame):
+    with pytest.raises(ValueError):
+        ind.IndicatorEngine(frame["Close"]).compute(["vwap"])
+
+
+@pytest.mark.parametrize("plot", [ta.bollinger, ta.macd, ta.ma, ta.cloud])
+def test_plots_do_not_mutate_the_cached_frame(frame, plot):
+    before = frame.copy()
+
+    plot(frame)
+
+    pd.testing.assert_frame_equal(frame, before)
+
+
+def test_ema_matches_pandas_with_late_listings_and_gaps():
+    rng = np.random.default_rng(3)
+    close = 100 + rng.normal(0, 1, (300, 40)).cumsum(axis=0)
+    close[:50, 1] = np.nan  # listed later
+    close[120:130, 2] = np.nan  # trading halt
+    close[:, 3] = np.nan
+    close[:, 4] = 42.0
+
+    expected = pd.DataFrame(close).ewm(span=12, adjust=False).mean().to_numpy()
+
+    np.testing.assert_allclose(ind.ema(close, 12), expected, rtol=1e-10)
+    assert (ind.ema(close, 12)[:, 4] == 42.0).all()
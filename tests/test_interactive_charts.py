@@ -0,0 +1,85 @@
+import json
+import sys
+from pathlib import Path
+
+import matplotlib
+import numpy as np
+import pandas as pd
+import pytest
+
+matplotlib.use("Agg")
+
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+import src.ui.stock_adv_technical_analysis as ta
+from src.ui.stock_adv_chart_cache import CachedIndicators, ChartCache
+from src.ui.stock_adv_interactive_charts import CHART_BUILDERS, INTERACTIVE
+
+
+@pytest.fixture
+def frame():
+    close = 100 + np.sin(np.arange(300) / 5)
+    index = pd.bdate_range("2023-01-02", periods=300, name="Date")
+    return pd.DataFrame({"Open": close - 0.5, "High": close + 1, "Low": close - 1, "Close": close,
+                         "Volume": np.full(300, 1e6)}, index=index)
+
+
+@pytest.mark.parametrize("name", sorted(CHART_BUILDERS))
+def test_builders_return_compact_columns_and_a_serializable_spec(frame, name):
+    original = frame.copy()
+    indicators = CachedIndicators("IBM", "2023-01-02", "2024-03-01", frame, ChartCache(1 << 24))
+
+    columns, spec = CHART_BUILDERS[name](frame, indicators)
+
+    assert len(columns) == len(frame)
+    assert columns["Date"].dtype.kind == "M"
+    assert all(columns[c].dtype == np.float32 for c in columns.columns if c != "Date")
+    assert spec["title"]
+    json.dumps(spec)
+    pd.testing.assert_frame_equal(frame, original)
+
+
+def test_bollinger_columns_match_the_indicator_engine(frame):
+    indicators = CachedIndicators("IBM", "2023-01-02", "2024-03-01", frame, ChartCache(1 << 24))
+    middle, upper, _ = indicators.bollinger(20, 2)
+
+    columns, _ = CHART_BUILDERS["bollinger"](frame, indicators)
+
+    np.testing.assert_allclose(columns["20-Day SMA"], middle, rtol=1e-6)
+    np.testing.assert_allclose(columns["Upper Band"], upper, rtol=1e-6)
+
+
+def test_cloud_is_green_above_and_red_below_its_base(frame):
+    indicators = CachedIndicators("IBM", "2023-01-02", "2024-03-01", frame, ChartCache(1 << 24))
+
+    columns, spec = CHART_BUILDERS["cloud"](frame, indicators)
+
+    areas = {layer["encoding"]["color"]["value"]: layer["encoding"] for layer in spec["layer"]
+             if layer.get("mark", {}).get("type") == "area"}
+    assert set(areas) == {"lightgreen", "lightcoral"}
+    bullish = columns["Senkou A"] >= columns["Senkou B"]
+    assert bullish.any() and (~bullish & columns["Senkou A"].notna()).any()
+    for color, shown in (("lightgreen", bullish), ("lightcoral", ~bullish)):
+        encoding = areas[color]
+        height = columns[encoding["y"]["field"]] - columns[encoding["y2"]["field"]]
+        # Each side of the cloud only has a height where its span is on top
+        assert (height[~shown].fillna(0) == 0).all()
+        assert (height[shown & columns["Senkou B"].notna()] >= 0).all() and height[shown].max() > 0
+
+
+def test_interactive_backend_sends_columns_instead_of_an_image(frame, monkeypatch):
+    monkeypatch.setattr(ta, "chart_cache", ChartCache(max_bytes=1 << 24))
+    monkeypatch.setattr(ta.st, "header", lambda title: None)
+    charts, images = [], []
+    monkeypatch.setattr(ta.st, "vega_lite_chart", lambda data, spec, **kwargs: charts.append((data, spec)))
+    monkeypatch.setattr(ta.st, "image", images.append)
+    monkeypatch.setattr(ta, "render_png", lambda *args: pytest.fail("no server-side rendering expected"))
+
+    for method in (ta.macd, ta.cloud, ta.macd):
+        ta.plot_ta("chart", frame, method, "IBM", "2023-01-02", "2024-03-01", INTERACTIVE)
+
+    assert images == []
+    assert len(charts) == 3
+    assert charts[0][0] is charts[2][0]  # the rerun is served from the cache
+    assert charts[1][1]["title"] == "Ichimoku Cloud"
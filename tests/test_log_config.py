@@ -0,0 +1,186 @@
+import gzip
+import io
+import json
+import logging
+import queue
+import sys
+import threading
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+import src.utils.log_config as log_config
+from src.utils.log_config import (JSON, SIZE, TIME, NonBlockingQueueHandler, Payload, PayloadSampler,
+                                  configure_logging, payload, rotating_file_handler, shutdown_logging)
+
+
+class Expensive:
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "x" * 5000
+
+
+@pytest.fixture
+def root_logging():
+    root = logging.getLogger()
+    level = root.level
+    yield root
+    shutdown_logging()
+    root.setLevel(level)
+
+
+def test_payload_is_truncated_and_summarized():
+    assert str(payload("short", limit=10)) == "short"
+    assert str(payload("a" * 25, limit=10)) == "a" * 10 + "… [15 more chars]"
+    assert Payload("a" * 25).summary() == "<str 25 chars>"
+    assert Payload({"beta": 1.1, "var": 0.02}).summary() == "<dict 2 items>"
+    assert Payload(pd.DataFrame({"a": range(40), "b": range(40)})).summary() == "<DataFrame 40x2>"
+    assert Payload(3.5).summary() == "<float>"
+
+
+def test_filtered_payload_is_never_formatted(root_logging):
+    stream = io.StringIO()
+    configure_logging("INFO", log_file=None, stream=stream, force=True)
+    value = Expensive()
+    logging.debug("output: %s", payload(value))
+    logging.info("output: %s", payload(value, limit=100))
+    shutdown_logging()
+
+    assert value.formatted == 1
+    assert "x" * 100 + "… [4900 more chars]" in stream.getvalue()
+
+
+def test_sampler_writes_one_payload_in_every_n_per_call_site():
+    logger = logging.getLogger("test_log_config.sampler")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    first, second = io.StringIO(), io.StringIO()
+    sampler = PayloadSampler(every=3)
+    for stream in (first, second):
+        handler = logging.StreamHandler(stream)
+        handler.addFilter(sampler)
+        logger.addHandler(handler)
+
+    for _ in range(6):
+        logger.debug("report: %s (%d)", payload("r" * 50), 7)
+    logger.debug("other site: %s", payload("o" * 50))
+
+    lines = first.getvalue().splitlines()
+    assert lines == second.getvalue().splitlines()
+    assert lines[:6] == ["report: " + "r" * 50 + " (7)", "report: <str 50 chars> (7)", "report: <str 50 chars> (7)"] * 2
+    assert lines[6] == "other site: " + "o" * 50
+
+
+def test_configure_logging_runs_once_unless_forced(root_logging, tmp_path):
+    log_file = tmp_path / "app.log"
+    configure_logging("warning", log_file=str(log_file), stream=io.StringIO(), force=True)
+    configure_logging("DEBUG", log_file=None)
+    assert root_logging.level == logging.WARNING
+    assert len(log_config._handlers) == 1
+    assert len(log_config._listener.handlers) == 2
+
+    logging.warning("kept")
+    logging.info("dropped")
+    shutdown_logging()
+    assert "WARNING - kept" in log_file.read_text()
+    assert "dropped" not in log_file.read_text()
+
+    configure_logging("not-a-level", log_file=None, stream=io.StringIO(), force=True)
+    assert root_logging.level == logging.INFO
+    assert len(log_config._listener.handlers) == 1
+    with pytest.raises(ValueError, match="Unknown log format"):
+        configure_logging(fmt="xml", force=True)
+
+
+def test_records_are_written_by_the_listener_thread(root_logging):
+    class ThreadRecorder(logging.Handler):
+        def __init__(self):
+            super().__init__()
+            self.threads = set()
+
+        def emit(self, record):
+            self.threads.add(threading.current_thread().name)
+
+    stream = io.StringIO()
+    configure_logging("INFO", log_file=None, stream=stream, force=True)
+    recorder = ThreadRecorder()
+    log_config._listener.handlers += (recorder,)
+    try:
+        raise RuntimeError("fetch failed")
+    except RuntimeError:
+        logging.exception("report %s failed", "IBM")
+    shutdown_logging()
+
+    assert recorder.threads and threading.current_thread().name not in recorder.threads
+    assert "ERROR - report IBM failed\nTraceback" in stream.getvalue()
+    assert "RuntimeError: fetch failed" in stream.getvalue()
+
+
+def test_full_queue_drops_records_without_blocking():
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=2))
+    logger = logging.getLogger("test_log_config.full_queue")
+    logger.propagate = False
+    logger.addHandler(handler)
+    for i in range(5):
+        logger.warning("record %d", i)
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+    assert handler.queue.get().getMessage() == "record 0"
+
+
+def test_json_format_writes_one_object_per_line(root_logging, tmp_path):
+    log_file = tmp_path / "app.log"
+    configure_logging("INFO", log_file=str(log_file), stream=io.StringIO(), force=True, fmt=JSON)
+    logging.info("report for %s ready", "IBM")
+    try:
+        1 / 0
+    except ZeroDivisionError:
+        logging.error("ratio failed", exc_info=True)
+    shutdown_logging()
+
+    entries = [json.loads(line) for line in log_file.read_text().splitlines()]
+    assert [entry["message"] for entry in entries] == ["report for IBM ready", "ratio failed"]
+    assert entries[0]["level"] == "INFO" and entries[0]["logger"] == "root" and entries[0]["time"].endswith("+00:00")
+    assert "exception" not in entries[0]
+    assert entries[1]["exception"].startswith("Traceback") and "ZeroDivisionError" in entries[1]["exception"]
+
+
+def test_size_rotation_gzips_rotated_files(tmp_path):
+    log_file = tmp_path / "app.log"
+    handler = rotating_file_handler(str(log_file), rotation=SIZE, max_bytes=1000, backup_count=2, compress=True)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger = logging.getLogger("test_log_config.rotation")
+    logger.propagate = False
+    logger.addHandler(handler)
+    for i in range(100):
+        logger.warning("line %03d %s", i, "x" * 40)
+    handler.close()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["app.log", "app.log.1.gz", "app.log.2.gz"]
+    newest = gzip.decompress((tmp_path / "app.log.1.gz").read_bytes()).decode()
+    assert newest.startswith("line ") and len(newest) <= 1000
+    assert "line 099" in log_file.read_text()
+
+
+def test_time_rotation_gzips_and_prunes_rotated_files(tmp_path):
+    log_file = tmp_path / "app.log"
+    handler = rotating_file_handler(str(log_file), rotation=TIME, when="S", backup_count=1, compress=True)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    for day in range(3):
+        handler.emit(logging.makeLogRecord({"msg": f"day {day}"}))
+        handler.rolloverAt -= 86400 * 3
+        handler.doRollover()
+    handler.close()
+
+    rotated = [p for p in tmp_path.iterdir() if p.name.endswith(".gz")]
+    assert len(rotated) == 1
+    assert gzip.decompress(rotated[0].read_bytes()).decode() == "day 2\n"
+    with pytest.raises(ValueError, match="Unknown log rotation"):
+        rotating_file_handler(str(log_file), rotation="weekly")
@@ -0,0 +1,111 @@
+import asyncio
+import math
+import sys
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+import src.utils.logging_helper as logging_helper
+from src.utils.metrics import MetricsRegistry, serve_metrics
+
+
+def test_counter_and_gauge_render_in_prometheus_format():
+    registry = MetricsRegistry()
+    calls = registry.counter("app_calls_total", "Calls", ("outcome",))
+    calls.inc(outcome="ok")
+    calls.inc(2, outcome="ok")
+    running = registry.gauge("app_running", "Running")
+    running.inc()
+    running.dec(0.5)
+
+    text = registry.render()
+    assert "# TYPE app_calls_total counter" in text
+    assert 'app_calls_total{outcome="ok"} 3' in text
+    assert "app_running 0.5" in text
+    with pytest.raises(ValueError):
+        calls.inc(-1, outcome="ok")
+    with pytest.raises(ValueError, match="expects labels"):
+        calls.inc(ticker="IBM")
+
+
+def test_histogram_buckets_are_cumulative_and_quantiles_interpolate():
+    registry = MetricsRegistry()
+    latency = registry.histogram("app_latency_seconds", "Latency", ("function",), buckets=(1, 2, 5))
+    for value in [0.5] * 50 + [1.5] * 40 + [4.0] * 9 + [30.0]:
+        latency.observe(value, function="report")
+
+    text = registry.render()
+    assert 'app_latency_seconds_bucket{function="report",le="1"} 50' in text
+    assert 'app_latency_seconds_bucket{function="report",le="2"} 90' in text
+    assert 'app_latency_seconds_bucket{function="report",le="+Inf"} 100' in text
+    assert 'app_latency_seconds_count{function="report"} 100' in text
+    assert latency.quantile(0.5, function="report") == pytest.approx(1.0)
+    assert latency.quantile(0.95, function="report") == pytest.approx(2 + 3 * 5 / 9)
+    assert math.isnan(latency.quantile(0.95, function="chat"))
+
+
+def test_registering_twice_returns_the_same_family():
+    registry = MetricsRegistry()
+    assert registry.counter("x_total", "X") is registry.counter("x_total", "X")
+    with pytest.raises(ValueError, match="already registered"):
+        registry.gauge("x_total", "X")
+
+
+def test_dump_and_http_endpoint_expose_the_registry(tmp_path):
+    registry = MetricsRegistry()
+    registry.counter("app_reports_total", "Reports").inc()
+
+    path = tmp_path / "metrics" / "stockadvisor.prom"
+    registry.dump(str(path))
+    assert "app_reports_total 1" in path.read_text()
+
+    server = serve_metrics(0, registry, host="127.0.0.1")
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_port}/metrics") as response:
+            assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            assert "app_reports_total 1" in response.read().decode()
+    finally:
+        server.shutdown()
+
+
+class FakeAnalyzer:
+    def __init__(self, ticker_symbol):
+        self.ticker_symbol = ticker_symbol
+
+    @logging_helper.log_performance
+    async def analyze(self):
+        await asyncio.sleep(0)
+        return "report"
+
+    @logging_helper.log_performance
+    def fetch(self, fail=False):
+        if fail:
+            raise RuntimeError("boom")
+        return 42
+
+
+def test_log_performance_records_async_calls_with_labels():
+    labels = {"function": "analyze", "agent": "FakeAnalyzer", "ticker_class": "equity"}
+    before = logging_helper.function_duration.count(**labels)
+
+    assert asyncio.run(FakeAnalyzer("IBM").analyze()) == "report"
+
+    assert logging_helper.function_duration.count(**labels) == before + 1
+    assert logging_helper.function_in_progress.value(function="analyze", agent="FakeAnalyzer") == 0
+
+
+def test_log_performance_wraps_sync_functions_and_counts_errors():
+    labels = {"function": "fetch", "agent": "FakeAnalyzer", "ticker_class": "share_class"}
+    ok = logging_helper.function_calls.value(outcome="ok", **labels)
+    failed = logging_helper.function_calls.value(outcome="error", **labels)
+
+    assert FakeAnalyzer("BRK.B").fetch() == 42
+    with pytest.raises(RuntimeError):
+        FakeAnalyzer("BRK.B").fetch(fail=True)
+
+    assert logging_helper.function_calls.value(outcome="ok", **labels) == ok + 1
+    assert logging_helper.function_calls.value(outcome="error", **labels) == failed + 1
@@ -0,0 +1,105 @@
+import asyncio
+import socket
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+
+from offline_replay import FixtureStore, OfflineError, StubSettings, offline
+
+
+def test_chat_path_runs_offline_on_the_stub_model():
+    from agents.stock_adv_agent import get_recommendation_agent_response
+
+    with offline(settings=StubSettings(answer_tokens=12)) as stats:
+        answer = asyncio.run(get_recommendation_agent_response("Should I buy IBM stock now?"))
+
+    assert len(answer.split()) == 12
+    # Recommendation agent: think, web search handoff, PortfolioRiskAnalyzer, final answer;
+    # web search agent: think, websearcher, answer
+    assert sum(stats.llm_calls.values()) == 7
+    # The portfolio tool downloads the holding and its benchmark
+    assert stats.calls == {"duckduckgo.news": 1, "duckduckgo.text": 1, "http.get": 8, "yfinance.history": 2}
+    assert stats.misses == []
+    assert stats.completion_tokens > 24 and stats.prompt_tokens > 0
+
+
+def test_tools_replay_recorded_market_data():
+    from tools.stock_adv_risk_assesment_tool import StockRiskAnalysisTool, StockRiskAnalysisToolInput
+
+    async def assess():
+        return await StockRiskAnalysisTool().run(StockRiskAnalysisToolInput(stock_symbol="IBM"))
+
+    with offline() as stats:
+        first = asyncio.run(assess()).result
+    with offline():
+        second = asyncio.run(assess()).result
+
+    assert first["market_risk"] == second["market_risk"]
+    assert first["fundamental_risk"]["solvency_check"] == "High Risk"
+    # Each block starts with empty stores: the stock and its benchmark are downloaded once
+    assert stats.calls["yfinance.history"] == 2
+    assert stats.misses == []
+
+
+def test_history_is_shifted_to_this_week_and_filtered():
+    import yfinance
+
+    with offline():
+        history = yfinance.Ticker("SPY").history(start="2020-01-01")
+        recent = yfinance.Ticker("SPY").history(start=str(pd.Timestamp.today().date() - pd.Timedelta(days=30)))
+
+    assert (pd.Timestamp.now(tz="America/New_York") - history.index[-1]).days < 7
+    assert history.index[-1].dayofweek == FixtureStore().history("SPY").index[-1].dayofweek
+    assert 15 <= len(recent) <= 23
+
+
+def test_unrecorded_requests_are_counted_and_network_is_blocked(tmp_path):
+    import requests
+
+    with offline(FixtureStore(tmp_path)) as stats:
+        assert requests.get("https://example.com/article").status_code == 404
+        with pytest.raises(OfflineError):
+            socket.create_connection(("93.184.215.14", 443), timeout=1)
+        with pytest.raises(OfflineError):
+            socket.getaddrinfo("example.com", 443)
+
+    assert stats.misses == ["No recorded page for https://example.com/article"]
+    assert stats.calls == {"http.get": 1}
+
+
+def test_chat_path_analyses_the_portfolio_risk(monkeypatch):
+    import tools.stock_adv_portfolio_risk_tool as portfolio
+    from agents.stock_adv_agent import get_recommendation_agent_response
+
+    requested = []
+    load_covariance = portfolio.load_covariance
+
+    def recording_load_covariance(tickers, *args, **kwargs):
+        requested.append(list(tickers))
+        return load_covariance(tickers, *args, **kwargs)
+
+    monkeypatch.setattr(portfolio, "load_covariance", recording_load_covariance)
+    with offline(settings=StubSettings(answer_tokens=12)) as stats:
+        asyncio.run(get_recommendation_agent_response("How risky is a portfolio of 100% IBM?"))
+
+    assert requested == [["IBM"]]
+    assert stats.misses == []
+
+
+def test_call_counts_that_differ_from_the_baseline_are_regressions():
+    from bench_end_to_end import regressions
+
+    baseline = {"wall_s": 1.0, "cpu_s": 1.0, "llm_calls": 6, "prompt_tokens": 100, "completion_tokens": 10,
+                "service_calls": {"http.get": 8, "yahoo_finance_news": 1}}
+
+    assert regressions(dict(baseline), baseline, 1.5) == []
+    fewer = dict(baseline, llm_calls=5, service_calls={"http.get": 8})
+    assert regressions(fewer, baseline, 1.5) == ["llm_calls 6 -> 5", "yahoo_finance_news 1 -> 0"]
+    more = dict(baseline, service_calls={"http.get": 9, "yahoo_finance_news": 1, "duckduckgo.text": 1})
+    assert regressions(more, baseline, 1.5) == ["duckduckgo.text 0 -> 1", "http.get 8 -> 9"]
@@ -0,0 +1,87 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+import src.tools.stock_adv_portfolio_risk_tool as prt
+import src.tools.stock_adv_benchmark_store as bs
+import src.tools.stock_adv_price_store as ps
+from src.tools.stock_adv_risk_engine import ledoit_wolf_covariance
+
+DATES = np.arange(np.datetime64("2024-01-01"), np.datetime64("2024-09-01"))
+
+
+@pytest.fixture
+def market(monkeypatch):
+    """Correlated synthetic closes for three tickers and SPY, served in place of the stores."""
+    rng = np.random.default_rng(5)
+    factor = rng.normal(0.0003, 0.01, len(DATES))
+    closes = {"SPY": 100 * np.cumprod(1 + factor)}
+    for symbol, loading in (("AAA", 1.3), ("BBB", 0.7), ("CCC", 0.2)):
+        closes[symbol] = 50 * np.cumprod(1 + loading * factor + rng.normal(0, 0.01, len(DATES)))
+    loads = []
+
+    class FakePrices:
+        def load(self, symbol, period="5y"):
+            loads.append(symbol)
+            return ps.PriceHistory(symbol, DATES, np.column_stack([closes[symbol]] * 5))
+
+    class FakeBenchmarks:
+        def get(self, ticker):
+            return bs.BenchmarkSeries(ticker, DATES, closes[ticker])
+
+    monkeypatch.setattr(prt, "price_store", FakePrices())
+    monkeypatch.setattr(prt, "benchmark_store", FakeBenchmarks())
+    return loads
+
+
+def test_shrinkage_is_bounded_and_keeps_covariance_invertible():
+    rng = np.random.default_rng(0)
+
+    covariance, shrinkage = ledoit_wolf_covariance(rng.normal(0, 0.01, (10, 30)))
+
+    assert 0.0 < shrinkage <= 1.0
+    assert np.all(np.linalg.eigvalsh(covariance) > 0)
+
+
+def test_weight_changes_reuse_cached_covariance(market, monkeypatch):
+    cache = prt.CovarianceCache()
+    estimates = []
+    original = prt.CovarianceEstimate.from_returns
+
+    def recording_from_returns(*args):
+        estimates.append(args[0])
+        return original(*args)
+
+    monkeypatch.setattr(prt.CovarianceEstimate, "from_returns", recording_from_returns)
+
+    first = prt.load_covariance(["aaa", "bbb", "ccc"], cache=cache)
+    second = prt.load_covariance(["CCC", "AAA", "BBB"], cache=cache)
+
+    assert second is first and len(estimates) == 1
+    assert first.tickers == ("AAA", "BBB", "CCC")
+
+
+def test_risk_breakdown_is_consistent(market):
+    estimate = prt.load_covariance(["AAA", "BBB", "CCC"], cache=prt.CovarianceCache())
+    weights = prt.normalize_weights(estimate, {"AAA": 2, "BBB": 1, "CCC": 1})
+
+    risk = prt.portfolio_risk(estimate, weights)
+
+    assert list(weights) == [0.5, 0.25, 0.25]
+    assert sum(risk["risk_contribution"].values()) == pytest.approx(1.0, abs=1e-3)
+    assert sum(risk["component_var"].values()) == pytest.approx(risk["value_at_risk"], abs=1e-3)
+    assert risk["diversification_ratio"] > 1.0
+    assert risk["correlation"]["AAA"]["AAA"] == pytest.approx(1.0)
+    assert risk["beta"] == pytest.approx(0.5 * 1.3 + 0.25 * 0.7 + 0.25 * 0.2, abs=0.15)
+
+
+def test_weights_must_be_positive(market):
+    estimate = prt.load_covariance(["AAA", "BBB"], cache=prt.CovarianceCache())
+
+    with pytest.raises(ValueError):
+        prt.normalize_weights(estimate, {"AAA": 0, "BBB": 0})
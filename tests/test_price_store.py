@@ -0,0 +1,170 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+import src.tools.stock_adv_price_store as ps
+
+DATES = np.arange(np.datetime64("2025-01-01"), np.datetime64("2025-03-01"))
+
+
+class FakeMarket:
+    """Serves synthetic daily bars in place of yfinance and records every request."""
+
+    def __init__(self):
+        self.calls = []
+        self.scale = 1.0
+        self.corporate_action = False
+
+    def bars(self, start, end=None):
+        mask = DATES >= start
+        if end is not None:
+            mask &= DATES < end
+        closes = (100.0 + np.arange(len(DATES)))[mask] * self.scale
+        ohlcv = np.column_stack([closes, closes + 1, closes - 1, closes, np.full(len(closes), 1e6)])
+        return DATES[mask], ohlcv
+
+    def download(self, symbol, start, end=None):
+        self.calls.append((symbol, str(start), None if end is None else str(end)))
+        dates, ohlcv = self.bars(start, end)
+        return dates, ohlcv, self.corporate_action
+
+
+@pytest.fixture
+def market(monkeypatch):
+    fake = FakeMarket()
+    monkeypatch.setattr(ps.PriceHistoryStore, "_download", staticmethod(fake.download))
+    return fake
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(ps.time, "time", lambda: now[0])
+    return now
+
+
+def test_ranges_are_served_from_disk_without_copies(tmp_path, market, clock):
+    store = ps.PriceHistoryStore(str(tmp_path), refresh_minutes=15)
+    store.load("ibm", start="2025-01-10", end="2025-02-01")
+
+    history = store.load("IBM", start="2025-01-15", end="2025-01-20")
+
+    assert len(market.calls) == 1
+    assert list(history.dates) == list(DATES[14:19])
+    assert isinstance(history.ohlcv, np.memmap)
+    assert np.array_equal(history.close, market.bars(DATES[14], DATES[19])[1][:, 3])
+
+
+def test_only_missing_ranges_are_downloaded(tmp_path, market, clock):
+    store = ps.PriceHistoryStore(str(tmp_path), refresh_minutes=15)
+    store.load("IBM", start="2025-01-10", end="2025-02-01")
+
+    # Older bars: only the head gap is requested
+    store.load("IBM", start="2025-01-05", end="2025-02-01")
+    assert market.calls[-1] == ("IBM", "2025-01-05", "2025-01-10")
+
+    # Newer bars once the refresh interval has passed: the tail from the last completed bar
+    clock[0] += 16 * 60
+    history = store.load("IBM", start="2025-01-05")
+    assert market.calls[-1] == ("IBM", "2025-01-30", None)
+    assert list(history.dates) == list(DATES[4:])
+    assert len(np.unique(history.dates)) == len(history.dates)
+
+
+def test_adjustment_triggers_full_reload(tmp_path, market, clock):
+    store = ps.PriceHistoryStore(str(tmp_path), refresh_minutes=15)
+    store.load("IBM", start="2025-01-10", end="2025-02-01")
+
+    market.scale = 0.5  # e.g. a 2-for-1 split restates the whole history
+    clock[0] += 16 * 60
+    history = store.load("IBM", start="2025-01-10")
+
+    assert market.calls[-1] == ("IBM", "2025-01-10", None)
+    assert np.allclose(history.close, market.bars(DATES[9])[1][:, 3])
+
+
+@pytest.mark.parametrize("reload_from", [None, "2025-01-20"])
+def test_failed_full_reload_keeps_the_stored_history(tmp_path, market, clock, monkeypatch, reload_from):
+    store = ps.PriceHistoryStore(str(tmp_path), refresh_minutes=15)
+    stored = store.load("IBM", start="2025-01-10", end="2025-02-01")
+    bars = market.bars
+
+    def throttled_reload(start, end=None):
+        # The tail still arrives, the full reload comes back empty or starting late
+        if start > np.datetime64("2025-01-10"):
+            return bars(start, end)
+        return bars(np.datetime64(reload_from), end) if reload_from else (DATES[:0], np.empty((0, 5)))
+
+    monkeypatch.setattr(market, "bars", throttled_reload)
+    market.corporate_action = True
+    clock[0] += 16 * 60
+    history = store.load("IBM", start="2025-01-10")
+
+    assert market.calls[-1] == ("IBM", "2025-01-10", None)
+    assert history.version == stored.version
+    assert list(history.dates) == list(DATES[9:31])
+    # The refresh is not recorded as done: the next load tries again
+    store.load("IBM", start="2025-01-10")
+    assert market.calls[-1] == ("IBM", "2025-01-10", None) and len(market.calls) == 5
+
+
+def test_empty_first_download_is_not_persisted(tmp_path, market, clock, monkeypatch):
+    store = ps.PriceHistoryStore(str(tmp_path), refresh_minutes=15)
+    monkeypatch.setattr(market, "bars", lambda start, end=None: (DATES[:0], np.empty((0, 5))))
+
+    assert len(store.load("IBM", start="2025-01-10", end="2025-02-01")) == 0
+
+    monkeypatch.undo()
+    monkeypatch.setattr(ps.PriceHistoryStore, "_download", staticmethod(market.download))
+    history = store.load("IBM", start="2025-01-10", end="2025-02-01")
+    assert len(market.calls) == 2 and len(history) == 22
+
+
+def test_refresh_by_another_process_is_picked_up(tmp_path, market, clock):
+    store = ps.PriceHistoryStore(str(tmp_path), refresh_minutes=15)
+    other_process = ps.PriceHistoryStore(str(tmp_path), refresh_minutes=15)
+    before = store.load("IBM", start="2025-01-10", end="2025-02-01")
+    other_process.load("IBM", start="2025-01-05", end="2025-02-01")
+
+    history = store.load("IBM", start="2025-01-05", end="2025-02-01")
+
+    assert len(market.calls) == 2
+    assert list(history.dates) == list(DATES[4:31])
+    # Views handed out before the swap keep reading the previous version; only the current one is kept
+    assert list(before.dates) == list(DATES[9:31])
+    assert [p.name for p in (tmp_path / "prices" / "IBM").glob("v*")] == [
+        (tmp_path / "prices" / "IBM" / "CURRENT").read_text()]
+
+
+def test_merge_prefers_new_bars():
+    dates = DATES[:3]
+    old = np.ones((3, 5))
+    new = np.full((2, 5), 2.0)
+
+    merged_dates, merged = ps.PriceHistoryStore.merge(dates, old, DATES[2:4], new)
+
+    assert list(merged_dates) == list(DATES[:4])
+    assert list(merged[:, 0]) == [1.0, 1.0, 2.0, 2.0]
+
+
+def test_to_frame_matches_yfinance_layout(tmp_path, market, clock):
+    store = ps.PriceHistoryStore(str(tmp_path))
+
+    frame = store.load("IBM", start="2025-01-10", end="2025-01-20").to_frame()
+
+    assert list(frame.columns) == list(ps.COLUMNS)
+    assert frame.index.name == "Date" and len(frame) == 10
+
+
+def test_to_trading_days_uses_exchange_local_dates():
+    index = pd.DatetimeIndex(["2025-01-02 00:00", "2025-01-03 00:00"]).tz_localize("America/New_York")
+
+    days = ps.to_trading_days(index)
+
+    assert list(days) == [np.datetime64("2025-01-02"), np.datetime64("2025-01-03")]
@@ -0,0 +1,162 @@
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+import src.utils.rate_limit_backends as backends
+from src.agents.stock_adv_security import RateLimiter
+from src.utils.rate_limit_backends import GCRA, SLIDING_WINDOW, InMemoryRedis, RedisBackend, SQLiteBackend
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def admitted_concurrently(make_limiter, threads: int = 8, attempts: int = 10) -> int:
+    """Hammer one user from several threads, each with its own limiter and backend instance."""
+    limiters = [make_limiter() for _ in range(threads)]
+    admitted = []
+    barrier = threading.Barrier(threads)
+
+    def worker(limiter):
+        barrier.wait()
+        admitted.append(sum(limiter.is_allowed("shared-user") for _ in range(attempts)))
+
+    pool = [threading.Thread(target=worker, args=(limiter,)) for limiter in limiters]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return sum(admitted)
+
+
+@pytest.mark.parametrize("mode", [SLIDING_WINDOW, GCRA])
+def test_sqlite_limit_is_shared_between_processes(tmp_path, mode):
+    path = str(tmp_path / "limits.sqlite")
+    clock = FakeClock()
+    first = RateLimiter(3, 10, mode, clock=clock, backend=SQLiteBackend(path))
+    second = RateLimiter(3, 10, mode, clock=clock, backend=SQLiteBackend(path))
+
+    assert [first.is_allowed("u"), second.is_allowed("u"), first.is_allowed("u")] == [True, True, True]
+    assert second.is_allowed("u") is False
+    assert first.get_remaining_requests("u") == 0
+
+    clock.now += 10
+    assert second.get_remaining_requests("u") == 3
+    assert second.is_allowed("u") is True
+
+
+@pytest.mark.parametrize("mode", [SLIDING_WINDOW, GCRA])
+def test_sqlite_check_and_increment_is_atomic(tmp_path, mode):
+    path = str(tmp_path / "limits.sqlite")
+    SQLiteBackend(path).reset("warm-up")
+    assert admitted_concurrently(lambda: RateLimiter(25, 60, mode, backend=SQLiteBackend(path))) == 25
+
+
+def test_sqlite_purges_expired_rows_and_resets(tmp_path):
+    clock = FakeClock()
+    backend = SQLiteBackend(str(tmp_path / "limits.sqlite"), sweep_interval=5)
+    limiter = RateLimiter(3, 10, clock=clock, backend=backend)
+    for i in range(20):
+        limiter.is_allowed(f"user-{i}")
+    assert len(limiter) == 20
+
+    clock.now += 11
+    limiter.is_allowed("recent")
+    assert len(limiter) == 1
+
+    limiter.reset_user("recent")
+    assert len(limiter) == 0
+
+
+def test_sqlite_errors_let_requests_through(tmp_path):
+    limiter = RateLimiter(1, 60, backend=SQLiteBackend(str(tmp_path)))
+    assert limiter.is_allowed("u") is True
+    assert limiter.is_allowed("u") is True
+    assert limiter.get_remaining_requests("u") == 1
+
+
+def test_limiters_sharing_a_backend_are_kept_apart_by_name():
+    backend = backends.InProcessBackend()
+    report = RateLimiter(1, 60, name="report", backend=backend)
+    chat = RateLimiter(2, 60, name="chat", backend=backend)
+
+    assert report.is_allowed("u") is True
+    assert report.is_allowed("u") is False
+    assert chat.is_allowed("u") is True
+    assert chat.get_remaining_requests("u") == 1
+
+
+@pytest.mark.parametrize("mode", [SLIDING_WINDOW, GCRA])
+def test_redis_backend_enforces_the_limit(mode):
+    clock = FakeClock()
+    limiter = RateLimiter(2, 10, mode, clock=clock, backend=RedisBackend(InMemoryRedis(clock)))
+    assert [limiter.is_allowed("u") for _ in range(3)] == [True, True, False]
+    assert limiter.get_remaining_requests("u") == 0
+
+    clock.now += 10
+    assert limiter.get_remaining_requests("u") == 2
+    limiter.reset_user("u")
+    assert limiter.is_allowed("u") is True
+
+
+@pytest.mark.parametrize("mode", [SLIDING_WINDOW, GCRA])
+def test_redis_check_and_increment_is_atomic(mode):
+    store = InMemoryRedis()
+    assert admitted_concurrently(lambda: RateLimiter(25, 60, mode, backend=RedisBackend(store))) == 25
+
+
+@pytest.mark.parametrize("mode", [SLIDING_WINDOW, GCRA])
+def test_redis_idle_keys_expire_in_the_store(mode):
+    clock = FakeClock()
+    store = InMemoryRedis(clock)
+    limiter = RateLimiter(2, 10, mode, clock=clock, backend=RedisBackend(store))
+    for i in range(50):
+        limiter.is_allowed(f"user-{i}")
+    assert store.dbsize() == 50
+
+    clock.now += 11
+    assert store.dbsize() == 0
+
+
+class UnreachableRedis(InMemoryRedis):
+    def _fail(self, *args, **kwargs):
+        raise TimeoutError("Timeout reading from socket")
+
+    get = delete = _fail
+
+    def pipeline(self, transaction=True):
+        raise ConnectionError("Error 111 connecting to localhost:6379. Connection refused.")
+
+    def register_script(self, script):
+        return self._fail
+
+
+@pytest.mark.parametrize("mode", [SLIDING_WINDOW, GCRA])
+def test_redis_errors_let_requests_through(mode):
+    backend = RedisBackend(UnreachableRedis())
+    limiter = RateLimiter(1, 60, mode, backend=backend)
+    assert limiter.is_allowed("u") is True
+    assert limiter.is_allowed("u") is True
+    assert limiter.get_remaining_requests("u") == 1
+    assert backend.reset("u") is False
+
+
+def test_create_backend():
+    assert isinstance(backends.create_backend("memory"), backends.InProcessBackend)
+    with pytest.raises(ValueError, match="Unknown rate limit backend"):
+        backends.create_backend("memcached")
+
+
+def test_create_redis_backend_without_the_package(monkeypatch):
+    monkeypatch.setitem(sys.modules, "redis", None)
+    with pytest.raises(ValueError, match="requires the 'redis' package"):
+        backends.create_backend("redis")
@@ -0,0 +1,104 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from src.agents.stock_adv_security import GCRA, SLIDING_WINDOW, RateLimiter
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.parametrize("mode", [SLIDING_WINDOW, GCRA])
+def test_limit_is_enforced_then_refills_after_window(mode):
+    clock = FakeClock()
+    limiter = RateLimiter(max_requests=3, time_window=10, mode=mode, clock=clock)
+
+    assert [limiter.is_allowed("u") for _ in range(4)] == [True, True, True, False]
+    assert limiter.get_remaining_requests("u") == 0
+    assert limiter.is_allowed("other") is True
+
+    clock.now += 10
+    assert limiter.get_remaining_requests("u") == 3
+    assert limiter.is_allowed("u") is True
+
+
+def test_sliding_window_frees_slots_one_by_one():
+    clock = FakeClock()
+    limiter = RateLimiter(max_requests=2, time_window=10, clock=clock)
+    limiter.is_allowed("u")
+    clock.now += 4
+    limiter.is_allowed("u")
+    assert limiter.is_allowed("u") is False
+
+    clock.now += 6
+    assert limiter.get_remaining_requests("u") == 1
+    assert limiter.is_allowed("u") is True
+    assert limiter.is_allowed("u") is False
+
+
+def test_gcra_refills_one_request_per_emission_interval():
+    clock = FakeClock()
+    limiter = RateLimiter(max_requests=5, time_window=10, mode=GCRA, clock=clock)
+    for _ in range(5):
+        assert limiter.is_allowed("u")
+    assert limiter.is_allowed("u") is False
+
+    clock.now += 2  # 10 s / 5 requests
+    assert limiter.get_remaining_requests("u") == 1
+    assert limiter.is_allowed("u") is True
+    assert limiter.is_allowed("u") is False
+
+
+@pytest.mark.parametrize("mode", [SLIDING_WINDOW, GCRA])
+def test_idle_users_are_swept(mode):
+    clock = FakeClock()
+    limiter = RateLimiter(max_requests=3, time_window=10, mode=mode, sweep_interval=5, clock=clock)
+    for i in range(100):
+        limiter.is_allowed(f"user-{i}")
+    clock.now += 6
+    limiter.is_allowed("recent")
+    assert len(limiter) == 101
+
+    clock.now += 6
+    limiter.is_allowed("recent")
+    assert len(limiter) == 1
+
+
+def test_tracked_users_are_bounded_least_recent_first():
+    limiter = RateLimiter(max_requests=1, time_window=60, max_keys=3, clock=FakeClock())
+    for user in ("a", "b", "c"):
+        limiter.is_allowed(user)
+    limiter.get_remaining_requests("a")
+    limiter.is_allowed("a")
+    limiter.is_allowed("d")
+
+    assert len(limiter) == 3
+    assert limiter.get_remaining_requests("b") == 1
+    assert limiter.get_remaining_requests("a") == 0
+
+
+def test_remaining_requests_does_not_track_unknown_users():
+    limiter = RateLimiter(max_requests=4, time_window=60)
+    assert limiter.get_remaining_requests("nobody") == 4
+    assert len(limiter) == 0
+
+
+def test_reset_user_restores_full_quota():
+    limiter = RateLimiter(max_requests=1, time_window=60, mode=GCRA)
+    limiter.is_allowed("u")
+    limiter.reset_user("u")
+    assert limiter.is_allowed("u") is True
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError, match="Unknown rate limiter mode"):
+        RateLimiter(mode="leaky")
@@ -0,0 +1,92 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from src.tools.stock_adv_ratio_engine import compute_fundamental_ratios
+
+PERIODS = pd.to_datetime(["2024-12-31", "2023-12-31", "2022-12-31"])
+
+
+@pytest.fixture
+def statements():
+    """Three fiscal years in the yfinance layout: line items as rows, newest period first."""
+    income = pd.DataFrame({
+        "Total Revenue": [200.0, 160.0, 100.0],
+        "Gross Profit": [100.0, 72.0, 40.0],
+        "Operating Income": [50.0, 32.0, 15.0],
+        "EBIT": [48.0, 30.0, 14.0],
+        "Net Income": [30.0, 20.0, 10.0],
+        "Interest Expense": [-6.0, -5.0, 0.0],
+        "Diluted EPS": [3.0, 2.0, 1.0],
+    }, index=PERIODS).T
+    balance = pd.DataFrame({
+        "Total Assets": [300.0, 250.0, 200.0],
+        "Stockholders Equity": [150.0, 125.0, 100.0],
+        "Current Assets": [90.0, 80.0, 60.0],
+        "Current Liabilities": [60.0, 50.0, 0.0],
+        "Inventory": [30.0, np.nan, 10.0],
+        "Total Debt": [75.0, 100.0, 120.0],
+    }, index=PERIODS).T
+    cash_flow = pd.DataFrame({
+        "Operating Cash Flow": [45.0, 30.0, 12.0],
+        "Capital Expenditure": [-15.0, -10.0, -8.0],
+    }, index=PERIODS).T
+    return income, balance, cash_flow
+
+
+def test_ratios_are_computed_for_every_period(statements):
+    result = compute_fundamental_ratios(*statements)
+
+    ratios = result.ratios
+    assert list(ratios.columns) == list(PERIODS)
+    assert list(ratios.loc["gross_margin"]) == pytest.approx([0.5, 0.45, 0.4])
+    assert list(ratios.loc["roe"]) == pytest.approx([0.2, 0.16, 0.1])
+    assert ratios.loc["quick_ratio", PERIODS[0]] == pytest.approx(1.0)
+    assert ratios.loc["quick_ratio", PERIODS[1]] == pytest.approx(1.6)  # missing inventory counts as zero
+    assert np.isnan(ratios.loc["current_ratio", PERIODS[2]])  # zero liabilities
+    assert np.isnan(ratios.loc["interest_coverage", PERIODS[2]])  # no interest expense
+    assert list(ratios.loc["free_cash_flow"]) == pytest.approx([30.0, 20.0, 4.0])
+
+
+def test_growth_and_cagr(statements):
+    result = compute_fundamental_ratios(*statements)
+
+    assert list(result.growth.loc["revenue"]) == pytest.approx([0.25, 0.6])
+    assert result.cagr["eps"] == pytest.approx(3.0 ** (365.25 / 731) - 1.0)
+
+
+def test_missing_statements_yield_empty_ratios():
+    result = compute_fundamental_ratios(None, pd.DataFrame())
+
+    assert result.latest() == {} and result.cagr == {}
+
+
+def test_to_dict_is_json_friendly(statements):
+    income, balance, _ = statements
+
+    summary = compute_fundamental_ratios(income, balance).to_dict()
+
+    assert summary["periods"][0] == summary["latest_period"] == "2024-12-31"
+    assert summary["latest"]["net_margin"] == pytest.approx(0.15)
+    assert summary["latest"]["free_cash_flow"] is None
+    assert summary["growth_yoy"]["net_income"]["2024-12-31"] == pytest.approx(0.5)
+
+
+def test_latest_never_mixes_in_older_periods(statements):
+    income, balance, cash_flow = statements
+    balance.loc["Inventory", PERIODS[0]] = np.nan
+    income.loc["Gross Profit", PERIODS[0]] = np.nan
+
+    result = compute_fundamental_ratios(income, balance, cash_flow)
+    latest = result.latest()
+
+    assert result.latest_period == "2024-12-31"
+    assert np.isnan(latest["gross_margin"])
+    assert latest["quick_ratio"] == pytest.approx(1.5)  # missing inventory counts as zero
+    assert latest["net_margin"] == pytest.approx(0.15)
@@ -0,0 +1,102 @@
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+import src.utils.report_cache as rc
+
+# Wednesday 2026-01-21, 11:00 and 20:00 New York time
+MARKET_HOURS = datetime(2026, 1, 21, 11, 0, tzinfo=rc.MARKET_TZ).timestamp()
+AFTER_CLOSE = datetime(2026, 1, 21, 20, 0, tzinfo=rc.MARKET_TZ).timestamp()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return rc.ReportCache(str(tmp_path / "reports.sqlite"), ttl_minutes=15, stale_minutes=60)
+
+
+@pytest.fixture
+def key():
+    return rc.ReportCacheKey(ticker="IBM", model_set="a|b|c", prompt_version="v1")
+
+
+def test_fresh_until_during_market_hours_uses_ttl():
+    assert rc.compute_fresh_until(MARKET_HOURS, 15) == MARKET_HOURS + 15 * 60
+
+
+def test_fresh_until_after_close_lasts_until_next_open():
+    fresh_until = rc.compute_fresh_until(AFTER_CLOSE, 15)
+    assert fresh_until == datetime(2026, 1, 22, 9, 30, tzinfo=rc.MARKET_TZ).timestamp()
+
+
+def test_fresh_until_on_friday_evening_skips_weekend():
+    friday_evening = datetime(2026, 1, 23, 18, 0, tzinfo=rc.MARKET_TZ).timestamp()
+    fresh_until = rc.compute_fresh_until(friday_evening, 15)
+    assert fresh_until == datetime(2026, 1, 26, 9, 30, tzinfo=rc.MARKET_TZ).timestamp()
+
+
+def test_put_get_and_expiry(cache, key):
+    cache.put(key, "report", now=MARKET_HOURS)
+
+    assert cache.get(key, now=MARKET_HOURS + 60).is_fresh(MARKET_HOURS + 60)
+    stale = cache.get(key, now=MARKET_HOURS + 30 * 60)
+    assert stale is not None and not stale.is_fresh(MARKET_HOURS + 30 * 60)
+    assert cache.get(key, now=MARKET_HOURS + 2 * 3600) is None
+
+
+def test_entries_are_shared_through_the_database(cache, key):
+    cache.put(key, "report", now=MARKET_HOURS)
+    other_process = rc.ReportCache(cache.path, ttl_minutes=15, stale_minutes=60)
+
+    assert other_process.get(key, now=MARKET_HOURS + 60).report == "report"
+    assert other_process.get(rc.ReportCacheKey("IBM", "a|b|c", "v2"), now=MARKET_HOURS + 60) is None
+
+
+@pytest.mark.asyncio
+async def test_get_or_generate_hit_miss_and_bypass(cache, key):
+    calls = []
+
+    async def generate():
+        calls.append(1)
+        return f"report {len(calls)}", True
+
+    assert await cache.get_or_generate(key, generate) == ("report 1", "miss")
+    assert await cache.get_or_generate(key, generate) == ("report 1", "hit")
+    assert await cache.get_or_generate(key, generate, force=True) == ("report 2", "bypass")
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_reports_are_not_cached(cache, key):
+    async def generate():
+        return "Report generation timed out", False
+
+    await cache.get_or_generate(key, generate)
+
+    assert cache.get(key) is None
+
+
+def test_stale_local_copy_is_replaced_by_a_report_regenerated_elsewhere(cache, key):
+    cache.put(key, "old report", now=MARKET_HOURS)
+    other_process = rc.ReportCache(cache.path, ttl_minutes=15, stale_minutes=60)
+    other_process.put(key, "new report", now=MARKET_HOURS + 20 * 60)
+
+    entry = cache.get(key, now=MARKET_HOURS + 21 * 60)
+    assert entry.report == "new report" and entry.is_fresh(MARKET_HOURS + 21 * 60)
+
+    other_process.invalidate(key)
+    assert cache.get(key, now=MARKET_HOURS + 40 * 60) is None
+
+
+def test_memory_level_is_bounded(tmp_path):
+    cache = rc.ReportCache(str(tmp_path / "reports.sqlite"), memory_entries=2)
+    keys = [rc.ReportCacheKey(ticker, "a|b|c", "v1") for ticker in ("IBM", "AAPL", "MSFT")]
+    for key in keys:
+        cache.put(key, f"report {key.ticker}", now=MARKET_HOURS)
+
+    assert list(cache._memory) == [k.as_string() for k in keys[1:]]
+    assert cache.get(keys[0], now=MARKET_HOURS + 60).report == "report IBM"
@@ -0,0 +1,82 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+import src.tools.stock_adv_risk_assesment_tool as rat
+from src.tools.stock_adv_benchmark_store import BenchmarkSeries
+from src.tools.stock_adv_price_store import PriceHistory
+from src.tools.stock_adv_risk_assesment_tool import StockRiskAnalysisTool, StockRiskAnalysisToolInput
+
+
+@pytest.mark.asyncio
+async def test_market_risk_of_a_single_return_reports_n_a():
+    # Two closes, e.g. a ticker listed yesterday: one daily return
+    dates = pd.bdate_range("2024-01-02", periods=1)
+    tool = StockRiskAnalysisTool()
+    tool.ticker_symbol, tool.risk_free_rate = "NEWCO", 0.045
+    tool.returns = pd.Series([0.02], index=dates)
+    tool.benchmark_returns = pd.Series([0.01], index=dates)
+    tool.benchmark_data = BenchmarkSeries("SPY", np.arange(np.datetime64("2024-01-01"), np.datetime64("2024-01-03")),
+                                          np.array([100.0, 101.0]))
+
+    market_risk = await tool.analyze_market_risk()
+
+    assert market_risk["expected_shortfall_95"] == "N/A"
+    assert market_risk["value_at_risk_95_10d"] == "N/A"
+    assert market_risk["expected_shortfall_95_10d"] == "N/A"
+    assert market_risk["volatility_annualized"] == "N/A"
+    assert market_risk["risk_interpretation"]
+
+
+def test_returns_stay_paired_with_the_benchmark_around_a_missing_close(monkeypatch):
+    dates = np.arange(np.datetime64("2025-01-01"), np.datetime64("2025-01-11"))
+    closes = 100.0 + np.arange(len(dates))
+    stock_closes = closes.copy()
+    stock_closes[4] = np.nan
+    ohlcv = np.column_stack([stock_closes] * 4 + [np.full(len(dates), 1e6)])
+    monkeypatch.setattr(rat.price_store, "load",
+                        lambda symbol, period: PriceHistory(symbol, dates, ohlcv, "v1"))
+    monkeypatch.setattr(rat.benchmark_store, "get", lambda ticker: BenchmarkSeries(ticker, dates, closes * 2))
+    monkeypatch.setattr(rat.yf, "Ticker", lambda symbol: SimpleNamespace(
+        info={}, balance_sheet=pd.DataFrame(), financials=pd.DataFrame(), cash_flow=pd.DataFrame()))
+
+    tool = StockRiskAnalysisTool()
+    tool.initialize_risk_data(StockRiskAnalysisToolInput(stock_symbol="IBM"))
+
+    # The returns into and out of the missing day are dropped from both series
+    assert list(tool.returns.index) == list(tool.benchmark_returns.index)
+    assert len(tool.returns) == len(dates) - 3
+    assert np.allclose(tool.returns, tool.benchmark_returns)
+
+
+@pytest.mark.asyncio
+async def test_beta_reuses_the_benchmark_variance_over_the_full_window(monkeypatch):
+    dates = np.arange(np.datetime64("2025-01-01"), np.datetime64("2025-03-01"))
+    closes = 100.0 * np.cumprod(1 + np.random.default_rng(3).normal(0, 0.01, len(dates)))
+    tool = StockRiskAnalysisTool()
+    tool.ticker_symbol, tool.risk_free_rate = "IBM", 0.045
+    tool.benchmark_data = BenchmarkSeries("SPY", dates, closes)
+    index = pd.DatetimeIndex(dates[1:])
+    tool.returns = pd.Series(tool.benchmark_data.returns * 1.5, index=index)
+    tool.benchmark_returns = pd.Series(tool.benchmark_data.aligned_returns(dates), index=index)
+    variances = []
+    compute = rat.compute_risk_metrics
+
+    def recording_compute(*args, benchmark_variance=None, **kwargs):
+        variances.append(benchmark_variance)
+        return compute(*args, benchmark_variance=benchmark_variance, **kwargs)
+
+    monkeypatch.setattr(rat, "compute_risk_metrics", recording_compute)
+    full = await tool.analyze_market_risk()
+    tool.returns, tool.benchmark_returns = tool.returns[1:], tool.benchmark_returns[1:]
+    await tool.analyze_market_risk()
+
+    assert variances == [tool.benchmark_data.variance, None]
+    assert full["beta"] == pytest.approx(1.5)
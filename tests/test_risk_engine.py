@@ -0,0 +1,92 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from src.tools.stock_adv_risk_engine import compute_risk_metrics, returns_from_prices
+
+
+def _reference_metrics(returns: pd.Series, benchmark: pd.Series, risk_free_rate: float) -> dict:
+    """Per-ticker pandas computation the vectorized engine must agree with."""
+    both = pd.concat([returns, benchmark], axis=1).dropna()
+    volatility = returns.std() * np.sqrt(252)
+    cumulative = (1 + returns.fillna(0)).cumprod()
+    return {
+        "volatility": volatility,
+        "beta": both.iloc[:, 0].cov(both.iloc[:, 1]) / both.iloc[:, 1].var(),
+        "max_drawdown": ((cumulative - cumulative.cummax()) / cumulative.cummax()).min(),
+        "value_at_risk_95": np.percentile(returns.dropna(), 5),
+        "sharpe_ratio": (returns.mean() * 252 - risk_free_rate) / volatility,
+    }
+
+
+@pytest.fixture
+def market():
+    rng = np.random.default_rng(7)
+    benchmark = rng.normal(0.0004, 0.01, 500)
+    returns = 1.3 * benchmark[:, None] + rng.normal(0, 0.015, (500, 4))
+    # Late listing and a gap in the middle of another history
+    returns[:120, 1] = np.nan
+    returns[200:230, 3] = np.nan
+    return returns, benchmark
+
+
+def test_matches_per_ticker_reference(market):
+    returns, benchmark = market
+
+    table = compute_risk_metrics(returns, benchmark, 0.045, tickers=["A", "B", "C", "D"])
+
+    for i, ticker in enumerate(table.tickers):
+        expected = _reference_metrics(pd.Series(returns[:, i]), pd.Series(benchmark), 0.045)
+        row = table.row(ticker)
+        for name, value in expected.items():
+            assert row[name] == pytest.approx(value, rel=1e-9), (ticker, name)
+
+
+def test_precomputed_benchmark_variance_is_reused_on_a_full_window(market):
+    returns, benchmark = market
+    variance = float(np.var(benchmark, ddof=1))
+
+    full = compute_risk_metrics(returns[:, [0, 2]], benchmark)
+    reused = compute_risk_metrics(returns[:, [0, 2]], benchmark, benchmark_variance=variance)
+    assert np.allclose(reused.beta, full.beta, rtol=1e-12)
+    # Proof that the given variance is the denominator, not a recomputed one
+    halved = compute_risk_metrics(returns[:, [0, 2]], benchmark, benchmark_variance=2 * variance)
+    assert np.allclose(halved.beta, full.beta / 2, rtol=1e-12)
+
+    # A column with missing days is paired on fewer dates: the variance of the whole benchmark does not apply
+    gapped = compute_risk_metrics(returns, benchmark, benchmark_variance=2 * variance)
+    assert np.allclose(gapped.beta, compute_risk_metrics(returns, benchmark).beta, rtol=1e-12)
+
+
+def test_columns_without_enough_history_are_nan(market):
+    returns, benchmark = market
+    returns[:, 2] = np.nan
+    returns[-1, 2] = 0.01
+
+    table = compute_risk_metrics(returns, benchmark)
+
+    assert table.observations[2] == 1
+    assert np.isnan(table.volatility[2]) and np.isnan(table.beta[2])
+    assert not np.isnan(table.volatility[0])
+
+
+def test_returns_from_prices_keeps_gaps_local():
+    prices = np.array([[10.0], [11.0], [np.nan], [12.1], [13.31]])
+
+    returns = returns_from_prices(prices)[:, 0]
+
+    assert returns[0] == pytest.approx(0.1)
+    assert np.isnan(returns[1]) and np.isnan(returns[2])
+    assert returns[3] == pytest.approx(0.1)
+
+
+def test_mismatched_benchmark_length_is_rejected(market):
+    returns, benchmark = market
+    with pytest.raises(ValueError):
+        compute_risk_metrics(returns, benchmark[:-1])
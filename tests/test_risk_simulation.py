@@ -0,0 +1,71 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from src.tools.stock_adv_risk_simulation import estimate_var, horizon_returns
+
+
+@pytest.fixture
+def returns():
+    return np.random.default_rng(3).normal(0.0005, 0.02, 2000)
+
+
+def test_historical_daily_var_matches_percentile(returns):
+    estimate = estimate_var(returns, "historical", confidence_levels=(0.95,), horizons=(1,))[0]
+
+    assert estimate.value_at_risk == pytest.approx(np.percentile(returns, 5))
+    assert estimate.expected_shortfall == pytest.approx(returns[returns <= estimate.value_at_risk].mean())
+
+
+def test_parametric_uses_normal_quantile_and_sqrt_time(returns):
+    one_day, ten_day = estimate_var(returns, "parametric", confidence_levels=(0.95,), horizons=(1, 10))
+
+    mu, sigma = returns.mean(), returns.std(ddof=1)
+    assert one_day.value_at_risk == pytest.approx(mu - 1.6448536 * sigma, rel=1e-6)
+    assert ten_day.value_at_risk == pytest.approx(10 * mu - 1.6448536 * sigma * np.sqrt(10), rel=1e-6)
+    assert one_day.expected_shortfall < one_day.value_at_risk
+
+
+def test_cornish_fisher_is_close_to_normal_for_normal_data(returns):
+    cf = estimate_var(returns, "cornish_fisher", confidence_levels=(0.99,), horizons=(1,))[0]
+    normal = estimate_var(returns, "parametric", confidence_levels=(0.99,), horizons=(1,))[0]
+
+    assert cf.value_at_risk == pytest.approx(normal.value_at_risk, rel=0.05)
+    assert cf.expected_shortfall == pytest.approx(normal.expected_shortfall, rel=0.05)
+
+
+@pytest.mark.parametrize("method", ["bootstrap", "monte_carlo"])
+def test_simulations_are_seeded_and_bracket_their_estimate(returns, method):
+    first = estimate_var(returns, method, horizons=(10,), n_paths=20_000, seed=11, batch_size=3_000)
+    second = estimate_var(returns, method, horizons=(10,), n_paths=20_000, seed=11, batch_size=3_000)
+
+    assert [e.value_at_risk for e in first] == [e.value_at_risk for e in second]
+    for estimate in first:
+        assert estimate.ci_low <= estimate.value_at_risk <= estimate.ci_high
+        assert estimate.expected_shortfall <= estimate.value_at_risk
+
+
+def test_bootstrap_agrees_with_historical_horizon_returns(returns):
+    simulated = estimate_var(returns, "bootstrap", confidence_levels=(0.95,), horizons=(5,), n_paths=50_000, seed=1)[0]
+    empirical = np.percentile(horizon_returns(returns, 5), 5)
+
+    assert simulated.value_at_risk == pytest.approx(empirical, rel=0.15)
+
+
+def test_unknown_method_is_rejected(returns):
+    with pytest.raises(ValueError):
+        estimate_var(returns, "garch")
+
+
+@pytest.mark.parametrize("horizon", [0, 5, 6, 50])
+def test_historical_horizon_longer_than_the_history_is_rejected(horizon):
+    short = np.array([0.01, -0.02, 0.005, 0.003, -0.01])
+
+    with pytest.raises(ValueError, match="horizon"):
+        estimate_var(short, "historical", horizons=(horizon,))
+    assert len(horizon_returns(short, 4)) == 2
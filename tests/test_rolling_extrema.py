@@ -0,0 +1,77 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from src.tools.stock_adv_indicators import IndicatorEngine
+from src.tools.stock_adv_rolling_extrema import MonotonicWindow, RollingExtrema, rolling_extrema
+
+WINDOWS = (1, 2, 9, 26, 52, 64)
+
+
+@pytest.fixture
+def bars():
+    rng = np.random.default_rng(4)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.02, 400))
+    return close * (1 + rng.uniform(0, 0.02, 400)), close * (1 - rng.uniform(0, 0.02, 400)), close
+
+
+def test_sparse_table_matches_pandas_rolling(bars):
+    high, low, _ = bars
+
+    extremes = rolling_extrema(high, low, WINDOWS)
+
+    for w in WINDOWS:
+        assert np.allclose(extremes[w][0], pd.Series(high).rolling(w).max(), equal_nan=True), w
+        assert np.allclose(extremes[w][1], pd.Series(low).rolling(w).min(), equal_nan=True), w
+
+
+def test_matrix_columns_and_missing_values(bars):
+    high, low, _ = bars
+    matrix = np.column_stack([high, low])
+    matrix[100, 1] = np.nan
+
+    maxima = rolling_extrema(matrix, matrix, (26,))[26][0]
+
+    assert np.allclose(maxima[:, 0], pd.Series(high).rolling(26).max(), equal_nan=True)
+    assert np.isnan(maxima[100:126, 1]).all() and not np.isnan(maxima[126, 1])
+
+
+def test_windows_longer_than_history_are_nan():
+    assert np.isnan(rolling_extrema(np.arange(5.0), np.arange(5.0), (9,))[9][0]).all()
+
+
+def test_appends_continue_the_batch_result(bars):
+    high, low, _ = bars
+    streaming = RollingExtrema((9, 26, 52))
+    streaming.fit(high[:300], low[:300])
+
+    appended = [streaming.append(h, l) for h, l in zip(high[300:], low[300:])]
+
+    full = rolling_extrema(high, low, (9, 26, 52))
+    for w in (9, 26, 52):
+        assert [a[w][0] for a in appended] == pytest.approx(full[w][0][300:])
+        assert [a[w][1] for a in appended] == pytest.approx(full[w][1][300:])
+
+
+def test_monotonic_window_waits_for_a_full_window():
+    window = MonotonicWindow(3, "min")
+
+    assert np.isnan(window.push(5.0)) and np.isnan(window.push(4.0))
+    assert [window.push(v) for v in (6.0, 7.0, 8.0, 1.0)] == [4.0, 4.0, 6.0, 1.0]
+
+
+def test_ichimoku_uses_highs_and_lows(bars):
+    high, low, close = bars
+
+    lines = IndicatorEngine(close, high, low).ichimoku()
+
+    tenkan = (pd.Series(high).rolling(9).max() + pd.Series(low).rolling(9).min()) / 2
+    senkou_b = ((pd.Series(high).rolling(52).max() + pd.Series(low).rolling(52).min()) / 2).shift(26)
+    assert np.allclose(lines["tenkan"], tenkan, equal_nan=True)
+    assert np.allclose(lines["senkou_b"], senkou_b, equal_nan=True)
@@ -0,0 +1,77 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from src.tools.stock_adv_rolling_risk import RollingRiskEngine
+
+WINDOWS = (5, 20)
+
+
+@pytest.fixture
+def history():
+    rng = np.random.default_rng(7)
+    benchmark = rng.normal(0.0004, 0.01, 120)
+    returns = 1.2 * benchmark + rng.normal(0.0002, 0.01, 120)
+    dates = np.arange(np.datetime64("2024-01-01"), np.datetime64("2024-01-01") + 120)
+    return dates, returns, benchmark
+
+
+def naive(returns, benchmark, window, rf=0.045):
+    """Recompute every window from scratch (the O(n * w) reference)."""
+    out = {name: np.full(len(returns), np.nan) for name in ("volatility", "beta", "sharpe_ratio", "drawdown")}
+    wealth = np.concatenate([[1.0], np.cumprod(1.0 + returns)])
+    for t in range(window - 1, len(returns)):
+        r, b = returns[t - window + 1:t + 1], benchmark[t - window + 1:t + 1]
+        vol = r.std(ddof=1) * np.sqrt(252)
+        out["volatility"][t] = vol
+        out["beta"][t] = np.cov(r, b, ddof=1)[0, 1] / b.var(ddof=1)
+        out["sharpe_ratio"][t] = (r.mean() * 252 - rf) / vol
+        out["drawdown"][t] = wealth[t + 1] / wealth[t + 1 - window:t + 2].max() - 1.0
+    return out
+
+
+def test_fit_matches_naive_windows(history):
+    dates, returns, benchmark = history
+
+    series = RollingRiskEngine(WINDOWS).fit(dates, returns, benchmark)
+
+    for row, window in enumerate(WINDOWS):
+        expected = naive(returns, benchmark, window)
+        for name, values in expected.items():
+            assert np.allclose(getattr(series, name)[row], values, equal_nan=True), (window, name)
+
+
+def test_append_extends_like_a_full_refit(history):
+    dates, returns, benchmark = history
+    engine = RollingRiskEngine(WINDOWS)
+    engine.fit(dates[:50], returns[:50], benchmark[:50])
+
+    for i in range(50, len(returns)):
+        engine.append(dates[i], returns[i], benchmark[i])
+
+    refit = RollingRiskEngine(WINDOWS).fit(dates, returns, benchmark)
+    assert list(engine.series.dates) == list(dates)
+    for name in ("volatility", "beta", "sharpe_ratio", "drawdown"):
+        assert np.allclose(getattr(engine.series, name), getattr(refit, name), equal_nan=True), name
+
+
+def test_summary_reports_latest_and_range(history):
+    dates, returns, benchmark = history
+
+    summary = RollingRiskEngine((5, 500)).fit(dates, returns, benchmark).summary()
+
+    volatility = summary["5d"]["volatility"]
+    assert volatility["min"] <= volatility["latest"] <= volatility["max"]
+    assert summary["500d"]["beta"] == "N/A"
+
+
+def test_misaligned_inputs_are_rejected(history):
+    dates, returns, benchmark = history
+
+    with pytest.raises(ValueError):
+        RollingRiskEngine().fit(dates, returns, benchmark[:-1])
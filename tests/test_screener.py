@@ -0,0 +1,112 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from src.tools.stock_adv_indicators import IndicatorEngine
+from src.tools.stock_adv_price_store import PriceHistory
+from src.tools.stock_adv_screener import (PRESET_RULES, PricePanel, Rule, crosses_above, crosses_below,
+                                          load_panel, screen)
+
+
+def history(symbol, closes, start="2024-01-01"):
+    closes = np.asarray(closes, dtype=float)
+    first = np.datetime64(start, "D")
+    dates = np.arange(first, first + np.timedelta64(len(closes), "D"))
+    ohlcv = np.column_stack([closes, closes * 1.01, closes * 0.99, closes, np.full(len(closes), 1e6)])
+    return PriceHistory(symbol, dates, ohlcv)
+
+
+@pytest.fixture
+def panel():
+    rng = np.random.default_rng(1)
+    flat = np.full(120, 100.0)
+    crash = np.r_[np.full(119, 100.0) + rng.normal(0, 0.5, 119), 80.0]
+    trend = 100 * np.cumprod(1 + rng.normal(0.001, 0.02, 120))
+    return PricePanel.from_histories([history("FLAT", flat), history("CRASH", crash), history("TREND", trend)])
+
+
+def test_histories_are_aligned_on_the_union_of_dates():
+    panel = PricePanel.from_histories([history("AAA", [1, 2, 3]), history("BBB", [5, 6], start="2024-01-02")])
+
+    assert panel.symbols == ["AAA", "BBB"]
+    assert len(panel.dates) == 3
+    np.testing.assert_array_equal(panel.series["close"][:, 1], [np.nan, 5, 6])
+
+
+def test_crosses_fire_only_on_the_crossing_date():
+    a = np.array([1.0, 2.0, 3.0, 2.0, 1.0])
+    b = np.full(5, 2.0)
+
+    assert crosses_above(a, b).tolist() == [False, False, True, False, False]
+    assert crosses_below(a, b).tolist() == [False, False, False, False, True]
+
+
+def test_price_below_lower_band_matches_only_the_crashed_symbol(panel):
+    matches = screen(panel, {"below_lower_bollinger": ""}, lookback=1)
+
+    assert [(m.symbol, m.rule, m.dates) for m in matches] == [("CRASH", "below_lower_bollinger", ["2024-04-29"])]
+
+
+def test_rules_agree_with_a_per_symbol_evaluation(panel):
+    matches = screen(panel, PRESET_RULES, lookback=len(panel.dates))
+
+    for match in (m for m in matches if m.rule == "macd_bullish_cross"):
+        column = panel.symbols.index(match.symbol)
+        line, signal, _ = IndicatorEngine(panel.series["close"][:, column]).macd()
+        expected = np.flatnonzero(crosses_above(line, signal))
+        assert match.dates == np.datetime_as_string(panel.dates[expected], unit="D").tolist()
+    assert {m.rule for m in matches} <= set(PRESET_RULES)
+
+
+def test_compound_rules_combine_conditions(panel):
+    rule = Rule("custom", "close < bollinger(20, 2).lower and not rsi(14) > 50 or close > 1000")
+
+    signals = rule.evaluate(panel.engine(), panel.series)
+
+    assert signals.dtype == bool and signals.shape == panel.series["close"].shape
+    assert signals[-1].tolist() == [False, True, False]
+
+
+@pytest.mark.parametrize("expression", [
+    "__import__('os').system('echo hi')",
+    "close.__class__",
+    "sma(20)",
+    "macd() > 0",
+    "sma(window=20) > close",
+    "vwap(20) > close",
+    "close == 3",
+    "bollinger(20, 2).width > 0",
+    "close < 'a'",
+    "close <",
+    "rsi(0) < 30",
+    "sma(2.5) > close",
+    "sma(0) > close",
+    "bollinger(1, 2).lower > close",
+    "bollinger(20, 0).lower > close",
+    "macd(12, 26, True).signal > 0",
+])
+def test_rules_outside_the_grammar_are_rejected(panel, expression):
+    with pytest.raises(ValueError):
+        Rule("bad", expression).evaluate(panel.engine(), panel.series)
+
+
+def test_unknown_preset_is_rejected(panel):
+    with pytest.raises(ValueError):
+        screen(panel, {"golden_cross": ""})
+
+
+def test_load_panel_skips_symbols_that_fail_to_load():
+    class Store:
+        def load(self, symbol, start=None, end=None, period="1y"):
+            if symbol == "BAD":
+                raise ValueError("no data")
+            return history(symbol, [1, 2, 3])
+
+    panel = load_panel(["aaa", "BAD", "AAA", "ccc"], store=Store())
+
+    assert panel.symbols == ["AAA", "CCC"]
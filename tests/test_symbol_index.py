@@ -0,0 +1,141 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+import src.agents.stock_adv_security as security
+import src.tools.stock_adv_symbol_index as symbols
+from src.tools.stock_adv_symbol_index import SymbolIndex, normalize_symbol, parse_nasdaq_trader
+
+NASDAQ_LISTED = """Symbol|Security Name|Market Category|Test Issue|Financial Status|Round Lot Size|ETF|NextShares
+AAPL|Apple Inc. - Common Stock|Q|N|N|100|N|N
+ZAZZT|Tick Pilot Test Stock Class A Common Stock|G|Y|N|100|N|N
+ABCDW|Some Acquisition Corp. - Warrant|G|N|N|100|N|N
+File Creation Time: 1019202608:01|||||||
+"""
+
+OTHER_LISTED = """ACT Symbol|Security Name|Exchange|CQS Symbol|ETF|Round Lot Size|Test Issue|NASDAQ Symbol
+BRK.B|Berkshire Hathaway Inc. Class B|N|BRK.B|N|100|N|BRK.B
+IBM|International Business Machines Corporation|N|IBM|N|100|N|IBM
+BAC$L|Bank of America Corporation Preferred Series L|N|BACpL|N|100|N|BAC-L
+File Creation Time: 1019202608:01|||||||
+"""
+
+
+@pytest.mark.parametrize("raw, expected", [("brk.b", "BRK-B"), (" RDS-A ", "RDS-A"), ("BF/B", "BF-B"),
+                                           ("ibm", "IBM")])
+def test_normalize_symbol(raw, expected):
+    assert normalize_symbol(raw) == expected
+
+
+def test_bundled_listing_resolves_share_classes():
+    index = SymbolIndex.load(symbols.BUNDLED_LISTING)
+    assert not index.exhaustive
+    assert "IBM" in index
+    assert "BRK.B" in index and "brk-b" in index
+    assert index.name("BRK.B") == "Berkshire Hathaway Inc. Class B"
+    assert "NOPE" not in index
+
+
+def test_suggest_returns_prefix_matches_in_order():
+    index = SymbolIndex.from_pairs({"MS": "Morgan Stanley", "MSFT": "Microsoft", "MSCI": "MSCI",
+                                    "MU": "Micron", "M": "Macy's"})
+    assert [s for s, _ in index.suggest("ms")] == ["MS", "MSCI", "MSFT"]
+    assert index.suggest("MS", limit=2) == [("MS", "Morgan Stanley"), ("MSCI", "MSCI")]
+    assert index.suggest("X") == []
+    assert index.suggest("") == []
+
+
+def test_load_sorts_an_unsorted_listing(tmp_path):
+    listing = tmp_path / "symbols.txt"
+    listing.write_text("Symbol|Security Name\nMSFT|Microsoft\nAAPL|Apple\nIBM|IBM\n")
+    index = SymbolIndex.load(listing)
+    assert len(index) == 3
+    assert [s for s, _ in index.suggest("A")] == ["AAPL"]
+    assert "MSFT" in index
+
+
+def test_parse_nasdaq_trader_keeps_listed_common_shares():
+    assert parse_nasdaq_trader(NASDAQ_LISTED) == {"AAPL": "Apple Inc. - Common Stock"}
+    assert parse_nasdaq_trader(OTHER_LISTED) == {"BRK-B": "Berkshire Hathaway Inc. Class B",
+                                                 "IBM": "International Business Machines Corporation"}
+
+
+def test_refresh_listing_writes_an_exhaustive_listing(tmp_path, monkeypatch):
+    pages = dict(zip(symbols.LISTING_URLS, [NASDAQ_LISTED, OTHER_LISTED]))
+    fake_httpx = SimpleNamespace(get=lambda url, timeout: SimpleNamespace(text=pages[url],
+                                                                          raise_for_status=lambda: None))
+    monkeypatch.setitem(sys.modules, "httpx", fake_httpx)
+    path = str(tmp_path / "listing" / "us_symbols.txt")
+
+    assert symbols.refresh_listing(path) == 3
+    index = symbols.load_symbol_index(path)
+    assert index.exhaustive
+    assert "BRK.B" in index and "AAPL" in index and len(index) == 3
+
+
+def test_load_symbol_index_falls_back_to_the_bundled_listing(tmp_path):
+    index = symbols.load_symbol_index(str(tmp_path / "missing.txt"))
+    assert not index.exhaustive
+    assert "AAPL" in index
+
+
+def test_missing_listing_is_fetched_in_the_background_and_swapped_in(tmp_path, monkeypatch):
+    pages = dict(zip(symbols.LISTING_URLS, [NASDAQ_LISTED, OTHER_LISTED]))
+    fake_httpx = SimpleNamespace(get=lambda url, timeout: SimpleNamespace(text=pages[url],
+                                                                          raise_for_status=lambda: None))
+    monkeypatch.setitem(sys.modules, "httpx", fake_httpx)
+    monkeypatch.setattr(symbols, "_refresh_started", False)
+    path = str(tmp_path / "us_symbols.txt")
+    index = symbols.load_symbol_index(path)
+    assert not index.exhaustive
+
+    symbols.start_listing_refresh(index, path, max_age_days=7, timeout=1).join(5)
+
+    assert index.exhaustive and len(index) == 3 and "BRK.B" in index
+    # Once per process, and the listing is now fresh anyway
+    assert symbols.start_listing_refresh(index, path, max_age_days=7, timeout=1) is None
+
+
+def test_failed_refresh_keeps_the_bundled_listing(tmp_path, monkeypatch):
+    def unreachable(url, timeout):
+        raise ConnectionError("no route to host")
+
+    monkeypatch.setitem(sys.modules, "httpx", SimpleNamespace(get=unreachable))
+    monkeypatch.setattr(symbols, "_refresh_started", False)
+    path = str(tmp_path / "us_symbols.txt")
+    index = symbols.load_symbol_index(path)
+
+    symbols.start_listing_refresh(index, path, max_age_days=7, timeout=1).join(5)
+
+    assert not index.exhaustive and "AAPL" in index
+    assert not (tmp_path / "us_symbols.txt").exists()
+
+
+def test_fresh_or_disabled_listing_is_not_fetched(tmp_path, monkeypatch):
+    monkeypatch.setattr(symbols, "_refresh_started", False)
+    path = tmp_path / "us_symbols.txt"
+    path.write_text(symbols.HEADER + "\nIBM|International Business Machines\n")
+
+    assert not symbols.listing_is_stale(str(path), max_age_days=7)
+    assert symbols.start_listing_refresh(path=str(path), max_age_days=7) is None
+    assert symbols.start_listing_refresh(path=str(tmp_path / "missing.txt"), max_age_days=0) is None
+    assert symbols.listing_is_stale(str(tmp_path / "missing.txt"))
+
+
+@pytest.mark.parametrize("symbol", ["BRK.B", "RDS-A", "brk/b", "IBM"])
+def test_validate_accepts_share_classes(symbol):
+    assert security.validate_stock_symbol(symbol) == (True, None)
+
+
+def test_validate_rejects_unlisted_symbols_with_a_full_listing(monkeypatch):
+    index = SymbolIndex.from_pairs({"IBM": "IBM", "BRK-B": "Berkshire Hathaway"}, exhaustive=True)
+    monkeypatch.setattr(security, "symbol_index", index)
+
+    assert security.validate_stock_symbol("brk.b") == (True, None)
+    assert security.validate_stock_symbol("ZZZZ") == (False, "Unknown stock symbol 'ZZZZ' (not listed on a US exchange)")
+    assert security.validate_stock_symbol("IN1") == (False, "Stock symbol must contain only letters (A-Z)")
@@ -0,0 +1,146 @@
+import asyncio
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+import src.utils.tracing as tracing
+from src.utils.tracing import (CLIENT, STATUS_ERROR, OTLPJSONFileExporter, Tracer, current_span,
+                               in_current_context, to_chrome_trace)
+
+
+class ListExporter:
+    def __init__(self):
+        self.traces = []
+
+    def export(self, spans):
+        self.traces.append(spans)
+
+
+def test_disabled_tracer_yields_none_and_exports_nothing():
+    exporter = ListExporter()
+    tracer = Tracer(exporter, enabled=False)
+    with tracer.span("report") as span:
+        assert span is None
+        assert current_span() is None
+    assert exporter.traces == []
+
+
+def test_spans_nest_across_asyncio_tasks():
+    exporter = ListExporter()
+    tracer = Tracer(exporter, enabled=True)
+
+    async def analysis(name):
+        with tracer.span(name):
+            await asyncio.sleep(0.01)
+            with tracer.span(f"{name}.fetch", CLIENT):
+                await asyncio.sleep(0)
+
+    async def report():
+        with tracer.span("report"):
+            await asyncio.gather(analysis("fundamental"), analysis("sentiment"), analysis("risk"))
+
+    asyncio.run(report())
+
+    assert len(exporter.traces) == 1
+    spans = {span.name: span for span in exporter.traces[0]}
+    assert len(spans) == 7
+    root = spans["report"]
+    assert root.parent_id is None
+    assert {span.trace_id for span in spans.values()} == {root.trace_id}
+    for name in ("fundamental", "sentiment", "risk"):
+        assert spans[name].parent_id == root.span_id
+        assert spans[f"{name}.fetch"].parent_id == spans[name].span_id
+        assert spans[f"{name}.fetch"].kind == CLIENT
+    assert root.duration >= spans["risk"].duration > 0
+
+
+def test_error_status_is_recorded_and_exception_propagates():
+    exporter = ListExporter()
+    tracer = Tracer(exporter, enabled=True)
+    with pytest.raises(RuntimeError):
+        with tracer.span("report"):
+            raise RuntimeError("yfinance unavailable")
+    (span,) = exporter.traces[0]
+    assert span.status == STATUS_ERROR
+    assert span.to_otlp()["status"] == {"code": STATUS_ERROR, "message": "RuntimeError: yfinance unavailable"}
+
+
+def test_in_current_context_keeps_parent_in_thread_pool():
+    exporter = ListExporter()
+    tracer = Tracer(exporter, enabled=True)
+
+    def fetch(symbol):
+        with tracer.span("fetch", symbol=symbol):
+            return current_span().parent_id
+
+    with tracer.span("report") as root:
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            parents = list(pool.map(in_current_context(fetch), ["IBM", "AAPL", "MSFT", "KO"]))
+
+    assert parents == [root.span_id] * 4
+    assert len(exporter.traces) == 1 and len(exporter.traces[0]) == 5
+
+
+def test_traced_decorator_wraps_sync_and_async_functions(monkeypatch):
+    exporter = ListExporter()
+    monkeypatch.setattr(tracing, "tracer", Tracer(exporter, enabled=True))
+
+    @tracing.traced()
+    def compute():
+        return current_span().name
+
+    @tracing.traced("fetch")
+    async def fetch():
+        return current_span().name
+
+    assert compute().endswith("compute")
+    assert asyncio.run(fetch()) == "fetch"
+    assert len(exporter.traces) == 2
+
+
+def test_exporter_writes_otlp_json_lines_convertible_to_chrome_trace(tmp_path):
+    otlp_path = tmp_path / "traces" / "traces.jsonl"
+    tracer = Tracer(OTLPJSONFileExporter(str(otlp_path)), enabled=True)
+
+    async def report():
+        with tracer.span("report", ticker="IBM"):
+            await asyncio.gather(*(analysis(name) for name in ("fundamental", "sentiment")))
+
+    async def analysis(name):
+        with tracer.span(name):
+            await asyncio.sleep(0.01)
+            with tracer.span("yfinance.history", CLIENT, cached=False):
+                await asyncio.sleep(0.001)
+
+    asyncio.run(report())
+    asyncio.run(report())
+
+    lines = otlp_path.read_text().splitlines()
+    assert len(lines) == 2
+    request = json.loads(lines[0])
+    resource = request["resourceSpans"][0]
+    assert resource["resource"]["attributes"] == [{"key": "service.name", "value": {"stringValue": "stockadvisor"}}]
+    spans = resource["scopeSpans"][0]["spans"]
+    assert len(spans) == 5
+    root = next(span for span in spans if span["name"] == "report")
+    assert "parentSpanId" not in root and len(root["traceId"]) == 32 and len(root["spanId"]) == 16
+    assert root["attributes"] == [{"key": "ticker", "value": {"stringValue": "IBM"}}]
+    assert int(root["endTimeUnixNano"]) > int(root["startTimeUnixNano"])
+
+    chrome_path = tmp_path / "chrome.json"
+    assert to_chrome_trace(str(otlp_path), str(chrome_path)) == 10
+    events = json.loads(chrome_path.read_text())["traceEvents"]
+    assert {event["pid"] for event in events} == {1, 2}
+    first = [event for event in events if event["pid"] == 1]
+    rows = {event["name"]: event["tid"] for event in first if event["name"] != "yfinance.history"}
+    # the concurrent analyses are on separate rows, each fetch stays on its analysis' row
+    assert rows["fundamental"] != rows["sentiment"]
+    fetch_rows = sorted(event["tid"] for event in first if event["name"] == "yfinance.history")
+    assert fetch_rows == sorted([rows["fundamental"], rows["sentiment"]])
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in events)
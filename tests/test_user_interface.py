@@ -1,5 +1,10 @@
+import os
+import subprocess
 import sys
+import threading
+import types
 from pathlib import Path
+from unittest import mock
 
 src_path = Path(__file__).parent.parent / "src"
 sys.path.insert(0, str(src_path))
@@ -53,3 +58,46 @@ def test_get_user_input_invalid_stock_symbol(mock_st, invalid_char_stock_symbol)
     assert result == ""
     mock_st.text_input.assert_called_once()
 
+
+def test_importing_the_interface_defers_the_agent_and_chart_stacks(tmp_path):
+    heavy = ("beeai_framework", "langchain_community", "yfinance", "mplfinance", "matplotlib", "duckduckgo_search")
+    check = (f"import ui.stock_adv_user_interface, sys; "
+             f"print([m for m in {heavy!r} if m in sys.modules])")
+    run = subprocess.run([sys.executable, "-c", check], cwd=tmp_path, capture_output=True, text=True,
+                         env={**os.environ, "PYTHONPATH": str(src_path)}, check=True)
+
+    assert run.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_generate_report_imports_the_agent_stack_in_the_script_thread(mock_st, monkeypatch):
+    import_threads, run_threads = [], []
+
+    class FakeReportGenerator:
+        def __init__(self, ticker, progress_bar):
+            run_threads.append(threading.current_thread())
+            self.report_completed = True
+
+        async def generate_report(self):
+            return "report"
+
+    def import_generator(name):
+        if name != "ReportGeneratorAgent":
+            raise AttributeError(name)
+        import_threads.append(threading.current_thread())
+        return FakeReportGenerator
+
+    # ``from ... import ReportGeneratorAgent`` goes through the module ``__getattr__``, in the importing thread
+    fake_module = types.ModuleType("agents.stock_adv_report_generator")
+    fake_module.__getattr__ = import_generator
+    monkeypatch.setitem(sys.modules, "agents.stock_adv_report_generator", fake_module)
+
+    class PassThroughCache:
+        async def get_or_generate(self, key, generate, force=False):
+            return (await generate())[0], "miss"
+
+    monkeypatch.setattr(user_interface, "report_cache", PassThroughCache())
+    monkeypatch.setattr(user_interface, "ProgressionBar", mock.MagicMock())
+
+    assert user_interface.generate_report("IBM", force=True) == "report"
+    assert import_threads == [threading.current_thread()]
+    assert run_threads and run_threads[0] is not threading.current_thread()